@@ -24,6 +24,7 @@ HEVITON_CONFIG = {
     "login_page": "/monitoring/login/login.do",
     "user_id": os.getenv("HEVITON_USER_ID", ""),
     "password": os.getenv("HEVITON_PASSWORD", ""),
+    "site_id": os.getenv("HEVITON_SITE_ID", ""),  # 리포트/라우팅용 사이트 식별자 (선택)
 }
 
 # 크롤링 대상 URL (로그인 후 확인 필요 - 예상 경로)
@@ -44,6 +45,176 @@ REQUEST_CONFIG = {
     }
 }
 
+# 잔디 웹훅 전송 설정
+JANDI_CONFIG = {
+    "connect_timeout": 3.05,   # 연결 타임아웃 (초)
+    "read_timeout": 10,        # 응답 대기 타임아웃 (초)
+    "retries": 3,              # 연결 실패/429/5xx 재시도 횟수
+    "backoff_factor": 0.5,     # 재시도 간격 (0.5, 1, 2초 ...), Retry-After 헤더 우선
+    "pool_maxsize": 10,        # keep-alive 연결 풀 크기
+    "workers": 4,              # 동시 전송 스레드 수 (채널/메시지 단위)
+    # 요약(digest) 모드: 여러 사이트 리포트를 메시지 하나에 합침
+    "digest": os.getenv("JANDI_DIGEST", "").lower() in ("1", "true", "yes"),
+    "digest_max_items": 20,    # 메시지당 connectInfo 항목 수 상한
+    "digest_max_chars": 4000,  # 메시지당 connectInfo 본문 길이 상한
+}
+
+# 잔디 전송 대상 (JSON 배열, 미설정 시 JANDI_WEBHOOK_URL 하나로 전체 전송)
+#   [{"url": "...", "sites": ["*"], "severities": ["report", "alert"]}, ...]
+JANDI_ROUTES = os.getenv("JANDI_ROUTES", "")
+
+# 알림 outbox 설정 (잔디 전송 대기열)
+OUTBOX_CONFIG = {
+    "path": DATA_DIR / "outbox.db",
+    "max_attempts": 20,        # 이 횟수 이상 실패하면 전송 포기 (dead)
+    "retry_backoff": 30,       # 첫 재시도 대기 (초, 실패마다 2배)
+    "max_backoff": 3600,       # 최대 재시도 대기 (초)
+    "drain_timeout": 15,       # 실행 종료 시 전송 완료 대기 상한 (초)
+    "claim_lease": 120,        # 전송 선점 유지 시간 (초, 선점한 프로세스가 죽으면 이후 다른 프로세스가 전송)
+}
+
+# 에러 알림 묶음 처리 설정 (같은 알림 반복 억제 + 채널별 전송량 제한)
+ALERT_CONFIG = {
+    "state": DATA_DIR / "alert_state.json",
+    "window": int(os.getenv("ALERT_COALESCE_WINDOW", str(6 * 3600))),  # 같은 알림 억제 구간 (초)
+    "rate_limit": int(os.getenv("ALERT_RATE_LIMIT", "5")),             # 채널별 최대 전송 수
+    "rate_period": int(os.getenv("ALERT_RATE_PERIOD", "600")),         # 전송 수 집계 구간 (초)
+}
+
+# Google Sheets 설정
+GOOGLE_SHEETS_CONFIG = {
+    "spreadsheet_id": os.getenv("GOOGLE_SHEETS_SPREADSHEET_ID", "1teGKsO3VP8m5NSP8FYnYmxTXj2a9izdOs0nhbmivr5I"),
+    # API 엔드포인트 변경 (로컬 테스트 서버: src/stubs/sheets_server.py)
+    "api_endpoint": os.getenv("GOOGLE_SHEETS_API_ENDPOINT", ""),
+    # Sheets API discovery 문서 캐시 (네트워크 없이 서비스 생성)
+    "discovery_cache": DATA_DIR / "discovery" / "sheets.v4.json",
+}
+
+# Sheets 쓰기 버퍼 설정 (연속 수집 모드)
+SHEETS_BUFFER_CONFIG = {
+    "journal": DATA_DIR / "sheets_buffer.jsonl",  # 미반영 쓰기 저널 (크래시 후 재생)
+    "flush_interval": int(os.getenv("SHEETS_FLUSH_INTERVAL", "300")),  # 초
+    "max_pending": int(os.getenv("SHEETS_FLUSH_MAX_PENDING", "100")),  # 건
+    "retry_backoff": 30,       # 반영 실패 후 재시도 대기 (초, 실패마다 2배)
+    "max_backoff": 1800,       # 재시도 대기 상한 (초)
+}
+
+# 로컬 저장소 설정 (수집 데이터 원본, SQLite)
+STORE_CONFIG = {
+    "path": DATA_DIR / "heviton.db",
+}
+
+# 수집 후 저장/전송 단계(sink) 설정 - 단계별 동시 실행 타임아웃 (초)
+PIPELINE_CONFIG = {
+    "timeouts": {
+        "jandi": float(os.getenv("SINK_TIMEOUT_JANDI", "20")),
+        "sheets": float(os.getenv("SINK_TIMEOUT_SHEETS", "60")),
+        "store": float(os.getenv("SINK_TIMEOUT_STORE", "10")),
+    },
+}
+
+# 실행 지표 설정 (단계별 소요 시간, 재시도/전송량)
+METRICS_CONFIG = {
+    "enabled": os.getenv("METRICS_ENABLED", "1").lower() not in ("0", "false", "no"),
+    "json_dir": LOGS_DIR,  # metrics_<run_id>.json
+    # Prometheus node_exporter textfile collector 디렉토리로 지정 가능
+    "textfile": Path(os.getenv("METRICS_TEXTFILE", str(DATA_DIR / "metrics" / "heviton.prom"))),
+    "max_spans": 5000,     # JSON 파일에 남기는 span 수 상한 (집계는 전체)
+}
+
+# 페이지 이동 성능 수집 설정 (선택 - Navigation Timing, CDP 네트워크 로그, JS 힙)
+NAV_PERF_CONFIG = {
+    "enabled": os.getenv("NAV_PERF", "").lower() in ("1", "true", "yes"),
+    "history": DATA_DIR / "nav_perf.jsonl",  # URL별 이력 (실행마다 추가)
+    "top_resources": 5,                      # 페이지별로 남기는 큰/느린 리소스 수
+}
+
+# 실행 프로파일링 설정 (--profile)
+PROFILE_CONFIG = {
+    "dir": LOGS_DIR,  # profile_<run_id>.pstats / .txt
+    "top": 30,        # 보고서에 표시할 상위 함수/할당 위치 수
+    "frames": 5,      # tracemalloc 할당 위치 추적 깊이
+}
+
+# 상주 실행 스케줄러 설정 (python main.py --serve)
+SCHEDULER_CONFIG = {
+    # 실행 시각 ("HH:MM" 매일, "mon HH:MM" 매주, "1 HH:MM" 매월 1일)
+    "daily": os.getenv("SCHEDULE_DAILY", "18:00"),
+    "weekly": os.getenv("SCHEDULE_WEEKLY", "mon 00:05"),
+    "monthly": os.getenv("SCHEDULE_MONTHLY", "1 00:00"),
+    "compact": os.getenv("SCHEDULE_COMPACT", "03:30"),  # 장중 샘플 보존 기간 압축
+    "utc_offset_hours": 9,                    # 스케줄 기준 시간대 (KST)
+    "state": DATA_DIR / "scheduler_state.json",  # 작업별 마지막 실행 시각
+    "catchup_days": 7,          # 중단 후 재시작 시 이 기간 안의 누락 실행만 따라잡음 (일)
+    "snapshot_ttl": 600,        # 수집 스냅샷 공유 시간 (초)
+    "session_max_age": 6 * 3600,  # 로그인 세션 최대 재사용 시간 (초)
+    "idle_close": 1800,         # 다음 작업까지 이보다 오래 남으면 브라우저 종료 (초)
+    "poll_interval": 300,       # 최대 대기 후 스케줄 재확인 (초)
+}
+
+# 과거 발전량 가져오기 설정 (scripts/import_historical_data.py, 통계 페이지 일별 표)
+HISTORY_CONFIG = {
+    "statistics_path": "/monitoring/stat/statistics.do",
+    "params": {"ua": "m", "inType": "web", "energyCode": "501"},
+    # 기간 조회 파라미터 (통계 페이지 검색 폼 기준, 사이트 변경 시 환경변수로 조정)
+    "start_param": os.getenv("HISTORY_START_PARAM", "startDate"),
+    "end_param": os.getenv("HISTORY_END_PARAM", "endDate"),
+    "date_format": os.getenv("HISTORY_DATE_FORMAT", "%Y-%m-%d"),
+    "start_date": os.getenv("HISTORY_START_DATE", ""),  # 첫 가져오기 시작일 (비우면 페이지 기본 기간)
+    "refetch_days": 1,      # 마지막으로 가져온 날부터 다시 요청할 일수 (늦은 보정 반영)
+    "max_range_days": 92,   # 요청 한 번의 최대 기간 (일, 긴 공백은 나누어 요청)
+    "page_wait": 5,         # 페이지 이동 후 표 로드 대기 (초)
+    # 지정 기간 병렬 가져오기 (--since/--until)
+    "workers": int(os.getenv("HISTORY_WORKERS", "4")),   # 동시 로그인 세션 수 (브라우저 수)
+    "chunk": os.getenv("HISTORY_CHUNK", "quarter"),     # 기간 분할 단위 (month/quarter)
+    "retries": 1,           # 기간 요청 실패 시 세션을 새로 만들어 다시 시도할 횟수
+}
+
+# 수집 페이지 원본 보관 설정 (선택 - 추출 로직 수정 후 재수집 없이 재파싱, scripts/reparse_pages.py)
+PAGE_ARCHIVE_CONFIG = {
+    "enabled": os.getenv("PAGE_ARCHIVE", "").lower() in ("1", "true", "yes"),
+    "dir": Path(os.getenv("PAGE_ARCHIVE_DIR", str(DATA_DIR / "pages"))),  # objects/ + index.db
+    "codec": os.getenv("PAGE_ARCHIVE_CODEC", ""),  # zstd / gzip (비우면 zstandard 설치 시 zstd)
+    "level": {"zstd": 10, "gzip": 6},               # 압축 수준
+}
+
+# 장중 발전량 샘플링 설정 (python main.py --sample)
+SAMPLER_CONFIG = {
+    "interval": float(os.getenv("SAMPLE_INTERVAL", "300")),    # 샘플 간격 (초)
+    "deadband": float(os.getenv("SAMPLE_DEADBAND", "0")),      # 이 값 이하의 변화는 무시 (필드 단위)
+    "keyframe_interval": 3600,  # 변화가 없어도 전체 값을 저장하는 간격 (초, 수집 공백과 구분)
+    "page_timeout": 8,          # 카운터 값이 채워질 때까지 최대 대기 (초)
+    "page_poll": 0.25,          # 카운터 값 확인 간격 (초)
+    # 샘플링 중 차단할 정적 리소스 (CDP Network.setBlockedURLs)
+    "blocked_resources": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.ico", "*.woff", "*.woff2", "*.ttf"],
+}
+
+# 장중 샘플 메모리 링 버퍼 설정 (사이트별 NumPy 배열)
+RING_CONFIG = {
+    "capacity": 4096,    # 사이트별 보관 샘플 수 (약 100KB, 5분 간격이면 14일)
+    "flush_every": 12,   # 이 샘플 수마다 바뀐 샘플을 로컬 저장소에 일괄 기록
+    "max_gap": 1800,     # 발전량 적분 시 이보다 긴 샘플 간격은 제외 (초, 수집 중단/밤)
+}
+
+# 장중 샘플 보존 기간 설정 (python main.py --compact, 원본 -> 15분 -> 1시간 집계)
+RETENTION_CONFIG = {
+    "raw_days": int(os.getenv("RETENTION_RAW_DAYS", "14")),            # 원본 샘플 보존 일수
+    "quarter_months": int(os.getenv("RETENTION_QUARTER_MONTHS", "6")),  # 15분 집계 보존 개월 수 (이후 1시간 집계)
+}
+
+# 일출/일몰 기반 샘플링 설정 (python main.py --sample --solar)
+SOLAR_CONFIG = {
+    # 사이트 좌표 (기본: 서울)
+    "latitude": float(os.getenv("SITE_LATITUDE", "37.5665")),
+    "longitude": float(os.getenv("SITE_LONGITUDE", "126.9780")),
+    "margin_minutes": 30,            # 일출 전/일몰 후 샘플 유지 시간 (분)
+    "peak_hours": 2,                 # 남중 전후 고빈도 샘플 구간 (시간)
+    "peak_interval": SAMPLER_CONFIG["interval"],           # 남중 전후 샘플 간격 (초)
+    "shoulder_interval": SAMPLER_CONFIG["interval"] * 2,   # 그 외 낮 샘플 간격 (초)
+    "night_interval": float(os.getenv("SAMPLE_NIGHT_INTERVAL", "0")),  # 밤 샘플 간격 (0: 샘플 없음)
+    "settlement_delay_minutes": 30,  # 일몰 후 오늘 발전량 정산 샘플 시각 (분)
+}
+
 # 로깅 설정
 LOGGING_CONFIG = {
     "level": "INFO",
@@ -6,26 +6,43 @@ Heviton 태양광 발전량 모니터링 크롤러
 Usage:
     python main.py              # 전체 데이터 수집 및 전송
     python main.py --daily      # 일별 데이터만
-    python main.py --weekly     # 주별 데이터만
-    python main.py --monthly    # 월별 데이터만
+    python main.py --weekly     # 지난 주 주별 기록 (로컬 일별 기록 기준)
+    python main.py --monthly    # 전월 월별 기록 (로컬 일별 기록 기준)
+    python main.py --serve      # 상주 실행 (일/주/월 작업 내부 스케줄)
+    python main.py --sample     # 장중 발전량 샘플링 (바뀐 값만 저장)
+    python main.py --sample --solar  # 일출/일몰 기준 샘플링 (밤 제외)
+    python main.py --compact    # 보존 기간 지난 장중 샘플 압축 (원본 -> 15분 -> 1시간)
     python main.py --test       # 테스트 메시지 전송
+    python main.py --reconcile  # 로컬 저장소 기준 Google Sheets 정합성 동기화
+    python main.py --flush-outbox  # 미전송 잔디 메시지 재전송
+    python main.py --nav-perf   # 수집 + 페이지 이동 성능 기록
+    python main.py --nav-report # 페이지 성능 이력 보고서
+    python main.py --profile    # 수집 실행 프로파일 (cProfile + tracemalloc)
 """
 import os
 import sys
 import argparse
 import logging
 from datetime import datetime
+from typing import Dict, Any, Optional, List
 from dotenv import load_dotenv
 
 # 프로젝트 루트 경로 추가
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, PROJECT_ROOT)
 
-from config.settings import LOGGING_CONFIG, LOGS_DIR
+from config.settings import LOGGING_CONFIG, LOGS_DIR, HEVITON_CONFIG, OUTBOX_CONFIG, NAV_PERF_CONFIG
 from src.auth import HevitonAuth
 from src.scraper import HevitonScraper
 from src.jandi_webhook import JandiWebhook
-from src.google_sheets import GoogleSheetsClient
+from src.jandi_router import JandiRouter, SEVERITY_ALERT
+from src.local_store import LocalStore
+from src.models import ConverterStatus
+from src.outbox import NotificationOutbox
+from src.alerts import AlertCoalescer
+from src.metrics import metrics
+from src.profiling import checkpoint, run_profiled
+from src.pipeline import SinkStage, SinkSkipped, run_sinks, exit_code as sink_exit_code
 
 # 환경변수 로드
 load_dotenv()
@@ -53,19 +70,157 @@ def get_jandi_webhook() -> JandiWebhook:
     return JandiWebhook(webhook_url)
 
 
+def get_jandi_router() -> JandiRouter:
+    """잔디 전송 라우터 생성 (JANDI_ROUTES 또는 JANDI_WEBHOOK_URL)"""
+    return JandiRouter()
+
+
+def notify_error(outbox: NotificationOutbox, router: JandiRouter,
+                 message: str, source: str, coalescer: Optional[AlertCoalescer] = None,
+                 site: Optional[str] = None):
+    """
+    에러 알림 전송 (채널별 반복 알림 억제 후 outbox에 등록)
+
+    Args:
+        outbox: 알림 outbox
+        router: 잔디 전송 라우터
+        message: 에러 메시지
+        source: 발생 위치 (지문 구분용)
+        coalescer: 반복 알림 억제기 (기본: 새로 생성)
+        site: 사이트 식별자 (라우팅용, 기본: HEVITON_SITE_ID)
+    """
+    coalescer = coalescer or AlertCoalescer()
+    site = HEVITON_CONFIG["site_id"] if site is None else site
+
+    for url in router.targets(site, SEVERITY_ALERT):
+        jandi = router.webhook(url)
+        result = coalescer.submit(url, message, source)
+
+        if result["digests"]:
+            outbox.enqueue(url, jandi.build_alert_digest(result["digests"]), "alert-digest")
+        if result["send"]:
+            outbox.enqueue(url, jandi.build_error_alert(message), "alert")
+
+
+def build_sink_stages(outbox: NotificationOutbox, router: JandiRouter) -> List[SinkStage]:
+    """
+    수집 후 저장/전송 단계 구성
+
+    Args:
+        outbox: 알림 outbox (잔디 리포트 등록 및 전송 대기)
+        router: 잔디 전송 라우터
+
+    Returns:
+        [잔디, Google Sheets, 로컬 저장소] 단계
+    """
+    logger = logging.getLogger(__name__)
+
+    def send_jandi(data: Dict[str, Any]) -> str:
+        # 백그라운드 전송 후 이번 리포트만 완료 대기 (이전 실행의 미전송분은 판정에서 제외),
+        # 남은 메시지는 다음 실행에서 재전송
+        messages = router.build_reports([data])
+        message_ids = [outbox.enqueue(url, payload, "report") for url, payload in messages]
+        undelivered = outbox.wait_for(message_ids, timeout=OUTBOX_CONFIG["drain_timeout"])
+        if undelivered:
+            raise RuntimeError(f"리포트 {len(undelivered)}/{len(messages)}건 미전송 - outbox에서 재전송 예정")
+        return f"리포트 {len(messages)}건 전송"
+
+    def write_sheets(data: Dict[str, Any]) -> str:
+        # Sheets 미사용 실행에서는 google API 모듈을 로드하지 않음
+        from src.google_sheets import GoogleSheetsClient
+
+        sheets = GoogleSheetsClient()
+        if not sheets.is_configured:
+            raise SinkSkipped("Google Sheets 연동 미설정 (선택사항)")
+        if not sheets.record_all(data):
+            raise RuntimeError("Google Sheets 기록 일부 실패")
+        return "Google Sheets 기록 완료"
+
+    def write_store(data: Dict[str, Any]) -> str:
+        # Sheets 정합성 검사 기준 데이터 (단계 스레드 안에서 연결 생성/종료)
+        from src.google_sheets import build_daily_record
+
+        with LocalStore() as store:
+            count = store.upsert_daily([build_daily_record(data)])
+        logger.debug(f"로컬 저장소 일별 기록 {count}건")
+        return f"일별 기록 {count}건 저장"
+
+    return [
+        SinkStage("jandi", send_jandi),
+        SinkStage("sheets", write_sheets),
+        SinkStage("store", write_store),
+    ]
+
+
+def collect_snapshot(driver) -> Dict[str, Any]:
+    """로그인된 드라이버로 전체 데이터 수집"""
+    logger = logging.getLogger(__name__)
+
+    data = HevitonScraper(driver).get_all_data()
+    logger.info("데이터 수집 완료")
+    logger.info(f"수집된 데이터: {data}")
+    checkpoint("scrape")
+    return data
+
+
+def process_snapshot(data: Dict[str, Any], outbox: NotificationOutbox, router: JandiRouter,
+                     coalescer: AlertCoalescer) -> int:
+    """
+    수집 스냅샷 처리 (설비 이상 알림 + 잔디/Sheets/로컬 저장소 기록)
+
+    Returns:
+        종료 코드 (0: 전체 성공)
+    """
+    logger = logging.getLogger(__name__)
+
+    # 설비 이상은 리포트와 별도로 알림 (반복 시 억제)
+    converter_status = ConverterStatus.coerce(data.get("converter_status"))
+    if converter_status.is_normal is False:
+        notify_error(outbox, router, f"설비 이상 감지: {converter_status.error_text}", "converter", coalescer,
+                     site=data.get("site"))
+
+    # 잔디/Sheets/로컬 저장소를 같은 스냅샷으로 동시에 처리 (단계별 타임아웃)
+    results = run_sinks(build_sink_stages(outbox, router), data)
+    code = sink_exit_code(results)
+    checkpoint("sinks")
+
+    if code == 0:
+        logger.info("크롤러 정상 종료")
+    else:
+        logger.warning("크롤러 종료 - 일부 단계 실패: "
+                       + ", ".join(r.name for r in results if not r.ok))
+    return code
+
+
+def flush_alert_digests(outbox: NotificationOutbox, router: JandiRouter, coalescer: AlertCoalescer):
+    """억제 구간이 끝난 반복 알림 요약 전송"""
+    for url in router.targets(HEVITON_CONFIG["site_id"], SEVERITY_ALERT):
+        digests = coalescer.flush_expired(url)
+        if digests:
+            outbox.enqueue(url, router.webhook(url).build_alert_digest(digests), "alert-digest")
+
+
 def run_scraper(args):
     """크롤러 실행"""
     logger = logging.getLogger(__name__)
     logger.info("=" * 50)
     logger.info("Heviton 발전량 크롤러 시작")
+    logger.info(f"실행 ID: {metrics.run_id}")
     logger.info("=" * 50)
 
     try:
-        jandi = get_jandi_webhook()
+        router = get_jandi_router()
     except ValueError as e:
         logger.error(str(e))
         return 1
 
+    # 잔디 메시지는 outbox에 기록 후 백그라운드 전송 (이전 실행의 미전송분 포함)
+    outbox = NotificationOutbox()
+    outbox.start()
+
+    coalescer = AlertCoalescer()
+    flush_alert_digests(outbox, router, coalescer)
+
     auth = None
     try:
         # 로그인 및 데이터 수집 (Selenium 기반)
@@ -73,44 +228,18 @@ def run_scraper(args):
         if not auth.login():
             error_msg = "로그인 실패 - 인증 정보를 확인하세요."
             logger.error(error_msg)
-            jandi.send_error_alert(error_msg)
+            notify_error(outbox, router, error_msg, "auth", coalescer)
             return 1
+        checkpoint("login")
 
-        scraper = HevitonScraper(auth.get_driver())
-
-        # 데이터 수집
-        data = scraper.get_all_data()
-
-        logger.info("데이터 수집 완료")
-        logger.info(f"수집된 데이터: {data}")
-
-        # 잔디로 전송
-        if jandi.send_generation_report(data):
-            logger.info("잔디 전송 완료")
-        else:
-            logger.warning("잔디 전송 실패")
-
-        # Google Sheets에 기록
-        try:
-            sheets = GoogleSheetsClient()
-            if sheets.service:
-                if sheets.record_all(data):
-                    logger.info("Google Sheets 기록 완료")
-                else:
-                    logger.warning("Google Sheets 기록 일부 실패")
-            else:
-                logger.info("Google Sheets 연동 미설정 (선택사항)")
-        except Exception as e:
-            logger.warning(f"Google Sheets 기록 실패: {e}")
-
-        logger.info("크롤러 정상 종료")
-        return 0
+        data = collect_snapshot(auth.get_driver())
+        return process_snapshot(data, outbox, router, coalescer)
 
     except Exception as e:
         error_msg = f"크롤러 실행 중 오류 발생: {str(e)}"
         logger.exception(error_msg)
         try:
-            jandi.send_error_alert(error_msg)
+            notify_error(outbox, router, error_msg, "run_scraper", coalescer)
         except:
             pass
         return 1
@@ -118,6 +247,237 @@ def run_scraper(args):
     finally:
         if auth:
             auth.logout()
+        # 전송 완료를 잠시 기다리고, 남은 메시지는 다음 실행에서 재전송
+        outbox.close()
+        router.close()
+
+
+def get_sheets_client():
+    """Google Sheets 클라이언트 (미설정이면 None, 주별/월별은 로컬 저장소에만 기록)"""
+    from src.google_sheets import GoogleSheetsClient
+
+    sheets = GoogleSheetsClient()
+    return sheets if sheets.is_configured else None
+
+
+def run_report(kind: str):
+    """
+    주별/월별 리포트 기록 (--weekly, --monthly)
+
+    로컬 저장소의 일별 기록으로 계산하고, 빠진 값이 있을 때만 로그인하여 수집한다.
+    주별/월별 발전량을 확인할 수 없으면 기록하지 않고 잔디로 알린다.
+    """
+    from src.backfill import browser_fetch
+    from src.jobs import run_weekly, run_monthly, MissingDataError
+    from src.scheduler import SharedSession, local_now
+
+    logger = logging.getLogger(__name__)
+    session = SharedSession(lambda: HevitonAuth(headless=True))
+    snapshot = lambda: collect_snapshot(session.driver())
+    fetch = lambda url: browser_fetch(session.driver())(url)
+
+    try:
+        with LocalStore() as store:
+            if kind == "weekly":
+                ok = run_weekly(local_now().date(), store, get_sheets_client(), fetch=fetch)
+            else:
+                ok = run_monthly(local_now().date(), snapshot, store, get_sheets_client(), fetch=fetch)
+        return 0 if ok else 1
+    except MissingDataError as e:
+        logger.error(f"{kind} 리포트 기록 안 함: {e}")
+        try:
+            router = get_jandi_router()
+            outbox = NotificationOutbox()
+            outbox.start()
+            try:
+                notify_error(outbox, router, str(e), f"report.{kind}")
+            finally:
+                outbox.close()
+                router.close()
+        except Exception as notify_exc:
+            logger.warning(f"알림 전송 실패: {notify_exc}")
+        return 1
+    except Exception as e:
+        logger.exception(f"{kind} 리포트 실패: {e}")
+        return 1
+    finally:
+        session.close()
+
+
+def run_compact():
+    """보존 기간이 지난 장중 샘플 압축 (--compact)"""
+    from src.retention import compact
+
+    logger = logging.getLogger(__name__)
+    try:
+        with LocalStore() as store:
+            report = compact(store)
+    except Exception as e:
+        logger.exception(f"샘플 압축 실패: {e}")
+        return 1
+
+    print(f"샘플 압축: {report.summary()}")
+    return 0
+
+
+def run_sample(args):
+    """
+    장중 발전량 샘플링 (--sample)
+
+    로그인 세션 하나로 monitoring.do 카운터를 SAMPLE_INTERVAL 간격으로 읽어
+    바뀐 값만 로컬 저장소에 기록한다. SIGTERM/Ctrl+C로 종료.
+    """
+    import signal
+    from src.sampler import PowerSampler
+    from src.scheduler import SharedSession
+
+    logger = logging.getLogger(__name__)
+    session = SharedSession(lambda: HevitonAuth(headless=True))
+    scraper: Optional[HevitonScraper] = None
+
+    def fetch() -> Dict[str, Any]:
+        # 재로그인으로 드라이버가 바뀌었을 때만 새 스크레이퍼 생성 (리소스 차단 1회)
+        nonlocal scraper
+        driver = session.driver()
+        if scraper is None or scraper.driver is not driver:
+            scraper = HevitonScraper(driver)
+            scraper.block_static_resources()
+        return scraper.sample_monitoring()
+
+    def on_error(error: Exception):
+        session.invalidate()
+
+    sheets = get_sheets_client()
+    buffer = None
+    if sheets is not None:
+        from src.sheets_buffer import SheetsWriteBuffer
+        buffer = SheetsWriteBuffer(sheets)
+        buffer.start()
+
+    policy = None
+    if args.solar:
+        # 밤에는 샘플하지 않고 남중 전후 고빈도, 일몰 후 정산 1회 (SITE_LATITUDE/SITE_LONGITUDE)
+        from src.solar import SolarPolicy
+        policy = SolarPolicy(peak_interval=args.interval,
+                             shoulder_interval=args.interval * 2 if args.interval else None)
+
+    store = LocalStore()
+    sampler = PowerSampler(HEVITON_CONFIG["site_id"], fetch, store, buffer,
+                           interval=args.interval, on_error=on_error,
+                           policy=policy, on_idle=session.close)
+    signal.signal(signal.SIGTERM, sampler.stop)
+    signal.signal(signal.SIGINT, sampler.stop)
+
+    try:
+        sampler.run(max_samples=args.samples)
+        # 모든 샘플이 실패했을 때만 실패로 종료
+        return 1 if sampler.errors and not sampler.samples else 0
+    finally:
+        session.close()
+        if buffer is not None and not buffer.close():
+            logger.warning("Sheets 반영 실패 - 저널에 남은 행은 다음 실행에서 재반영")
+        store.close()
+
+
+def run_serve(args):
+    """
+    상주 실행 (--serve)
+
+    일/주/월 작업을 내부 스케줄로 실행한다. 로그인 세션, 수집 스냅샷, outbox, Sheets 클라이언트를
+    작업 간에 재사용하고, 중단되었던 동안 놓친 실행은 재시작 시 한 번씩 따라잡는다.
+    """
+    from src.backfill import browser_fetch
+    from src.jobs import run_weekly, run_monthly
+    from src.retention import compact
+    from src.scheduler import (JobScheduler, ScheduledJob, Schedule, SharedSession,
+                               SnapshotCache)
+    from config.settings import SCHEDULER_CONFIG
+
+    logger = logging.getLogger(__name__)
+
+    try:
+        router = get_jandi_router()
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+
+    outbox = NotificationOutbox()
+    outbox.start()
+    coalescer = AlertCoalescer()
+    session = SharedSession(lambda: HevitonAuth(headless=True))
+    cache = SnapshotCache(lambda: collect_snapshot(session.driver()))
+    sheets = get_sheets_client()
+
+    def daily(due) -> bool:
+        flush_alert_digests(outbox, router, coalescer)
+        # 일별 작업은 항상 새로 수집 (수집한 스냅샷은 뒤이은 주별/월별 작업이 재사용)
+        return process_snapshot(cache.get(max_age=0), outbox, router, coalescer) == 0
+
+    def weekly(due) -> bool:
+        with LocalStore() as store:
+            # 빠진 날은 통계 페이지에서 (실패하면 tracked에서 알림)
+            return run_weekly(due.date(), store, sheets,
+                              fetch=lambda url: browser_fetch(session.driver())(url))
+
+    def monthly(due) -> bool:
+        with LocalStore() as store:
+            # 빠진 날은 통계 페이지에서 (실패하면 tracked에서 알림)
+            return run_monthly(due.date(), cache.get, store, sheets,
+                               fetch=lambda url: browser_fetch(session.driver())(url))
+
+    def compaction(due) -> bool:
+        # 로그인 불필요 (로컬 저장소만 사용)
+        with LocalStore() as store:
+            compact(store, due.date())
+        return True
+
+    def tracked(name, func):
+        # 작업마다 실행 ID/지표를 새로 기록하고, 실패하면 다음 작업에서 새로 로그인
+        def run(due) -> bool:
+            metrics.reset()
+            logger.info(f"실행 ID: {metrics.run_id} ({name})")
+            try:
+                ok = func(due)
+            except Exception as e:
+                logger.exception(f"{name} 작업 오류: {e}")
+                session.invalidate()
+                cache.invalidate()
+                notify_error(outbox, router, f"{name} 작업 오류: {e}", f"serve.{name}", coalescer)
+                ok = False
+            metrics.write_reports(success=ok)
+            return ok
+        return run
+
+    scheduler = JobScheduler(
+        [
+            ScheduledJob(name, Schedule.parse(SCHEDULER_CONFIG[name]), tracked(name, func))
+            for name, func in (("daily", daily), ("weekly", weekly), ("monthly", monthly),
+                               ("compact", compaction))
+        ],
+        on_idle=session.close,
+    )
+    scheduler.install_signal_handlers()
+
+    try:
+        scheduler.serve_forever()
+        return 0
+    finally:
+        session.close()
+        outbox.close()
+        router.close()
+
+
+def flush_outbox():
+    """이전 실행에서 남은 잔디 메시지 즉시 재전송"""
+    logger = logging.getLogger(__name__)
+
+    outbox = NotificationOutbox()
+    sent, failed = outbox.deliver_pending(ignore_schedule=True)
+    remaining = outbox.close(timeout=0)
+
+    logger.info(f"outbox 재전송: 성공 {sent}건, 실패 {failed}건, 남은 메시지 {remaining}건")
+    print(f"outbox 재전송: 성공 {sent}건, 실패 {failed}건, 남은 메시지 {remaining}건")
+    return 0 if remaining == 0 else 1
 
 
 def test_webhook():
@@ -162,6 +522,37 @@ def test_webhook():
         return 1
 
 
+def run_reconcile(args):
+    """로컬 저장소와 Google Sheets 정합성 검사 및 최소 차분 동기화"""
+    logger = logging.getLogger(__name__)
+
+    from src.google_sheets import GoogleSheetsClient
+    from src.reconcile import SheetsReconciler
+
+    sheets = GoogleSheetsClient()
+    if not sheets.service:
+        logger.error("Google Sheets 연결 실패")
+        return 1
+
+    try:
+        with LocalStore() as store:
+            report = SheetsReconciler(sheets, store).reconcile(dry_run=args.dry_run, full=args.full)
+    except Exception as e:
+        logger.exception(f"정합성 검사 실패: {e}")
+        return 1
+
+    print(report.summary())
+    return 0
+
+
+def nav_report(args):
+    """페이지 이동 성능 이력 보고서 (느린 페이지 순, 추세 포함)"""
+    from src.nav_perf import load_history, build_report, format_report
+
+    print(format_report(build_report(load_history()), top=args.top))
+    return 0
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Heviton 태양광 발전량 모니터링 크롤러"
@@ -172,16 +563,72 @@ def main():
     )
     parser.add_argument(
         "--weekly", action="store_true",
-        help="주별 발전량만 수집"
+        help="지난 주 주별 발전량 기록 (빠진 날이 있을 때만 수집)"
     )
     parser.add_argument(
         "--monthly", action="store_true",
-        help="월별 발전량만 수집"
+        help="전월 월별 발전량 기록 (필요할 때만 수집)"
+    )
+    parser.add_argument(
+        "--serve", action="store_true",
+        help="상주 실행 - 일/주/월 작업을 내부 스케줄로 실행 (SIGTERM으로 종료)"
+    )
+    parser.add_argument(
+        "--sample", action="store_true",
+        help="장중 발전량 샘플링 - monitoring.do 카운터를 일정 간격으로 기록 (SIGTERM으로 종료)"
+    )
+    parser.add_argument(
+        "--solar", action="store_true",
+        help="--sample 시 일출/일몰 기준 스케줄 (밤 샘플 없음, 남중 전후 고빈도, 일몰 후 정산)"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=None,
+        help="--sample 간격 (초, 기본: SAMPLE_INTERVAL)"
+    )
+    parser.add_argument(
+        "--samples", type=int, default=None,
+        help="--sample 최대 샘플 수 (기본: 종료 요청까지)"
+    )
+    parser.add_argument(
+        "--compact", action="store_true",
+        help="보존 기간이 지난 장중 샘플을 15분/1시간 집계로 압축 (RETENTION_RAW_DAYS, RETENTION_QUARTER_MONTHS)"
     )
     parser.add_argument(
         "--test", action="store_true",
         help="잔디 웹훅 테스트 메시지 전송"
     )
+    parser.add_argument(
+        "--reconcile", action="store_true",
+        help="로컬 저장소 기준으로 Google Sheets 정합성 검사 및 차분 동기화"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="--reconcile 시 차분만 계산하고 기록하지 않음"
+    )
+    parser.add_argument(
+        "--full", action="store_true",
+        help="--reconcile 시 모든 구간을 내려받아 비교 (시트에서 값만 직접 고친 경우 검출)"
+    )
+    parser.add_argument(
+        "--flush-outbox", action="store_true",
+        help="이전 실행에서 전송하지 못한 잔디 메시지 재전송"
+    )
+    parser.add_argument(
+        "--nav-perf", action="store_true",
+        help="페이지 이동마다 Navigation Timing/네트워크/JS 힙 기록 (data/nav_perf.jsonl)"
+    )
+    parser.add_argument(
+        "--nav-report", action="store_true",
+        help="페이지 이동 성능 이력 보고서 출력"
+    )
+    parser.add_argument(
+        "--top", type=int, default=10,
+        help="--nav-report 시 표시할 페이지 수"
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="cProfile/tracemalloc 프로파일 저장 (logs/profile_<실행 ID>.*)"
+    )
     parser.add_argument(
         "--debug", action="store_true",
         help="디버그 모드"
@@ -192,13 +639,40 @@ def main():
     # 로깅 설정
     if args.debug:
         LOGGING_CONFIG["level"] = "DEBUG"
+    if args.nav_perf:
+        NAV_PERF_CONFIG["enabled"] = True
     setup_logging()
 
     # 실행
     if args.test:
         return test_webhook()
+    elif args.reconcile:
+        return run_reconcile(args)
+    elif args.flush_outbox:
+        return flush_outbox()
+    elif args.nav_report:
+        return nav_report(args)
+    elif args.serve:
+        return run_serve(args)
     else:
-        return run_scraper(args)
+        if args.sample:
+            task, task_args = run_sample, (args,)
+        elif args.compact:
+            task, task_args = run_compact, ()
+        elif args.weekly or args.monthly:
+            task, task_args = run_report, ("weekly" if args.weekly else "monthly",)
+        else:
+            task, task_args = run_scraper, (args,)
+
+        # 실행별 단계 소요 시간/재시도/전송량 -> logs/metrics_<run_id>.json, data/metrics/heviton.prom
+        metrics.reset()
+        if args.profile:
+            # cProfile + 단계별 tracemalloc -> logs/profile_<run_id>.pstats/.txt
+            code = run_profiled(task, metrics.run_id, "main.py", *task_args)
+        else:
+            code = task(*task_args)
+        metrics.write_reports(success=code == 0)
+        return code
 
 
 if __name__ == "__main__":
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Heviton 전 구간 실행 벤치마크 (로컬 대체 사이트, 오프라인)
+
+로컬 Heviton 대체 서버(src/stubs/heviton_site.py)를 HEVITON_BASE_URL로 연결하고 헤드리스 Chrome으로
+실제 수집 경로를 실행하여 사이트 조건/설정별 전체 소요 시간(wall clock)을 측정한다.
+- snapshot: 로그인 + HevitonScraper.get_all_data (main.py 일별 수집의 사이트 구간, 잔디/Sheets 기록 제외)
+- sample: 로그인 + sample_monitoring --samples회 (main.py --sample 경로)
+- import: ImportPool로 --years년 기간 가져오기 (임시 로컬 저장소, --workers x --page-wait 조합별)
+사이트 조건은 --latency x --ajax-delay 조합 (--no-ajax면 값이 HTML에 포함된 페이지).
+Chrome/chromedriver가 필요하다 (chromedriver는 webdriver_manager 캐시 사용).
+
+--check: 브라우저 없이 대체 서버만 확인 (로그인 리다이렉트, 세션, 장애 주입, 페이지 추출 결과), 실패 시 1
+
+Usage:
+    python scripts/benchmark_e2e.py --check
+    python scripts/benchmark_e2e.py --scenarios snapshot import --latency 0 0.3 --ajax-delay 0 3
+    python scripts/benchmark_e2e.py --scenarios import --workers 1 2 4 --page-wait 5 2 --years 3
+"""
+import argparse
+import http.cookiejar
+import itertools
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Any, List, Callable, Tuple
+from urllib.parse import urlencode
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import HEVITON_CONFIG, HISTORY_CONFIG
+from src.backfill import Backfill, split_ranges, statistics_url
+from src.parsers import parse_monitoring_page, parse_converter_page, parse_history_page, parse_daily_page
+from src.stubs.heviton_site import FakeHevitonSite, LOGIN_PATH
+
+USER_ID = "bench"
+PASSWORD = "bench-pass"
+
+
+def login_opener(base_url: str, user_id: str, password: str) -> Tuple[urllib.request.OpenerDirector, str]:
+    """로그인 폼 제출 (리다이렉트 따라감) -> (쿠키 유지 opener, 최종 URL)"""
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+    form = urlencode({"loginId": user_id, "password": password}).encode()
+    with opener.open(f"{base_url}/monitoring/login/loginProc.do", form) as response:
+        return opener, response.geturl()
+
+
+def fetch(opener: urllib.request.OpenerDirector, url: str) -> Tuple[int, str, str]:
+    """-> (상태 코드, 최종 URL, 본문)"""
+    try:
+        with opener.open(url) as response:
+            return response.status, response.geturl(), response.read().decode("utf-8")
+    except urllib.error.HTTPError as e:
+        return e.code, url, e.read().decode("utf-8")
+
+
+def check_site() -> List[str]:
+    """대체 서버 확인 (브라우저 없음) -> 실패 목록"""
+    failures = []
+
+    def expect(name: str, ok: bool, detail: Any = ""):
+        print(f"{'ok  ' if ok else 'FAIL'} {name}{f' ({detail})' if detail and not ok else ''}")
+        if not ok:
+            failures.append(f"{name}: {detail}")
+
+    today = date(2026, 10, 15)
+    yesterday = today - timedelta(days=1)
+    with FakeHevitonSite(user_id=USER_ID, password=PASSWORD, today=today, ajax=False) as site:
+        base = site.url
+        _, url = login_opener(base, "nobody", PASSWORD)
+        expect("없는 ID -> ret=idNotFound", url.endswith("ret=idNotFound"), url)
+        opener, url = login_opener(base, USER_ID, "wrong")
+        expect("틀린 비밀번호 -> ret=passNotEq", url.endswith("ret=passNotEq"), url)
+        _, _, page = fetch(opener, url)
+        expect("실패 알림 (swal-text)", "swal-text" in page and "비밀번호" in page)
+
+        status, url, _ = fetch(opener, f"{base}/monitoring/stat/statistics.do")
+        expect("로그인 전 요청 -> 로그인 페이지", LOGIN_PATH in url and "/login/" in url, url)
+
+        opener, url = login_opener(base, USER_ID, PASSWORD)
+        status, url, page = fetch(opener, url)
+        expect("로그인 -> monitoring.do", status == 200 and url.startswith(f"{base}/monitoring/status/monitoring.do"), url)
+        expect("로그인 확인 문자열 (님/로그아웃)", "님" in page and "로그아웃" in page)
+        expect("모니터링 카운터", parse_monitoring_page(page) == site.counters(), parse_monitoring_page(page))
+
+        _, _, page = fetch(opener, f"{base}/monitoring/status/inverter.do?ua=m&inType=web&energyCode=501")
+        converter = parse_converter_page(page)
+        expect("설비상태 정상", converter["is_normal"] and len(converter["converters"]) == 2, converter)
+
+        _, _, page = fetch(opener, f"{base}/monitoring/stat/history.do?ua=m&inType=web")
+        expect("발전이력 30일", len(parse_history_page(page)) == 30)
+
+        start = yesterday - timedelta(days=364)
+        _, _, page = fetch(opener, statistics_url(start, yesterday, base))
+        points = parse_daily_page(page, start, yesterday)
+        expect("통계 기간 조회 365일", len(points) == 365 and points[0].day == start and points[-1].day == yesterday,
+               len(points))
+        _, _, page = fetch(opener, statistics_url(yesterday - timedelta(days=2), today + timedelta(days=5), base))
+        expect("통계 미래 날짜 제외", len(parse_daily_page(page)) == 3)
+
+        status, url, _ = fetch(opener, f"{base}/monitoring/login/logoutProc.do")
+        expect("로그아웃 -> 로그인 페이지", "/login/" in url, url)
+        status, url, _ = fetch(opener, f"{base}/monitoring/status/monitoring.do")
+        expect("로그아웃 후 세션 없음", "/login/" in url, url)
+
+    with FakeHevitonSite(user_id=USER_ID, password=PASSWORD, today=today, ajax_delay=0.2,
+                         inverter_fault=True) as site:
+        base = site.url
+        opener, url = login_opener(base, USER_ID, PASSWORD)
+        _, _, page = fetch(opener, url)
+        expect("AJAX 모드: HTML 카운터 비어 있음", not any(parse_monitoring_page(page).values()))
+        started = time.perf_counter()
+        _, _, data = fetch(opener, f"{base}/monitoring/status/monitoringData.do")
+        elapsed = time.perf_counter() - started
+        expect("AJAX 모드: 카운터 JSON", json.loads(data) == site.counters(), data)
+        expect("느린 AJAX 지연", elapsed >= 0.2, f"{elapsed:.2f}초")
+
+        start = yesterday - timedelta(days=29)
+        _, _, page = fetch(opener, statistics_url(start, yesterday, base))
+        expect("AJAX 모드: HTML 통계 표 비어 있음", parse_daily_page(page) == [])
+        _, _, data = fetch(opener, f"{base}/monitoring/stat/statisticsData.do?"
+                                   f"{urlencode({'startDate': start.isoformat(), 'endDate': yesterday.isoformat()})}")
+        expect("AJAX 모드: 통계 JSON 30일", len(json.loads(data)["rows"]) == 30)
+
+        _, _, page = fetch(opener, f"{base}/monitoring/status/inverter.do")
+        converter = parse_converter_page(page)
+        expect("설비 이상 표시", converter["is_normal"] is False and converter["error_messages"] == ["통신 오류"],
+               converter)
+
+        site.error_rate = 1.0
+        status, _, _ = fetch(opener, f"{base}/monitoring/stat/history.do")
+        expect("장애 주입: 500", status == 500, status)
+        site.error_rate, site.expire_rate = 0.0, 1.0
+        status, url, _ = fetch(opener, f"{base}/monitoring/stat/history.do")
+        expect("장애 주입: 세션 만료 -> 로그인 페이지", "/login/" in url, url)
+        site.expire_rate = 0.0
+        status, url, _ = fetch(opener, f"{base}/monitoring/stat/history.do")
+        expect("세션 만료 후 재로그인 필요", "/login/" in url, url)
+        print(site.summary())
+    return failures
+
+
+def run_snapshot(site: FakeHevitonSite) -> Tuple[bool, str]:
+    """로그인 + 전체 데이터 수집 (main.py 일별 수집의 사이트 구간)"""
+    from src.auth import HevitonAuth
+    from src.scraper import HevitonScraper
+
+    auth = HevitonAuth(headless=True)
+    try:
+        if not auth.login():
+            return False, "로그인 실패"
+        data = HevitonScraper(auth.get_driver()).get_all_data()
+    finally:
+        auth.logout()
+    dashboard = data["dashboard"]
+    ok = (dashboard.today_generation is not None and data["converter_status"].is_normal is not None
+          and len(data["recent_5days"]) == 5)
+    return ok, f"오늘 {dashboard.today_generation} kWh, 최근 {len(data['recent_5days'])}일"
+
+
+def run_sample(site: FakeHevitonSite, samples: int) -> Tuple[bool, str]:
+    """로그인 + 모니터링 카운터 샘플 samples회 (main.py --sample 경로)"""
+    from src.auth import HevitonAuth
+    from src.scraper import HevitonScraper
+
+    auth = HevitonAuth(headless=True)
+    try:
+        if not auth.login():
+            return False, "로그인 실패"
+        scraper = HevitonScraper(auth.get_driver())
+        filled = sum(bool(scraper.sample_monitoring().get("today_generation")) for _ in range(samples))
+    finally:
+        auth.logout()
+    return filled == samples, f"값 확인 {filled}/{samples}회"
+
+
+def run_import(site: FakeHevitonSite, years: int, workers: int, page_wait: float) -> Tuple[bool, str]:
+    """지정 기간 병렬 가져오기 (임시 로컬 저장소)"""
+    from src.import_pool import ImportPool
+    from src.local_store import LocalStore
+
+    yesterday = site.today - timedelta(days=1)
+    since = yesterday - timedelta(days=years * 365 - 1)
+    ranges = split_ranges(since, yesterday)
+    expected = (yesterday - since).days + 1
+    with tempfile.TemporaryDirectory() as tmp, LocalStore(Path(tmp) / "benchmark.db") as store:
+        with ImportPool(workers=workers, page_wait=page_wait) as pool:
+            report = Backfill(store, site="benchmark", pool=pool).run(ranges=ranges)
+    return report.days == expected, f"기간 {len(ranges)}개, {report.days}/{expected}일"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Heviton 전 구간 실행 벤치마크 (로컬 대체 사이트)")
+    parser.add_argument("--check", action="store_true", help="브라우저 없이 대체 서버만 확인")
+    parser.add_argument("--scenarios", nargs="*", default=["snapshot", "import"],
+                        choices=["snapshot", "sample", "import"], help="측정 시나리오 (기본: snapshot import)")
+    parser.add_argument("--latency", type=float, nargs="*", default=[0.0], help="사이트 요청당 지연 (초)")
+    parser.add_argument("--ajax-delay", type=float, nargs="*", default=[0.0], help="JSON 응답 추가 지연 (초)")
+    parser.add_argument("--no-ajax", action="store_true", help="카운터/통계 표를 HTML에 포함")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="사이트 500 응답 확률")
+    parser.add_argument("--workers", type=int, nargs="*", default=[HISTORY_CONFIG["workers"]],
+                        help="import 동시 세션 수")
+    parser.add_argument("--page-wait", type=float, nargs="*", default=[HISTORY_CONFIG["page_wait"]],
+                        help="import 페이지 이동 후 표 로드 대기 (초)")
+    parser.add_argument("--years", type=int, default=1, help="import 기간 (년)")
+    parser.add_argument("--samples", type=int, default=3, help="sample 횟수")
+    parser.add_argument("--repeat", type=int, default=1, help="항목별 반복 횟수")
+    parser.add_argument("--output", metavar="PATH", help="결과 JSON 저장")
+    parser.add_argument("--debug", action="store_true", help="수집 로그 출력")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.debug else logging.WARNING,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.check:
+        failures = check_site()
+        for failure in failures:
+            print(f"FAIL {failure}")
+        print("OK" if not failures else "FAIL")
+        return 1 if failures else 0
+
+    # 시나리오 -> [(설정 이름, 실행 함수)]
+    cases: List[Tuple[str, str, Callable[[FakeHevitonSite], Tuple[bool, str]]]] = []
+    for scenario in args.scenarios:
+        if scenario == "snapshot":
+            cases.append((scenario, "-", run_snapshot))
+        elif scenario == "sample":
+            cases.append((scenario, f"samples={args.samples}", lambda s: run_sample(s, args.samples)))
+        else:
+            for workers, page_wait in itertools.product(args.workers, args.page_wait):
+                cases.append((scenario, f"workers={workers} wait={page_wait:g}",
+                              lambda s, w=workers, p=page_wait: run_import(s, args.years, w, p)))
+
+    HEVITON_CONFIG.update(user_id=USER_ID, password=PASSWORD)
+    results: List[Dict[str, Any]] = []
+    print(f"{'시나리오':<10}{'설정':<22}{'사이트':<26}{'소요':>10}  {'요청':>6}  결과")
+    for latency, ajax_delay in itertools.product(args.latency, args.ajax_delay):
+        site_label = f"latency={latency:g} ajax={'off' if args.no_ajax else f'{ajax_delay:g}'}"
+        with FakeHevitonSite(user_id=USER_ID, password=PASSWORD, history_days=max(3, args.years + 1) * 366,
+                             latency=latency, ajax=not args.no_ajax, ajax_delay=ajax_delay,
+                             error_rate=args.error_rate) as site:
+            HEVITON_CONFIG["base_url"] = site.url
+            for (scenario, setting, run), _ in itertools.product(cases, range(args.repeat)):
+                site.reset()
+                started = time.perf_counter()
+                try:
+                    ok, detail = run(site)
+                except Exception as e:
+                    ok, detail = False, f"{type(e).__name__}: {e}"
+                seconds = time.perf_counter() - started
+                requests = sum(site.requests.values())
+                print(f"{scenario:<10}{setting:<22}{site_label:<26}{seconds:>9.1f}s  {requests:>6}  "
+                      f"{'ok' if ok else 'FAIL'} {detail}")
+                results.append({"scenario": scenario, "setting": setting, "site": site_label,
+                                "seconds": round(seconds, 3), "ok": ok, "detail": detail,
+                                "requests": dict(site.requests), "status": dict(site.status_counts)})
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.output}")
+    return 0 if all(r["ok"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
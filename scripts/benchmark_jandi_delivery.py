@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+잔디 메시지 전송 처리량 / 지연 벤치마크 (오프라인)
+
+로컬 잔디 대체 서버(src/stubs/jandi_server.py)에 JandiRouter를 연결하여
+정상, 지연, 5xx, 429 조건에서 초당 전송 수와 메시지별 지연(p50/p95/p99)을 측정한다.
+--check 옵션이면 리포트/알림 메시지의 잔디 v2 형식과 대체 서버 수신을 검증하고,
+실패 시 실패 코드(1)로 종료한다. 메시지 내용 검증은 tests/test_jandi_webhook.py에 있다.
+
+Usage:
+    python scripts/benchmark_jandi_delivery.py
+    python scripts/benchmark_jandi_delivery.py --messages 500 --latency 0.05 --check
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from typing import Dict, Any, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import JANDI_CONFIG
+from src.jandi_router import JandiRouter, JandiRoute
+from src.jandi_webhook import JandiWebhook
+from src.stubs.jandi_server import FakeJandiServer, validate_payload
+
+# 벤치마크 전송용 발전량 리포트 (메시지 내용 검증은 tests/test_jandi_webhook.py)
+SAMPLE_REPORT = {
+    "dashboard": {
+        "current_power": "50000",
+        "today_generation": "123.45",
+        "month_generation": "3456.78",
+        "total_generation": "28.90",
+    },
+    "converter_status": {"is_normal": True},
+}
+
+SCENARIOS = [
+    ("정상", {}),
+    ("지연", {"latency": None}),
+    ("5xx", {"error_rate": None}),
+    ("429", {"rate_limit_rate": None}),
+]
+
+
+class TimedWebhook(JandiWebhook):
+    """post_payload 소요 시간을 기록하는 JandiWebhook"""
+
+    def __init__(self, webhook_url: str, latencies: List[float]):
+        super().__init__(webhook_url)
+        self.latencies = latencies
+        self._latency_lock = threading.Lock()
+
+    def post_payload(self, payload: Dict[str, Any], label: str = "잔디 메시지") -> bool:
+        started = time.perf_counter()
+        try:
+            return super().post_payload(payload, label)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._latency_lock:
+                self.latencies.append(elapsed)
+
+
+def percentile(values: List[float], p: float) -> float:
+    """최근접 순위 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def run_scenario(name: str, options: Dict[str, Any], messages: int, channels: int) -> Dict[str, Any]:
+    """시나리오 하나 측정"""
+    with FakeJandiServer(seed=0, **options) as server:
+        latencies: List[float] = []
+        routes = [JandiRoute(url=f"{server.url}/{i}") for i in range(channels)]
+        router = JandiRouter(routes, webhook_factory=lambda url: TimedWebhook(url, latencies))
+
+        batch = [
+            (routes[i % channels].url, router.webhook(routes[0].url).build_generation_report(SAMPLE_REPORT))
+            for i in range(messages)
+        ]
+
+        started = time.perf_counter()
+        results = router.deliver(batch, label="벤치마크")
+        elapsed = time.perf_counter() - started
+        router.close()
+
+        return {
+            "name": name,
+            "sent": sum(results),
+            "failed": len(results) - sum(results),
+            "received": len(server.messages),
+            "rejected": len(server.rejected),
+            "status": dict(server.status_counts),
+            "rate": messages / elapsed if elapsed else 0.0,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+        }
+
+
+def check_payloads() -> List[str]:
+    """메시지 형식 + 대체 서버 수신 검증 (메시지 내용은 tests/test_jandi_webhook.py에서 검증)"""
+    failures = []
+    webhook = JandiWebhook("http://127.0.0.1")
+
+    payloads = [("generation_report", webhook.build_generation_report(SAMPLE_REPORT))]
+    payloads.append(("error_alert", webhook.build_error_alert("로그인 실패: idNotFound")))
+    payloads.append(("alert_digest", webhook.build_alert_digest([{
+        "source": "auth", "sample": "로그인 실패", "suppressed": 3,
+        "first_seen": time.time() - 3600, "last_seen": time.time(),
+    }])))
+
+    router = JandiRouter([JandiRoute(url="http://127.0.0.1")], webhook_factory=lambda url: webhook)
+    sites = [dict(SAMPLE_REPORT, site=f"site-{i:02d}") for i in range(30)]
+    for i, (_, payload) in enumerate(router.build_reports(sites, digest=True)):
+        payloads.append((f"report_digest_{i}", payload))
+        if len(payload["connectInfo"]) > JANDI_CONFIG["digest_max_items"]:
+            failures.append(f"report_digest_{i}: connectInfo {len(payload['connectInfo'])}개 (한도 초과)")
+
+    for name, payload in payloads:
+        for error in validate_payload(payload):
+            failures.append(f"{name}: {error}")
+
+    # 실제 전송 경로 (헤더 포함) 검증
+    with FakeJandiServer() as server:
+        with JandiWebhook(server.url) as client:
+            for name, payload in payloads:
+                if not client.post_payload(payload, name):
+                    failures.append(f"{name}: 대체 서버 전송 실패")
+            if not client.send_generation_report(SAMPLE_REPORT):
+                failures.append("send_generation_report: 대체 서버 전송 실패")
+        for record in server.rejected:
+            failures.append(f"대체 서버 거부: {record['errors']}")
+
+    webhook.close()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="잔디 전송 오프라인 벤치마크")
+    parser.add_argument("--messages", type=int, default=200, help="시나리오별 전송 메시지 수")
+    parser.add_argument("--channels", type=int, default=4, help="채널(웹훅 URL) 수")
+    parser.add_argument("--latency", type=float, default=0.05, help="지연 시나리오의 요청당 지연 (초)")
+    parser.add_argument("--error-rate", type=float, default=0.1, help="5xx 시나리오의 503 응답 확률")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.05, help="429 시나리오의 429 응답 확률")
+    parser.add_argument("--check", action="store_true", help="메시지 형식 검증")
+    args = parser.parse_args()
+
+    failed = False
+
+    if args.check:
+        failures = check_payloads()
+        print(f"메시지 검증: {'OK' if not failures else 'FAIL'}")
+        for failure in failures:
+            print(f"  {failure}")
+        failed = bool(failures)
+
+    defaults = {"latency": args.latency, "error_rate": args.error_rate, "rate_limit_rate": args.rate_limit_rate}
+    print(f"{'시나리오':<8}{'전송/s':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}  결과")
+    for name, options in SCENARIOS:
+        options = {k: defaults[k] for k in options}
+        r = run_scenario(name, options, args.messages, args.channels)
+        status = ", ".join(f"{k}={v}" for k, v in sorted(r["status"].items()))
+        print(f"{r['name']:<8}{r['rate']:>10.1f}{r['p50'] * 1000:>10.1f}{r['p95'] * 1000:>10.1f}"
+              f"{r['p99'] * 1000:>10.1f}  성공 {r['sent']} / 실패 {r['failed']} (서버: {status})")
+        if args.check and (r["rejected"] or r["received"] != r["sent"]):
+            print(f"  수신 {r['received']}건 / 거부 {r['rejected']}건 - 전송 결과와 다름")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+페이지 추출기 벤치마크 (고정 페이지, 오프라인)
+
+src/stubs/fixtures/heviton 고정 페이지와 다년 합성 통계 표(수천 행)로 src/parsers.py 추출기의
+호출당 시간(최소/중앙값/평균/표준편차)과 최대 메모리(tracemalloc)를 측정한다.
+- 결과가 고정 페이지의 기대값과 다르면 실패 (빠르지만 틀린 파서 방지)
+- BUDGETS: 추출기별 중앙값 시간/최대 메모리 상한 (--check 시 초과하면 실패)
+- --save-baseline으로 결과를 저장하고 --compare로 비교 (--tolerance 이상 느려지거나 커지면 회귀)
+
+Usage:
+    python scripts/benchmark_parsers.py
+    python scripts/benchmark_parsers.py --save-baseline logs/parser_baseline.json
+    python scripts/benchmark_parsers.py --compare logs/parser_baseline.json --check
+    python scripts/benchmark_parsers.py --filter daily_page --years 3 10 20
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.parsers import (parse_monitoring_page, parse_converter_page, parse_history_page,
+                         parse_statistics_table, parse_daily_page, parse_recent_daily)
+from src.stubs.heviton_pages import FIXTURE_TODAY, load_corpus, statistics_fixture
+
+# 추출기별 상한 (중앙값 ms, 최대 메모리 KB) - 다년 표는 1년(365행)당 상한
+BUDGETS = {
+    "monitoring_page": (8, 512),
+    "converter_page": (8, 512),
+    "history_page": (1, 128),
+    "statistics_table": (20, 1024),
+    "daily_page": (20, 1024),
+    "recent_daily": (20, 1024),
+    "statistics_table_per_year": (150, 4096),
+    "daily_page_per_year": (150, 4096),
+}
+
+
+class Case(NamedTuple):
+    name: str
+    budget: str                         # BUDGETS 키
+    scale: float                        # 상한 배수 (다년 표는 연수)
+    func: Callable[[], Any]
+    check: Callable[[Any], Optional[str]]   # 결과 검증 (오류 메시지 또는 None)
+
+
+def expect_rows(rows: int) -> Callable[[Any], Optional[str]]:
+    return lambda result: None if len(result) == rows else f"행 수 {len(result)} != {rows}"
+
+
+def expect_values(expected: Dict[str, Any]) -> Callable[[Any], Optional[str]]:
+    def check(result):
+        for key, value in expected.items():
+            actual = len(result[key]) if key == "converters" else result[key]
+            if actual != value:
+                return f"{key}: {actual!r} != {value!r}"
+        return None
+    return check
+
+
+def build_cases(years: List[int]) -> List[Case]:
+    corpus = load_corpus()
+    extractors = {"monitoring.do": ("monitoring_page", parse_monitoring_page),
+                  "inverter.do": ("converter_page", parse_converter_page),
+                  "history.do": ("history_page", parse_history_page)}
+
+    cases = []
+    for filename, (page, source, expected) in corpus.items():
+        label = filename.rsplit(".", 1)[0]
+        if page in extractors:
+            budget, extractor = extractors[page]
+            check = expect_rows(expected["rows"]) if "rows" in expected else expect_values(expected)
+            cases.append(Case(label, budget, 1, lambda e=extractor, s=source: e(s), check))
+        elif page == "statistics.do":
+            rows = expected["rows"]
+            cases += [
+                Case(f"{label}/table", "statistics_table", 1,
+                     lambda s=source: parse_statistics_table(s), expect_rows(rows)),
+                Case(f"{label}/daily_page", "daily_page", 1,
+                     lambda s=source: parse_daily_page(s), expect_rows(rows)),
+                Case(f"{label}/recent_daily", "recent_daily", 1,
+                     lambda s=source: parse_recent_daily(s, 5, datetime.combine(FIXTURE_TODAY, datetime.min.time())),
+                     expect_rows(5)),
+            ]
+
+    for year in years:
+        days = year * 365
+        source = statistics_fixture(days)
+        # 수집 누락(값 "-")도 날짜는 남으므로 행 수 = 일수
+        cases += [
+            Case(f"statistics_{year}y/table", "statistics_table_per_year", year,
+                 lambda s=source: parse_statistics_table(s), expect_rows(days)),
+            Case(f"statistics_{year}y/daily_page", "daily_page_per_year", year,
+                 lambda s=source: parse_daily_page(s), expect_rows(days)),
+        ]
+    return cases
+
+
+def measure(func: Callable[[], Any], min_time: float, max_rounds: int) -> Dict[str, float]:
+    """호출당 시간 통계 (min_time초 이상 또는 max_rounds회 반복) + 최대 메모리"""
+    func()  # 준비 호출 (import/캐시)
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < max_rounds and (time.perf_counter() - started < min_time or len(timings) < 3):
+        t0 = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - t0)
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "rounds": len(timings),
+        "min_ms": min(timings) * 1000,
+        "median_ms": statistics.median(timings) * 1000,
+        "mean_ms": statistics.fmean(timings) * 1000,
+        "stddev_ms": (statistics.stdev(timings) if len(timings) > 1 else 0.0) * 1000,
+        "peak_kb": peak / 1024,
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """기준 결과 대비 회귀 목록 (중앙값 시간, 최대 메모리)"""
+    regressions = []
+    print(f"\n기준 결과 비교 ({baseline.get('created_at', '-')}, 허용 +{tolerance:.0%})")
+    print(f"{'추출기':<34}{'시간':>18}{'메모리':>20}")
+    for name, result in results.items():
+        base = baseline["cases"].get(name)
+        if base is None:
+            print(f"{name:<34}{'(새 항목)':>18}")
+            continue
+        cells = []
+        for key, unit in (("median_ms", "ms"), ("peak_kb", "KB")):
+            ratio = result[key] / base[key] - 1 if base[key] else 0.0
+            cells.append(f"{base[key]:.1f}->{result[key]:.1f}{unit} {ratio:+.0%}")
+            if ratio > tolerance:
+                regressions.append(f"{name} {key}: {base[key]:.2f} -> {result[key]:.2f} ({ratio:+.0%})")
+        print(f"{name:<34}{cells[0]:>18}{cells[1]:>20}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="페이지 추출기 벤치마크")
+    parser.add_argument("--years", type=int, nargs="*", default=[3, 10], help="합성 통계 표 연수 (기본: 3 10)")
+    parser.add_argument("--filter", default="", help="이름에 이 문자열이 있는 항목만")
+    parser.add_argument("--min-time", type=float, default=0.2, help="항목별 최소 측정 시간 (초)")
+    parser.add_argument("--max-rounds", type=int, default=200, help="항목별 최대 반복 횟수")
+    parser.add_argument("--save-baseline", metavar="PATH", help="결과를 기준 파일로 저장")
+    parser.add_argument("--compare", metavar="PATH", help="기준 파일과 비교")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="회귀 판정 비율 (기본 0.25 = 25%%)")
+    parser.add_argument("--check", action="store_true", help="상한 초과/회귀/결과 오류 시 실패 코드(1)")
+    args = parser.parse_args()
+
+    failures = []
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{'추출기':<34}{'반복':>6}{'최소':>10}{'중앙값':>10}{'평균':>10}{'표준편차':>10}{'메모리':>12}{'상한':>16}")
+    for case in build_cases(args.years):
+        if args.filter not in case.name:
+            continue
+        error = case.check(case.func())
+        if error:
+            failures.append(f"{case.name} 결과 오류: {error}")
+
+        result = measure(case.func, args.min_time, args.max_rounds)
+        results[case.name] = result
+        budget_ms, budget_kb = (value * case.scale for value in BUDGETS[case.budget])
+        over = result["median_ms"] > budget_ms or result["peak_kb"] > budget_kb
+        if over:
+            failures.append(f"{case.name} 상한 초과: {result['median_ms']:.1f}ms/{result['peak_kb']:.0f}KB "
+                            f"(상한 {budget_ms:.0f}ms/{budget_kb:.0f}KB)")
+        print(f"{case.name:<34}{result['rounds']:>6}{result['min_ms']:>9.2f}ms{result['median_ms']:>8.2f}ms"
+              f"{result['mean_ms']:>8.2f}ms{result['stddev_ms']:>8.2f}ms{result['peak_kb']:>10.0f}KB"
+              f"{f'{budget_ms:.0f}ms/{budget_kb:.0f}KB':>16}{' !' if over or error else ''}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            failures += [f"회귀: {r}" for r in compare(results, json.load(f), args.tolerance)]
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "cases": results,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"\n기준 결과 저장: {args.save_baseline}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if args.check:
+        print("OK" if not failures else "FAIL")
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
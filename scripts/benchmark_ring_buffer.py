@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+장중 샘플 메모리 벤치마크 (dict 목록 vs NumPy 링 버퍼)
+
+사이트 수 x 샘플 수만큼 장중 샘플을 만들어 두 가지 표현의 메모리(tracemalloc)와
+최근 구간 조회/오늘 발전량 적분 시간을 비교한다.
+- dict: get_all_data()의 dashboard처럼 문자열 값 dict + 수집 시각 문자열
+- ring: src/ring_buffer.SiteRings (int64 시각 + float32 값 + uint8 변경 마스크)
+--check 옵션이면 링 버퍼가 dict 대비 max_ratio 이하 메모리가 아닐 때 실패 코드(1)로 종료한다.
+
+Usage:
+    python scripts/benchmark_ring_buffer.py
+    python scripts/benchmark_ring_buffer.py --sites 100 --samples 2880 --check
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ring_buffer import SiteRings
+
+
+def sample_values(i: int):
+    """측정용 샘플 값 (낮 시간대 발전 곡선 흉내)"""
+    power = max(0.0, 50000 * (1 - ((i % 288) - 144) ** 2 / 144 ** 2))
+    return {
+        "current_power": f"{power:.0f}",
+        "today_generation": f"{i % 288 * 0.8:.2f}",
+        "month_generation": f"{3000 + i * 0.01:.2f}",
+        "total_generation": "28.90",
+    }
+
+
+def build_dicts(sites: int, samples: int, start: datetime):
+    data = {}
+    for s in range(sites):
+        rows = []
+        for i in range(samples):
+            row = dict(sample_values(i))
+            row["collected_at"] = (start + timedelta(minutes=5 * i)).isoformat()
+            rows.append(row)
+        data[f"site-{s}"] = rows
+    return data
+
+
+def build_rings(sites: int, samples: int, start: datetime):
+    rings = SiteRings(capacity=samples)
+    base = int(start.timestamp())
+    for s in range(sites):
+        ring = rings[f"site-{s}"]
+        for i in range(samples):
+            ring.append(base + 300 * i, {k: float(v) for k, v in sample_values(i).items()})
+    return rings
+
+
+def measure(build, *args):
+    """생성 후 남은 메모리 (바이트)와 생성 시간"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build(*args)
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def dict_window(rows, minutes: int, now: datetime):
+    start = (now - timedelta(minutes=minutes)).isoformat()
+    return [float(r["current_power"]) for r in rows if start <= r["collected_at"] <= now.isoformat()]
+
+
+def dict_energy(rows, now: datetime):
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
+    points = [(datetime.fromisoformat(r["collected_at"]), float(r["current_power"]))
+              for r in rows if r["collected_at"] >= midnight]
+    total = 0.0
+    for (t0, p0), (t1, p1) in zip(points, points[1:]):
+        total += (p0 + p1) / 2 * (t1 - t0).total_seconds()
+    return total / 3600 / 1000
+
+
+def timed(func, repeat: int = 20):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="장중 샘플 메모리 벤치마크")
+    parser.add_argument("--sites", type=int, default=50, help="사이트 수")
+    parser.add_argument("--samples", type=int, default=2016, help="사이트별 샘플 수 (기본: 5분 간격 7일)")
+    parser.add_argument("--window", type=int, default=60, help="최근 구간 조회 길이 (분)")
+    parser.add_argument("--check", action="store_true", help="메모리 비율 검사")
+    parser.add_argument("--max-ratio", type=float, default=0.2, help="--check 시 허용 메모리 비율 (ring/dict)")
+    args = parser.parse_args()
+
+    start = datetime(2026, 6, 1)
+    now = start + timedelta(minutes=5 * (args.samples - 1))
+    total = args.sites * args.samples
+
+    dicts, dict_bytes, dict_build = measure(build_dicts, args.sites, args.samples, start)
+    rings, ring_bytes, ring_build = measure(build_rings, args.sites, args.samples, start)
+
+    site_rows = dicts["site-0"]
+    site_ring = rings["site-0"]
+    now_ts = int(now.timestamp())
+
+    results = [
+        ("메모리", f"{dict_bytes / 1024 / 1024:.1f} MB", f"{ring_bytes / 1024 / 1024:.2f} MB"),
+        ("샘플당", f"{dict_bytes / total:.0f} B", f"{ring_bytes / total:.1f} B"),
+        ("생성", f"{dict_build:.2f}초", f"{ring_build:.2f}초"),
+        (f"최근 {args.window}분 조회",
+         f"{timed(lambda: dict_window(site_rows, args.window, now)) * 1000:.3f}ms",
+         f"{timed(lambda: site_ring.field('current_power', args.window * 60, now_ts)) * 1000:.3f}ms"),
+        ("오늘 발전량 적분",
+         f"{timed(lambda: dict_energy(site_rows, now)) * 1000:.3f}ms",
+         f"{timed(lambda: site_ring.energy_today(now)) * 1000:.3f}ms"),
+    ]
+
+    print(f"사이트 {args.sites}개 x 샘플 {args.samples}개 = {total:,}개")
+    print(f"{'항목':<16}{'dict 목록':>14}{'링 버퍼':>14}")
+    for name, dict_value, ring_value in results:
+        print(f"{name:<16}{dict_value:>14}{ring_value:>14}")
+
+    energy_dict, energy_ring = dict_energy(site_rows, now), site_ring.energy_today(now)
+    print(f"오늘 발전량 적분 결과: dict {energy_dict:.3f} kWh / 링 버퍼 {energy_ring:.3f} kWh")
+
+    ratio = ring_bytes / dict_bytes
+    print(f"메모리 비율 (링 버퍼 / dict): {ratio:.3f}")
+
+    if args.check:
+        ok = ratio <= args.max_ratio and abs(energy_dict - energy_ring) <= max(0.01, energy_dict * 1e-4)
+        print("OK" if ok else "FAIL")
+        return 0 if ok else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
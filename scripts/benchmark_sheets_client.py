@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+GoogleSheetsClient API 호출 수 / 기록 지연 벤치마크 (오프라인)
+
+로컬 Sheets 대체 서버(src/stubs/sheets_server.py)에 클라이언트를 연결하여
+record_all과 bulk_insert_* 경로의 엔드포인트별 호출 수와 소요 시간을 측정한다.
+--check 옵션이면 기대 호출 수와 다를 때 실패 코드(1)로 종료한다.
+
+Usage:
+    python scripts/benchmark_sheets_client.py
+    python scripts/benchmark_sheets_client.py --latency 0.05 --rows 3650 --check
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import GOOGLE_SHEETS_CONFIG
+from src.stubs.sheets_server import FakeSheetsServer
+
+# 시트가 이미 있는 상태에서의 기대 호출 수
+EXPECTED_CALLS = {
+    "record_all": {"get": 1, "values.append": 1},
+    "bulk_insert_daily": {"get": 1, "values.append": 1},
+    "bulk_insert_weekly": {"get": 1, "values.append": 1},
+    "bulk_insert_monthly": {"get": 1, "values.append": 1},
+    "upsert_rows": {"get": 1, "values.batchGet": 1, "values.batchUpdate": 1},
+}
+
+SAMPLE_DATA = {
+    "dashboard": {
+        "current_power": "50000",
+        "today_generation": "123.45",
+        "month_generation": "3456.78",
+        "total_generation": "28.90",
+    },
+    "converter_status": {"is_normal": True},
+}
+
+
+def make_records(rows: int):
+    """측정용 일별/주별/월별 기록 생성"""
+    start = date(2020, 1, 1)
+    daily = [
+        {"date": (start + timedelta(days=i)).isoformat(), "generation": f"{100 + i % 50:.2f}", "status": "정상"}
+        for i in range(rows)
+    ]
+    weekly = [
+        {"week_label": f"{2020 + i // 52}년 {i % 52 + 1}주차", "start_date": "", "end_date": "", "total": "700.00"}
+        for i in range(rows // 7)
+    ]
+    monthly = [
+        {"year_month": f"{2020 + i // 12}-{i % 12 + 1:02d}", "total": "3000.00", "cumulative": f"{3 * (i + 1):.2f}"}
+        for i in range(rows // 30)
+    ]
+    return daily, weekly, monthly
+
+
+def measure(server: FakeSheetsServer, name: str, func):
+    """호출 수와 소요 시간 측정"""
+    server.reset_stats()
+    started = time.perf_counter()
+    ok = func()
+    elapsed = time.perf_counter() - started
+    return {"name": name, "ok": ok, "elapsed": elapsed, "calls": server.stats()["calls"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GoogleSheetsClient 오프라인 벤치마크")
+    parser.add_argument("--latency", type=float, default=0.02, help="요청당 지연 시간 (초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429 응답 확률")
+    parser.add_argument("--rows", type=int, default=365, help="bulk_insert 일별 행 수")
+    parser.add_argument("--check", action="store_true", help="기대 호출 수 검증")
+    args = parser.parse_args()
+
+    with FakeSheetsServer(latency=args.latency, error_rate=args.error_rate, seed=0) as server:
+        GOOGLE_SHEETS_CONFIG["api_endpoint"] = server.url
+
+        from src.google_sheets import (
+            GoogleSheetsClient, SHEET_DAILY, SHEET_WEEKLY, SHEET_MONTHLY, daily_row,
+        )
+
+        client = GoogleSheetsClient(credentials_json="")
+        daily, weekly, monthly = make_records(args.rows)
+
+        # 시트 생성 (측정 제외)
+        client.ensure_sheets_exist([SHEET_DAILY, SHEET_WEEKLY, SHEET_MONTHLY])
+
+        results = [
+            measure(server, "record_all", lambda: client.record_all(SAMPLE_DATA)),
+            measure(server, "bulk_insert_daily", lambda: client.bulk_insert_daily(daily)),
+            measure(server, "bulk_insert_weekly", lambda: client.bulk_insert_weekly(weekly)),
+            measure(server, "bulk_insert_monthly", lambda: client.bulk_insert_monthly(monthly)),
+            measure(server, "upsert_rows", lambda: client.upsert_rows(
+                {SHEET_DAILY: [daily_row(r) for r in daily[-30:]]}
+            )),
+        ]
+
+    failed = False
+    print(f"{'경로':<22}{'결과':<6}{'시간(ms)':>10}  호출 수")
+    for r in results:
+        calls = ", ".join(f"{k}={v}" for k, v in sorted(r["calls"].items()))
+        print(f"{r['name']:<22}{'OK' if r['ok'] else 'FAIL':<6}{r['elapsed'] * 1000:>10.1f}  {calls}")
+        if args.check and (not r["ok"] or r["calls"] != EXPECTED_CALLS[r["name"]]):
+            print(f"  기대 호출 수와 다름: {EXPECTED_CALLS[r['name']]}")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
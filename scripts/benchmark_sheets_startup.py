@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+GoogleSheetsClient 기동 시간 벤치마크
+
+기존 방식(모듈 로드 시 googleapiclient.discovery import + 생성자에서 build())과
+지연 생성 방식(캐시된 discovery 문서 + 첫 사용 시 build_from_document)을 비교한다.
+각 측정은 별도 프로세스에서 실행하여 import 캐시의 영향을 배제한다.
+
+Usage:
+    python scripts/benchmark_sheets_startup.py
+    python scripts/benchmark_sheets_startup.py --repeat 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 측정용 코드 (별도 프로세스에서 실행, 결과는 JSON으로 출력)
+LEGACY_SNIPPET = """
+import json, time
+t0 = time.perf_counter()
+from google.oauth2.service_account import Credentials
+from googleapiclient.discovery import build
+t1 = time.perf_counter()
+credentials = Credentials.from_service_account_info(
+    json.loads({creds!r}), scopes=["https://www.googleapis.com/auth/spreadsheets"]
+)
+service = build("sheets", "v4", credentials=credentials)
+t2 = time.perf_counter()
+print(json.dumps({{"import": t1 - t0, "init": t2 - t1, "first_use": 0.0}}))
+"""
+
+LAZY_SNIPPET = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+t0 = time.perf_counter()
+import src.google_sheets as gs
+t1 = time.perf_counter()
+client = gs.GoogleSheetsClient(credentials_json={creds!r})
+t2 = time.perf_counter()
+service = client.service
+t3 = time.perf_counter()
+assert service is not None
+print(json.dumps({{"import": t1 - t0, "init": t2 - t1, "first_use": t3 - t2}}))
+"""
+
+
+def make_throwaway_credentials() -> str:
+    """측정용 서비스 계정 JSON 생성 (임시 RSA 키, 실제 API 호출 없음)"""
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode()
+
+    return json.dumps({
+        "type": "service_account",
+        "project_id": "benchmark",
+        "private_key_id": "benchmark",
+        "private_key": pem,
+        "client_email": "benchmark@benchmark.iam.gserviceaccount.com",
+        "client_id": "0",
+        "token_uri": "https://oauth2.googleapis.com/token",
+    })
+
+
+def run_snippet(code: str) -> dict:
+    """별도 프로세스에서 측정 코드 실행"""
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True, text=True, check=True, cwd=PROJECT_ROOT,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(name: str, samples: list):
+    """측정 결과 출력 (ms, 중앙값)"""
+    row = {key: statistics.median(s[key] for s in samples) * 1000 for key in samples[0]}
+    startup = row["import"] + row["init"]
+    print(f"{name:<8} import {row['import']:8.1f} ms | init {row['init']:8.1f} ms | "
+          f"first use {row['first_use']:8.1f} ms | "
+          f"startup(import+init) {startup:8.1f} ms | total {startup + row['first_use']:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GoogleSheetsClient 기동 시간 벤치마크")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수 (기본 5)")
+    args = parser.parse_args()
+
+    creds = make_throwaway_credentials()
+    lazy_code = LAZY_SNIPPET.format(root=PROJECT_ROOT, creds=creds)
+
+    # 첫 실행에서 discovery 문서 캐시 파일 생성
+    run_snippet(lazy_code)
+
+    legacy_code = LEGACY_SNIPPET.format(creds=creds)
+    legacy = [run_snippet(legacy_code) for _ in range(args.repeat)]
+    lazy = [run_snippet(lazy_code) for _ in range(args.repeat)]
+
+    # startup: Sheets를 쓰지 않는 실행에서도 지불하는 비용
+    # first use: 실제 기록 시점에 한 번 지불하는 비용
+    print(f"반복 {args.repeat}회 중앙값")
+    summarize("legacy", legacy)
+    summarize("lazy", lazy)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,44 @@
 #!/usr/bin/env python3
 """
-과거 발전량 데이터를 Google Sheets에 일괄 입력하는 스크립트
+과거 발전량 데이터를 로컬 저장소 / Google Sheets에 가져오는 스크립트 (증분)
+
+사이트별 워터마크(마지막으로 확인한 날) 이후 기간만 통계 페이지에 요청하고,
+마지막 날은 다시 요청하여 늦은 보정을 반영한다. 첫 가져오기 이후에는 보통 요청 1회로 끝난다.
+새로 생기거나 바뀐 일별 기록과 그 주/월 기록만 Google Sheets에 반영한다 (키 기준 갱신).
+기간 하나씩 저장소 병합 -> Sheets 반영 -> 워터마크 순으로 흘려보내므로 중단되어도 끝난 기간은 남는다.
+--since를 지정하면 그 기간을 월/분기 단위로 나누어 여러 로그인 세션에서 동시에 요청한다.
 
 Usage:
     python scripts/import_historical_data.py
+    python scripts/import_historical_data.py --since 2024-01-01 --workers 4
+    python scripts/import_historical_data.py --since 2024-01-01 --until 2024-12-31 --chunk month
+    python scripts/import_historical_data.py --full      # 워터마크 무시, 처음부터 다시
+    python scripts/import_historical_data.py --plan      # 요청할 기간만 출력
+    python scripts/import_historical_data.py --profile   # logs/profile_<실행 ID>.pstats/.txt
 """
+import argparse
 import os
 import sys
 import logging
-import time
-from datetime import datetime, timedelta
+from datetime import date, timedelta
 
 # 프로젝트 루트 추가
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
 
 load_dotenv()
 
+from config.settings import HEVITON_CONFIG, HISTORY_CONFIG
 from src.auth import HevitonAuth
-from src.google_sheets import GoogleSheetsClient
+from src.backfill import (Backfill, ImportChunk, WATERMARK_KIND, browser_fetch, plan_ranges, split_ranges,
+                          statistics_url)
+from src.import_pool import ImportPool
+from src.google_sheets import (GoogleSheetsClient, SHEET_DAILY, SHEET_WEEKLY, SHEET_MONTHLY,
+                               daily_row, weekly_row, monthly_row)
+from src.local_store import LocalStore
+from src.metrics import new_run_id
+from src.profiling import checkpoint, run_profiled
 
 logging.basicConfig(
     level=logging.INFO,
@@ -29,237 +47,112 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def get_all_daily_data(driver, base_url: str) -> list:
-    """통계 페이지에서 모든 일별 데이터 수집"""
-    logger.info("일별 데이터 수집 중...")
-
-    url = f"{base_url}/monitoring/stat/statistics.do?ua=m&inType=web&energyCode=501"
-    driver.get(url)
-    time.sleep(5)
-
-    page_source = driver.page_source
-    soup = BeautifulSoup(page_source, 'lxml')
-
-    daily_records = []
-    tables = soup.find_all('table')
-
-    for table in tables:
-        rows = table.find_all('tr')
-        if rows:
-            header = rows[0].get_text(strip=True)
-            if '기간' in header and '발전량' in header:
-                for row in rows[1:]:
-                    cols = row.find_all(['td', 'th'])
-                    if len(cols) >= 2:
-                        date_text = cols[0].get_text(strip=True)
-                        value_text = cols[1].get_text(strip=True)
-
-                        # YYYY.MM.DD 형식인지 확인
-                        if date_text and value_text and '.' in date_text:
-                            if '합계' in date_text or '기간' in date_text:
-                                continue
-
-                            # YYYY.MM.DD -> YYYY-MM-DD 변환
-                            try:
-                                parts = date_text.split('.')
-                                if len(parts) == 3:
-                                    formatted_date = f"{parts[0]}-{parts[1]}-{parts[2]}"
-                                    daily_records.append({
-                                        "date": formatted_date,
-                                        "generation": value_text,
-                                        "status": "정상",
-                                    })
-                            except:
-                                pass
-                break
-
-    # 날짜순 정렬
-    daily_records.sort(key=lambda x: x["date"])
-    logger.info(f"일별 데이터 {len(daily_records)}건 수집 완료")
-    return daily_records
-
-
-def get_all_monthly_data(driver, base_url: str) -> list:
-    """통계 페이지에서 모든 월별 데이터 수집"""
-    logger.info("월별 데이터 수집 중...")
-
-    # 모니터링 페이지에서 월별 발전량 히스토리 조회
-    url = f"{base_url}/monitoring/stat/statistics.do?ua=m&inType=web&energyCode=501"
-    driver.get(url)
-    time.sleep(5)
-
-    page_source = driver.page_source
-    soup = BeautifulSoup(page_source, 'lxml')
-
-    monthly_records = []
-
-    # 월별 테이블 찾기 (캘린더 형태)
-    tables = soup.find_all('table')
-
-    # 월별 데이터는 보통 캘린더 형태로 표시됨
-    # 각 셀에서 월과 발전량 추출
-    current_year = datetime.now().year
-
-    for table in tables:
-        rows = table.find_all('tr')
-        header = rows[0].get_text(strip=True) if rows else ""
-
-        # 년도 확인
-        if str(current_year) in header or str(current_year - 1) in header:
-            year_match = None
-            for y in range(current_year - 5, current_year + 1):
-                if str(y) in header:
-                    year_match = y
-                    break
-
-            if year_match:
-                # 각 셀에서 월별 데이터 추출
-                for row in rows[1:]:
-                    cells = row.find_all(['td', 'th'])
-                    for cell in cells:
-                        text = cell.get_text(strip=True)
-                        # "1월", "2월" 등의 형식
-                        for month in range(1, 13):
-                            month_str = f"{month}월"
-                            if month_str == text:
-                                # 다음 셀에서 발전량 확인 필요
-                                pass
-
-    # 월별 데이터가 캘린더 형태로 복잡하면 일별 데이터에서 집계
-    logger.info(f"월별 데이터 {len(monthly_records)}건 수집 완료")
-    return monthly_records
-
-
-def calculate_weekly_from_daily(daily_records: list) -> list:
-    """일별 데이터에서 주별 데이터 계산"""
-    logger.info("주별 데이터 계산 중...")
-
-    weekly_records = []
-
-    if not daily_records:
-        return weekly_records
-
-    # 날짜별로 그룹화
-    from collections import defaultdict
-    weekly_sums = defaultdict(lambda: {"dates": [], "total": 0})
-
-    for record in daily_records:
-        try:
-            date = datetime.strptime(record["date"], "%Y-%m-%d")
-            year = date.year
-            week_num = date.isocalendar()[1]
-            key = (year, week_num)
-
-            gen = float(record["generation"])
-            weekly_sums[key]["total"] += gen
-            weekly_sums[key]["dates"].append(date)
-        except:
-            pass
-
-    for (year, week_num), data in sorted(weekly_sums.items()):
-        if data["dates"]:
-            start_date = min(data["dates"]).strftime("%Y-%m-%d")
-            end_date = max(data["dates"]).strftime("%Y-%m-%d")
-            weekly_records.append({
-                "week_label": f"{year}년 {week_num}주차",
-                "start_date": start_date,
-                "end_date": end_date,
-                "total": f"{data['total']:.2f}",
-            })
-
-    logger.info(f"주별 데이터 {len(weekly_records)}건 계산 완료")
-    return weekly_records
-
-
-def calculate_monthly_from_daily(daily_records: list) -> list:
-    """일별 데이터에서 월별 데이터 계산"""
-    logger.info("월별 데이터 계산 중...")
-
-    monthly_records = []
-
-    if not daily_records:
-        return monthly_records
-
-    from collections import defaultdict
-    monthly_sums = defaultdict(float)
-
-    for record in daily_records:
-        try:
-            date = datetime.strptime(record["date"], "%Y-%m-%d")
-            year_month = date.strftime("%Y-%m")
-            gen = float(record["generation"])
-            monthly_sums[year_month] += gen
-        except:
-            pass
-
-    cumulative = 0
-    for year_month in sorted(monthly_sums.keys()):
-        total = monthly_sums[year_month]
-        cumulative += total
-        monthly_records.append({
-            "year_month": year_month,
-            "total": f"{total:.2f}",
-            "cumulative": f"{cumulative / 1000:.2f}",  # MWh 변환
+def print_plan(ranges=None):
+    """요청할 기간 출력 (로그인하지 않음, ranges 없으면 워터마크 기준)"""
+    with LocalStore() as store:
+        watermark = store.get_watermark(WATERMARK_KIND, HEVITON_CONFIG["site_id"])
+    if ranges is None:
+        ranges = plan_ranges(date.fromisoformat(watermark) if watermark else None,
+                             date.today() - timedelta(days=1))
+    print(f"워터마크: {watermark or '없음 (첫 가져오기)'}")
+    for start, end in ranges:
+        print(f"  {start or '처음'} ~ {end}: {statistics_url(start, end)}")
+    return 0
+
+
+def sheets_sink(sheets: GoogleSheetsClient):
+    """기간 묶음마다 바뀐 행만 Google Sheets에 반영 (키 기준 갱신, 없으면 추가)"""
+    def write(chunk: ImportChunk) -> bool:
+        return sheets.upsert_rows({
+            SHEET_DAILY: [daily_row(r) for r in chunk.daily],
+            SHEET_WEEKLY: [weekly_row(r) for r in chunk.weekly],
+            SHEET_MONTHLY: [monthly_row(r) for r in chunk.monthly],
         })
+    return write
 
-    logger.info(f"월별 데이터 {len(monthly_records)}건 계산 완료")
-    return monthly_records
 
+def backfill(store: LocalStore, full: bool, ranges=None, workers=None, sink=None):
+    """빠진 기간 요청 + 로컬 저장소 병합 (ranges 지정 시 병렬 세션, 없으면 로그인 1회 순차 요청)"""
+    if ranges is not None:
+        with ImportPool(workers=workers) as pool:
+            return Backfill(store, pool=pool).run(full=full, ranges=ranges, sink=sink)
 
-def main():
-    logger.info("=" * 50)
-    logger.info("과거 발전량 데이터 일괄 입력 시작")
-    logger.info("=" * 50)
-
-    # 로그인
     auth = HevitonAuth(headless=True)
     if not auth.login():
-        logger.error("로그인 실패")
         auth.close()
-        return 1
-
+        raise RuntimeError("로그인 실패")
+    checkpoint("login")
     try:
-        driver = auth.get_driver()
-        base_url = "https://monitoring.heviton.com"
-
-        # 1. 일별 데이터 수집
-        daily_records = get_all_daily_data(driver, base_url)
-
-        # 2. 주별/월별 데이터 계산
-        weekly_records = calculate_weekly_from_daily(daily_records)
-        monthly_records = calculate_monthly_from_daily(daily_records)
+        return Backfill(store, browser_fetch(auth.get_driver())).run(full=full, sink=sink)
+    finally:
+        auth.logout()
 
-        # 3. Google Sheets에 기록
-        sheets = GoogleSheetsClient()
-        if not sheets.service:
-            logger.error("Google Sheets 연결 실패")
-            return 1
 
-        logger.info("Google Sheets에 데이터 입력 중...")
+def run_import(full: bool = False, ranges=None, workers=None):
+    logger.info("=" * 50)
+    logger.info("과거 발전량 데이터 가져오기 시작")
+    logger.info("=" * 50)
 
-        # 일별 데이터 입력
-        if daily_records:
-            sheets.bulk_insert_daily(daily_records)
+    sheets = GoogleSheetsClient()
+    sink = sheets_sink(sheets) if sheets.is_configured else None
+    if sink is None:
+        logger.info("Google Sheets 연동 미설정 - 로컬 저장소에만 기록")
 
-        # 주별 데이터 입력
-        if weekly_records:
-            sheets.bulk_insert_weekly(weekly_records)
+    # 기간마다 요청 -> 로컬 저장소 병합(커밋) -> Google Sheets 반영 -> 워터마크
+    try:
+        with LocalStore() as store:
+            report = backfill(store, full, ranges, workers, sink)
+    except Exception as e:
+        logger.error(f"과거 기록 가져오기 실패 (완료된 기간은 저장됨): {e}")
+        return 1
+    checkpoint("backfill")
 
-        # 월별 데이터 입력
-        if monthly_records:
-            sheets.bulk_insert_monthly(monthly_records)
+    logger.info("=" * 50)
+    if report.sink_failures:
+        logger.info(f"Google Sheets 반영 실패 {report.sink_failures}건 (로컬 저장소에는 기록됨, main.py --reconcile로 복구)")
+    else:
+        logger.info("과거 데이터 가져오기 완료!")
+    logger.info(f"  - 일별: {report.changed}건")
+    logger.info(f"  - 주별: {len(report.weekly)}건")
+    logger.info(f"  - 월별: {len(report.monthly)}건")
+    logger.info("=" * 50)
 
-        logger.info("=" * 50)
-        logger.info("과거 데이터 입력 완료!")
-        logger.info(f"  - 일별: {len(daily_records)}건")
-        logger.info(f"  - 주별: {len(weekly_records)}건")
-        logger.info(f"  - 월별: {len(monthly_records)}건")
-        logger.info("=" * 50)
+    return 1 if report.sink_failures else 0
 
-        return 0
 
-    finally:
-        auth.logout()
+def main():
+    parser = argparse.ArgumentParser(description="과거 발전량 데이터 증분 가져오기 (로컬 저장소 + Google Sheets)")
+    parser.add_argument("--full", action="store_true",
+                        help="워터마크를 무시하고 처음부터 다시 가져오기")
+    parser.add_argument("--plan", action="store_true",
+                        help="요청할 기간만 출력 (로그인하지 않음)")
+    parser.add_argument("--profile", action="store_true",
+                        help="cProfile/tracemalloc 프로파일 저장 (logs/profile_<실행 ID>.*)")
+    parser.add_argument("--since", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                        help="이 날부터 지정 기간 병렬 가져오기 (워터마크 대신)")
+    parser.add_argument("--until", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                        help="지정 기간 종료일 (기본: 어제)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help=f"동시 로그인 세션 수 (기본: {HISTORY_CONFIG['workers']})")
+    parser.add_argument("--chunk", choices=("month", "quarter"), default=None,
+                        help=f"기간 분할 단위 (기본: {HISTORY_CONFIG['chunk']})")
+    args = parser.parse_args()
+
+    ranges = None
+    if args.since:
+        until = args.until or date.today() - timedelta(days=1)
+        if args.since > until:
+            parser.error("--since가 --until보다 늦습니다")
+        ranges = split_ranges(args.since, until, args.chunk)
+    elif args.until:
+        parser.error("--until은 --since와 함께 지정하세요")
+
+    if args.plan:
+        return print_plan(ranges)
+    if args.profile:
+        return run_profiled(run_import, new_run_id(), "import_historical_data.py",
+                            args.full, ranges, args.workers)
+    return run_import(args.full, ranges, args.workers)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+보관한 수집 페이지 재파싱 스크립트 (사이트에 다시 접속하지 않음)
+
+PAGE_ARCHIVE=1로 보관한 페이지(src/page_archive.py)에 src/parsers.py 추출기를 프로세스 풀에서
+다시 실행한다. 같은 내용의 페이지는 한 번만 해석한다.
+- 기본: 페이지별 성공/실패/추출 건수 요약 (--output이면 페이지마다 결과 JSON 한 줄)
+- --apply: 통계 페이지(statistics.do) 일별 표를 수집 시각순으로 로컬 저장소에 다시 병합
+  (늦게 수집한 페이지가 우선, 주/월 기록 재계산, Google Sheets는 main.py --reconcile로 동기화)
+
+Usage:
+    python scripts/reparse_pages.py --stats
+    python scripts/reparse_pages.py --page monitoring.do --since 2026-01-01
+    python scripts/reparse_pages.py --output logs/reparse.jsonl --workers 4
+    python scripts/reparse_pages.py --page statistics.do --apply
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# 프로젝트 루트 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import PAGE_ARCHIVE_CONFIG
+from src.backfill import Backfill, DateRange, range_from_url
+from src.local_store import LocalStore
+from src.models import DailyPoint
+from src.page_archive import ArchiveEntry, PageArchive, load_page
+from src.parsers import EXTRACTORS, parse_daily_page
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def extract(root: Path, sha256: str, codec: str, page: str) -> Tuple[str, Any]:
+    """프로세스 풀 작업: 보관 객체 -> (상태, 추출 결과 또는 오류)"""
+    extractor = EXTRACTORS.get(page)
+    if extractor is None:
+        return "skip", None
+    try:
+        return "ok", extractor(load_page(root, sha256, codec))
+    except Exception as e:
+        return "error", f"{type(e).__name__}: {e}"
+
+
+def reparse(archive: PageArchive, entries: List[ArchiveEntry],
+            workers: Optional[int]) -> Iterator[Tuple[ArchiveEntry, str, Any]]:
+    """보관 페이지 재파싱 (같은 내용+페이지는 한 번만, 색인 순서대로 돌려줌)"""
+    unique = list(dict.fromkeys((e.sha256, e.codec, e.page) for e in entries))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = dict(zip(unique, executor.map(
+            extract, [archive.root] * len(unique), *zip(*unique), chunksize=8,
+        ))) if unique else {}
+    for entry in entries:
+        status, result = results[(entry.sha256, entry.codec, entry.page)]
+        yield entry, status, result
+
+
+def _count(result: Any) -> int:
+    return len(result) if isinstance(result, (list, dict)) else int(result is not None)
+
+
+def print_summary(rows: Iterator[Tuple[ArchiveEntry, str, Any]], output: Optional[Path]) -> int:
+    """페이지별 요약 출력 (output 지정 시 결과 JSON Lines 기록), 실패가 있으면 1"""
+    counts: Dict[str, Counter] = defaultdict(Counter)
+    out = open(output, "w", encoding="utf-8") if output else None
+    try:
+        for entry, status, result in rows:
+            counts[entry.page][status] += 1
+            if status == "ok":
+                counts[entry.page]["items"] += _count(result)
+            elif status == "error":
+                logger.warning(f"{entry.fetched_at} {entry.page} ({entry.sha256[:12]}): {result}")
+            if out:
+                out.write(json.dumps({
+                    "id": entry.id, "site": entry.site, "url": entry.url, "page": entry.page,
+                    "fetched_at": entry.fetched_at, "sha256": entry.sha256,
+                    "status": status, "result": result,
+                }, ensure_ascii=False) + "\n")
+    finally:
+        if out:
+            out.close()
+
+    print(f"{'페이지':<16} {'성공':>6} {'실패':>6} {'추출기 없음':>10} {'추출 건수':>10}")
+    for page, c in sorted(counts.items()):
+        print(f"{page:<16} {c['ok']:>6} {c['error']:>6} {c['skip']:>10} {c['items']:>10}")
+    if output:
+        print(f"결과: {output}")
+    return 1 if any(c["error"] for c in counts.values()) else 0
+
+
+def parse_archived_statistics(root: Path, sha256: str, codec: str,
+                              start: Optional[date], end: date) -> List[DailyPoint]:
+    """프로세스 풀 작업: 보관한 통계 페이지 -> 기간 안의 DailyPoint"""
+    return parse_daily_page(load_page(root, sha256, codec), start, end)
+
+
+class ArchiveReplay:
+    """보관한 통계 페이지 -> Backfill 기간 결과 (ImportPool 대신 Backfill(pool=...)로 사용)"""
+
+    def __init__(self, archive: PageArchive, entries: List[ArchiveEntry], workers: Optional[int] = None):
+        self.archive = archive
+        self.entries = entries
+        self.workers = workers
+        self.ranges: List[DateRange] = []
+        for entry in entries:
+            start, end = range_from_url(entry.url)
+            # 기간 파라미터 없는 페이지는 수집 전날까지 (수집 당일은 미완료)
+            fetched_day = date.fromisoformat(entry.fetched_at[:10])
+            self.ranges.append((start, min(end or fetched_day, fetched_day - timedelta(days=1))))
+
+    def fetch_ranges(self, ranges: List[DateRange]) -> Iterator[Tuple[DateRange, List[DailyPoint]]]:
+        """ranges는 self.ranges (색인 순서), 해석은 프로세스 풀에서 병렬"""
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            results = executor.map(
+                parse_archived_statistics,
+                [self.archive.root] * len(self.entries),
+                [e.sha256 for e in self.entries],
+                [e.codec for e in self.entries],
+                [start for start, _ in ranges],
+                [end for _, end in ranges],
+            )
+            yield from zip(ranges, results)
+
+
+def apply_statistics(archive: PageArchive, entries: List[ArchiveEntry], workers: Optional[int]) -> int:
+    """통계 페이지 일별 표를 로컬 저장소에 다시 병합 (수집 시각순)"""
+    entries = [e for e in entries if e.page == "statistics.do"]
+    if not entries:
+        print("병합할 통계 페이지 없음")
+        return 0
+
+    replay = ArchiveReplay(archive, entries, workers)
+    with LocalStore() as store:
+        report = Backfill(store, pool=replay).run(ranges=replay.ranges)
+    print(report.summary())
+    if report.changed:
+        print("Google Sheets 반영: python main.py --reconcile")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="보관한 수집 페이지 재파싱 (src/parsers.py 추출기)")
+    parser.add_argument("--dir", type=Path, default=None, help="보관 디렉토리 (기본: PAGE_ARCHIVE_DIR)")
+    parser.add_argument("--page", default=None, help="페이지 파일명 (예: statistics.do)")
+    parser.add_argument("--site", default=None, help="사이트 식별자")
+    parser.add_argument("--since", default=None, help="수집 시각 시작 (YYYY-MM-DD)")
+    parser.add_argument("--until", default=None, help="수집 시각 끝 (YYYY-MM-DD, 그 날 포함)")
+    parser.add_argument("--workers", type=int, default=None, help="해석 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--output", type=Path, default=None, help="결과 JSON Lines 파일")
+    parser.add_argument("--stats", action="store_true", help="보관 현황만 출력")
+    parser.add_argument("--apply", action="store_true",
+                        help="통계 페이지 일별 표를 로컬 저장소에 다시 병합")
+    args = parser.parse_args()
+
+    if not (args.dir or PAGE_ARCHIVE_CONFIG["dir"]).is_dir():
+        parser.error("보관 디렉토리가 없습니다 (PAGE_ARCHIVE=1로 수집하거나 --dir 지정)")
+
+    with PageArchive(args.dir) as archive:
+        if args.stats:
+            stats = archive.stats()
+            ratio = stats["stored_bytes"] / stats["raw_bytes"] if stats["raw_bytes"] else 0
+            print(f"페이지 {stats['pages']}건, 고유 객체 {stats['objects']}개, "
+                  f"원본 {stats['raw_bytes'] / 1e6:.1f}MB -> 보관 {stats['stored_bytes'] / 1e6:.1f}MB "
+                  f"({ratio:.1%}, {archive.codec})")
+            return 0
+
+        entries = archive.entries(args.page, args.site, args.since, args.until)
+        logger.info(f"보관 페이지 {len(entries)}건 재파싱")
+        if args.apply:
+            return apply_statistics(archive, entries, args.workers)
+        return print_summary(reparse(archive, entries, args.workers), args.output)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+에러 알림 묶음 처리 (alert storm control)
+
+- 메시지를 정규화(숫자/시각/URL 등 제거)한 지문과 발생 위치(source)로 같은 알림을 식별
+- 억제 구간(window) 안의 중복 알림은 보내지 않고 건수만 집계
+- 억제 구간이 끝나면 억제된 건수를 요약 메시지 1건으로 전송
+- 채널(웹훅 URL)별 전송량 제한 (rate_period초 동안 최대 rate_limit건)
+
+실행마다 새 프로세스이므로 상태는 파일(ALERT_CONFIG["state"])에 저장한다.
+억제 구간이 끝난 요약은 다음 알림 또는 다음 실행 시작(flush_expired) 때 전송되므로,
+상태 파일이 실행 사이에 유지되어야 한다 (GitHub Actions는 actions/cache로 복원/저장).
+상태 파일이 없어지면 아직 보내지 않은 요약도 함께 사라진다.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+import sys
+sys.path.append(str(__file__).rsplit('/', 2)[0])
+from config.settings import ALERT_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# 지문 계산 시 제거할 가변 요소 (순서 중요)
+_NORMALIZE_PATTERNS = [
+    (re.compile(r"https?://\S+"), "<url>"),
+    (re.compile(r"\d{4}[-./]\d{1,2}[-./]\d{1,2}([ T]\d{1,2}:\d{2}(:\d{2})?(\.\d+)?)?"), "<time>"),
+    (re.compile(r"\b\d{1,2}:\d{2}(:\d{2})?\b"), "<time>"),
+    (re.compile(r"\b0x[0-9a-f]+\b|\b[0-9a-f]{8,}\b"), "<hex>"),
+    (re.compile(r"\d+(\.\d+)?"), "<n>"),
+    (re.compile(r"\s+"), " "),
+]
+
+
+def normalize_message(message: str) -> str:
+    """알림 메시지에서 실행마다 바뀌는 값을 제거"""
+    text = message.lower()
+    for pattern, replacement in _NORMALIZE_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text.strip()[:300]
+
+
+def fingerprint(message: str, source: str) -> str:
+    """알림 지문 (정규화 메시지 + 발생 위치)"""
+    return hashlib.sha1(f"{source}|{normalize_message(message)}".encode("utf-8")).hexdigest()[:12]
+
+
+class AlertCoalescer:
+    """중복 알림 억제 및 채널별 전송량 제한"""
+
+    def __init__(
+        self,
+        state_path: Optional[Path] = None,
+        window: Optional[int] = None,
+        rate_limit: Optional[int] = None,
+        rate_period: Optional[int] = None,
+    ):
+        """
+        Args:
+            state_path: 상태 파일 경로
+            window: 같은 알림 억제 구간 (초)
+            rate_limit: 채널별 최대 전송 수
+            rate_period: 전송 수 집계 구간 (초)
+        """
+        self.state_path = Path(state_path or ALERT_CONFIG["state"])
+        self.window = window or ALERT_CONFIG["window"]
+        self.rate_limit = rate_limit or ALERT_CONFIG["rate_limit"]
+        self.rate_period = rate_period or ALERT_CONFIG["rate_period"]
+        self._lock = threading.Lock()
+        self._state = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        """상태 파일 로드"""
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                state = json.load(f)
+            state.setdefault("alerts", {})
+            state.setdefault("sends", {})
+            return state
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"알림 상태 파일 로드 실패 - 초기화: {e}")
+        return {"alerts": {}, "sends": {}}
+
+    def _save(self):
+        """상태 파일 저장 (임시 파일 교체)"""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.state_path)
+
+    def _allow_send(self, channel: str, now: float) -> bool:
+        """채널 전송량 제한 확인 (허용 시 전송 기록)"""
+        sends = [t for t in self._state["sends"].get(channel, []) if now - t < self.rate_period]
+        allowed = len(sends) < self.rate_limit
+        if allowed:
+            sends.append(now)
+        self._state["sends"][channel] = sends
+        return allowed
+
+    def _expired_digests(self, channel: str, now: float) -> List[Dict[str, Any]]:
+        """억제 구간이 끝난 알림의 요약 항목 (전송 허용된 경우만 상태에서 제거)"""
+        digests = []
+        alerts = self._state["alerts"]
+
+        for key in [k for k, a in alerts.items() if a["channel"] == channel and a["window_end"] <= now]:
+            entry = alerts[key]
+            if entry["suppressed"] == 0:
+                del alerts[key]
+                continue
+            if not self._allow_send(channel, now):
+                break
+            digests.append(entry)
+            del alerts[key]
+
+        return digests
+
+    def submit(self, channel: str, message: str, source: str = "main") -> Dict[str, Any]:
+        """
+        알림 제출
+
+        Args:
+            channel: 잔디 웹훅 URL
+            message: 에러 메시지
+            source: 발생 위치 (auth, scraper, converter 등)
+
+        Returns:
+            {"send": bool - 이 알림을 보낼지, "digests": [억제 요약 항목, ...]}
+        """
+        now = time.time()
+
+        with self._lock:
+            digests = self._expired_digests(channel, now)
+            key = f"{channel}|{fingerprint(message, source)}"
+            entry = self._state["alerts"].get(key)
+
+            if entry and entry["window_end"] > now:
+                # 억제 구간 내 중복
+                entry["suppressed"] += 1
+                entry["last_seen"] = now
+                entry["sample"] = message
+                send = False
+                logger.info(f"중복 알림 억제 ({source}, 누적 {entry['suppressed']}건)")
+            else:
+                send = self._allow_send(channel, now)
+                # 전송량 제한으로 아직 보내지 못한 요약이 남아 있으면 새 구간에 이어서 집계
+                carried = entry["suppressed"] if entry else 0
+                self._state["alerts"][key] = {
+                    "channel": channel,
+                    "source": source,
+                    "sample": message,
+                    "first_seen": entry["first_seen"] if carried else now,
+                    "last_seen": now,
+                    "window_end": now + self.window,
+                    "suppressed": carried + (0 if send else 1),
+                }
+                if not send:
+                    logger.warning(f"알림 전송량 제한 초과 - 요약으로 전송 예정 ({source})")
+
+            self._save()
+
+        return {"send": send, "digests": digests}
+
+    def flush_expired(self, channel: str) -> List[Dict[str, Any]]:
+        """억제 구간이 끝난 알림의 요약 항목 (새 알림 없이 실행 시작 시 호출)"""
+        with self._lock:
+            digests = self._expired_digests(channel, time.time())
+            self._save()
+        return digests
@@ -16,7 +16,8 @@ from webdriver_manager.chrome import ChromeDriverManager
 
 import sys
 sys.path.append(str(__file__).rsplit('/', 2)[0])
-from config.settings import HEVITON_CONFIG
+from config.settings import HEVITON_CONFIG, NAV_PERF_CONFIG
+from src.metrics import span, traced
 
 logger = logging.getLogger(__name__)
 
@@ -58,15 +59,23 @@ class HevitonAuth:
         options.add_argument("--disable-notifications")
         options.add_experimental_option("excludeSwitches", ["enable-logging"])
 
+        # 페이지 이동 성능 수집 시 CDP 성능 로그 활성화
+        if NAV_PERF_CONFIG["enabled"]:
+            from src.nav_perf import enable_capture
+            enable_capture(options)
+
         try:
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=options)
+            with span("auth.driver_resolve"):
+                service = Service(ChromeDriverManager().install())
+            with span("auth.chrome_start"):
+                self.driver = webdriver.Chrome(service=service, options=options)
             self.driver.implicitly_wait(10)
             logger.info("Chrome WebDriver 초기화 완료")
         except WebDriverException as e:
             logger.error(f"WebDriver 초기화 실패: {e}")
             raise
 
+    @traced("auth.login", ok=bool)
     def login(self, user_id: Optional[str] = None, password: Optional[str] = None) -> bool:
         """
         로그인 수행
@@ -93,7 +102,8 @@ class HevitonAuth:
             # 1. 로그인 페이지 접속
             login_url = f"{self.base_url}/monitoring/login/login.do?ua=m&inType=web"
             logger.info(f"로그인 페이지 접속: {login_url}")
-            self.driver.get(login_url)
+            with span("auth.navigate", page="login.do"):
+                self.driver.get(login_url)
 
             # 페이지 로드 대기
             time.sleep(2)
@@ -116,18 +126,19 @@ class HevitonAuth:
             logger.debug("비밀번호 입력 완료")
 
             # 3. 로그인 버튼 클릭
-            login_btn = self.driver.find_element(By.CSS_SELECTOR, "a.btn76.c1")
-            login_btn.click()
-            logger.info("로그인 버튼 클릭")
-
-            # 4. 로그인 결과 확인 - 페이지 전환 대기
-            # URL이 변경될 때까지 대기 (최대 10초)
-            for _ in range(20):
-                time.sleep(0.5)
-                current_url = self.driver.current_url
-                # loginProc.do에서 벗어나면 결과 확인
-                if "loginProc" not in current_url:
-                    break
+            with span("auth.submit"):
+                login_btn = self.driver.find_element(By.CSS_SELECTOR, "a.btn76.c1")
+                login_btn.click()
+                logger.info("로그인 버튼 클릭")
+
+                # 4. 로그인 결과 확인 - 페이지 전환 대기
+                # URL이 변경될 때까지 대기 (최대 10초)
+                for _ in range(20):
+                    time.sleep(0.5)
+                    current_url = self.driver.current_url
+                    # loginProc.do에서 벗어나면 결과 확인
+                    if "loginProc" not in current_url:
+                        break
 
             logger.debug(f"현재 URL: {current_url}")
 
@@ -190,6 +201,7 @@ class HevitonAuth:
             logger.error(f"로그인 중 오류 발생: {e}")
             return False
 
+    @traced("auth.logout")
     def logout(self):
         """로그아웃 및 드라이버 종료"""
         try:
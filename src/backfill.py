@@ -0,0 +1,419 @@
+"""
+과거 발전량 증분 가져오기 모듈
+
+통계 페이지(statistics.do)의 일별 표를 기간 파라미터로 요청하여 로컬 저장소에 병합한다.
+- 사이트별 워터마크: 통계 페이지에서 마지막으로 확인한 날짜 (retention_state, kind="backfill")
+- 첫 실행: HISTORY_START_DATE(없으면 페이지 기본 기간)부터 어제까지
+- 이후: 워터마크에서 refetch_days만큼 되돌아간 날부터 어제까지 (늦은 보정 반영, 보통 요청 1회)
+- 긴 공백은 max_range_days 단위로 나누어 요청
+- 지정 기간(--since/--until)은 월/분기 단위로 나누어 여러 세션에서 병렬 요청 (src/import_pool.py)
+- 일별 기록은 발전량만 병합 (수집 시 기록한 출력/상태 유지), 바뀐 날이 속한 주/월 기록을 다시 계산
+- 기간 하나씩 흘려보내는 파이프라인: 요청 -> 해석 -> 병합(커밋) -> 주/월 누적 -> sink 기록 -> 워터마크
+  (전체 기록을 모아두지 않아 기간이 길어도 메모리는 일정, 중단되어도 끝난 기간은 남음)
+"""
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Any, Optional, List, Set, Tuple, Iterator
+from urllib.parse import urlencode, urlparse, parse_qs
+
+import sys
+sys.path.append(str(__file__).rsplit('/', 2)[0])
+from config.settings import HEVITON_CONFIG, HISTORY_CONFIG
+from src.local_store import LocalStore
+from src.metrics import span, incr
+from src.models import DailyPoint, format_number, parse_energy
+from src.page_archive import archive_page
+from src.parsers import parse_daily_page
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_KIND = "backfill"
+
+# 페이지 요청 함수 (URL -> HTML)
+FetchFn = Callable[[str], str]
+
+# 요청 기간 (시작일 None이면 페이지 기본 기간)
+DateRange = Tuple[Optional[date], date]
+
+
+@dataclass
+class BackfillReport:
+    """가져오기 결과 (기록 자체는 ImportChunk로 흘려보내고 건수만 유지)"""
+    ranges: List[DateRange] = field(default_factory=list)
+    days: int = 0            # 통계 표에서 읽은 날 수 (요청 기간 안)
+    changed: int = 0         # 새로 생기거나 바뀐 일별 기록 수
+    weekly: Set[str] = field(default_factory=set)     # 다시 계산한 주차
+    monthly: Set[str] = field(default_factory=set)    # 다시 계산한 년월
+    sink_failures: int = 0   # sink 기록 실패 묶음 수
+    watermark: Optional[str] = None
+
+    def summary(self) -> str:
+        return (f"요청 {len(self.ranges)}회, 일별 {self.days}일 확인 / {self.changed}일 변경, "
+                f"주별 {len(self.weekly)}건, 월별 {len(self.monthly)}건 갱신 (워터마크 {self.watermark})")
+
+
+@dataclass
+class ImportChunk:
+    """기간 하나의 병합 결과 (로컬 저장소에 커밋된 뒤 sink에 한 번에 기록하는 단위)"""
+    range: Optional[DateRange]   # None이면 마지막 누적 발전량 갱신 묶음
+    days: int = 0
+    daily: List[Dict[str, Any]] = field(default_factory=list)     # 새로 생기거나 바뀐 일별 기록 (병합 후)
+    weekly: List[Dict[str, Any]] = field(default_factory=list)    # 다시 계산한 주별 기록
+    monthly: List[Dict[str, Any]] = field(default_factory=list)   # 다시 계산한 월별 기록
+    latest: Optional[str] = None   # 통계 표에 나온 마지막 날
+
+    def __bool__(self) -> bool:
+        return bool(self.daily or self.weekly or self.monthly)
+
+
+# 묶음 기록 함수 (ImportChunk -> 성공 여부, 예: Google Sheets 키 기준 갱신)
+SinkFn = Callable[[ImportChunk], bool]
+
+
+def statistics_url(start: Optional[date], end: Optional[date], base_url: Optional[str] = None) -> str:
+    """통계 페이지 URL (기간 파라미터 포함)"""
+    base_url = base_url or HEVITON_CONFIG["base_url"]
+    params = dict(HISTORY_CONFIG["params"])
+    date_format = HISTORY_CONFIG["date_format"]
+    if start is not None:
+        params[HISTORY_CONFIG["start_param"]] = start.strftime(date_format)
+    if end is not None:
+        params[HISTORY_CONFIG["end_param"]] = end.strftime(date_format)
+    return f"{base_url}{HISTORY_CONFIG['statistics_path']}?{urlencode(params)}"
+
+
+def range_from_url(url: str) -> Tuple[Optional[date], Optional[date]]:
+    """통계 페이지 URL -> 요청 기간 (statistics_url의 역, 파라미터가 없으면 None)"""
+    params = parse_qs(urlparse(url).query)
+    date_format = HISTORY_CONFIG["date_format"]
+
+    def param(name: str) -> Optional[date]:
+        values = params.get(HISTORY_CONFIG[name])
+        return datetime.strptime(values[0], date_format).date() if values else None
+
+    return param("start_param"), param("end_param")
+
+
+def plan_ranges(watermark: Optional[date], yesterday: date, history_start: Optional[date] = None,
+                refetch_days: Optional[int] = None, max_range_days: Optional[int] = None) -> List[DateRange]:
+    """
+    요청할 기간 목록
+
+    Args:
+        watermark: 마지막으로 확인한 날 (없으면 첫 가져오기)
+        yesterday: 마지막 완료일
+        history_start: 첫 가져오기 시작일 (없으면 페이지 기본 기간, 요청 1회)
+        refetch_days: 워터마크부터 다시 요청할 일수
+        max_range_days: 요청 한 번의 최대 기간
+
+    Returns:
+        [(시작일, 종료일), ...] (오래된 순)
+    """
+    refetch_days = HISTORY_CONFIG["refetch_days"] if refetch_days is None else refetch_days
+    max_range_days = max_range_days or HISTORY_CONFIG["max_range_days"]
+
+    if watermark is not None:
+        start = min(watermark + timedelta(days=1 - refetch_days), yesterday)
+    elif history_start is not None:
+        start = history_start
+    else:
+        return [(None, yesterday)]
+
+    ranges = []
+    while start <= yesterday:
+        end = min(start + timedelta(days=max_range_days - 1), yesterday)
+        ranges.append((start, end))
+        start = end + timedelta(days=1)
+    return ranges
+
+
+def split_ranges(since: date, until: date, chunk: Optional[str] = None) -> List[DateRange]:
+    """
+    지정 기간을 달력 월/분기 단위로 나누기 (병렬 요청 단위)
+
+    Args:
+        since: 시작일
+        until: 종료일 (포함)
+        chunk: "month" 또는 "quarter" (기본: HISTORY_CONFIG["chunk"])
+
+    Returns:
+        [(시작일, 종료일), ...] (오래된 순, 첫/마지막 기간은 since/until에서 잘림)
+    """
+    chunk = chunk or HISTORY_CONFIG["chunk"]
+    if chunk not in ("month", "quarter"):
+        raise ValueError(f"알 수 없는 분할 단위: {chunk}")
+    months = 1 if chunk == "month" else 3
+
+    ranges = []
+    start = since
+    while start <= until:
+        # 다음 월/분기 첫날 전날까지
+        first_month = start.month - (start.month - 1) % months
+        index = start.year * 12 + first_month - 1 + months
+        next_start = date(index // 12, index % 12 + 1, 1)
+        end = min(next_start - timedelta(days=1), until)
+        ranges.append((start, end))
+        start = end + timedelta(days=1)
+    return ranges
+
+
+def weekly_rollups(points: List[DailyPoint]) -> List[Dict[str, Any]]:
+    """일별 발전량 -> ISO 주차별 주별 기록 (주차순)"""
+    weeks: Dict[Tuple[int, int], List[DailyPoint]] = defaultdict(list)
+    for point in points:
+        year, week_num, _ = point.day.isocalendar()
+        weeks[(year, week_num)].append(point)
+
+    return [
+        {
+            "week_label": f"{year}년 {week_num}주차",
+            "start_date": min(p.day for p in week).isoformat(),
+            "end_date": max(p.day for p in week).isoformat(),
+            "total": format_number(sum(p.generation or 0.0 for p in week)),
+        }
+        for (year, week_num), week in sorted(weeks.items())
+    ]
+
+
+class MonthlyRollup:
+    """
+    월별 기록 누적기
+
+    누적 발전량은 이후 모든 달에 영향을 주므로 처음 바뀐 달부터 마지막 달까지 이어서 다시 계산한다.
+    기간마다 저장소를 한 행씩 읽어 그 기간의 마지막 달까지 계산하고, 마지막 달은 다음 기간에서
+    날이 더 채워질 수 있어 확정하지 않는다 (확정한 달까지의 누적값만 유지).
+    """
+
+    def __init__(self, store: LocalStore):
+        self.store = store
+        self.cursor: Optional[str] = None   # 아직 확정하지 않은 첫 달 (YYYY-MM)
+        self.cumulative = 0.0               # cursor 이전 달까지 누적 발전량 (kWh)
+
+    def _totals(self, start: Optional[str], end: Optional[str]) -> Iterator[Tuple[str, float]]:
+        """start~end 일별 기록 -> (년월, 발전량 합계) (년월순)"""
+        year_month, total = None, 0.0
+        for point in DailyPoint.parse_all(self.store.iter_daily(start, end), "store.daily"):
+            key = f"{point.day:%Y-%m}"
+            if key != year_month:
+                if year_month is not None:
+                    yield year_month, total
+                year_month, total = key, 0.0
+            total += point.generation or 0.0
+        if year_month is not None:
+            yield year_month, total
+
+    def update(self, daily: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """바뀐 일별 기록 -> 처음 바뀐 달(또는 미확정 달)부터 이번 기간 마지막 달까지 월별 기록"""
+        if not daily:
+            return []
+        first = min(r["date"] for r in daily)[:7]
+        if self.cursor is None or first < self.cursor:
+            before = (date.fromisoformat(f"{first}-01") - timedelta(days=1)).isoformat()
+            self.cursor = first
+            self.cumulative = sum(total for _, total in self._totals(None, before))
+        return self._emit(f"{max(r['date'] for r in daily)[:7]}-31", final=False)
+
+    def finish(self) -> List[Dict[str, Any]]:
+        """미확정 달부터 저장소 마지막 달까지 (누적 발전량 전파)"""
+        return [] if self.cursor is None else self._emit(None, final=True)
+
+    def _emit(self, end: Optional[str], final: bool) -> List[Dict[str, Any]]:
+        records = []
+        cumulative = last_total = self.cumulative
+        for year_month, total in self._totals(f"{self.cursor}-01", end):
+            cumulative += total
+            last_total = total
+            records.append({
+                "year_month": year_month,
+                "total": format_number(total),
+                "cumulative": format_number(cumulative / 1000),
+            })
+        if records and not final:
+            self.cursor = records[-1]["year_month"]
+            self.cumulative = cumulative - last_total
+        return records
+
+
+class Backfill:
+    """통계 페이지 -> 로컬 저장소 증분 가져오기"""
+
+    def __init__(self, store: LocalStore, fetch: Optional[FetchFn] = None, site: Optional[str] = None,
+                 pool=None):
+        """
+        Args:
+            store: 로컬 저장소
+            fetch: URL -> 페이지 HTML (로그인된 세션, 순차 요청)
+            site: 사이트 식별자 (워터마크 구분, 기본: HEVITON_SITE_ID)
+            pool: 여러 기간 병렬 요청 (src/import_pool.ImportPool, 지정 시 fetch 대신 사용)
+        """
+        self.store = store
+        self.fetch = fetch
+        self.site = HEVITON_CONFIG["site_id"] if site is None else site
+        self.pool = pool
+
+    def _fetch_range(self, start: Optional[date], end: date) -> List[DailyPoint]:
+        """기간 하나 요청 -> 기간 안의 DailyPoint (페이지가 기간을 무시해도 걸러냄)"""
+        url = statistics_url(start, end)
+        with span("backfill.fetch", start=str(start or ""), end=str(end)):
+            page_source = self.fetch(url)
+        incr("backfill_requests")
+        incr("backfill_page_bytes", len(page_source.encode("utf-8")))
+        archive_page(url, page_source, self.site)
+
+        with span("backfill.parse"):
+            return parse_daily_page(page_source, start, end)
+
+    def _results(self, ranges: List[DateRange]) -> Iterator[Tuple[DateRange, List[DailyPoint]]]:
+        """기간별 결과 (요청 순서대로)"""
+        if self.pool is not None:
+            yield from self.pool.fetch_ranges(ranges)
+            return
+        for start, end in ranges:
+            yield (start, end), self._fetch_range(start, end)
+
+    def run(self, today: Optional[date] = None, full: bool = False,
+            ranges: Optional[List[DateRange]] = None, sink: Optional[SinkFn] = None) -> BackfillReport:
+        """
+        빠진 기간 가져오기
+
+        Args:
+            today: 기준일 (기본: 오늘, 오늘은 아직 완료되지 않은 날이라 제외)
+            full: 워터마크를 무시하고 처음부터 다시 가져오기
+            ranges: 요청할 기간 (지정하면 워터마크 기준 계획 대신 사용)
+            sink: 기간마다 병합 결과를 기록할 함수 (워터마크를 옮기기 전에 호출)
+
+        Returns:
+            BackfillReport
+        """
+        today = today or date.today()
+        yesterday = today - timedelta(days=1)
+        watermark = None if full else self.store.get_watermark(WATERMARK_KIND, self.site)
+        history_start = HISTORY_CONFIG["start_date"] or None
+
+        report = BackfillReport(watermark=watermark)
+        if ranges is not None:
+            report.ranges = ranges
+            logger.info(f"과거 기록 가져오기: 지정 기간 {len(ranges)}개 "
+                        f"({ranges[0][0] if ranges else '-'} ~ {ranges[-1][1] if ranges else '-'})")
+        else:
+            report.ranges = plan_ranges(
+                date.fromisoformat(watermark) if watermark else None,
+                yesterday,
+                date.fromisoformat(history_start) if history_start else None,
+            )
+            if watermark:
+                logger.info(f"과거 기록 가져오기: 워터마크 {watermark} 이후 {len(report.ranges)}개 기간")
+            else:
+                logger.info(f"과거 기록 가져오기: 첫 실행 ({history_start or '페이지 기본 기간'} ~ {yesterday})")
+
+        for chunk in self.chunks(report.ranges):
+            report.days += chunk.days
+            report.changed += len(chunk.daily)
+            report.weekly.update(r["week_label"] for r in chunk.weekly)
+            report.monthly.update(r["year_month"] for r in chunk.monthly)
+            if sink is not None and chunk and not sink(chunk):
+                report.sink_failures += 1
+                logger.warning(f"{self._label(chunk.range)} sink 기록 실패 (로컬 저장소에는 기록됨)")
+
+            if chunk.range is not None and chunk.days and self._contiguous(report.watermark, chunk.range[0]):
+                # 통계 표에 나온 마지막 날까지 확인 완료 (기간마다 기록하여 중단 후 이어서 진행)
+                latest = chunk.latest
+                if report.watermark is None or latest > report.watermark:
+                    report.watermark = latest
+                    self.store.set_watermark(WATERMARK_KIND, self.site, latest)
+
+        logger.info(f"과거 기록 가져오기 완료: {report.summary()}")
+        return report
+
+    def chunks(self, ranges: List[DateRange]) -> Iterator[ImportChunk]:
+        """
+        가져오기 파이프라인 (기간 하나씩 흘려보냄, 메모리는 기간 크기로 제한)
+
+        페이지 요청 -> 표 해석(DailyPoint) -> 로컬 저장소 병합(커밋) -> 주/월 누적 -> ImportChunk.
+        마지막에 누적 발전량만 바뀐 이후 달을 묶음 하나로 더 보낸다.
+        """
+        monthly = MonthlyRollup(self.store)
+        for (start, end), points in self._results(ranges):
+            daily = self._merge(points)
+            chunk = ImportChunk((start, end), len(points), daily, self._weekly(daily), monthly.update(daily),
+                                latest=max(p.day for p in points).isoformat() if points else None)
+            self.store.upsert_weekly(chunk.weekly)
+            self.store.upsert_monthly(chunk.monthly)
+            logger.debug(f"  {self._label(chunk.range)}: {len(points)}일, {len(daily)}일 변경")
+            yield chunk
+
+        tail = ImportChunk(None, monthly=monthly.finish())
+        if tail:
+            self.store.upsert_monthly(tail.monthly)
+            yield tail
+
+    @staticmethod
+    def _label(rng: Optional[DateRange]) -> str:
+        return "누적 발전량 갱신" if rng is None else f"{rng[0] or '처음'} ~ {rng[1]}"
+
+    @staticmethod
+    def _contiguous(watermark: Optional[str], start: Optional[date]) -> bool:
+        """워터마크 다음 날까지 이어지는 기간인지 (지정 기간이 떨어져 있으면 워터마크를 옮기지 않음)"""
+        if watermark is None or start is None:
+            return True
+        return start <= date.fromisoformat(watermark) + timedelta(days=1)
+
+    def _merge(self, points: List[DailyPoint]) -> List[Dict[str, Any]]:
+        """발전량이 새로 생기거나 바뀐 날만 병합 (병합 후 기록 반환)"""
+        if not points:
+            return []
+        start, end = min(p.day for p in points).isoformat(), max(p.day for p in points).isoformat()
+        stored = {r["date"]: r for r in self.store.get_daily_range(start, end)}
+
+        changed = []
+        for point in points:
+            record = stored.get(point.day.isoformat())
+            if record is None:
+                changed.append(point.record(status="정상"))
+                continue
+            if point.generation is None:
+                continue  # 표에 값이 없는 날은 기존 기록 유지
+            previous = parse_energy(record["generation"])
+            if previous is None or abs(previous - point.generation) >= 0.005:
+                changed.append(point.record())
+
+        if changed:
+            self.store.merge_daily(changed)
+            merged = {r["date"]: r for r in self.store.get_daily_range(start, end)}
+            changed = [merged[r["date"]] for r in changed]
+        return changed
+
+    def _weekly(self, daily: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """바뀐 날이 속한 주의 주별 기록 (그 주의 저장된 일별 기록으로 다시 계산)"""
+        days = [date.fromisoformat(r["date"]) for r in daily]
+        records = []
+        for monday in sorted({day - timedelta(days=day.weekday()) for day in days}):
+            rows = self.store.get_daily_range(monday.isoformat(), (monday + timedelta(days=6)).isoformat())
+            records.extend(weekly_rollups(DailyPoint.parse_all(rows, "store.daily")))
+        return records
+
+
+def browser_fetch(driver, wait: Optional[float] = None) -> FetchFn:
+    """로그인된 Selenium 드라이버로 페이지 요청 (표 로드 대기 후 HTML)"""
+    wait = HISTORY_CONFIG["page_wait"] if wait is None else wait
+
+    def fetch(url: str) -> str:
+        driver.get(url)
+        if wait:
+            time.sleep(wait)
+        return driver.page_source
+
+    return fetch
+
+
+# 테스트용 (요청 기간 계획)
+if __name__ == "__main__":
+    with LocalStore() as store:
+        watermark = store.get_watermark(WATERMARK_KIND, HEVITON_CONFIG["site_id"])
+    yesterday = date.today() - timedelta(days=1)
+    print(f"워터마크: {watermark}")
+    for start, end in plan_ranges(date.fromisoformat(watermark) if watermark else None, yesterday):
+        print(f"{start or '처음'} ~ {end}: {statistics_url(start, end)}")
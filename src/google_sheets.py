@@ -8,14 +8,18 @@ import os
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+import sys
+sys.path.append(str(__file__).rsplit('/', 2)[0])
+from config.settings import GOOGLE_SHEETS_CONFIG
+from src.metrics import span, incr, traced
+from src.models import Dashboard, ConverterStatus, format_number
+
 logger = logging.getLogger(__name__)
 
-# 스프레드시트 ID (URL에서 추출)
-SPREADSHEET_ID = "1teGKsO3VP8m5NSP8FYnYmxTXj2a9izdOs0nhbmivr5I"
+# 스프레드시트 ID (URL에서 추출, GOOGLE_SHEETS_SPREADSHEET_ID로 변경 가능)
+SPREADSHEET_ID = GOOGLE_SHEETS_CONFIG["spreadsheet_id"]
 
 # 시트 이름
 SHEET_DAILY = "일별"
@@ -25,6 +29,143 @@ SHEET_MONTHLY = "월별"
 # Google Sheets API 범위
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
 
+# 프로세스 내 캐시 (여러 클라이언트 인스턴스가 공유)
+_credentials_cache: Dict[str, Any] = {}
+_discovery_document: Optional[str] = None
+_traced_request_class = None
+
+
+def _load_credentials(creds_json: str):
+    """서비스 계정 인증 정보 로드 (같은 JSON이면 캐시된 객체 재사용)"""
+    credentials = _credentials_cache.get(creds_json)
+    if credentials is None:
+        from google.oauth2.service_account import Credentials
+
+        credentials = Credentials.from_service_account_info(
+            json.loads(creds_json), scopes=SCOPES
+        )
+        _credentials_cache[creds_json] = credentials
+    return credentials
+
+
+def _load_discovery_document() -> str:
+    """
+    Sheets v4 discovery 문서 로드
+
+    메모리 캐시 -> 로컬 캐시 파일 -> 라이브러리 번들 문서 순으로 조회하며,
+    네트워크 요청은 하지 않는다.
+    """
+    global _discovery_document
+
+    if _discovery_document is not None:
+        return _discovery_document
+
+    cache_path = GOOGLE_SHEETS_CONFIG["discovery_cache"]
+    if cache_path.exists():
+        _discovery_document = cache_path.read_text(encoding="utf-8")
+        return _discovery_document
+
+    from googleapiclient.discovery_cache import get_static_doc
+
+    document = get_static_doc("sheets", "v4")
+    if document is None:
+        raise RuntimeError("번들된 Sheets v4 discovery 문서를 찾을 수 없습니다.")
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(document, encoding="utf-8")
+    except OSError as e:
+        logger.debug(f"discovery 문서 캐시 저장 실패: {e}")
+
+    _discovery_document = document
+    return _discovery_document
+
+
+def _get_traced_request_class():
+    """API 호출마다 span/전송량을 기록하는 HttpRequest 클래스 (googleapiclient 지연 로드)"""
+    global _traced_request_class
+
+    if _traced_request_class is None:
+        from googleapiclient.http import HttpRequest
+
+        class TracedHttpRequest(HttpRequest):
+            def execute(self, http=None, num_retries=0):
+                method = self.methodId or "unknown"
+                postproc = self.postproc
+
+                def counting_postproc(resp, content):
+                    incr("sheets_bytes_received", len(content or b""), method=method)
+                    return postproc(resp, content)
+
+                self.postproc = counting_postproc
+                body = self.body or b""
+                incr("sheets_bytes_sent", len(body.encode("utf-8") if isinstance(body, str) else body), method=method)
+                with span("sheets.request", method=method):
+                    return super().execute(http=http, num_retries=num_retries)
+
+        _traced_request_class = TracedHttpRequest
+    return _traced_request_class
+
+
+def build_daily_record(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    크롤링 데이터에서 오늘의 일별 기록 생성
+
+    Args:
+        data: 크롤링된 전체 데이터
+
+    Returns:
+        {"date", "generation", "current_power", "status", "record_time"}
+    """
+    dashboard = Dashboard.coerce(data.get("dashboard"))
+    converter_status = ConverterStatus.coerce(data.get("converter_status"))
+
+    return {
+        "date": datetime.now().strftime("%Y-%m-%d"),
+        "generation": format_number(dashboard.today_generation),
+        "current_power": format_number(dashboard.current_power_kw),  # kW
+        "status": converter_status.label,
+        "record_time": datetime.now().strftime("%H:%M:%S"),
+    }
+
+
+def _cell(record: Dict[str, Any], key: str, default: Any = "") -> Any:
+    """기록에서 셀 값 조회 (키가 없거나 None이면 기본값)"""
+    value = record.get(key)
+    return default if value is None else value
+
+
+def daily_row(record: Dict[str, Any]) -> List[Any]:
+    """일별 기록 -> 시트 행 (A:E)"""
+    return [
+        _cell(record, "date"),
+        _cell(record, "generation"),
+        _cell(record, "current_power", "-"),
+        _cell(record, "status", "정상"),
+        _cell(record, "record_time", datetime.now().strftime("%H:%M:%S")),
+    ]
+
+
+def weekly_row(record: Dict[str, Any]) -> List[Any]:
+    """주별 기록 -> 시트 행 (A:E)"""
+    return [
+        _cell(record, "week_label"),
+        _cell(record, "start_date"),
+        _cell(record, "end_date"),
+        _cell(record, "total"),
+        _cell(record, "record_time", datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+    ]
+
+
+def monthly_row(record: Dict[str, Any]) -> List[Any]:
+    """월별 기록 -> 시트 행 (A:D)"""
+    return [
+        _cell(record, "year_month"),
+        _cell(record, "total"),
+        _cell(record, "cumulative"),
+        _cell(record, "record_time", datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+    ]
+
 
 class GoogleSheetsClient:
     """Google Sheets API 클라이언트"""
@@ -33,64 +174,114 @@ class GoogleSheetsClient:
         """
         Args:
             credentials_json: 서비스 계정 JSON 문자열 (환경변수에서 로드)
+
+        API 서비스는 첫 사용 시점에 생성된다 (`service` 참조).
         """
         self.spreadsheet_id = SPREADSHEET_ID
-        self.service = None
-        self._init_service(credentials_json)
-
-    def _init_service(self, credentials_json: Optional[str] = None):
+        self._credentials_json = credentials_json or os.getenv("GOOGLE_SHEETS_CREDENTIALS")
+        self._service = None
+        self._spreadsheets_resource = None
+        self._values_resource = None
+        self._init_failed = False
+
+        if not self.is_configured:
+            logger.warning("GOOGLE_SHEETS_CREDENTIALS 환경변수가 설정되지 않았습니다.")
+
+    @property
+    def is_configured(self) -> bool:
+        """인증 정보(또는 테스트 엔드포인트) 설정 여부 (서비스를 생성하지 않음)"""
+        return bool(self._credentials_json or GOOGLE_SHEETS_CONFIG["api_endpoint"])
+
+    @property
+    def service(self):
+        """Google Sheets API 서비스 (첫 접근 시 생성)"""
+        if self._service is None and self.is_configured and not self._init_failed:
+            self._init_service()
+        return self._service
+
+    @property
+    def _spreadsheets(self):
+        """spreadsheets 리소스 (생성 비용이 커서 재사용)"""
+        if self._spreadsheets_resource is None:
+            self._spreadsheets_resource = self.service.spreadsheets()
+        return self._spreadsheets_resource
+
+    @property
+    def _values(self):
+        """spreadsheets.values 리소스 (재사용)"""
+        if self._values_resource is None:
+            self._values_resource = self._spreadsheets.values()
+        return self._values_resource
+
+    def _init_service(self):
         """Google Sheets API 서비스 초기화"""
-        try:
-            # 환경변수에서 credentials 로드
-            creds_json = credentials_json or os.getenv("GOOGLE_SHEETS_CREDENTIALS")
+        with span("sheets.init") as current:
+            self._build_service()
+            if self._service is None:
+                current.fail()
 
-            if not creds_json:
-                logger.warning("GOOGLE_SHEETS_CREDENTIALS 환경변수가 설정되지 않았습니다.")
-                return
+    def _build_service(self):
+        """캐시된 discovery 문서로 서비스 생성 (실패 시 _init_failed 설정)"""
+        try:
+            from googleapiclient.discovery import build_from_document
 
-            # JSON 문자열을 딕셔너리로 변환
-            creds_dict = json.loads(creds_json)
+            api_endpoint = GOOGLE_SHEETS_CONFIG["api_endpoint"]
+            client_options = {"api_endpoint": api_endpoint} if api_endpoint else None
 
-            # 서비스 계정 인증
-            credentials = Credentials.from_service_account_info(
-                creds_dict, scopes=SCOPES
+            if self._credentials_json:
+                credentials = _load_credentials(self._credentials_json)
+            else:
+                # 테스트 엔드포인트는 인증 없이 접속
+                from google.auth.credentials import AnonymousCredentials
+                credentials = AnonymousCredentials()
+
+            # 캐시된 discovery 문서로 Sheets API 서비스 생성
+            self._service = build_from_document(
+                _load_discovery_document(),
+                credentials=credentials,
+                client_options=client_options,
+                requestBuilder=_get_traced_request_class(),
             )
-
-            # Sheets API 서비스 생성
-            self.service = build("sheets", "v4", credentials=credentials)
-            logger.info("Google Sheets API 초기화 완료")
+            logger.info(f"Google Sheets API 초기화 완료{f' ({api_endpoint})' if api_endpoint else ''}")
 
         except Exception as e:
             logger.error(f"Google Sheets API 초기화 실패: {e}")
-            self.service = None
+            self._service = None
+            self._init_failed = True
 
     def _ensure_sheet_exists(self, sheet_name: str):
         """시트가 없으면 생성"""
+        self.ensure_sheets_exist([sheet_name])
+
+    def ensure_sheets_exist(self, sheet_names: List[str]):
+        """없는 시트를 한 번의 batchUpdate로 생성"""
         try:
             # 현재 시트 목록 조회
-            spreadsheet = self.service.spreadsheets().get(
-                spreadsheetId=self.spreadsheet_id
+            spreadsheet = self._spreadsheets.get(
+                spreadsheetId=self.spreadsheet_id,
+                fields="sheets.properties.title"
             ).execute()
 
             existing_sheets = [s["properties"]["title"] for s in spreadsheet["sheets"]]
+            missing = [name for name in sheet_names if name not in existing_sheets]
 
-            if sheet_name not in existing_sheets:
+            if missing:
                 # 시트 생성
                 request = {
-                    "requests": [{
-                        "addSheet": {
-                            "properties": {"title": sheet_name}
-                        }
-                    }]
+                    "requests": [
+                        {"addSheet": {"properties": {"title": name}}}
+                        for name in missing
+                    ]
                 }
-                self.service.spreadsheets().batchUpdate(
+                self._spreadsheets.batchUpdate(
                     spreadsheetId=self.spreadsheet_id,
                     body=request
                 ).execute()
-                logger.info(f"시트 '{sheet_name}' 생성 완료")
 
-                # 헤더 추가
-                self._add_headers(sheet_name)
+                for name in missing:
+                    logger.info(f"시트 '{name}' 생성 완료")
+                    # 헤더 추가
+                    self._add_headers(name)
 
         except HttpError as e:
             logger.error(f"시트 확인/생성 실패: {e}")
@@ -107,7 +298,7 @@ class GoogleSheetsClient:
             return
 
         try:
-            self.service.spreadsheets().values().update(
+            self._values.update(
                 spreadsheetId=self.spreadsheet_id,
                 range=f"{sheet_name}!A1",
                 valueInputOption="RAW",
@@ -134,40 +325,15 @@ class GoogleSheetsClient:
         try:
             self._ensure_sheet_exists(SHEET_DAILY)
 
-            dashboard = data.get("dashboard", {})
-            converter_status = data.get("converter_status", {})
-
-            # 오늘 날짜
-            today = datetime.now().strftime("%Y-%m-%d")
-
-            # 발전량 (kWh)
-            today_gen = dashboard.get("today_generation", "")
-
-            # 현재 출력 (W -> kW 변환)
-            current_power = dashboard.get("current_power", "")
-            if current_power:
-                try:
-                    current_power = f"{float(current_power) / 1000:.2f}"
-                except:
-                    pass
-
-            # 설비 상태
-            is_normal = converter_status.get("is_normal")
-            if is_normal is True:
-                status = "정상"
-            elif is_normal is False:
-                status = "이상"
-            else:
-                status = "확인필요"
-
-            # 기록 시간
-            record_time = datetime.now().strftime("%H:%M:%S")
+            record = build_daily_record(data)
+            today = record["date"]
+            today_gen = record["generation"]
 
             # 데이터 행
-            row = [[today, today_gen, current_power, status, record_time]]
+            row = [daily_row(record)]
 
             # 데이터 추가
-            self.service.spreadsheets().values().append(
+            self._values.append(
                 spreadsheetId=self.spreadsheet_id,
                 range=f"{SHEET_DAILY}!A:E",
                 valueInputOption="RAW",
@@ -199,22 +365,20 @@ class GoogleSheetsClient:
         try:
             self._ensure_sheet_exists(SHEET_MONTHLY)
 
-            dashboard = data.get("dashboard", {})
+            dashboard = Dashboard.coerce(data.get("dashboard"))
 
             # 년월
             year_month = datetime.now().strftime("%Y-%m")
 
-            # 월 발전량
-            month_gen = dashboard.get("month_generation", "")
-
-            # 누적 발전량
-            total_gen = dashboard.get("total_generation", "")
+            # 월 발전량 (kWh), 누적 발전량 (MWh)
+            month_gen = format_number(dashboard.month_generation)
+            total_gen = format_number(dashboard.total_generation)
 
             # 기록 시간
             record_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
             # 기존 데이터 확인 (같은 월 데이터가 있으면 업데이트)
-            result = self.service.spreadsheets().values().get(
+            result = self._values.get(
                 spreadsheetId=self.spreadsheet_id,
                 range=f"{SHEET_MONTHLY}!A:A"
             ).execute()
@@ -231,7 +395,7 @@ class GoogleSheetsClient:
 
             if row_index:
                 # 기존 행 업데이트
-                self.service.spreadsheets().values().update(
+                self._values.update(
                     spreadsheetId=self.spreadsheet_id,
                     range=f"{SHEET_MONTHLY}!A{row_index}:D{row_index}",
                     valueInputOption="RAW",
@@ -240,7 +404,7 @@ class GoogleSheetsClient:
                 logger.info(f"월별 데이터 업데이트: {year_month} - {month_gen} kWh")
             else:
                 # 새 행 추가
-                self.service.spreadsheets().values().append(
+                self._values.append(
                     spreadsheetId=self.spreadsheet_id,
                     range=f"{SHEET_MONTHLY}!A:D",
                     valueInputOption="RAW",
@@ -281,7 +445,7 @@ class GoogleSheetsClient:
             record_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
             # 기존 데이터 확인 (같은 주차 데이터가 있으면 업데이트)
-            result = self.service.spreadsheets().values().get(
+            result = self._values.get(
                 spreadsheetId=self.spreadsheet_id,
                 range=f"{SHEET_WEEKLY}!A:A"
             ).execute()
@@ -297,7 +461,7 @@ class GoogleSheetsClient:
             row = [[week_label, start_date, end_date, total_gen, record_time]]
 
             if row_index:
-                self.service.spreadsheets().values().update(
+                self._values.update(
                     spreadsheetId=self.spreadsheet_id,
                     range=f"{SHEET_WEEKLY}!A{row_index}:E{row_index}",
                     valueInputOption="RAW",
@@ -305,7 +469,7 @@ class GoogleSheetsClient:
                 ).execute()
                 logger.info(f"주별 데이터 업데이트: {week_label} - {total_gen} kWh")
             else:
-                self.service.spreadsheets().values().append(
+                self._values.append(
                     spreadsheetId=self.spreadsheet_id,
                     range=f"{SHEET_WEEKLY}!A:E",
                     valueInputOption="RAW",
@@ -336,18 +500,10 @@ class GoogleSheetsClient:
         try:
             self._ensure_sheet_exists(SHEET_DAILY)
 
-            rows = []
-            for record in daily_records:
-                rows.append([
-                    record.get("date", ""),
-                    record.get("generation", ""),
-                    record.get("current_power", "-"),
-                    record.get("status", "정상"),
-                    record.get("record_time", datetime.now().strftime("%H:%M:%S"))
-                ])
+            rows = [daily_row(record) for record in daily_records]
 
             if rows:
-                self.service.spreadsheets().values().append(
+                self._values.append(
                     spreadsheetId=self.spreadsheet_id,
                     range=f"{SHEET_DAILY}!A:E",
                     valueInputOption="RAW",
@@ -378,18 +534,10 @@ class GoogleSheetsClient:
         try:
             self._ensure_sheet_exists(SHEET_WEEKLY)
 
-            rows = []
-            for record in weekly_records:
-                rows.append([
-                    record.get("week_label", ""),
-                    record.get("start_date", ""),
-                    record.get("end_date", ""),
-                    record.get("total", ""),
-                    record.get("record_time", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-                ])
+            rows = [weekly_row(record) for record in weekly_records]
 
             if rows:
-                self.service.spreadsheets().values().append(
+                self._values.append(
                     spreadsheetId=self.spreadsheet_id,
                     range=f"{SHEET_WEEKLY}!A:E",
                     valueInputOption="RAW",
@@ -420,17 +568,10 @@ class GoogleSheetsClient:
         try:
             self._ensure_sheet_exists(SHEET_MONTHLY)
 
-            rows = []
-            for record in monthly_records:
-                rows.append([
-                    record.get("year_month", ""),
-                    record.get("total", ""),
-                    record.get("cumulative", ""),
-                    record.get("record_time", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-                ])
+            rows = [monthly_row(record) for record in monthly_records]
 
             if rows:
-                self.service.spreadsheets().values().append(
+                self._values.append(
                     spreadsheetId=self.spreadsheet_id,
                     range=f"{SHEET_MONTHLY}!A:D",
                     valueInputOption="RAW",
@@ -445,6 +586,91 @@ class GoogleSheetsClient:
             logger.error(f"월별 데이터 일괄 입력 실패: {e}")
             return False
 
+    def batch_get_values(self, ranges: List[str]) -> List[List[List[Any]]]:
+        """
+        여러 범위를 한 번의 요청으로 조회
+
+        Args:
+            ranges: A1 표기 범위 리스트
+
+        Returns:
+            범위별 값 (요청 순서와 동일)
+        """
+        if not ranges:
+            return []
+
+        result = self._values.batchGet(
+            spreadsheetId=self.spreadsheet_id,
+            ranges=ranges
+        ).execute()
+
+        return [vr.get("values", []) for vr in result.get("valueRanges", [])]
+
+    def batch_update_values(self, data: List[Dict[str, Any]]) -> int:
+        """
+        여러 범위를 한 번의 요청으로 기록
+
+        Args:
+            data: [{"range": "일별!A2:E2", "values": [[...]]}, ...]
+
+        Returns:
+            갱신된 셀 수
+        """
+        if not data:
+            return 0
+
+        result = self._values.batchUpdate(
+            spreadsheetId=self.spreadsheet_id,
+            body={"valueInputOption": "RAW", "data": data}
+        ).execute()
+
+        return result.get("totalUpdatedCells", 0)
+
+    def upsert_rows(self, rows_by_sheet: Dict[str, List[List[Any]]]) -> bool:
+        """
+        첫 컬럼(키) 기준으로 행 갱신/추가 (시트 수와 무관하게 조회 1회 + 기록 1회)
+
+        Args:
+            rows_by_sheet: {"일별": [[날짜, ...], ...], ...}
+
+        Returns:
+            성공 여부
+        """
+        if not self.service:
+            return False
+
+        sheet_names = [name for name, rows in rows_by_sheet.items() if rows]
+        if not sheet_names:
+            return True
+
+        try:
+            self.ensure_sheets_exist(sheet_names)
+            key_columns = self.batch_get_values([f"{name}!A:A" for name in sheet_names])
+
+            data = []
+            for name, key_column in zip(sheet_names, key_columns):
+                positions = {}
+                for i, row in enumerate(key_column, start=1):
+                    if row and row[0] not in positions:
+                        positions[row[0]] = i
+                next_row = max(len(key_column), 1) + 1
+
+                for row in rows_by_sheet[name]:
+                    row_number = positions.get(row[0])
+                    if row_number is None:
+                        row_number = positions[row[0]] = next_row
+                        next_row += 1
+                    data.append({"range": f"{name}!A{row_number}", "values": [row]})
+
+            self.batch_update_values(data)
+            logger.info(f"시트 {len(data)}행 일괄 기록 완료")
+            return True
+
+        except HttpError as e:
+            logger.error(f"시트 일괄 기록 실패: {e}")
+            return False
+
+    @traced("sheets.record_all", ok=bool)
     def record_all(self, data: Dict[str, Any]) -> bool:
         """
         모든 시트에 데이터 기록 (일별만 - 주별/월별은 별도 스케줄)
@@ -481,7 +707,7 @@ if __name__ == "__main__":
     }
 
     client = GoogleSheetsClient()
-    if client.service:
+    if client.is_configured:
         client.record_all(test_data)
     else:
         print("Google Sheets 연결 실패 - GOOGLE_SHEETS_CREDENTIALS 환경변수를 확인하세요.")
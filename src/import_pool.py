@@ -0,0 +1,210 @@
+"""
+과거 기록 병렬 가져오기 모듈
+
+지정 기간(--since/--until)을 월/분기 단위로 나눈 여러 기간을 동시에 요청한다.
+- 요청: 스레드 풀 + 로그인 세션 풀 (세션마다 브라우저 1개, 최대 workers개, 필요할 때 로그인)
+- 해석: 프로세스 풀 (parse_daily_page, lxml 파싱이 요청 스레드의 GIL을 잡지 않도록)
+- 결과: 요청 순서대로 돌려줌 (Backfill이 오래된 기간부터 병합하고 워터마크를 옮김)
+- 앞서 요청하는 기간은 workers * 2개까지 (기간이 많아도 메모리에 쌓이는 페이지 수 제한)
+- 요청 실패 시 세션을 폐기하고 새 세션으로 retries회 다시 시도, 그래도 실패하면 이후 기간은 취소
+"""
+import itertools
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future
+from datetime import date
+from typing import Callable, Any, Optional, List, Iterator, Tuple
+
+import sys
+sys.path.append(str(__file__).rsplit('/', 2)[0])
+from config.settings import HISTORY_CONFIG
+from src.backfill import DateRange, browser_fetch, statistics_url
+from src.metrics import span, incr
+from src.models import DailyPoint
+from src.page_archive import archive_page
+from src.parsers import parse_daily_page
+
+logger = logging.getLogger(__name__)
+
+
+def default_session_factory():
+    """헤드리스 브라우저 로그인 세션 (첫 요청 때 로그인)"""
+    from src.auth import HevitonAuth
+    from src.scheduler import SharedSession
+    return SharedSession(lambda: HevitonAuth(headless=True))
+
+
+class SessionPool:
+    """로그인 세션 풀 (최대 size개, 빌려줄 세션이 없을 때만 새로 생성)"""
+
+    def __init__(self, session_factory: Callable[[], Any], size: int):
+        """
+        Args:
+            session_factory: 세션 생성 함수 (driver(), invalidate(), close()를 가진 SharedSession)
+            size: 최대 세션 수
+        """
+        self.session_factory = session_factory
+        self.size = size
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._sessions: List[Any] = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """세션 빌리기 (모두 사용 중이고 최대 수에 도달했으면 반납될 때까지 대기)"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._sessions) < self.size:
+                session = self.session_factory()
+                self._sessions.append(session)
+                return session
+        return self._idle.get()
+
+    def release(self, session):
+        self._idle.put(session)
+
+    def close(self):
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            try:
+                session.close()
+            except Exception as e:
+                logger.warning(f"세션 종료 실패: {e}")
+
+
+class ImportPool:
+    """여러 기간 동시 요청 + 병렬 해석 (Backfill(pool=...)로 사용)"""
+
+    def __init__(self, workers: Optional[int] = None,
+                 session_factory: Optional[Callable[[], Any]] = None,
+                 parse_processes: Optional[int] = None,
+                 page_wait: Optional[float] = None,
+                 retries: Optional[int] = None):
+        """
+        Args:
+            workers: 동시 요청 수 = 최대 로그인 세션 수 (기본: HISTORY_CONFIG["workers"])
+            session_factory: 세션 생성 함수 (기본: 헤드리스 HevitonAuth SharedSession)
+            parse_processes: 해석 프로세스 수 (기본: workers, 0이면 요청 스레드에서 해석)
+            page_wait: 페이지 이동 후 표 로드 대기 (초, 기본: HISTORY_CONFIG["page_wait"])
+            retries: 기간 요청 실패 시 다시 시도할 횟수 (기본: HISTORY_CONFIG["retries"])
+        """
+        self.workers = max(1, workers or HISTORY_CONFIG["workers"])
+        self.sessions = SessionPool(session_factory or default_session_factory, self.workers)
+        self.page_wait = page_wait
+        self.retries = HISTORY_CONFIG["retries"] if retries is None else retries
+
+        parse_processes = self.workers if parse_processes is None else parse_processes
+        self._fetchers = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="import-fetch")
+        self._parsers = ProcessPoolExecutor(max_workers=parse_processes) if parse_processes > 0 else None
+
+        # 진행 상황 (완료 순서 기준)
+        self._progress_lock = threading.Lock()
+        self._done = 0
+        self._total = 0
+        self._started_at = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _fetch_page(self, start: Optional[date], end: date) -> str:
+        """기간 하나 요청 (실패 시 세션 폐기 후 새 세션으로 다시 시도)"""
+        url = statistics_url(start, end)
+        for attempt in range(self.retries + 1):
+            session = self.sessions.acquire()
+            try:
+                with span("backfill.fetch", start=str(start or ""), end=str(end)):
+                    page_source = browser_fetch(session.driver(), self.page_wait)(url)
+            except Exception as e:
+                session.invalidate()
+                if attempt >= self.retries:
+                    raise
+                logger.warning(f"{start} ~ {end} 요청 실패 - 새 세션으로 다시 시도: {e}")
+                incr("backfill_retries")
+                continue
+            finally:
+                self.sessions.release(session)
+
+            incr("backfill_requests")
+            incr("backfill_page_bytes", len(page_source.encode("utf-8")))
+            archive_page(url, page_source)
+            return page_source
+
+    def _task(self, start: Optional[date], end: date) -> List[DailyPoint]:
+        """요청 스레드 작업: 페이지 요청 (세션 반납) -> 프로세스 풀 해석"""
+        page_source = self._fetch_page(start, end)
+        with span("backfill.parse"):
+            if self._parsers is None:
+                points = parse_daily_page(page_source, start, end)
+            else:
+                points = self._parsers.submit(parse_daily_page, page_source, start, end).result()
+        self._report_progress(start, end, len(points))
+        return points
+
+    def _report_progress(self, start: Optional[date], end: date, days: int):
+        with self._progress_lock:
+            self._done += 1
+            elapsed = time.monotonic() - self._started_at
+            remaining = elapsed / self._done * (self._total - self._done)
+            logger.info(f"[{self._done}/{self._total}] {start or '처음'} ~ {end}: {days}일 "
+                        f"(경과 {elapsed:.0f}초, 남은 예상 {remaining:.0f}초)")
+
+    def fetch_ranges(self, ranges: List[DateRange]) -> Iterator[Tuple[DateRange, List[DailyPoint]]]:
+        """
+        여러 기간 동시 요청
+
+        Yields:
+            ((시작일, 종료일), [DailyPoint, ...]) - ranges 순서대로 (앞 기간이 끝나야 다음 기간을 돌려줌,
+            돌려준 만큼만 다음 기간을 요청)
+
+        Raises:
+            기간 요청/해석 실패 (다시 시도 후에도 실패, 남은 기간은 취소)
+        """
+        with self._progress_lock:
+            self._done = 0
+            self._total = len(ranges)
+            self._started_at = time.monotonic()
+        logger.info(f"기간 {len(ranges)}개 병렬 요청 (세션 {min(self.workers, len(ranges))}개)")
+
+        # 앞서 요청하는 기간 수 제한 (소비가 늦어도 완료된 페이지가 메모리에 쌓이지 않도록)
+        pending: "deque[Tuple[DateRange, Future]]" = deque()
+        remaining = iter(ranges)
+        try:
+            for rng in itertools.islice(remaining, self.workers * 2):
+                pending.append((rng, self._fetchers.submit(self._task, *rng)))
+            while pending:
+                rng, future = pending.popleft()
+                points = future.result()
+                for next_rng in itertools.islice(remaining, 1):
+                    pending.append((next_rng, self._fetchers.submit(self._task, *next_rng)))
+                yield rng, points
+        finally:
+            # 실패 또는 중단 시 아직 시작하지 않은 기간 취소
+            for _, future in pending:
+                future.cancel()
+
+    def close(self):
+        """작업 스레드/프로세스 종료 후 세션 로그아웃"""
+        self._fetchers.shutdown(wait=True, cancel_futures=True)
+        if self._parsers is not None:
+            self._parsers.shutdown(wait=True, cancel_futures=True)
+        self.sessions.close()
+
+
+# 테스트용 (분할 기간만 출력, 로그인하지 않음)
+if __name__ == "__main__":
+    from datetime import timedelta
+    from src.backfill import split_ranges
+
+    logging.basicConfig(level=logging.INFO)
+    yesterday = date.today() - timedelta(days=1)
+    for rng in split_ranges(yesterday.replace(month=1, day=1), yesterday):
+        print(rng, statistics_url(*rng))
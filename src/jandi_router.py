@@ -0,0 +1,198 @@
+"""
+잔디 다중 채널 라우팅 모듈
+사이트/심각도별 전송 대상 선택, 여러 사이트 리포트 요약(digest), 동시 전송
+"""
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Any, Optional, List, Tuple
+
+import sys
+sys.path.append(str(__file__).rsplit('/', 2)[0])
+from config.settings import JANDI_CONFIG, JANDI_ROUTES
+from src.jandi_webhook import JandiWebhook
+
+logger = logging.getLogger(__name__)
+
+SEVERITY_REPORT = "report"
+SEVERITY_ALERT = "alert"
+
+
+@dataclass
+class JandiRoute:
+    """전송 규칙 (sites/severities의 "*"는 전체)"""
+    url: str
+    sites: List[str] = field(default_factory=lambda: ["*"])
+    severities: List[str] = field(default_factory=lambda: ["*"])
+
+    def matches(self, site: Optional[str], severity: str) -> bool:
+        site_ok = "*" in self.sites or (site or "") in self.sites
+        severity_ok = "*" in self.severities or severity in self.severities
+        return site_ok and severity_ok
+
+
+def load_routes(raw: Optional[str] = None) -> List[JandiRoute]:
+    """
+    전송 규칙 로드 (JANDI_ROUTES, 없으면 JANDI_WEBHOOK_URL 하나)
+
+    Raises:
+        ValueError: 전송 대상이 없거나 JANDI_ROUTES 형식 오류
+    """
+    raw = raw if raw is not None else JANDI_ROUTES
+    if raw:
+        try:
+            routes = [
+                JandiRoute(
+                    url=item["url"],
+                    sites=item.get("sites", ["*"]),
+                    severities=item.get("severities", ["*"]),
+                )
+                for item in json.loads(raw)
+            ]
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"JANDI_ROUTES 형식이 올바르지 않습니다: {e}")
+        if routes:
+            return routes
+
+    webhook_url = os.getenv("JANDI_WEBHOOK_URL")
+    if not webhook_url:
+        raise ValueError("JANDI_WEBHOOK_URL 환경변수가 설정되지 않았습니다.")
+    return [JandiRoute(url=webhook_url)]
+
+
+class JandiRouter:
+    """여러 잔디 채널로 리포트/알림 전송"""
+
+    def __init__(
+        self,
+        routes: Optional[List[JandiRoute]] = None,
+        webhook_factory: Callable[[str], JandiWebhook] = JandiWebhook,
+    ):
+        """
+        Args:
+            routes: 전송 규칙 (기본: load_routes())
+            webhook_factory: 웹훅 URL -> JandiWebhook 생성 함수
+        """
+        self.routes = routes if routes is not None else load_routes()
+        self.webhook_factory = webhook_factory
+        self._webhooks: Dict[str, JandiWebhook] = {}
+
+    def webhook(self, url: str) -> JandiWebhook:
+        """URL별 JandiWebhook (HTTP 세션 재사용)"""
+        if url not in self._webhooks:
+            self._webhooks[url] = self.webhook_factory(url)
+        return self._webhooks[url]
+
+    def targets(self, site: Optional[str], severity: str) -> List[str]:
+        """사이트/심각도에 해당하는 웹훅 URL (중복 제거, 규칙 순서)"""
+        urls = []
+        for route in self.routes:
+            if route.matches(site, severity) and route.url not in urls:
+                urls.append(route.url)
+        return urls
+
+    def build_reports(self, reports: List[Dict[str, Any]],
+                      digest: Optional[bool] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        사이트별 수집 데이터 -> (웹훅 URL, 메시지) 목록
+
+        Args:
+            reports: get_all_data() 결과 목록 (각 항목의 "site"로 라우팅)
+            digest: True면 채널별로 여러 사이트를 최소 개수의 메시지로 합침
+                    (기본: JANDI_CONFIG["digest"])
+
+        Returns:
+            [(url, payload), ...]
+        """
+        digest = JANDI_CONFIG["digest"] if digest is None else digest
+
+        by_url: Dict[str, List[Dict[str, Any]]] = {}
+        for data in reports:
+            for url in self.targets(data.get("site"), SEVERITY_REPORT):
+                by_url.setdefault(url, []).append(data)
+
+        messages = []
+        for url, items in by_url.items():
+            webhook = self.webhook(url)
+            if digest and len(items) > 1:
+                for payload in self._build_digest(webhook, items):
+                    messages.append((url, payload))
+            else:
+                for data in items:
+                    messages.append((url, webhook.build_generation_report(data)))
+        return messages
+
+    @staticmethod
+    def _build_digest(webhook: JandiWebhook, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """여러 사이트 리포트를 connectInfo 한도 안에서 최소 개수의 메시지로 묶음"""
+        max_items = JANDI_CONFIG["digest_max_items"]
+        max_chars = JANDI_CONFIG["digest_max_chars"]
+
+        pages: List[List[Dict[str, str]]] = [[]]
+        page_chars = 0
+
+        for data in items:
+            site = data.get("site") or "-"
+            section = [
+                {"title": f"[{site}] {info['title']}", "description": info["description"]}
+                for info in webhook.build_generation_report(data)["connectInfo"]
+            ]
+
+            for info in section:
+                size = len(info["title"]) + len(info["description"])
+                # 사이트 항목이 현재 메시지에 다 들어가지 않으면 새 메시지에서 시작
+                if info is section[0]:
+                    section_size = sum(len(i["title"]) + len(i["description"]) for i in section)
+                    fits = (len(pages[-1]) + len(section) <= max_items
+                            and page_chars + section_size <= max_chars)
+                    if not fits and pages[-1]:
+                        pages.append([])
+                        page_chars = 0
+                elif len(pages[-1]) >= max_items or page_chars + size > max_chars:
+                    pages.append([])
+                    page_chars = 0
+
+                pages[-1].append(info)
+                page_chars += size
+
+        now = datetime.now().strftime("%Y-%m-%d %H:%M")
+        total = len(pages)
+        return [
+            {
+                "body": f"🌞 Heviton 발전량 리포트 요약 ({now}) - 사이트 {len(items)}개"
+                        + (f" ({i}/{total})" if total > 1 else ""),
+                "connectColor": "#F5A623",
+                "connectInfo": page,
+            }
+            for i, page in enumerate(pages, start=1)
+        ]
+
+    def deliver(self, messages: List[Tuple[str, Dict[str, Any]]], label: str = "발전량 리포트") -> List[bool]:
+        """
+        메시지를 작은 스레드 풀에서 동시 전송
+
+        Returns:
+            메시지별 성공 여부 (입력 순서)
+        """
+        if not messages:
+            return []
+
+        def send(message: Tuple[str, Dict[str, Any]]) -> bool:
+            url, payload = message
+            return self.webhook(url).post_payload(payload, label)
+
+        # 웹훅 객체는 미리 생성 (스레드 간 경쟁 방지)
+        for url, _ in messages:
+            self.webhook(url)
+
+        workers = min(len(messages), JANDI_CONFIG["workers"])
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jandi-send") as pool:
+            return list(pool.map(send, messages))
+
+    def close(self):
+        """HTTP 세션 종료"""
+        for webhook in self._webhooks.values():
+            webhook.close()
@@ -1,14 +1,20 @@
 """
 잔디(Jandi) 웹훅 전송 모듈
 """
+import json
 import requests
 import logging
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 import sys
 sys.path.append(str(__file__).rsplit('/', 2)[0])
-from config.settings import REQUEST_CONFIG
+from config.settings import JANDI_CONFIG
+from src.metrics import span, incr
+from src.models import Dashboard, DailyPoint, ConverterStatus, format_number
 
 logger = logging.getLogger(__name__)
 
@@ -16,16 +22,94 @@ logger = logging.getLogger(__name__)
 class JandiWebhook:
     """잔디 Incoming Webhook 클래스"""
 
-    def __init__(self, webhook_url: str):
+    def __init__(self, webhook_url: str, session: Optional[requests.Session] = None):
         """
         Args:
             webhook_url: 잔디 Incoming Webhook URL
+            session: 재사용할 HTTP 세션 (기본: keep-alive + 재시도 세션 생성)
         """
         self.webhook_url = webhook_url
         self.headers = {
             "Accept": "application/vnd.tosslab.jandi-v2+json",
             "Content-Type": "application/json",
         }
+        self.timeout = (JANDI_CONFIG["connect_timeout"], JANDI_CONFIG["read_timeout"])
+        self.session = session or self._create_session()
+
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """keep-alive 연결 풀과 재시도 정책을 가진 세션 생성"""
+        retries = JANDI_CONFIG["retries"]
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            # 요청이 이미 전달되었을 수 있는 읽기 실패는 재시도하지 않음 (메시지 중복 방지)
+            read=0,
+            status=retries,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["POST"]),
+            backoff_factor=JANDI_CONFIG["backoff_factor"],
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            max_retries=retry,
+            pool_connections=1,
+            pool_maxsize=JANDI_CONFIG["pool_maxsize"],
+        )
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _post(self, payload: Dict[str, Any], label: str) -> bool:
+        """
+        페이로드 전송 (세션 재사용, 재시도는 어댑터에서 처리)
+
+        Args:
+            payload: 잔디 v2 메시지
+            label: 로그용 메시지 종류
+
+        Returns:
+            bool: 전송 성공 여부
+        """
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+        with span("jandi.post") as current:
+            try:
+                response = self.session.post(
+                    self.webhook_url,
+                    data=body,
+                    headers=self.headers,
+                    timeout=self.timeout
+                )
+                incr("jandi_bytes_sent", len(body))
+                incr("jandi_bytes_received", len(response.content))
+                # 어댑터에서 재시도한 횟수 (429/5xx/연결 실패)
+                retries = getattr(response.raw, "retries", None)
+                if retries is not None and retries.history:
+                    incr("jandi_retries", len(retries.history))
+                response.raise_for_status()
+                incr("jandi_messages", status="sent")
+                logger.info(f"{label} 전송 성공")
+                return True
+
+            except requests.RequestException as e:
+                current.fail(str(e))
+                incr("jandi_messages", status="failed")
+                logger.error(f"{label} 전송 실패: {e}")
+                return False
+
+    def close(self):
+        """HTTP 세션 종료"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     def send_message(
         self,
@@ -60,20 +144,7 @@ class JandiWebhook:
         if connect_info:
             payload["connectInfo"] = connect_info
 
-        try:
-            response = requests.post(
-                self.webhook_url,
-                json=payload,
-                headers=self.headers,
-                timeout=REQUEST_CONFIG["timeout"]
-            )
-            response.raise_for_status()
-            logger.info("잔디 메시지 전송 성공")
-            return True
-
-        except requests.RequestException as e:
-            logger.error(f"잔디 메시지 전송 실패: {e}")
-            return False
+        return self._post(payload, "잔디 메시지")
 
     def send_generation_report(self, data: Dict[str, Any]) -> bool:
         """
@@ -85,49 +156,50 @@ class JandiWebhook:
         Returns:
             bool: 전송 성공 여부
         """
+        return self._post(self.build_generation_report(data), "발전량 리포트")
+
+    def build_generation_report(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        발전량 리포트 메시지 생성
+
+        Args:
+            data: 발전량 데이터 (daily, weekly, monthly, dashboard 포함)
+
+        Returns:
+            잔디 v2 메시지 페이로드
+        """
         now = datetime.now().strftime("%Y-%m-%d %H:%M")
 
         # 메시지 구성
         connect_info = []
 
-        # 대시보드 요약 (새로운 구조)
+        # 대시보드 요약 (수집 시 해석된 값, 직접 만든 dict도 허용)
         dashboard = data.get("dashboard", {})
-        if isinstance(dashboard, dict) and not dashboard.get("data"):
-            # 새로운 구조: dashboard가 직접 데이터를 담고 있음
-            current_power = dashboard.get("current_power")
-            today_gen = dashboard.get("today_generation")
-            month_gen = dashboard.get("month_generation")
-            total_gen = dashboard.get("total_generation")
-
-            if current_power:
-                # 현재 발전량 (W -> kW 변환)
-                try:
-                    power_kw = float(current_power) / 1000
-                    power_str = f"{power_kw:.2f} kW"
-                except:
-                    power_str = f"{current_power} W"
+        if not (isinstance(dashboard, dict) and dashboard.get("data")):
+            dashboard = Dashboard.coerce(dashboard)
 
+            if dashboard.current_power is not None:
                 connect_info.append({
                     "title": "⚡ 현재 발전량",
-                    "description": power_str,
+                    "description": f"{dashboard.current_power_kw:.2f} kW",
                 })
 
-            if today_gen:
+            if dashboard.today_generation is not None:
                 connect_info.append({
                     "title": f"📅 오늘 발전량 ({data.get('daily', {}).get('date', datetime.now().strftime('%Y-%m-%d'))})",
-                    "description": f"{today_gen} kWh",
+                    "description": f"{format_number(dashboard.today_generation)} kWh",
                 })
 
-            if month_gen:
+            if dashboard.month_generation is not None:
                 connect_info.append({
                     "title": f"📊 이번달 발전량 ({data.get('monthly', {}).get('year_month', datetime.now().strftime('%Y-%m'))})",
-                    "description": f"{month_gen} kWh",
+                    "description": f"{format_number(dashboard.month_generation)} kWh",
                 })
 
-            if total_gen:
+            if dashboard.total_generation is not None:
                 connect_info.append({
                     "title": "📈 누적 발전량",
-                    "description": f"{total_gen} MWh",
+                    "description": f"{format_number(dashboard.total_generation)} MWh",
                 })
 
         # 기존 구조 지원 (호환성)
@@ -153,40 +225,31 @@ class JandiWebhook:
                     })
 
         # 컨버터 상태 추가
-        converter_status = data.get("converter_status", {})
-        if converter_status:
-            is_normal = converter_status.get("is_normal")
-            if is_normal is True:
+        if data.get("converter_status"):
+            converter_status = ConverterStatus.coerce(data["converter_status"])
+            if converter_status.is_normal is True:
                 connect_info.append({
                     "title": "🟢 설비 상태",
                     "description": "컨버터 정상 작동 중",
                 })
-            elif is_normal is False:
-                error_msgs = converter_status.get("error_messages", [])
-                error_text = ", ".join(error_msgs) if error_msgs else "상태 확인 필요"
+            elif converter_status.is_normal is False:
                 connect_info.append({
                     "title": "🔴 설비 상태",
-                    "description": f"이상 감지: {error_text}",
+                    "description": f"이상 감지: {converter_status.error_text}",
                 })
 
-        # 최근 5일 발전량 추가
-        recent_5days = data.get("recent_5days", [])
+        # 최근 5일 발전량 추가 (한 줄로 표시)
+        recent_5days = DailyPoint.parse_all(data.get("recent_5days", []), "jandi.recent_5days")
         if recent_5days:
-            # 최근 5일 데이터를 한 줄로 표시
-            recent_text_parts = []
-            for day_data in recent_5days:
-                date = day_data.get("date", "")
-                gen = day_data.get("generation", "-")
-                if date and gen != "-":
-                    recent_text_parts.append(f"{date}: {gen}kWh")
-                elif date:
-                    recent_text_parts.append(f"{date}: -")
-
-            if recent_text_parts:
-                connect_info.append({
-                    "title": "📋 최근 5일 발전량",
-                    "description": " | ".join(recent_text_parts),
-                })
+            recent_text = " | ".join(
+                f"{point.day:%m/%d}: {format_number(point.generation)}kWh" if point.generation is not None
+                else f"{point.day:%m/%d}: -"
+                for point in recent_5days
+            )
+            connect_info.append({
+                "title": "📋 최근 5일 발전량",
+                "description": recent_text,
+            })
 
         if not connect_info:
             connect_info.append({
@@ -194,27 +257,13 @@ class JandiWebhook:
                 "description": "수집된 발전량 데이터가 없습니다.",
             })
 
-        payload = {
-            "body": f"🌞 Heviton 발전량 리포트 ({now})",
+        site = data.get("site")
+        return {
+            "body": f"🌞 Heviton 발전량 리포트{f' - {site}' if site else ''} ({now})",
             "connectColor": "#F5A623",
             "connectInfo": connect_info,
         }
 
-        try:
-            response = requests.post(
-                self.webhook_url,
-                json=payload,
-                headers=self.headers,
-                timeout=REQUEST_CONFIG["timeout"]
-            )
-            response.raise_for_status()
-            logger.info("발전량 리포트 전송 성공")
-            return True
-
-        except requests.RequestException as e:
-            logger.error(f"발전량 리포트 전송 실패: {e}")
-            return False
-
     def send_error_alert(self, error_message: str) -> bool:
         """
         에러 알림 전송
@@ -225,9 +274,21 @@ class JandiWebhook:
         Returns:
             bool: 전송 성공 여부
         """
+        return self._post(self.build_error_alert(error_message), "에러 알림")
+
+    def build_error_alert(self, error_message: str) -> Dict[str, Any]:
+        """
+        에러 알림 메시지 생성
+
+        Args:
+            error_message: 에러 메시지
+
+        Returns:
+            잔디 v2 메시지 페이로드
+        """
         now = datetime.now().strftime("%Y-%m-%d %H:%M")
 
-        payload = {
+        return {
             "body": f"🚨 Heviton 크롤러 에러 발생 ({now})",
             "connectColor": "#E74C3C",
             "connectInfo": [{
@@ -236,20 +297,36 @@ class JandiWebhook:
             }],
         }
 
-        try:
-            response = requests.post(
-                self.webhook_url,
-                json=payload,
-                headers=self.headers,
-                timeout=REQUEST_CONFIG["timeout"]
-            )
-            response.raise_for_status()
-            logger.info("에러 알림 전송 성공")
-            return True
+    def build_alert_digest(self, digests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        억제된 반복 알림 요약 메시지 생성
+
+        Args:
+            digests: AlertCoalescer 요약 항목 [{"source", "sample", "suppressed", "first_seen", "last_seen"}, ...]
+
+        Returns:
+            잔디 v2 메시지 페이로드
+        """
+        now = datetime.now().strftime("%Y-%m-%d %H:%M")
+
+        connect_info = []
+        for entry in digests:
+            first = datetime.fromtimestamp(entry["first_seen"]).strftime("%m-%d %H:%M")
+            last = datetime.fromtimestamp(entry["last_seen"]).strftime("%m-%d %H:%M")
+            connect_info.append({
+                "title": f"🔁 {entry['source']} - 추가 {entry['suppressed']}건 ({first} ~ {last})",
+                "description": entry["sample"],
+            })
+
+        return {
+            "body": f"🔕 Heviton 반복 알림 요약 ({now})",
+            "connectColor": "#E67E22",
+            "connectInfo": connect_info,
+        }
 
-        except requests.RequestException as e:
-            logger.error(f"에러 알림 전송 실패: {e}")
-            return False
+    def post_payload(self, payload: Dict[str, Any], label: str = "잔디 메시지") -> bool:
+        """미리 생성한 메시지 전송 (알림 outbox 전송용)"""
+        return self._post(payload, label)
 
 
 # 테스트용
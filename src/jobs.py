@@ -0,0 +1,191 @@
+"""
+주별/월별 집계 작업 모듈
+
+주별/월별 기록은 로컬 저장소의 일별 기록에서 계산하고, 빠진 날짜가 있을 때만
+통계 페이지(fetch)에서 그 주/그 달 기간을 가져온다. 매일 수집이 정상적으로 돌았다면 로그인 없이 끝난다.
+대시보드의 이번달 발전량은 지난 달 값이 아니므로 쓰지 않는다 (확인할 수 없으면 기록하지 않고 MissingDataError).
+"""
+import logging
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+import sys
+sys.path.append(str(__file__).rsplit('/', 2)[0])
+from src.backfill import Backfill, FetchFn
+from src.local_store import LocalStore
+from src.models import Dashboard, ValueParseError, parse_energy, format_number
+
+logger = logging.getLogger(__name__)
+
+# 스냅샷 요청 함수 (필요할 때만 로그인/수집)
+SnapshotFn = Callable[[], Dict[str, Any]]
+
+
+class MissingDataError(RuntimeError):
+    """기록할 기간의 발전량을 확인할 수 없음 (잘못된 값을 기록하지 않고 작업 실패로 알림)"""
+
+
+def last_week(today: date) -> Tuple[date, date]:
+    """지난 주 (월요일, 일요일)"""
+    sunday = today - timedelta(days=today.weekday() + 1)
+    return sunday - timedelta(days=6), sunday
+
+
+def previous_month(today: date) -> str:
+    """전월 (YYYY-MM)"""
+    return (today.replace(day=1) - timedelta(days=1)).strftime("%Y-%m")
+
+
+def month_days(year_month: str) -> Tuple[date, date]:
+    """YYYY-MM -> (1일, 말일)"""
+    first = date.fromisoformat(f"{year_month}-01")
+    return first, (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+
+
+def _daily_values(store: LocalStore, start: str, end: str) -> Dict[str, float]:
+    """로컬 저장소 일별 발전량 {YYYY-MM-DD: kWh} (start~end, 값 있는 날만)"""
+    values = {}
+    for record in store.get_daily_range(start, end):
+        try:
+            generation = parse_energy(record.get("generation"))
+        except ValueParseError as e:
+            logger.warning(f"일별 기록 {record['date']} 제외: {e}")
+            continue
+        if generation is not None:
+            values[record["date"]] = generation
+    return values
+
+
+def weekly_record(monday: date, store: LocalStore, fetch: Optional[FetchFn] = None) -> Dict[str, Any]:
+    """
+    주별 기록 계산
+
+    로컬 일별 기록이 그 주 전체에 없으면 통계 페이지에서 그 주 기간을 가져와 병합한 뒤 계산한다
+    (GitHub Actions처럼 data/가 유지되지 않는 실행).
+
+    Args:
+        monday: 주 시작일
+        store: 로컬 저장소 (일별 기록)
+        fetch: URL -> 통계 페이지 HTML (로그인된 세션, 빠진 날 가져오기용)
+
+    Returns:
+        {"week_label", "start_date", "end_date", "total", "record_time"}
+
+    Raises:
+        MissingDataError: 그 주의 일별 발전량을 확인할 수 없음
+    """
+    sunday = monday + timedelta(days=6)
+    start, end = monday.isoformat(), sunday.isoformat()
+    missing = 7 - len(store.get_daily_range(start, end))
+
+    if missing:
+        if fetch is None:
+            raise MissingDataError(f"주별 집계: {start} ~ {end} 로컬 일별 기록 {missing}일 없음 (통계 페이지 요청 불가)")
+        logger.info(f"주별 집계: {start} ~ {end} 로컬 기록 없는 날 {missing}일 - 통계 페이지에서 가져오기")
+        Backfill(store, fetch=fetch).run(ranges=[(monday, sunday)])
+        missing = 7 - len(store.get_daily_range(start, end))
+        if missing:
+            raise MissingDataError(f"주별 집계: {start} ~ {end} 통계 페이지에도 {missing}일 없음")
+
+    values = _daily_values(store, start, end)
+    if len(values) < 7:
+        logger.warning(f"주별 집계: {start} ~ {end} 중 {len(values)}일만 발전량 있음 (나머지는 통계 표에 값 없음)")
+
+    # ISO 연도/주차 (backfill.weekly_rollups와 같은 키 - 연초/연말 주가 다른 해 행을 덮어쓰지 않도록)
+    year, week_num, _ = monday.isocalendar()
+    return {
+        "week_label": f"{year}년 {week_num}주차",
+        "start_date": start,
+        "end_date": end,
+        "total": f"{sum(values.values()):.2f}",
+        "record_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def monthly_record(year_month: str, store: LocalStore, snapshot_fn: SnapshotFn,
+                   fetch: Optional[FetchFn] = None) -> Dict[str, Any]:
+    """
+    월별 기록 계산
+
+    월 발전량은 로컬 일별 기록 합계, 누적 발전량(MWh)은 직전 월 누적에 더해 계산한다.
+    로컬 일별 기록이 그 달 전체에 없으면 통계 페이지에서 그 달 기간을 가져와 병합한 뒤 계산한다
+    (GitHub Actions처럼 data/가 유지되지 않는 실행). 직전 월 누적이 없으면 수집 스냅샷의
+    누적 발전량(실행 시점 값)을 사용한다.
+
+    Args:
+        year_month: 대상 월 (YYYY-MM)
+        store: 로컬 저장소
+        snapshot_fn: 누적 발전량을 로컬 기록으로 계산할 수 없을 때 호출할 수집 함수
+        fetch: URL -> 통계 페이지 HTML (로그인된 세션, 빠진 날 가져오기용)
+
+    Returns:
+        {"year_month", "total", "cumulative", "record_time"}
+
+    Raises:
+        MissingDataError: 그 달의 일별 발전량을 확인할 수 없음
+    """
+    first, last = month_days(year_month)
+    start, end = first.isoformat(), last.isoformat()
+    stored = {r["date"] for r in store.get_daily_range(start, end)}
+    missing = (last - first).days + 1 - len(stored)
+
+    if missing:
+        if fetch is None:
+            raise MissingDataError(f"월별 집계: {year_month} 로컬 일별 기록 {missing}일 없음 (통계 페이지 요청 불가)")
+        logger.info(f"월별 집계: {year_month} 로컬 기록 없는 날 {missing}일 - 통계 페이지에서 가져오기")
+        report = Backfill(store, fetch=fetch).run(ranges=[(first, last)])
+        if not report.days:
+            raise MissingDataError(f"월별 집계: {year_month} 통계 페이지에서 일별 발전량을 읽지 못함")
+
+    values = _daily_values(store, start, end)
+    if not values:
+        raise MissingDataError(f"월별 집계: {year_month} 발전량이 있는 날이 없음")
+    total = sum(values.values())
+
+    cumulative = None
+    previous = [r for r in store.get_monthly() if r["year_month"] < year_month]
+    if previous:
+        previous_cumulative = parse_energy(previous[-1].get("cumulative"), "mwh")
+        if previous_cumulative is not None:
+            cumulative = previous_cumulative + total / 1000  # MWh
+    if cumulative is None:
+        cumulative = Dashboard.coerce(snapshot_fn().get("dashboard")).total_generation
+
+    return {
+        "year_month": year_month,
+        "total": format_number(total),
+        "cumulative": format_number(cumulative),
+        "record_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def _record(table: str, records: List[Dict[str, Any]], store: LocalStore, sheets=None) -> bool:
+    """로컬 저장소 + Google Sheets(설정 시) 기록"""
+    from src.google_sheets import SHEET_WEEKLY, SHEET_MONTHLY, weekly_row, monthly_row
+
+    getattr(store, f"upsert_{table}")(records)
+    if sheets is None or not sheets.is_configured:
+        logger.info("Google Sheets 연동 미설정 - 로컬 저장소에만 기록")
+        return True
+
+    if table == "weekly":
+        rows = {SHEET_WEEKLY: [weekly_row(r) for r in records]}
+    else:
+        rows = {SHEET_MONTHLY: [monthly_row(r) for r in records]}
+    return sheets.upsert_rows(rows)
+
+
+def run_weekly(today: date, store: LocalStore, sheets=None, fetch: Optional[FetchFn] = None) -> bool:
+    """지난 주 주별 기록 (발전량을 확인할 수 없으면 MissingDataError, 기록하지 않음)"""
+    monday, sunday = last_week(today)
+    record = weekly_record(monday, store, fetch)
+    logger.info(f"주별 리포트: {record['week_label']} ({monday} ~ {sunday}) - {record['total']} kWh")
+    return _record("weekly", [record], store, sheets)
+
+
+def run_monthly(today: date, snapshot_fn: SnapshotFn, store: LocalStore, sheets=None,
+                fetch: Optional[FetchFn] = None) -> bool:
+    """전월 월별 기록 (발전량을 확인할 수 없으면 MissingDataError, 기록하지 않음)"""
+    record = monthly_record(previous_month(today), store, snapshot_fn, fetch)
+    logger.info(f"월별 리포트: {record['year_month']} - {record['total']} kWh (누적 {record['cumulative']} MWh)")
+    return _record("monthly", [record], store, sheets)
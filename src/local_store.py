@@ -0,0 +1,301 @@
+"""
+로컬 저장소 모듈 (SQLite)
+수집한 일별/주별/월별 발전량 기록을 Google Sheets와 같은 형태로 보관
+"""
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple, Iterator
+
+import sys
+sys.path.append(str(__file__).rsplit('/', 2)[0])
+from config.settings import STORE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# 테이블별 컬럼 (첫 컬럼이 키, 시트 컬럼 순서와 동일)
+TABLE_COLUMNS = {
+    "daily": ["date", "generation", "current_power", "status", "record_time"],
+    "weekly": ["week_label", "start_date", "end_date", "total", "record_time"],
+    "monthly": ["year_month", "total", "cumulative", "record_time"],
+}
+
+# 장중 샘플 컬럼 (바뀐 값만 저장, 나머지는 NULL - 조회 시 직전 값으로 채움)
+SAMPLE_FIELDS = ["current_power", "today_generation", "month_generation", "total_generation"]
+
+# 장중 샘플 집계 계층 테이블 (src/retention.py, 구간 시작 시각 기준)
+AGGREGATE_TABLES = {"15m": "samples_15m", "1h": "samples_1h"}
+AGGREGATE_COLUMNS = ["n", "power_min", "power_max", "power_mean", "energy",
+                     "today_generation", "month_generation", "total_generation"]
+
+
+class LocalStore:
+    """발전량 기록 로컬 저장소"""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: SQLite 파일 경로 (기본: STORE_CONFIG["path"])
+        """
+        self.path = Path(path or STORE_CONFIG["path"])
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.row_factory = sqlite3.Row
+        self._create_tables()
+
+    def _create_tables(self):
+        """테이블 생성"""
+        with self.conn:
+            for table, columns in TABLE_COLUMNS.items():
+                key, *rest = columns
+                column_defs = ", ".join([f"{key} TEXT PRIMARY KEY"] + [f"{c} TEXT" for c in rest])
+                self.conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({column_defs})")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS samples (site TEXT NOT NULL, ts TEXT NOT NULL, "
+                + ", ".join(f"{c} REAL" for c in SAMPLE_FIELDS)
+                + ", PRIMARY KEY (site, ts))"
+            )
+            for table in AGGREGATE_TABLES.values():
+                self.conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} (site TEXT NOT NULL, bucket TEXT NOT NULL, "
+                    + ", ".join(f"{c} {'INTEGER' if c == 'n' else 'REAL'}" for c in AGGREGATE_COLUMNS)
+                    + ", PRIMARY KEY (site, bucket))"
+                )
+            # 작업/사이트별 처리 완료 날짜 (보존 기간 압축 계층, 과거 기록 가져오기)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS retention_state "
+                "(tier TEXT NOT NULL, site TEXT NOT NULL, watermark TEXT, PRIMARY KEY (tier, site))"
+            )
+            # 마지막 동기화 시 시트 구간(월/년)별 다이제스트 (src/reconcile.py, 바뀐 구간만 내려받기)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS sheet_digests "
+                "(sheet TEXT NOT NULL, bucket TEXT NOT NULL, digest TEXT NOT NULL, PRIMARY KEY (sheet, bucket))"
+            )
+
+    def _upsert(self, table: str, records: List[Dict[str, Any]], merge: bool = False) -> int:
+        """키 기준 삽입/갱신 (merge면 값이 있는 컬럼만 갱신)"""
+        columns = TABLE_COLUMNS[table]
+        key = columns[0]
+        placeholders = ", ".join("?" for _ in columns)
+        if merge:
+            updates = ", ".join(f"{c} = COALESCE(excluded.{c}, {c})" for c in columns[1:])
+        else:
+            updates = ", ".join(f"{c} = excluded.{c}" for c in columns[1:])
+
+        rows = [
+            tuple(_to_text(record.get(c)) for c in columns)
+            for record in records
+            if record.get(key)
+        ]
+
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+                f"ON CONFLICT({key}) DO UPDATE SET {updates}",
+                rows,
+            )
+
+        logger.debug(f"로컬 저장소 {table} {len(rows)}건 저장")
+        return len(rows)
+
+    def _select(self, table: str) -> List[Dict[str, Any]]:
+        """키 순서로 전체 조회"""
+        columns = TABLE_COLUMNS[table]
+        cursor = self.conn.execute(
+            f"SELECT {', '.join(columns)} FROM {table} ORDER BY {columns[0]}"
+        )
+        return [dict(row) for row in cursor]
+
+    def upsert_daily(self, records: List[Dict[str, Any]]) -> int:
+        """
+        일별 기록 저장
+
+        Args:
+            records: [{"date": "YYYY-MM-DD", "generation": "123.45", ...}, ...]
+
+        Returns:
+            저장 건수
+        """
+        return self._upsert("daily", records)
+
+    def merge_daily(self, records: List[Dict[str, Any]]) -> int:
+        """
+        일별 기록 병합 (과거 기록 가져오기용 - 기록에 없는 컬럼은 기존 값 유지)
+
+        Args:
+            records: [{"date": "YYYY-MM-DD", "generation": "123.45"}, ...]
+
+        Returns:
+            저장 건수
+        """
+        return self._upsert("daily", records, merge=True)
+
+    def upsert_weekly(self, records: List[Dict[str, Any]]) -> int:
+        """주별 기록 저장 (week_label 기준)"""
+        return self._upsert("weekly", records)
+
+    def upsert_monthly(self, records: List[Dict[str, Any]]) -> int:
+        """월별 기록 저장 (year_month 기준)"""
+        return self._upsert("monthly", records)
+
+    def get_daily(self) -> List[Dict[str, Any]]:
+        """일별 기록 전체 (날짜순)"""
+        return self._select("daily")
+
+    def get_weekly(self) -> List[Dict[str, Any]]:
+        """주별 기록 전체"""
+        return self._select("weekly")
+
+    def get_monthly(self) -> List[Dict[str, Any]]:
+        """월별 기록 전체 (년월순)"""
+        return self._select("monthly")
+
+    def get_daily_range(self, start: str, end: str) -> List[Dict[str, Any]]:
+        """start~end(YYYY-MM-DD, 양끝 포함) 일별 기록 (날짜순)"""
+        columns = TABLE_COLUMNS["daily"]
+        cursor = self.conn.execute(
+            f"SELECT {', '.join(columns)} FROM daily WHERE date BETWEEN ? AND ? ORDER BY date",
+            (start, end),
+        )
+        return [dict(row) for row in cursor]
+
+    def iter_daily(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """start~end 일별 기록을 한 행씩 (날짜순, 전체를 메모리에 올리지 않음)"""
+        columns = TABLE_COLUMNS["daily"]
+        cursor = self.conn.execute(
+            f"SELECT {', '.join(columns)} FROM daily WHERE date >= ? AND date <= ? ORDER BY date",
+            (start or "", end or "9999-12-31"),
+        )
+        for row in cursor:
+            yield dict(row)
+
+    def get_watermark(self, kind: str, site: str) -> Optional[str]:
+        """작업/사이트별 처리 완료 날짜 (없으면 None)"""
+        row = self.conn.execute(
+            "SELECT watermark FROM retention_state WHERE tier = ? AND site = ?", (kind, site)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, kind: str, site: str, value: str):
+        """작업/사이트별 처리 완료 날짜 기록"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO retention_state (tier, site, watermark) VALUES (?, ?, ?) "
+                "ON CONFLICT(tier, site) DO UPDATE SET watermark = excluded.watermark",
+                (kind, site, value),
+            )
+
+    def get_sheet_digests(self, sheet: str) -> Dict[str, str]:
+        """시트의 마지막 동기화 구간별 다이제스트 {구간: 다이제스트}"""
+        cursor = self.conn.execute("SELECT bucket, digest FROM sheet_digests WHERE sheet = ?", (sheet,))
+        return {row[0]: row[1] for row in cursor}
+
+    def set_sheet_digests(self, sheet: str, digests: Dict[str, Optional[str]]):
+        """구간별 다이제스트 기록 (None이면 삭제 - 다음 검사에서 다시 내려받음)"""
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM sheet_digests WHERE sheet = ? AND bucket = ?",
+                [(sheet, bucket) for bucket, digest in digests.items() if digest is None],
+            )
+            self.conn.executemany(
+                "INSERT INTO sheet_digests (sheet, bucket, digest) VALUES (?, ?, ?) "
+                "ON CONFLICT(sheet, bucket) DO UPDATE SET digest = excluded.digest",
+                [(sheet, bucket, digest) for bucket, digest in digests.items() if digest is not None],
+            )
+
+    def insert_sample(self, site: str, ts: str, changes: Dict[str, float]) -> bool:
+        """
+        장중 샘플 저장 (직전 샘플에서 바뀐 값만)
+
+        Args:
+            site: 사이트 식별자
+            ts: 샘플 시각 (ISO 형식)
+            changes: {필드: 값} (바뀐 필드만, 비어 있으면 저장하지 않음)
+
+        Returns:
+            저장 여부
+        """
+        return self.insert_samples(site, [(ts, changes)]) > 0
+
+    def insert_samples(self, site: str, rows: List[Tuple[str, Dict[str, float]]]) -> int:
+        """
+        장중 샘플 일괄 저장 (트랜잭션 1회)
+
+        Args:
+            site: 사이트 식별자
+            rows: [(ISO 시각, {필드: 값}), ...] (빈 변경은 건너뜀)
+
+        Returns:
+            저장 건수
+        """
+        params = [
+            (site, ts, *(changes.get(c) for c in SAMPLE_FIELDS))
+            for ts, changes in rows if changes
+        ]
+        if not params:
+            return 0
+        with self.conn:
+            # 같은 시각 샘플이 다시 들어오면 새 값만 덮어씀
+            self.conn.executemany(
+                f"INSERT INTO samples (site, ts, {', '.join(SAMPLE_FIELDS)}) "
+                f"VALUES (?, ?, {', '.join('?' for _ in SAMPLE_FIELDS)}) "
+                f"ON CONFLICT(site, ts) DO UPDATE SET "
+                + ", ".join(f"{c} = COALESCE(excluded.{c}, {c})" for c in SAMPLE_FIELDS),
+                params,
+            )
+        return len(params)
+
+    def last_sample_values(self, site: str) -> Dict[str, float]:
+        """필드별 마지막 저장 값 (재시작 후 변경 감지 기준)"""
+        values = {}
+        for field in SAMPLE_FIELDS:
+            row = self.conn.execute(
+                f"SELECT {field} FROM samples WHERE site = ? AND {field} IS NOT NULL "
+                f"ORDER BY ts DESC LIMIT 1",
+                (site,),
+            ).fetchone()
+            if row is not None:
+                values[field] = row[0]
+        return values
+
+    def get_samples(self, site: str, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        장중 샘플 조회 (바뀌지 않은 필드는 직전 값으로 채움)
+
+        Args:
+            site: 사이트 식별자
+            since: 이 시각 이후만 (ISO 형식, 채움 기준은 이전 샘플 포함)
+
+        Returns:
+            [{"ts", "current_power", "today_generation", ...}, ...] (시각순)
+        """
+        cursor = self.conn.execute(
+            f"SELECT ts, {', '.join(SAMPLE_FIELDS)} FROM samples WHERE site = ? ORDER BY ts",
+            (site,),
+        )
+        current = dict.fromkeys(SAMPLE_FIELDS)
+        samples = []
+        for row in cursor:
+            current.update((c, row[c]) for c in SAMPLE_FIELDS if row[c] is not None)
+            if since is None or row["ts"] >= since:
+                samples.append(dict(current, ts=row["ts"]))
+        return samples
+
+    def close(self):
+        """연결 종료"""
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _to_text(value: Any) -> Optional[str]:
+    """저장용 문자열 변환 (None 유지)"""
+    if value is None:
+        return None
+    return str(value)
@@ -0,0 +1,311 @@
+"""
+실행 추적(span) 및 지표 모듈
+
+실행 한 번의 단계별 소요 시간(span), 재시도/전송량 등 카운터를 모아
+실행 종료 시 두 가지 파일로 기록한다.
+- JSON 지표 파일: LOGS_DIR/metrics_<run_id>.json (span 목록 + 집계)
+- Prometheus textfile collector 파일: METRICS_CONFIG["textfile"] (마지막 실행 값)
+
+Usage:
+    from src.metrics import span, incr, traced
+
+    with span("scraper.navigate", page="monitoring.do"):
+        driver.get(url)
+
+    @traced("auth.login", ok=bool)
+    def login(...): ...
+"""
+import functools
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Any, Optional, List, Tuple
+
+import sys
+sys.path.append(str(__file__).rsplit('/', 2)[0])
+from config.settings import METRICS_CONFIG
+
+logger = logging.getLogger(__name__)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def new_run_id() -> str:
+    """실행 ID (시각 + 임의 접미사, 파일 이름으로 정렬 가능)"""
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Span:
+    """단계 하나의 실행 기록"""
+
+    def __init__(self, name: str, labels: Dict[str, Any], parent: Optional[str]):
+        self.name = name
+        self.labels = labels
+        self.parent = parent
+        self.start = time.time()
+        self._started = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.ok = True
+        self.error: Optional[str] = None
+
+    def fail(self, error: Optional[str] = None):
+        """예외 없이 실패한 단계 표시 (False 반환 등)"""
+        self.ok = False
+        if error:
+            self.error = error
+
+    def to_dict(self, run_start: float) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "labels": self.labels,
+            "parent": self.parent,
+            "offset": round(self.start - run_start, 6),
+            "duration": round(self.duration or 0.0, 6),
+            "ok": self.ok,
+            "error": self.error,
+        }
+
+
+class MetricsRegistry:
+    """실행 단위 span/카운터 저장소 (스레드 안전)"""
+
+    def __init__(self, run_id: Optional[str] = None):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset(run_id)
+
+    def reset(self, run_id: Optional[str] = None):
+        """새 실행 시작 (기록 초기화)"""
+        with self._lock:
+            self.run_id = run_id or new_run_id()
+            self.started_at = time.time()
+            self._spans: List[Span] = []
+            self._dropped = 0
+            # (이름, 라벨) -> [호출 수, 실패 수, 총 소요 시간, 최대 소요 시간]
+            self._span_stats: Dict[Tuple[str, LabelKey], List[float]] = {}
+            self._counters: Dict[Tuple[str, LabelKey], float] = {}
+            self._gauges: Dict[Tuple[str, LabelKey], float] = {}
+
+    def _stack(self) -> List[Span]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def span(self, name: str, **labels):
+        """
+        단계 소요 시간 기록
+
+        예외가 발생하면 실패로 기록하고 예외는 그대로 전달한다.
+        라벨 이름 stage는 Prometheus 출력에서 span 이름으로 쓰이므로 사용하지 않는다.
+        """
+        stack = self._stack()
+        current = Span(name, labels, stack[-1].name if stack else None)
+        stack.append(current)
+        try:
+            yield current
+        except BaseException as e:
+            current.fail(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            current.duration = time.perf_counter() - current._started
+            stack.pop()
+            self._finish(current)
+
+    def _finish(self, span: Span):
+        with self._lock:
+            key = (span.name, _label_key(span.labels))
+            stats = self._span_stats.setdefault(key, [0, 0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += 0 if span.ok else 1
+            stats[2] += span.duration
+            stats[3] = max(stats[3], span.duration)
+
+            if len(self._spans) < METRICS_CONFIG["max_spans"]:
+                self._spans.append(span)
+            else:
+                self._dropped += 1
+
+    def incr(self, name: str, value: float = 1, **labels):
+        """카운터 증가 (재시도 수, 전송 바이트 등)"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def gauge(self, name: str, value: float, **labels):
+        """현재 값 기록"""
+        with self._lock:
+            self._gauges[(name, _label_key(labels))] = value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재까지의 기록 (JSON 직렬화 가능)"""
+        with self._lock:
+            now = time.time()
+            return {
+                "run_id": self.run_id,
+                "started_at": datetime.fromtimestamp(self.started_at).isoformat(),
+                "duration": round(now - self.started_at, 6),
+                "spans": [s.to_dict(self.started_at) for s in self._spans],
+                "dropped_spans": self._dropped,
+                "stages": [
+                    {
+                        "name": name,
+                        "labels": dict(labels),
+                        "calls": int(stats[0]),
+                        "failures": int(stats[1]),
+                        "total": round(stats[2], 6),
+                        "max": round(stats[3], 6),
+                    }
+                    for (name, labels), stats in sorted(self._span_stats.items())
+                ],
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self._counters.items())
+                ],
+                "gauges": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self._gauges.items())
+                ],
+            }
+
+    def write_json(self, snapshot: Dict[str, Any], path: Optional[Path] = None) -> Path:
+        """JSON 지표 파일 기록"""
+        path = Path(path or METRICS_CONFIG["json_dir"] / f"metrics_{snapshot['run_id']}.json")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False, indent=2)
+        return path
+
+    def write_prometheus(self, snapshot: Dict[str, Any], path: Optional[Path] = None) -> Path:
+        """Prometheus textfile collector 파일 기록 (임시 파일 교체)"""
+        path = Path(path or METRICS_CONFIG["textfile"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(format_prometheus(snapshot))
+        os.replace(tmp_path, path)
+        return path
+
+    def write_reports(self, success: bool) -> Dict[str, Any]:
+        """
+        실행 종료 시 지표 파일 기록 (실패해도 예외를 전달하지 않음)
+
+        Args:
+            success: 실행 성공 여부
+
+        Returns:
+            기록한 스냅샷
+        """
+        self.gauge("run_success", 1 if success else 0)
+        self.gauge("last_run_timestamp_seconds", time.time())
+        snapshot = self.snapshot()
+        snapshot["success"] = success
+
+        if not METRICS_CONFIG["enabled"]:
+            return snapshot
+
+        try:
+            json_path = self.write_json(snapshot)
+            prom_path = self.write_prometheus(snapshot)
+            logger.info(f"실행 지표 기록: {json_path}, {prom_path}")
+        except OSError as e:
+            logger.warning(f"실행 지표 기록 실패: {e}")
+        return snapshot
+
+
+def _metric_name(name: str) -> str:
+    return "heviton_" + re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in sorted(labels.items())) + "}"
+
+
+def format_prometheus(snapshot: Dict[str, Any]) -> str:
+    """스냅샷 -> Prometheus 텍스트 형식 (모든 값은 마지막 실행 기준 gauge)"""
+    lines = []
+
+    def family(name: str, help_text: str, samples: List[Tuple[Dict[str, str], float]]):
+        if not samples:
+            return
+        metric = _metric_name(name)
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        for labels, value in samples:
+            lines.append(f"{metric}{_format_labels(labels)} {float(value)!r}")
+
+    stages = snapshot["stages"]
+    family("stage_duration_seconds", "Total time spent in each stage during the last run",
+           [(dict(s["labels"], stage=s["name"]), s["total"]) for s in stages])
+    family("stage_max_duration_seconds", "Slowest single call of each stage during the last run",
+           [(dict(s["labels"], stage=s["name"]), s["max"]) for s in stages])
+    family("stage_calls", "Number of calls of each stage during the last run",
+           [(dict(s["labels"], stage=s["name"]), s["calls"]) for s in stages])
+    family("stage_success", "1 if every call of the stage succeeded during the last run",
+           [(dict(s["labels"], stage=s["name"]), 0 if s["failures"] else 1) for s in stages])
+
+    counters: Dict[str, List[Tuple[Dict[str, str], float]]] = {}
+    for c in snapshot["counters"]:
+        counters.setdefault(c["name"], []).append((c["labels"], c["value"]))
+    for name, samples in sorted(counters.items()):
+        family(name, f"{name} during the last run", samples)
+
+    gauges: Dict[str, List[Tuple[Dict[str, str], float]]] = {}
+    for g in snapshot["gauges"]:
+        gauges.setdefault(g["name"], []).append((g["labels"], g["value"]))
+    for name, samples in sorted(gauges.items()):
+        family(name, f"{name} of the last run", samples)
+
+    family("run_duration_seconds", "Wall time of the last run", [({}, snapshot["duration"])])
+    return "\n".join(lines) + "\n"
+
+
+# 프로세스 기본 저장소 (실행마다 reset)
+metrics = MetricsRegistry()
+
+
+def span(name: str, **labels):
+    """기본 저장소에 span 기록 (with 문)"""
+    return metrics.span(name, **labels)
+
+
+def incr(name: str, value: float = 1, **labels):
+    """기본 저장소 카운터 증가"""
+    metrics.incr(name, value, **labels)
+
+
+def traced(name: str, ok: Optional[Callable[[Any], bool]] = None):
+    """
+    함수 실행을 span으로 기록하는 데코레이터
+
+    Args:
+        name: span 이름
+        ok: 반환값 -> 성공 여부 (예외 없이 실패를 반환하는 함수용)
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with metrics.span(name) as current:
+                result = func(*args, **kwargs)
+                if ok is not None and not ok(result):
+                    current.fail()
+                return result
+        return wrapper
+    return decorator
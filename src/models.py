@@ -0,0 +1,262 @@
+"""
+발전량 데이터 모델
+
+수집 시점에 화면 문자열("1,234.5", "50 kW", "12/22")을 한 번만 해석하여 숫자/단위/날짜로 정규화하고,
+저장/전송 단계(Sheets, 잔디, 로컬 저장소)는 이 값에서 표시 문자열을 만든다.
+- 필드별 기준 단위: 현재 출력 W, 오늘/이번달 발전량 kWh, 누적 발전량 MWh (사이트 표시 단위)
+- 단위가 붙은 값은 기준 단위로 환산 ("1.2 MWh" -> 1200.0 kWh)
+- 값 없음("", "-")은 None, 해석할 수 없는 값은 ValueParseError (수집 단계에서 경고 + parse_errors 지표)
+"""
+import logging
+import re
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Any, Optional, Tuple, Iterable, List
+
+import sys
+sys.path.append(str(__file__).rsplit('/', 2)[0])
+from src.metrics import incr
+
+logger = logging.getLogger(__name__)
+
+POWER_UNITS = {"w": 1.0, "kw": 1e3, "mw": 1e6}
+ENERGY_UNITS = {"wh": 1e-3, "kwh": 1.0, "mwh": 1e3, "gwh": 1e6}
+
+# 대시보드 필드 -> (기준 단위, 단위 표)
+FIELD_UNITS = {
+    "current_power": ("w", POWER_UNITS),
+    "today_generation": ("kwh", ENERGY_UNITS),
+    "month_generation": ("kwh", ENERGY_UNITS),
+    "total_generation": ("mwh", ENERGY_UNITS),
+}
+
+EMPTY_VALUES = ("", "-", "--")
+
+_QUANTITY = re.compile(r"^(-?\d+(?:\.\d+)?|-?\.\d+)\s*([a-z]*)$")
+_FULL_DATE = re.compile(r"^(\d{4})\s*[./-]\s*(\d{1,2})\s*[./-]\s*(\d{1,2})\.?$")
+_SHORT_DATE = re.compile(r"^(\d{1,2})\s*[./-]\s*(\d{1,2})$")
+
+
+class ValueParseError(ValueError):
+    """화면 값을 숫자/날짜로 해석할 수 없음"""
+
+
+def parse_quantity(value: Any, unit: str, units: Dict[str, float]) -> Optional[float]:
+    """
+    수량 문자열 -> 기준 단위 숫자
+
+    Args:
+        value: "1,234.5", "50 kW", 숫자 등
+        unit: 기준 단위 (units의 키, 단위 없는 값은 이 단위로 봄)
+        units: {단위: 배수}
+
+    Returns:
+        기준 단위 값 (값 없음은 None)
+
+    Raises:
+        ValueParseError: 숫자가 아니거나 알 수 없는 단위
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+
+    text = str(value).strip().replace(",", "").lower()
+    if text in EMPTY_VALUES:
+        return None
+    match = _QUANTITY.match(text)
+    if not match or (match.group(2) and match.group(2) not in units):
+        raise ValueParseError(f"수량 해석 불가: {value!r}")
+
+    number = float(match.group(1))
+    suffix = match.group(2)
+    return number if not suffix or suffix == unit else number * units[suffix] / units[unit]
+
+
+def parse_energy(value: Any, unit: str = "kwh") -> Optional[float]:
+    """발전량 문자열 -> kWh (기본)"""
+    return parse_quantity(value, unit, ENERGY_UNITS)
+
+
+def parse_day(value: Any, today: Optional[date] = None) -> Optional[date]:
+    """
+    날짜 문자열 -> date
+
+    "YYYY.MM.DD", "YYYY-MM-DD", "MM/DD" 형식을 받는다. 연도가 없으면 today 기준
+    가장 최근 날짜로 본다 (1월에 받은 "12/31"은 작년).
+
+    Raises:
+        ValueParseError: 날짜가 아님
+    """
+    if value is None:
+        return None
+    if isinstance(value, date):
+        return value
+
+    text = str(value).strip()
+    if text in EMPTY_VALUES:
+        return None
+    try:
+        match = _FULL_DATE.match(text)
+        if match:
+            return date(*(int(g) for g in match.groups()))
+        match = _SHORT_DATE.match(text)
+        if match:
+            today = today or date.today()
+            day = date(today.year, int(match.group(1)), int(match.group(2)))
+            # 수집 시각 차이로 하루 이틀 앞선 날짜는 허용, 그 이상은 작년
+            return day if day <= today + timedelta(days=7) else day.replace(year=today.year - 1)
+    except ValueError:
+        pass
+    raise ValueParseError(f"날짜 해석 불가: {value!r}")
+
+
+def _report_error(source: str, error: ValueParseError):
+    """수집 단계의 해석 실패 기록 (값은 None으로 두고 계속)"""
+    logger.warning(f"{source}: {error}")
+    incr("parse_errors", source=source)
+
+
+def format_number(value: Optional[float], digits: int = 2) -> str:
+    """숫자 -> 표시 문자열 (값 없음은 "")"""
+    return "" if value is None else f"{value:.{digits}f}"
+
+
+@dataclass(frozen=True, slots=True)
+class Dashboard:
+    """모니터링 대시보드 카운터 (필드별 기준 단위, 값 없음은 None)"""
+    current_power: Optional[float] = None      # 현재 출력 (W)
+    today_generation: Optional[float] = None   # 오늘 발전량 (kWh)
+    month_generation: Optional[float] = None   # 이번달 발전량 (kWh)
+    total_generation: Optional[float] = None   # 누적 발전량 (MWh)
+
+    @classmethod
+    def from_raw(cls, raw: Optional[Dict[str, Any]]) -> "Dashboard":
+        """화면 값 dict -> Dashboard (해석 실패 필드는 경고 후 None)"""
+        raw = raw or {}
+        values = {}
+        for field, (unit, units) in FIELD_UNITS.items():
+            try:
+                values[field] = parse_quantity(raw.get(field), unit, units)
+            except ValueParseError as e:
+                _report_error(f"dashboard.{field}", e)
+                values[field] = None
+        return cls(**values)
+
+    @classmethod
+    def coerce(cls, value: Any) -> "Dashboard":
+        """Dashboard 또는 화면 값 dict (직접 만든 리포트 데이터 호환)"""
+        return value if isinstance(value, cls) else cls.from_raw(value)
+
+    @property
+    def current_power_kw(self) -> Optional[float]:
+        return None if self.current_power is None else self.current_power / 1000
+
+    def values(self) -> Dict[str, Optional[float]]:
+        """{필드: 값} (로컬 저장소 샘플 컬럼 순서)"""
+        return {field: getattr(self, field) for field in FIELD_UNITS}
+
+    def __bool__(self) -> bool:
+        return any(value is not None for value in self.values().values())
+
+
+@dataclass(frozen=True, slots=True)
+class DailyPoint:
+    """일별 발전량 한 건"""
+    day: date
+    generation: Optional[float] = None  # kWh
+
+    @classmethod
+    def from_raw(cls, raw: Dict[str, Any], today: Optional[date] = None) -> "DailyPoint":
+        """
+        {"date", "generation"} -> DailyPoint
+
+        Raises:
+            ValueParseError: 날짜 또는 발전량 해석 불가
+        """
+        day = parse_day(raw.get("date"), today)
+        if day is None:
+            raise ValueParseError(f"날짜 없음: {raw!r}")
+        return cls(day, parse_energy(raw.get("generation")))
+
+    @classmethod
+    def parse_all(cls, items: Iterable[Any], source: str,
+                  today: Optional[date] = None) -> List["DailyPoint"]:
+        """여러 건 해석 (해석 실패 항목은 경고 후 제외, DailyPoint는 그대로)"""
+        points = []
+        for item in items or ():
+            if isinstance(item, cls):
+                points.append(item)
+                continue
+            try:
+                points.append(cls.from_raw(item, today))
+            except ValueParseError as e:
+                _report_error(source, e)
+        return points
+
+    def record(self, **extra: Any) -> Dict[str, Any]:
+        """로컬 저장소/Sheets 일별 기록 ({"date", "generation", ...})"""
+        return {"date": self.day.isoformat(), "generation": format_number(self.generation), **extra}
+
+
+@dataclass(frozen=True, slots=True)
+class Converter:
+    """설비(컨버터/인버터) 한 대의 상태"""
+    name: str
+    normal: bool
+
+    @property
+    def label(self) -> str:
+        return "정상" if self.normal else "확인필요"
+
+
+@dataclass(frozen=True, slots=True)
+class ConverterStatus:
+    """설비 상태 (is_normal: None이면 조회 실패)"""
+    is_normal: Optional[bool] = None
+    converters: Tuple[Converter, ...] = ()
+    error_messages: Tuple[str, ...] = ()
+    error: Optional[str] = None  # 조회 실패 사유
+
+    @classmethod
+    def from_raw(cls, raw: Optional[Dict[str, Any]]) -> "ConverterStatus":
+        raw = raw or {}
+        return cls(
+            is_normal=raw.get("is_normal"),
+            converters=tuple(
+                item if isinstance(item, Converter)
+                else Converter(item.get("name", ""), item.get("status") == "정상")
+                for item in raw.get("converters", ())
+            ),
+            error_messages=tuple(raw.get("error_messages", ())),
+            error=raw.get("error"),
+        )
+
+    @classmethod
+    def coerce(cls, value: Any) -> "ConverterStatus":
+        return value if isinstance(value, cls) else cls.from_raw(value)
+
+    @property
+    def label(self) -> str:
+        """시트 표시 상태 (정상/이상/확인필요)"""
+        if self.is_normal is True:
+            return "정상"
+        if self.is_normal is False:
+            return "이상"
+        return "확인필요"
+
+    @property
+    def error_text(self) -> str:
+        return ", ".join(self.error_messages) or "상태 확인 필요"
+
+
+# 테스트용
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+
+    print(Dashboard.from_raw({"current_power": "50,000", "today_generation": "123.45 kWh",
+                              "month_generation": "3.45 MWh", "total_generation": "N/A"}))
+    print(DailyPoint.parse_all([{"date": "2026.01.02", "generation": "12.3"},
+                                {"date": "12/31", "generation": "-"},
+                                {"date": "합계", "generation": "1"}], "test", today=date(2026, 1, 3)))
+    print(ConverterStatus.from_raw({"is_normal": False, "error_messages": ["통신 오류"]}).label)
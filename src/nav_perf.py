@@ -0,0 +1,295 @@
+"""
+페이지 이동 성능 수집 모듈 (선택 기능)
+
+페이지 이동마다 Chrome의 Navigation/Resource Timing, CDP 네트워크 로그, JS 힙 크기를 수집하여
+URL(경로)별 이력 파일(JSONL)에 누적하고, 느린 페이지와 추세를 보고서로 보여 준다.
+어떤 페이지를 차단/캐시하거나 API 직접 호출로 바꿀지 판단하는 근거 데이터로 사용한다.
+
+사용:
+    python main.py --nav-perf      # 수집 실행 + 페이지 성능 기록 (또는 NAV_PERF=1)
+    python main.py --nav-report    # 이력 보고서 출력
+"""
+import json
+import logging
+import statistics
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+from urllib.parse import urlparse
+
+import sys
+sys.path.append(str(__file__).rsplit('/', 2)[0])
+from config.settings import NAV_PERF_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Navigation Timing + Resource Timing + JS 힙 (performance.memory는 Chrome 전용)
+_TIMING_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+return {
+    nav: nav ? nav.toJSON() : null,
+    resources: performance.getEntriesByType('resource').map(r => ({
+        url: r.name, type: r.initiatorType, bytes: r.transferSize, duration: r.duration
+    })),
+    heap: performance.memory ? performance.memory.usedJSHeapSize : null,
+};
+"""
+
+
+def enable_capture(options):
+    """Chrome 옵션에 CDP 성능 로그 수집 설정 추가 (드라이버 생성 전에 호출)"""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+
+def page_key(url: str) -> str:
+    """이력 집계 키 (URL 경로, 쿼리 제외)"""
+    return urlparse(url).path or url
+
+
+def summarize_network_log(entries: List[Dict[str, Any]], top: int = 5) -> Dict[str, Any]:
+    """
+    CDP 성능 로그(driver.get_log("performance")) -> 네트워크 통계
+
+    Returns:
+        {"requests", "failed", "bytes", "largest": [{"url", "bytes"}, ...]}
+    """
+    urls: Dict[str, str] = {}
+    sizes: Dict[str, float] = {}
+    failed = 0
+
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+
+        method = message.get("method")
+        params = message.get("params", {})
+        request_id = params.get("requestId")
+
+        if method == "Network.requestWillBeSent":
+            urls[request_id] = params.get("request", {}).get("url", "")
+        elif method == "Network.loadingFinished":
+            sizes[request_id] = params.get("encodedDataLength", 0)
+        elif method == "Network.loadingFailed":
+            failed += 1
+
+    largest = sorted(
+        ({"url": urls.get(rid, ""), "bytes": int(size)} for rid, size in sizes.items()),
+        key=lambda item: item["bytes"],
+        reverse=True,
+    )[:top]
+
+    return {
+        "requests": len(urls),
+        "failed": failed,
+        "bytes": int(sum(sizes.values())),
+        "largest": largest,
+    }
+
+
+class NavigationProfiler:
+    """페이지 이동별 성능 수집기"""
+
+    def __init__(self, driver, history_path: Optional[Path] = None, run_id: Optional[str] = None):
+        """
+        Args:
+            driver: Selenium WebDriver (enable_capture 옵션으로 생성된 경우 CDP 로그 사용)
+            history_path: 이력 파일 경로 (기본: NAV_PERF_CONFIG["history"])
+            run_id: 이력에 함께 기록할 실행 ID
+        """
+        self.driver = driver
+        self.history_path = Path(history_path or NAV_PERF_CONFIG["history"])
+        self.run_id = run_id
+        self.top = NAV_PERF_CONFIG["top_resources"]
+        self._cdp_metrics = True
+
+    def _drain_log(self) -> List[Dict[str, Any]]:
+        """CDP 성능 로그 읽기 (읽으면 비워짐, 미설정이면 빈 목록)"""
+        try:
+            return self.driver.get_log("performance")
+        except Exception:
+            return []
+
+    def begin(self):
+        """이동 직전 호출 - 이전 페이지의 로그를 비움"""
+        self._drain_log()
+
+    def _heap_size(self, fallback: Optional[float]) -> Optional[float]:
+        """JS 힙 사용량 (CDP Performance.getMetrics, 실패 시 performance.memory)"""
+        if self._cdp_metrics:
+            try:
+                self.driver.execute_cdp_cmd("Performance.enable", {})
+                result = self.driver.execute_cdp_cmd("Performance.getMetrics", {})
+                for metric in result.get("metrics", []):
+                    if metric.get("name") == "JSHeapUsedSize":
+                        return metric.get("value")
+            except Exception:
+                self._cdp_metrics = False
+        return fallback
+
+    def capture(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        현재 페이지 성능 수집 후 이력 파일에 추가
+
+        Returns:
+            기록 항목 (수집 실패 시 None)
+        """
+        try:
+            timing = self.driver.execute_script(_TIMING_SCRIPT) or {}
+        except Exception as e:
+            logger.debug(f"페이지 성능 수집 실패 ({url}): {e}")
+            return None
+
+        nav = timing.get("nav") or {}
+        resources = timing.get("resources") or []
+        network = summarize_network_log(self._drain_log(), self.top)
+
+        if not network["requests"]:
+            # CDP 로그가 없으면 Resource Timing으로 대신 집계 (문서 자체 포함)
+            network = {
+                "requests": len(resources) + 1,
+                "failed": 0,
+                "bytes": int(sum(r.get("bytes") or 0 for r in resources) + (nav.get("transferSize") or 0)),
+                "largest": [
+                    {"url": r.get("url"), "bytes": int(r.get("bytes") or 0)}
+                    for r in sorted(resources, key=lambda r: r.get("bytes") or 0, reverse=True)[:self.top]
+                ],
+            }
+
+        entry = {
+            "run_id": self.run_id,
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "page": page_key(url),
+            "url": url,
+            "ttfb_ms": _ms(nav.get("responseStart")),
+            "dom_content_loaded_ms": _ms(nav.get("domContentLoadedEventEnd")),
+            "load_ms": _ms(nav.get("loadEventEnd")),
+            "document_bytes": int(nav.get("transferSize") or 0),
+            "requests": network["requests"],
+            "failed_requests": network["failed"],
+            "bytes": network["bytes"],
+            "js_heap_bytes": self._heap_size(timing.get("heap")),
+            "slowest": [
+                {"url": r.get("url"), "ms": _ms(r.get("duration"))}
+                for r in sorted(resources, key=lambda r: r.get("duration") or 0, reverse=True)[:self.top]
+            ],
+            "largest": network["largest"],
+        }
+
+        try:
+            self.history_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.history_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.warning(f"페이지 성능 이력 기록 실패: {e}")
+
+        logger.info(
+            f"페이지 성능 {entry['page']}: load {entry['load_ms']}ms, "
+            f"요청 {entry['requests']}건, {entry['bytes'] / 1024:.0f}KB"
+        )
+        return entry
+
+
+def _ms(value: Any) -> Optional[float]:
+    """밀리초 값 정리 (0/없음은 None)"""
+    if not value:
+        return None
+    return round(float(value), 1)
+
+
+def load_history(path: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """이력 파일 로드 (손상된 줄은 건너뜀)"""
+    path = Path(path or NAV_PERF_CONFIG["history"])
+    entries = []
+    if not path.exists():
+        return entries
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+    return entries
+
+
+def _median(values: List[Any]) -> Optional[float]:
+    values = [v for v in values if v is not None]
+    return statistics.median(values) if values else None
+
+
+def _p95(values: List[Any]) -> Optional[float]:
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(round(0.95 * len(values) + 0.5)) - 1)]
+
+
+def build_report(entries: List[Dict[str, Any]], window: int = 5) -> List[Dict[str, Any]]:
+    """
+    페이지별 집계 (느린 순)
+
+    Args:
+        entries: 이력 항목 (기록 순서)
+        window: 추세 비교 구간 (최근 window건 중앙값 vs 그 이전 window건 중앙값)
+
+    Returns:
+        [{"page", "samples", "load_median", "load_p95", "load_last", "dcl_median",
+          "requests_median", "bytes_median", "heap_median", "trend_pct", "largest"}, ...]
+    """
+    by_page: Dict[str, List[Dict[str, Any]]] = {}
+    for entry in entries:
+        by_page.setdefault(entry.get("page", "?"), []).append(entry)
+
+    rows = []
+    for page, items in by_page.items():
+        loads = [e.get("load_ms") for e in items]
+        recent = _median(loads[-window:])
+        previous = _median(loads[-2 * window:-window])
+
+        rows.append({
+            "page": page,
+            "samples": len(items),
+            "load_median": _median(loads),
+            "load_p95": _p95(loads),
+            "load_last": loads[-1],
+            "dcl_median": _median([e.get("dom_content_loaded_ms") for e in items]),
+            "requests_median": _median([e.get("requests") for e in items]),
+            "bytes_median": _median([e.get("bytes") for e in items]),
+            "heap_median": _median([e.get("js_heap_bytes") for e in items]),
+            "trend_pct": (recent - previous) / previous * 100 if recent and previous else None,
+            "largest": items[-1].get("largest", []),
+        })
+
+    rows.sort(key=lambda r: r["load_median"] or 0, reverse=True)
+    return rows
+
+
+def format_report(rows: List[Dict[str, Any]], top: int = 10) -> str:
+    """보고서 텍스트"""
+    if not rows:
+        return "페이지 성능 이력이 없습니다. (python main.py --nav-perf 로 수집)"
+
+    def fmt(value, scale=1.0, digits=0):
+        return "-" if value is None else f"{value / scale:.{digits}f}"
+
+    lines = [
+        f"{'페이지':<42}{'건수':>5}{'load중앙':>9}{'p95':>8}{'최근':>8}{'DCL':>8}"
+        f"{'요청':>6}{'KB':>8}{'힙MB':>7}{'추세':>8}",
+    ]
+    for row in rows[:top]:
+        trend = "-" if row["trend_pct"] is None else f"{row['trend_pct']:+.0f}%"
+        lines.append(
+            f"{row['page'][-42:]:<42}{row['samples']:>5}{fmt(row['load_median']):>9}"
+            f"{fmt(row['load_p95']):>8}{fmt(row['load_last']):>8}{fmt(row['dcl_median']):>8}"
+            f"{fmt(row['requests_median']):>6}{fmt(row['bytes_median'], 1024):>8}"
+            f"{fmt(row['heap_median'], 1024 * 1024, 1):>7}{trend:>8}"
+        )
+
+    lines.append("")
+    lines.append("느린 페이지의 큰 리소스 (최근 기록)")
+    for row in rows[:3]:
+        lines.append(f"  {row['page']}")
+        for item in row["largest"][:3]:
+            lines.append(f"    {item['bytes'] / 1024:>8.1f}KB  {item['url']}")
+    return "\n".join(lines)
@@ -0,0 +1,358 @@
+"""
+알림 outbox 모듈
+잔디 메시지를 로컬 대기열(SQLite)에 먼저 기록하고 백그라운드 스레드에서 전송
+
+- 채널(웹훅 URL)별로 기록 순서대로 전송하며, 앞 메시지가 실패하면 뒤 메시지는 대기
+- 서로 다른 채널은 작은 스레드 풀에서 동시에 전송 (JANDI_CONFIG["workers"])
+- 실패한 메시지는 지수 백오프로 재시도하고, 실행 종료 후 남은 메시지는
+  다음 실행 또는 `main.py --flush-outbox`에서 다시 전송
+- 전송 전에 메시지를 선점(claimed_by/claimed_until)하여 같은 outbox를 여러 프로세스
+  (--serve와 --flush-outbox 등)가 처리해도 한 번만 전송 (선점한 프로세스가 죽으면 lease 후 다시 전송)
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Any, Optional, List, Tuple
+from uuid import uuid4
+
+import sys
+sys.path.append(str(__file__).rsplit('/', 2)[0])
+from config.settings import OUTBOX_CONFIG, JANDI_CONFIG
+from src.jandi_webhook import JandiWebhook
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_DEAD = "dead"
+
+
+class NotificationOutbox:
+    """잔디 메시지 전송 대기열"""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        webhook_factory: Callable[[str], JandiWebhook] = JandiWebhook,
+    ):
+        """
+        Args:
+            path: SQLite 파일 경로 (기본: OUTBOX_CONFIG["path"])
+            webhook_factory: 채널(웹훅 URL) -> JandiWebhook 생성 함수
+        """
+        self.path = Path(path or OUTBOX_CONFIG["path"])
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.webhook_factory = webhook_factory
+        self.max_attempts = OUTBOX_CONFIG["max_attempts"]
+        self.owner = f"{os.getpid()}-{uuid4().hex[:8]}"   # 선점 표시 (프로세스/인스턴스)
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._lock = threading.Lock()
+        self._progress = threading.Condition()   # 전송 결과 기록/idle 알림 (wait_for)
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._idle = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._webhooks: Dict[str, JandiWebhook] = {}
+
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    channel TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    claimed_by TEXT,
+                    claimed_until REAL NOT NULL DEFAULT 0
+                )
+            """)
+            # 선점 컬럼이 없던 이전 outbox.db
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(outbox)")}
+            if "claimed_by" not in columns:
+                self._conn.execute("ALTER TABLE outbox ADD COLUMN claimed_by TEXT")
+                self._conn.execute("ALTER TABLE outbox ADD COLUMN claimed_until REAL NOT NULL DEFAULT 0")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS outbox_channel ON outbox (channel, status, id)"
+            )
+
+    def enqueue(self, channel: str, payload: Dict[str, Any], kind: str = "message") -> int:
+        """
+        메시지를 대기열에 기록 (즉시 반환, 전송은 백그라운드)
+
+        Args:
+            channel: 잔디 웹훅 URL
+            payload: 잔디 v2 메시지
+            kind: 메시지 종류 (report, alert 등 - 로그용)
+
+        Returns:
+            메시지 ID
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO outbox (channel, kind, payload, created_at) VALUES (?, ?, ?, ?)",
+                (channel, kind, json.dumps(payload, ensure_ascii=False), time.time()),
+            )
+        self._idle.clear()
+        self._wakeup.set()
+        logger.debug(f"outbox 기록: {kind} #{cursor.lastrowid}")
+        return cursor.lastrowid
+
+    def pending_count(self) -> int:
+        """전송 대기 중인 메시지 수"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM outbox WHERE status = ?", (STATUS_PENDING,)
+            ).fetchone()
+        return row[0]
+
+    def wait_for(self, message_ids: List[int], timeout: Optional[float] = None) -> List[int]:
+        """
+        지정한 메시지가 전송될 때까지 대기 (다른 실행이 남긴 메시지는 기다리지 않음)
+
+        같은 채널 앞쪽 메시지가 재시도 대기 중이라 지금 보낼 수 없으면 timeout 전에 돌아온다.
+
+        Args:
+            message_ids: enqueue가 돌려준 메시지 ID
+            timeout: 최대 대기 시간 (초)
+
+        Returns:
+            전송되지 않은 메시지 ID (비어 있으면 모두 전송)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = self._remaining(message_ids)
+            if not remaining or self._thread is None:
+                return remaining
+            left = None if deadline is None else deadline - time.monotonic()
+            if self._idle.is_set() or (left is not None and left <= 0):
+                return remaining
+            with self._progress:
+                self._progress.wait(timeout=0.5 if left is None else min(left, 0.5))
+
+    def _remaining(self, message_ids: List[int]) -> List[int]:
+        """아직 outbox에 남은 메시지 ID (대기/전송 포기)"""
+        if not message_ids:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id FROM outbox WHERE id IN ({', '.join('?' * len(message_ids))}) ORDER BY id",
+                list(message_ids),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def _notify_progress(self):
+        with self._progress:
+            self._progress.notify_all()
+
+    def _claim(self, message_id: int) -> bool:
+        """전송 전 선점 (다른 프로세스/스레드가 전송 중이면 False)"""
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE outbox SET claimed_by = ?, claimed_until = ? "
+                "WHERE id = ? AND status = ? AND (claimed_by IS NULL OR claimed_until < ?)",
+                (self.owner, now + OUTBOX_CONFIG["claim_lease"], message_id, STATUS_PENDING, now),
+            )
+        return cursor.rowcount == 1
+
+    def _channel_heads(self, ignore_schedule: bool) -> List[Tuple]:
+        """채널별 가장 오래된 대기 메시지"""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT id, channel, kind, payload, attempts, next_attempt_at, claimed_by, claimed_until
+                FROM outbox
+                WHERE id IN (
+                    SELECT MIN(id) FROM outbox WHERE status = ? GROUP BY channel
+                )
+                ORDER BY id
+            """, (STATUS_PENDING,)).fetchall()
+
+        now = time.time()
+        return [row for row in rows if ignore_schedule or self._due_at(row) <= now]
+
+    def _due_at(self, row: Tuple) -> float:
+        """전송 가능 시각 (재시도 대기, 전송 중인 메시지는 선점 lease 만료)"""
+        if row[6]:
+            return max(row[5], row[7])
+        return row[5]
+
+    def _webhook(self, channel: str) -> JandiWebhook:
+        """채널별 JandiWebhook (HTTP 세션 재사용)"""
+        if channel not in self._webhooks:
+            self._webhooks[channel] = self.webhook_factory(channel)
+        return self._webhooks[channel]
+
+    def _deliver(self, row: Tuple) -> bool:
+        """메시지 1건 전송 및 결과 기록"""
+        message_id, channel, kind, payload, attempts = row[:5]
+        try:
+            ok = self._webhook(channel).post_payload(json.loads(payload), label=f"outbox {kind} #{message_id}")
+            error = None if ok else "전송 실패"
+        except Exception as e:
+            ok, error = False, str(e)
+
+        with self._lock, self._conn:
+            if ok:
+                self._conn.execute("DELETE FROM outbox WHERE id = ?", (message_id,))
+            else:
+                attempts += 1
+                if attempts >= self.max_attempts:
+                    self._conn.execute(
+                        "UPDATE outbox SET status = ?, attempts = ?, last_error = ?, claimed_by = NULL "
+                        "WHERE id = ?",
+                        (STATUS_DEAD, attempts, error, message_id),
+                    )
+                    logger.error(f"outbox {kind} #{message_id} 전송 포기 ({attempts}회 실패)")
+                else:
+                    backoff = min(
+                        OUTBOX_CONFIG["retry_backoff"] * (2 ** (attempts - 1)),
+                        OUTBOX_CONFIG["max_backoff"],
+                    )
+                    self._conn.execute(
+                        "UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ?, claimed_by = NULL "
+                        "WHERE id = ?",
+                        (attempts, time.time() + backoff, error, message_id),
+                    )
+                    logger.warning(f"outbox {kind} #{message_id} 전송 실패 - {backoff:.0f}초 후 재시도")
+        self._notify_progress()
+        return ok
+
+    def _channel_head(self, channel: str, ignore_schedule: bool) -> Optional[Tuple]:
+        """채널의 가장 오래된 대기 메시지 (재시도 대기 중이면 None)"""
+        with self._lock:
+            row = self._conn.execute("""
+                SELECT id, channel, kind, payload, attempts, next_attempt_at, claimed_by, claimed_until
+                FROM outbox
+                WHERE channel = ? AND status = ?
+                ORDER BY id LIMIT 1
+            """, (channel, STATUS_PENDING)).fetchone()
+
+        if row is None or (not ignore_schedule and row[5] > time.time()):
+            return None
+        if row[6] and row[7] > time.time():
+            return None  # 다른 프로세스/스레드가 전송 중 (순서 보장: 뒤 메시지도 보내지 않음)
+        return row
+
+    def _deliver_channel(self, channel: str, ignore_schedule: bool) -> Tuple[int, int]:
+        """채널 하나의 메시지를 순서대로 전송 (실패하면 해당 채널은 중단)"""
+        sent = 0
+        while not self._stop.is_set():
+            row = self._channel_head(channel, ignore_schedule)
+            if row is None:
+                return sent, 0
+            if not self._claim(row[0]):
+                logger.debug(f"outbox {row[2]} #{row[0]} 다른 프로세스/스레드가 전송 중")
+                return sent, 0
+            if not self._deliver(row):
+                # 순서 보장: 실패한 채널의 뒤 메시지는 이번 회차에서 보내지 않음
+                return sent, 1
+            sent += 1
+        return sent, 0
+
+    def deliver_pending(self, ignore_schedule: bool = False) -> Tuple[int, int]:
+        """
+        전송 가능한 메시지 전송 (채널 내 순서 유지, 채널 간 병렬)
+
+        Args:
+            ignore_schedule: True면 재시도 대기 시간을 무시하고 즉시 전송
+
+        Returns:
+            (성공 건수, 실패 건수)
+        """
+        channels = [row[1] for row in self._channel_heads(ignore_schedule)]
+        if not channels:
+            return 0, 0
+
+        workers = min(len(channels), JANDI_CONFIG["workers"])
+        if workers == 1:
+            results = [self._deliver_channel(channel, ignore_schedule) for channel in channels]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jandi-send") as pool:
+                results = list(pool.map(lambda c: self._deliver_channel(c, ignore_schedule), channels))
+
+        return sum(r[0] for r in results), sum(r[1] for r in results)
+
+    def _next_due_in(self) -> Optional[float]:
+        """다음 전송 가능 시점까지 남은 시간 (채널 맨 앞 메시지 기준, 없으면 None)"""
+        heads = self._channel_heads(ignore_schedule=True)
+        if not heads:
+            return None
+        return max(min(self._due_at(row) for row in heads) - time.time(), 0)
+
+    def _run(self):
+        """백그라운드 전송 루프"""
+        while not self._stop.is_set():
+            self._wakeup.clear()
+            try:
+                self.deliver_pending()
+            except Exception as e:
+                logger.error(f"outbox 전송 루프 오류: {e}")
+
+            # 지금 보낼 수 있는 메시지가 없으면 idle (재시도 대기 중인 메시지는 나중에)
+            due_in = self._next_due_in()
+            if due_in is None or due_in > 0:
+                self._idle.set()
+                if self._wakeup.is_set():
+                    self._idle.clear()
+                self._notify_progress()
+            self._wakeup.wait(timeout=due_in)
+
+    def start(self):
+        """백그라운드 전송 시작 (이전 실행에서 남은 메시지 포함)"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="jandi-outbox", daemon=True)
+            self._thread.start()
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        지금 보낼 수 있는 메시지를 모두 처리할 때까지 대기
+
+        Args:
+            timeout: 최대 대기 시간 (초)
+
+        Returns:
+            bool: 모두 전송되었는지 여부
+        """
+        if self._thread is None:
+            return self.pending_count() == 0
+        self._idle.wait(timeout=timeout)
+        return self.pending_count() == 0
+
+    def close(self, timeout: Optional[float] = None) -> int:
+        """
+        전송 완료를 최대 timeout초 기다린 뒤 종료
+
+        Returns:
+            남은 메시지 수 (다음 실행에서 재전송)
+        """
+        if timeout is None:
+            timeout = OUTBOX_CONFIG["drain_timeout"]
+        self.drain(timeout)
+
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread:
+            # 전송 중인 메시지의 결과 기록이 끝날 때까지 대기 (요청 timeout으로 제한됨).
+            # 먼저 DB를 닫으면 선점이 풀리지 않아 lease 만료 후 같은 메시지가 재전송된다.
+            self._thread.join()
+            self._thread = None
+
+        remaining = self.pending_count()
+        if remaining:
+            logger.warning(f"outbox 미전송 메시지 {remaining}건 - 다음 실행 또는 --flush-outbox에서 재전송")
+
+        for webhook in self._webhooks.values():
+            webhook.close()
+        with self._lock:
+            self._conn.close()
+        return remaining
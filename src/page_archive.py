@@ -0,0 +1,251 @@
+"""
+수집 페이지 원본 보관 모듈 (선택, PAGE_ARCHIVE=1)
+
+파싱 후 버리던 페이지 HTML을 압축하여 내용 해시(SHA-256)로 보관한다.
+- objects/<해시 앞 2자리>/<해시>.<zst|gz>: 같은 내용은 한 번만 저장 (바뀌지 않은 페이지는 색인 한 행만 추가)
+- index.db: 사이트/URL/페이지/수집 시각 -> 해시 색인 (SQLite)
+- 압축: zstandard 설치 시 zstd, 없으면 gzip (PAGE_ARCHIVE_CODEC으로 지정 가능)
+- 추출 로직 수정 후 scripts/reparse_pages.py로 재수집 없이 다시 추출
+"""
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+from urllib.parse import urlparse
+
+import sys
+sys.path.append(str(__file__).rsplit('/', 2)[0])
+from config.settings import HEVITON_CONFIG, PAGE_ARCHIVE_CONFIG
+from src.metrics import incr
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성 (없으면 gzip)
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONS = {"zstd": "zst", "gzip": "gz"}
+
+
+def default_codec() -> str:
+    codec = PAGE_ARCHIVE_CONFIG["codec"] or ("zstd" if zstandard is not None else "gzip")
+    if codec not in EXTENSIONS:
+        raise ValueError(f"알 수 없는 압축 방식: {codec}")
+    if codec == "zstd" and zstandard is None:
+        logger.warning("zstandard 미설치 - gzip으로 보관")
+        return "gzip"
+    return codec
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    level = PAGE_ARCHIVE_CONFIG["level"][codec]
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd로 보관된 페이지를 읽으려면 zstandard가 필요합니다 (pip install zstandard)")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def page_name(url: str) -> str:
+    """URL -> 페이지 파일명 (예: statistics.do)"""
+    return urlparse(url).path.rsplit("/", 1)[-1]
+
+
+@dataclass(frozen=True, slots=True)
+class ArchiveEntry:
+    """보관 페이지 색인 한 행"""
+    id: int
+    site: str
+    url: str
+    page: str
+    fetched_at: str
+    sha256: str
+    codec: str
+    size: int          # 원본 크기 (bytes)
+    stored_size: int   # 압축 크기 (bytes, 중복이면 처음 저장한 크기)
+
+
+class PageArchive:
+    """내용 해시 기준 페이지 보관소 (여러 스레드에서 put 가능)"""
+
+    def __init__(self, root: Optional[Path] = None, codec: Optional[str] = None):
+        """
+        Args:
+            root: 보관 디렉토리 (기본: PAGE_ARCHIVE_DIR)
+            codec: "zstd" 또는 "gzip" (기본: zstandard 설치 여부로 결정)
+        """
+        self.root = Path(root or PAGE_ARCHIVE_CONFIG["dir"])
+        self.codec = codec or default_codec()
+        self.objects = self.root / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.root / "index.db"), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, site TEXT NOT NULL, url TEXT NOT NULL, "
+                "page TEXT NOT NULL, fetched_at TEXT NOT NULL, sha256 TEXT NOT NULL, codec TEXT NOT NULL, "
+                "size INTEGER NOT NULL, stored_size INTEGER NOT NULL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS pages_lookup ON pages (site, page, fetched_at)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS pages_sha256 ON pages (sha256)")
+
+    def object_path(self, sha256: str, codec: str) -> Path:
+        return self.objects / sha256[:2] / f"{sha256}.{EXTENSIONS[codec]}"
+
+    def _stored(self, sha256: str) -> Optional[sqlite3.Row]:
+        """이미 보관한 내용이면 (codec, stored_size)"""
+        return self.conn.execute(
+            "SELECT codec, stored_size FROM pages WHERE sha256 = ? LIMIT 1", (sha256,)
+        ).fetchone()
+
+    def put(self, url: str, page_source: str, site: Optional[str] = None,
+            fetched_at: Optional[str] = None) -> str:
+        """
+        페이지 보관 (같은 내용이 있으면 색인만 추가)
+
+        Returns:
+            내용 해시 (SHA-256 hex)
+        """
+        data = page_source.encode("utf-8")
+        sha256 = hashlib.sha256(data).hexdigest()
+        site = HEVITON_CONFIG["site_id"] if site is None else site
+        fetched_at = fetched_at or datetime.now().isoformat(timespec="seconds")
+
+        with self._lock:
+            stored = self._stored(sha256)
+            if stored is not None and self.object_path(sha256, stored["codec"]).exists():
+                codec, stored_size = stored["codec"], stored["stored_size"]
+                incr("archive_dedup_pages")
+            else:
+                codec = self.codec
+                blob = compress(data, codec)
+                path = self.object_path(sha256, codec)
+                path.parent.mkdir(exist_ok=True)
+                # 임시 파일에 쓴 뒤 이름 변경 (중단되어도 깨진 객체가 남지 않도록)
+                tmp = path.with_suffix(path.suffix + ".tmp")
+                tmp.write_bytes(blob)
+                os.replace(tmp, path)
+                stored_size = len(blob)
+                incr("archive_stored_bytes", stored_size)
+
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO pages (site, url, page, fetched_at, sha256, codec, size, stored_size) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (site, url, page_name(url), fetched_at, sha256, codec, len(data), stored_size),
+                )
+        incr("archive_pages", page=page_name(url))
+        return sha256
+
+    def get(self, sha256: str) -> str:
+        """해시 -> 페이지 HTML"""
+        with self._lock:
+            stored = self._stored(sha256)
+        if stored is None:
+            raise KeyError(sha256)
+        return load_page(self.root, sha256, stored["codec"])
+
+    def entries(self, page: Optional[str] = None, site: Optional[str] = None,
+                since: Optional[str] = None, until: Optional[str] = None) -> List[ArchiveEntry]:
+        """
+        색인 조회 (수집 시각순)
+
+        Args:
+            page: 페이지 파일명 (예: statistics.do)
+            site: 사이트 식별자
+            since/until: 수집 시각 범위 (ISO 문자열 앞부분 비교, 예: "2026-01" ~ "2026-03-31")
+        """
+        clauses, params = [], []
+        for column, value in (("page", page), ("site", site)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            clauses.append("fetched_at >= ?")
+            params.append(since)
+        if until:
+            # 날짜만 지정하면 그 날 끝까지
+            clauses.append("fetched_at <= ?")
+            params.append(until + "~")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        cursor = self.conn.execute(f"SELECT * FROM pages {where} ORDER BY fetched_at, id", params)
+        return [ArchiveEntry(**dict(row)) for row in cursor]
+
+    def stats(self) -> Dict[str, Any]:
+        """보관 현황 (페이지 수, 고유 객체 수, 원본/압축 크기)"""
+        row = self.conn.execute(
+            "SELECT COUNT(*) AS pages, COUNT(DISTINCT sha256) AS objects, COALESCE(SUM(size), 0) AS raw_bytes "
+            "FROM pages"
+        ).fetchone()
+        stored = self.conn.execute(
+            "SELECT COALESCE(SUM(stored_size), 0) FROM (SELECT MAX(stored_size) AS stored_size "
+            "FROM pages GROUP BY sha256)"
+        ).fetchone()[0]
+        return {**dict(row), "stored_bytes": stored}
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_page(root: Path, sha256: str, codec: str) -> str:
+    """보관 객체 -> 페이지 HTML (프로세스 풀 작업 단위, 색인 DB를 열지 않음)"""
+    path = Path(root) / "objects" / sha256[:2] / f"{sha256}.{EXTENSIONS[codec]}"
+    return decompress(path.read_bytes(), codec).decode("utf-8")
+
+
+_archive: Optional[PageArchive] = None
+_archive_lock = threading.Lock()
+
+
+def get_archive() -> Optional[PageArchive]:
+    """설정에서 켠 경우 공용 보관소 (꺼져 있으면 None)"""
+    global _archive
+    if not PAGE_ARCHIVE_CONFIG["enabled"]:
+        return None
+    with _archive_lock:
+        if _archive is None:
+            _archive = PageArchive()
+        return _archive
+
+
+def archive_page(url: str, page_source: str, site: Optional[str] = None):
+    """수집한 페이지 보관 (설정에서 켠 경우만, 실패해도 수집은 계속)"""
+    archive = get_archive()
+    if archive is None:
+        return
+    try:
+        archive.put(url, page_source, site)
+    except Exception as e:
+        logger.warning(f"페이지 보관 실패 ({page_name(url)}): {e}")
+        incr("archive_errors")
+
+
+# 테스트용 (보관 현황)
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    with PageArchive() as archive:
+        print(archive.codec, archive.stats())
+        for entry in archive.entries()[-10:]:
+            print(entry.fetched_at, entry.page, entry.sha256[:12], entry.size, entry.stored_size)
@@ -0,0 +1,210 @@
+"""
+페이지 HTML 파서 모듈
+
+드라이버/저장소에 의존하지 않는 순수 함수만 둔다 (프로세스 풀에서 병렬 파싱, 저장한 페이지 재파싱용).
+입력은 페이지 소스 문자열(이미 파싱한 soup를 함께 넘기면 재사용), 출력은 화면 문자열 dict 또는
+src/models.py 모델이다. 브라우저에서 스크립트로 읽는 값(표시 여부 등)은 HevitonScraper에 남는다.
+"""
+import json
+import logging
+import re
+from datetime import date, datetime
+from typing import Dict, Any, Callable, Optional, List
+
+from bs4 import BeautifulSoup
+
+import sys
+sys.path.append(str(__file__).rsplit('/', 2)[0])
+from src.models import DailyPoint
+
+logger = logging.getLogger(__name__)
+
+# 설비상태 페이지의 실제 이상 메시지 (단순 UI 텍스트 제외)
+ERROR_KEYWORDS = ["에러 발생", "통신 오류", "통신 이상", "장애 발생", "고장"]
+
+# 이력 페이지 차트 데이터 스크립트 변수
+_CHART_VARIABLE = re.compile(r"\b(?:chartData|dayData|dailyData)\s*=\s*(\[.*?\])\s*;", re.S)
+
+
+def _soup(page_source: str, soup: Optional[BeautifulSoup] = None) -> BeautifulSoup:
+    return soup if soup is not None else BeautifulSoup(page_source, 'lxml')
+
+
+def parse_monitoring_page(page_source: str, soup: Optional[BeautifulSoup] = None) -> Dict[str, Optional[str]]:
+    """
+    모니터링 페이지 카운터 (.now/.today/.month/.accrue 안의 .num)
+
+    Returns:
+        {"current_power", "today_generation", "month_generation", "total_generation"} (화면 문자열, 없으면 None)
+    """
+    soup = _soup(page_source, soup)
+    data = {
+        "current_power": None,      # 현재 발전량 (W)
+        "today_generation": None,   # 오늘 발전량 (kWh)
+        "month_generation": None,   # 이번달 발전량 (kWh)
+        "total_generation": None,   # 누적 발전량 (MWh)
+    }
+    for elem in soup.find_all(class_='num'):
+        text = elem.get_text(strip=True)
+        if text:
+            logger.debug(f"발견된 값: {text}")
+
+    fields = {"now": "current_power", "today": "today_generation",
+              "month": "month_generation", "accrue": "total_generation"}
+    for section in soup.find_all(class_=list(fields)):
+        num = section.find(class_='num')
+        if not num:
+            continue
+        section_class = section.get('class', [])
+        for css, field in fields.items():
+            if css in section_class:
+                data[field] = num.get_text(strip=True)
+                break
+    return data
+
+
+def parse_converter_page(page_source: str, soup: Optional[BeautifulSoup] = None) -> Dict[str, Any]:
+    """
+    설비상태 페이지 컨버터 목록 + 이상 메시지 (HTML 기준, 요소 표시 여부는 확인하지 않음)
+
+    Returns:
+        {"is_normal", "converters": [{"name", "status"}], "error_messages"}
+    """
+    soup = _soup(page_source, soup)
+    status_data = {"is_normal": True, "converters": [], "error_messages": []}
+
+    for section in soup.find_all(class_=['converter', 'device_box', 'inverter_box']):
+        name = section.find(class_=['name', 'title', 'device_name'])
+        status = section.find(class_=['status', 'state'])
+        if name:
+            status_data["converters"].append({
+                "name": name.get_text(strip=True),
+                "status": "정상" if status and "error" not in str(status.get('class', [])) else "확인필요",
+            })
+
+    for keyword in ERROR_KEYWORDS:
+        if keyword in page_source:
+            status_data["is_normal"] = False
+            status_data["error_messages"].append(keyword)
+            break
+    return status_data
+
+
+def parse_history_page(page_source: str) -> List[Dict[str, Any]]:
+    """이력 페이지 인라인 스크립트의 차트 데이터 (chartData/dayData/dailyData 배열, 없으면 [])"""
+    for match in _CHART_VARIABLE.finditer(page_source):
+        try:
+            items = json.loads(match.group(1))
+        except ValueError:
+            continue
+        if isinstance(items, list):
+            return [item for item in items if isinstance(item, dict)]
+    return []
+
+
+def parse_statistics_table(page_source: str) -> List[Dict[str, str]]:
+    """
+    통계 페이지 일별 표 -> [{"date", "generation"}, ...] (화면 문자열)
+
+    "기간"과 "발전량" 헤더가 있는 첫 표에서 YYYY.MM.DD 행만 읽는다 (합계 행 제외).
+    """
+    soup = BeautifulSoup(page_source, 'lxml')
+    for table in soup.find_all('table'):
+        rows = table.find_all('tr')
+        if not rows:
+            continue
+        header = rows[0].get_text(strip=True)
+        if '기간' not in header or '발전량' not in header:
+            continue
+
+        raw_rows = []
+        for row in rows[1:]:
+            cols = row.find_all(['td', 'th'])
+            if len(cols) < 2:
+                continue
+            date_text = cols[0].get_text(strip=True)
+            value_text = cols[1].get_text(strip=True)
+            if date_text and value_text and '.' in date_text and '합계' not in date_text and '기간' not in date_text:
+                raw_rows.append({"date": date_text, "generation": value_text})
+        return raw_rows
+    return []
+
+
+def parse_daily_page(page_source: str, start: Optional[date] = None,
+                     end: Optional[date] = None) -> List[DailyPoint]:
+    """
+    통계 페이지 -> 기간 안의 DailyPoint (날짜순, 프로세스 풀 작업 단위)
+
+    페이지가 기간 파라미터를 무시하고 더 많은 날을 보여줘도 start~end만 남긴다.
+    """
+    points = DailyPoint.parse_all(parse_statistics_table(page_source), "statistics.daily")
+    return sorted(
+        (p for p in points if (start is None or p.day >= start) and (end is None or p.day <= end)),
+        key=lambda p: p.day,
+    )
+
+
+def parse_recent_daily(page_source: str, days: int = 5, today: Optional[datetime] = None,
+                       soup: Optional[BeautifulSoup] = None) -> List[Dict[str, str]]:
+    """
+    통계 페이지 일별 표 -> 최근 N일 [{"date": "MM/DD", "generation"}, ...] (오래된 순)
+
+    "YYYY.MM.DD"와 "MM/DD" 행을 모두 받고, 연말/연초는 today 기준으로 정렬한다.
+    """
+    soup = _soup(page_source, soup)
+    for table in soup.find_all('table'):
+        rows = table.find_all('tr')
+        # 헤더 확인: "기간"과 "총발전량" 컬럼이 있는 테이블 찾기
+        if not rows:
+            continue
+        header = rows[0].get_text(strip=True)
+        if '기간' not in header or '발전량' not in header:
+            continue
+
+        all_data = []
+        for row in rows[1:]:  # 헤더 제외한 모든 행
+            cols = row.find_all(['td', 'th'])
+            if len(cols) < 2:
+                continue
+            date_text = cols[0].get_text(strip=True)
+            value_text = cols[1].get_text(strip=True)
+            # "합계", "기간" 등 헤더/푸터 행 제외
+            if not (date_text and value_text and ('.' in date_text or '/' in date_text)):
+                continue
+            if '합계' in date_text or '기간' in date_text:
+                continue
+            # 날짜를 MM/DD 형식으로 변환
+            if '.' in date_text:
+                parts = date_text.split('.')
+                if len(parts) >= 3:
+                    date_text = f"{parts[1]}/{parts[2]}"
+            all_data.append({"date": date_text, "generation": value_text})
+
+        # 날짜 기준 정렬 후 최근 N일 추출 (MM/DD 형식, 연말/연초 처리)
+        today = today or datetime.now()
+
+        def parse_date_to_comparable(item):
+            try:
+                month, day = (int(part) for part in item["date"].split("/")[:2])
+            except ValueError:
+                return (0, 0, 0)
+            # 연말에 1월 데이터가 있으면 다음 해로 처리
+            year = today.year
+            if today.month == 12 and month == 1:
+                year += 1
+            elif today.month == 1 and month == 12:
+                year -= 1
+            return (year, month, day)
+
+        all_data.sort(key=parse_date_to_comparable)
+        return all_data[-days:]
+    return []
+
+
+# 보관 페이지 재파싱용 추출기 (페이지 파일명 -> 페이지 소스를 받는 함수, 결과는 JSON 직렬화 가능)
+EXTRACTORS: Dict[str, Callable[[str], Any]] = {
+    "monitoring.do": parse_monitoring_page,
+    "inverter.do": parse_converter_page,
+    "history.do": parse_history_page,
+    "statistics.do": parse_statistics_table,
+}
@@ -0,0 +1,133 @@
+"""
+수집 후 저장/전송 단계(sink) 동시 실행 모듈
+
+수집한 스냅샷 하나를 잔디, Google Sheets, 로컬 저장소 등 여러 sink에 동시에 전달한다.
+- 단계마다 별도 스레드에서 스냅샷 사본을 받아 실행 (다른 단계의 지연/실패와 무관)
+- 단계별 타임아웃: 시간 안에 끝나지 않은 단계는 timeout으로 보고하고 기다리지 않음
+- 단계별 결과(SinkResult)를 모아 종료 코드 결정
+"""
+import copy
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Any, Optional, List
+
+import sys
+sys.path.append(str(__file__).rsplit('/', 2)[0])
+from config.settings import PIPELINE_CONFIG
+from src.metrics import span
+
+logger = logging.getLogger(__name__)
+
+STATUS_OK = "ok"
+STATUS_SKIPPED = "skipped"
+STATUS_FAILED = "failed"
+STATUS_TIMEOUT = "timeout"
+
+
+class SinkSkipped(Exception):
+    """sink 미설정 등으로 단계를 건너뜀 (실패로 보지 않음)"""
+
+
+@dataclass
+class SinkResult:
+    """단계 실행 결과"""
+    name: str
+    status: str
+    elapsed: float
+    detail: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status in (STATUS_OK, STATUS_SKIPPED)
+
+    def summary(self) -> str:
+        text = f"{self.name}: {self.status} ({self.elapsed:.2f}초)"
+        return f"{text} - {self.detail}" if self.detail else text
+
+
+@dataclass
+class SinkStage:
+    """
+    저장/전송 단계
+
+    func는 스냅샷을 받아 결과 설명(문자열 또는 None)을 반환한다.
+    실패는 예외(또는 False 반환), 건너뜀은 SinkSkipped로 알린다.
+    """
+    name: str
+    func: Callable[[Dict[str, Any]], Any]
+    timeout: Optional[float] = None
+
+    def __post_init__(self):
+        if self.timeout is None:
+            self.timeout = PIPELINE_CONFIG["timeouts"].get(self.name, 30)
+
+    def run(self, snapshot: Dict[str, Any]) -> SinkResult:
+        """단계 실행 (예외를 결과로 변환)"""
+        started = time.monotonic()
+        # 라벨 이름 stage는 Prometheus 출력에서 span 이름에 쓰이므로 sink로 구분
+        with span("sink", sink=self.name) as current:
+            try:
+                outcome = self.func(snapshot)
+                if outcome is False:
+                    status, detail = STATUS_FAILED, "실패 반환"
+                else:
+                    status, detail = STATUS_OK, "" if outcome in (None, True) else str(outcome)
+            except SinkSkipped as e:
+                status, detail = STATUS_SKIPPED, str(e)
+            except Exception as e:
+                logger.exception(f"{self.name} 단계 오류: {e}")
+                status, detail = STATUS_FAILED, str(e)
+            if status == STATUS_FAILED:
+                current.fail(detail)
+        return SinkResult(self.name, status, time.monotonic() - started, detail)
+
+
+def run_sinks(stages: List[SinkStage], snapshot: Dict[str, Any]) -> List[SinkResult]:
+    """
+    모든 단계를 동시에 실행하고 단계별 타임아웃까지 결과 수집
+
+    시간 안에 끝나지 않은 단계의 스레드는 데몬으로 남겨 두고(프로세스 종료 시 정리)
+    timeout 결과를 보고한다.
+
+    Args:
+        stages: 실행할 단계 목록
+        snapshot: 수집 데이터 (단계마다 사본 전달)
+
+    Returns:
+        단계별 결과 (입력 순서)
+    """
+    results: Dict[str, SinkResult] = {}
+    threads = []
+    started = time.monotonic()
+
+    for stage in stages:
+        stage_snapshot = copy.deepcopy(snapshot)
+
+        def target(stage=stage, stage_snapshot=stage_snapshot):
+            results[stage.name] = stage.run(stage_snapshot)
+
+        thread = threading.Thread(target=target, name=f"sink-{stage.name}", daemon=True)
+        thread.start()
+        threads.append((stage, thread))
+
+    ordered = []
+    for stage, thread in threads:
+        thread.join(timeout=max(started + stage.timeout - time.monotonic(), 0))
+        result = results.get(stage.name)
+        if result is None:
+            result = SinkResult(stage.name, STATUS_TIMEOUT, time.monotonic() - started,
+                                f"{stage.timeout:g}초 초과")
+            logger.warning(f"{stage.name} 단계 시간 초과 ({stage.timeout:g}초) - 결과를 기다리지 않음")
+        ordered.append(result)
+
+    for result in ordered:
+        log = logger.info if result.ok else logger.warning
+        log(f"sink {result.summary()}")
+    return ordered
+
+
+def exit_code(results: List[SinkResult]) -> int:
+    """단계 결과 -> 종료 코드 (모두 성공/건너뜀이면 0)"""
+    return 0 if all(r.ok for r in results) else 1
@@ -0,0 +1,156 @@
+"""
+실행 프로파일링 모듈 (--profile)
+
+작업 전체를 cProfile로 실행하고, 단계 경계(checkpoint)마다 tracemalloc 스냅샷을 찍어
+상위 메모리 할당 위치와 직전 단계 대비 증가분을 기록한다.
+결과는 실행 ID별로 LOGS_DIR에 저장하여 실행 간 비교할 수 있다.
+- profile_<run_id>.pstats: cProfile 원본 (python -m pstats, snakeviz 등으로 확인)
+- profile_<run_id>.txt: 누적 시간 상위 함수 + 단계별 메모리 할당 상위 위치
+
+cProfile은 호출한 스레드(메인 스레드)만 측정한다. 수집/파싱은 메인 스레드에서 실행되며,
+sink 단계(스레드)의 시간은 실행 지표(metrics)의 span으로 확인한다.
+"""
+import cProfile
+import io
+import logging
+import pstats
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Optional, List, Tuple
+
+import sys
+sys.path.append(str(__file__).rsplit('/', 2)[0])
+from config.settings import PROFILE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# 현재 실행 중인 프로파일러 (checkpoint()에서 사용, 없으면 아무 일도 하지 않음)
+_active: Optional["RunProfiler"] = None
+
+
+class RunProfiler:
+    """cProfile + tracemalloc 실행 프로파일러"""
+
+    def __init__(self, run_id: str, name: str = "run", output_dir: Optional[Path] = None):
+        """
+        Args:
+            run_id: 실행 ID (파일 이름에 사용)
+            name: 작업 이름 (보고서 제목)
+            output_dir: 결과 디렉토리 (기본: PROFILE_CONFIG["dir"])
+        """
+        self.run_id = run_id
+        self.name = name
+        self.output_dir = Path(output_dir or PROFILE_CONFIG["dir"])
+        self.top = PROFILE_CONFIG["top"]
+        self.profile = cProfile.Profile()
+        self._snapshots: List[Tuple[str, float, tracemalloc.Snapshot]] = []
+        self._started = 0.0
+
+    def start(self):
+        """프로파일링 시작"""
+        global _active
+
+        tracemalloc.start(PROFILE_CONFIG["frames"])
+        self._started = time.perf_counter()
+        self.checkpoint("start")
+        _active = self
+        self.profile.enable()
+
+    def checkpoint(self, label: str):
+        """단계 경계 메모리 스냅샷 (프로파일 측정에서 제외)"""
+        self.profile.disable()
+        try:
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            ))
+            self._snapshots.append((label, time.perf_counter() - self._started, snapshot))
+        finally:
+            if _active is self:
+                self.profile.enable()
+
+    def stop(self) -> Tuple[Path, Path]:
+        """
+        프로파일링 종료 및 보고서 저장
+
+        Returns:
+            (pstats 파일, 텍스트 보고서)
+        """
+        global _active
+
+        self.profile.disable()
+        _active = None
+        self.checkpoint("end")
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stats_path = self.output_dir / f"profile_{self.run_id}.pstats"
+        report_path = self.output_dir / f"profile_{self.run_id}.txt"
+
+        self.profile.dump_stats(str(stats_path))
+        with open(report_path, "w", encoding="utf-8") as f:
+            f.write(self._format_report(peak))
+
+        logger.info(f"프로파일 저장: {stats_path}, {report_path}")
+        return stats_path, report_path
+
+    def _format_report(self, peak: int) -> str:
+        """텍스트 보고서 (CPU 상위 함수 + 단계별 메모리)"""
+        out = io.StringIO()
+        out.write(f"# {self.name} 프로파일 (실행 ID: {self.run_id})\n")
+        out.write(f"# tracemalloc 최대 사용량: {peak / 1024 / 1024:.1f} MB\n\n")
+
+        out.write(f"## 누적 시간 상위 {self.top}개 함수\n")
+        stats = pstats.Stats(self.profile, stream=out)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(self.top)
+
+        out.write(f"## 자체 시간 상위 {self.top}개 함수\n")
+        stats.sort_stats("tottime").print_stats(self.top)
+
+        previous = None
+        for label, elapsed, snapshot in self._snapshots:
+            total = sum(stat.size for stat in snapshot.statistics("filename"))
+            out.write(f"## 단계 '{label}' ({elapsed:.2f}초, 추적 메모리 {total / 1024 / 1024:.1f} MB)\n")
+
+            out.write(f"### 할당 상위 {self.top}개 위치\n")
+            for stat in snapshot.statistics("lineno")[:self.top]:
+                out.write(f"  {stat.size / 1024:>10.1f} KB  {stat.count:>8}개  {stat.traceback[0]}\n")
+
+            if previous is not None:
+                out.write(f"### 직전 단계 대비 증가 상위 {self.top}개 위치\n")
+                for stat in snapshot.compare_to(previous, "lineno")[:self.top]:
+                    out.write(f"  {stat.size_diff / 1024:>+10.1f} KB  {stat.count_diff:>+8}개  {stat.traceback[0]}\n")
+            out.write("\n")
+            previous = snapshot
+
+        return out.getvalue()
+
+
+def checkpoint(label: str):
+    """단계 경계 표시 (--profile 실행 중일 때만 스냅샷)"""
+    if _active is not None:
+        _active.checkpoint(label)
+
+
+def run_profiled(func, run_id: str, name: str, *args, **kwargs):
+    """
+    함수를 프로파일링하며 실행
+
+    Args:
+        func: 실행할 작업
+        run_id: 실행 ID
+        name: 작업 이름
+
+    Returns:
+        func의 반환값
+    """
+    profiler = RunProfiler(run_id, name)
+    profiler.start()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        stats_path, report_path = profiler.stop()
+        print(f"프로파일: {report_path} (원본: {stats_path})")
@@ -0,0 +1,320 @@
+"""
+로컬 저장소 <-> Google Sheets 정합성 검사 및 최소 차분 동기화
+
+시트 전체를 내려받지 않고 구간(일별: 월, 주별/월별: 년)마다 필요한 행만 내려받는다.
+- 키 컬럼(A)만 내려받아 구간별 시트 키 목록을 로컬 키와 비교 (빠진 행, 지운 행, 중복 추가된 행)
+- 로컬 구간 다이제스트를 마지막 동기화 때 기록한 다이제스트(LocalStore.sheet_digests)와 비교
+  (로컬 기록이 바뀐 구간)
+- 둘 중 하나라도 다르면 그 구간의 행만 내려받아 실제 시트 내용으로 다이제스트를 다시 계산하고,
+  다르면 셀 단위 차분을 한 번의 values.batchUpdate로 반영
+- 시트에서 키는 그대로 두고 값만 직접 고친 경우는 full=True(--reconcile --full)로 전체를 내려받아야 검출된다
+- 시트에만 있는 키와 중복 키는 보고만 하고 고치지 않는다 (어느 행이 맞는지 알 수 없음)
+
+API 호출 수 (시트 생성 제외):
+    1. spreadsheets.get            - 시트 존재 확인
+    2. values.batchGet             - 각 시트 키 컬럼
+    3. values.batchGet (필요 시)    - 불일치 의심 구간의 비교 대상 컬럼
+    4. values.batchUpdate (필요 시) - 변경 셀 + 빠진 행 추가
+"""
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from src.google_sheets import (
+    GoogleSheetsClient,
+    SHEET_DAILY,
+    SHEET_WEEKLY,
+    SHEET_MONTHLY,
+    daily_row,
+    weekly_row,
+    monthly_row,
+)
+from src.local_store import LocalStore
+
+logger = logging.getLogger(__name__)
+
+COLUMN_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+@dataclass
+class SheetSpec:
+    """시트별 동기화 규칙"""
+    name: str
+    width: int                              # 전체 컬럼 수
+    compared: int                           # 비교 대상 컬럼 수 (기록시간 제외)
+    to_row: Callable[[Dict[str, Any]], List[Any]]
+    load: Callable[[LocalStore], List[Dict[str, Any]]]
+    bucket: Callable[[str], str]            # 키 -> 구간
+
+
+SHEET_SPECS = {
+    SHEET_DAILY: SheetSpec(
+        SHEET_DAILY, 5, 4, daily_row, LocalStore.get_daily,
+        bucket=lambda key: key[:7],         # YYYY-MM
+    ),
+    SHEET_WEEKLY: SheetSpec(
+        SHEET_WEEKLY, 5, 4, weekly_row, LocalStore.get_weekly,
+        bucket=lambda key: key[:4],         # "2024년 52주차" -> 2024
+    ),
+    SHEET_MONTHLY: SheetSpec(
+        SHEET_MONTHLY, 4, 3, monthly_row, LocalStore.get_monthly,
+        bucket=lambda key: key[:4],         # YYYY-MM -> YYYY
+    ),
+}
+
+
+@dataclass
+class ReconcileReport:
+    """정합성 검사 결과"""
+    buckets_checked: int = 0
+    buckets_fetched: int = 0                # 행을 내려받은 구간 수
+    rows_fetched: int = 0
+    buckets_changed: List[Tuple[str, str]] = field(default_factory=list)
+    cells_updated: int = 0
+    rows_appended: int = 0
+    sheet_only_keys: List[Tuple[str, str]] = field(default_factory=list)
+    duplicate_keys: List[Tuple[str, str, List[int]]] = field(default_factory=list)  # (시트, 키, 행 번호들)
+    api_calls: int = 0
+
+    def summary(self) -> str:
+        return (f"구간 {self.buckets_checked}개 검사 (내려받음 {self.buckets_fetched}개, {self.rows_fetched}행), "
+                f"불일치 {len(self.buckets_changed)}개, "
+                f"셀 {self.cells_updated}개 갱신, 행 {self.rows_appended}개 추가, "
+                f"시트에만 있는 키 {len(self.sheet_only_keys)}개, 중복 키 {len(self.duplicate_keys)}개, "
+                f"API 호출 {self.api_calls}회")
+
+
+def _normalize(value: Any) -> str:
+    """비교용 셀 문자열"""
+    return "" if value is None else str(value).strip()
+
+
+def compute_digest(rows: List[List[Any]], compared: int) -> str:
+    """행 목록의 다이제스트 (키 순 정렬, 비교 대상 컬럼만)"""
+    h = hashlib.sha256()
+    for row in sorted(rows, key=lambda r: _normalize(r[0])):
+        cells = [_normalize(row[i]) if i < len(row) else "" for i in range(compared)]
+        h.update("\x1f".join(cells).encode("utf-8"))
+        h.update(b"\x1e")
+    return h.hexdigest()[:16]
+
+
+def _column(index: int) -> str:
+    return COLUMN_LETTERS[index]
+
+
+def _contiguous_runs(numbers: List[int]) -> List[Tuple[int, int]]:
+    """정렬된 행 번호를 연속 구간으로 묶음"""
+    runs = []
+    for n in sorted(numbers):
+        if runs and runs[-1][1] == n - 1:
+            runs[-1] = (runs[-1][0], n)
+        else:
+            runs.append((n, n))
+    return runs
+
+
+def _key_digest(keys: List[str]) -> str:
+    """구간 키 목록 다이제스트 (중복 포함)"""
+    return hashlib.sha256("\x1e".join(sorted(keys)).encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class _SheetPlan:
+    """시트 하나의 검사 상태"""
+    spec: SheetSpec
+    local_rows: Dict[str, List[Any]]                    # 키 -> 로컬 행
+    sheet_keys: Dict[str, List[int]]                    # 키 -> 시트 행 번호 (중복 키는 여러 개)
+    used_rows: int                                      # 키 컬럼 기준 사용 중인 행 수 (헤더 포함)
+    local_digests: Dict[str, str] = field(default_factory=dict)
+    suspect: List[str] = field(default_factory=list)    # 행을 내려받을 구간
+    sheet_rows: Dict[int, List[Any]] = field(default_factory=dict)  # 내려받은 행 번호 -> 행
+    changed: set = field(default_factory=set)
+
+
+class SheetsReconciler:
+    """로컬 저장소 기준으로 시트를 최소 차분 동기화"""
+
+    def __init__(self, sheets: GoogleSheetsClient, store: LocalStore):
+        self.sheets = sheets
+        self.store = store
+
+    def reconcile(self, sheet_names: Optional[List[str]] = None,
+                  dry_run: bool = False, full: bool = False) -> ReconcileReport:
+        """
+        정합성 검사 및 동기화
+
+        Args:
+            sheet_names: 대상 시트 (기본: 일별/주별/월별)
+            dry_run: True면 차분만 계산하고 기록하지 않음
+            full: True면 모든 구간을 내려받아 비교 (시트에서 값만 직접 고친 경우 검출)
+
+        Returns:
+            ReconcileReport
+        """
+        specs = [SHEET_SPECS[name] for name in (sheet_names or list(SHEET_SPECS))]
+        report = ReconcileReport()
+
+        self.sheets.ensure_sheets_exist([spec.name for spec in specs])
+        report.api_calls += 1
+
+        # 1. 각 시트 키 컬럼 -> 구간별 키 목록 비교 + 로컬 다이제스트와 마지막 동기화 다이제스트 비교
+        key_columns = self.sheets.batch_get_values([f"{spec.name}!A:A" for spec in specs])
+        report.api_calls += 1
+
+        plans = []
+        for spec, key_column in zip(specs, key_columns):
+            plan = self._plan(spec, key_column, full, report)
+            plans.append(plan)
+
+        for name, key, row_numbers in report.duplicate_keys:
+            logger.warning(f"시트 중복 키 (수정하지 않음): {name} {key} - {row_numbers}행")
+        for name, key in report.sheet_only_keys:
+            logger.warning(f"로컬 저장소에 없는 시트 행: {name} {key}")
+
+        # 2. 의심 구간의 행만 내려받아 실제 시트 내용으로 다이제스트 비교
+        self._fetch_suspect_rows(plans, report)
+        for plan in plans:
+            for bucket in plan.suspect:
+                sheet_rows = [plan.sheet_rows.get(n, [key])
+                              for key, numbers in plan.sheet_keys.items() if plan.spec.bucket(key) == bucket
+                              for n in numbers]
+                local_rows = [row for key, row in plan.local_rows.items() if plan.spec.bucket(key) == bucket]
+                if compute_digest(local_rows, plan.spec.compared) != compute_digest(sheet_rows, plan.spec.compared):
+                    plan.changed.add(bucket)
+                    report.buckets_changed.append((plan.spec.name, bucket))
+
+        # 3. 불일치 구간의 셀 단위 차분
+        updates: List[Dict[str, Any]] = []
+        for plan in plans:
+            updates.extend(self._diff(plan, report))
+
+        if dry_run:
+            logger.info(f"정합성 검사 (dry-run): {report.summary()}")
+            return report
+
+        # 4. 한 번의 batchUpdate로 반영 후 동기화된 구간 다이제스트 기록
+        if updates:
+            self.sheets.batch_update_values(updates)
+            report.api_calls += 1
+        self._record_digests(plans, report)
+
+        if report.buckets_changed:
+            logger.info(f"정합성 동기화 완료: {report.summary()}")
+        else:
+            logger.info(f"정합성 검사 완료 - 변경 없음 ({report.summary()})")
+        return report
+
+    def _plan(self, spec: SheetSpec, key_column: List[List[Any]], full: bool,
+              report: ReconcileReport) -> _SheetPlan:
+        """키 컬럼과 로컬 기록으로 내려받을 구간 결정"""
+        local_rows: Dict[str, List[Any]] = {}
+        for record in spec.load(self.store):
+            row = spec.to_row(record)
+            local_rows[_normalize(row[0])] = row
+
+        # 시트 키 -> 행 번호 (헤더 제외, 중복 키는 모든 행 유지)
+        sheet_keys: Dict[str, List[int]] = {}
+        for i, row in enumerate(key_column[1:], start=2):
+            key = _normalize(row[0]) if row else ""
+            if key:
+                sheet_keys.setdefault(key, []).append(i)
+
+        plan = _SheetPlan(spec, local_rows, sheet_keys, max(len(key_column), 1))
+
+        local_keys: Dict[str, List[str]] = {}
+        for key in local_rows:
+            local_keys.setdefault(spec.bucket(key), []).append(key)
+        sheet_bucket_keys: Dict[str, List[str]] = {}
+        for key, numbers in sheet_keys.items():
+            sheet_bucket_keys.setdefault(spec.bucket(key), []).extend([key] * len(numbers))
+
+        recorded = self.store.get_sheet_digests(spec.name)
+        for bucket in sorted(set(local_keys) | set(sheet_bucket_keys)):
+            report.buckets_checked += 1
+            rows = [local_rows[key] for key in local_keys.get(bucket, [])]
+            plan.local_digests[bucket] = compute_digest(rows, spec.compared)
+            keys_match = _key_digest(local_keys.get(bucket, [])) == _key_digest(sheet_bucket_keys.get(bucket, []))
+            if full or not keys_match or recorded.get(bucket) != plan.local_digests[bucket]:
+                plan.suspect.append(bucket)
+
+        for key, numbers in sorted(sheet_keys.items()):
+            if len(numbers) > 1:
+                report.duplicate_keys.append((spec.name, key, numbers))
+            elif key not in local_rows:
+                report.sheet_only_keys.append((spec.name, key))
+        return plan
+
+    def _fetch_suspect_rows(self, plans: List[_SheetPlan], report: ReconcileReport):
+        """의심 구간의 시트 행을 한 번의 batchGet으로 (연속 행 번호는 범위 하나로)"""
+        ranges, starts = [], []
+        for plan in plans:
+            suspect = set(plan.suspect)
+            numbers = [n for key, ns in plan.sheet_keys.items() if plan.spec.bucket(key) in suspect for n in ns]
+            report.buckets_fetched += len(suspect)
+            report.rows_fetched += len(numbers)
+            for first, last in _contiguous_runs(numbers):
+                ranges.append(f"{plan.spec.name}!A{first}:{_column(plan.spec.compared - 1)}{last}")
+                starts.append((plan, first))
+
+        if not ranges:
+            return
+        values = self.sheets.batch_get_values(ranges)
+        report.api_calls += 1
+        for (plan, first), rows in zip(starts, values):
+            for offset, row in enumerate(rows):
+                plan.sheet_rows[first + offset] = row
+
+    def _diff(self, plan: _SheetPlan, report: ReconcileReport) -> List[Dict[str, Any]]:
+        """불일치 구간의 변경 셀 / 빠진 행 추가"""
+        spec = plan.spec
+        updates = []
+        next_row = plan.used_rows + 1
+        for key, local_row in sorted(plan.local_rows.items()):
+            if spec.bucket(key) not in plan.changed:
+                continue
+
+            numbers = plan.sheet_keys.get(key)
+            if numbers is None:
+                # 시트에 없는 행 -> 마지막 행 뒤에 추가
+                updates.append({
+                    "range": f"{spec.name}!A{next_row}:{_column(spec.width - 1)}{next_row}",
+                    "values": [local_row],
+                })
+                next_row += 1
+                report.rows_appended += 1
+                continue
+            if len(numbers) > 1:
+                continue  # 중복 키는 보고만 (어느 행을 고칠지 알 수 없음)
+
+            row_number = numbers[0]
+            sheet_row = plan.sheet_rows.get(row_number, [key])
+            diff_cols = [
+                i for i in range(spec.compared)
+                if _normalize(local_row[i]) != _normalize(sheet_row[i] if i < len(sheet_row) else "")
+            ]
+            if diff_cols:
+                first, last = diff_cols[0], diff_cols[-1]
+                updates.append({
+                    "range": f"{spec.name}!{_column(first)}{row_number}:{_column(last)}{row_number}",
+                    "values": [local_row[first:last + 1]],
+                })
+                report.cells_updated += last - first + 1
+        return updates
+
+    def _record_digests(self, plans: List[_SheetPlan], report: ReconcileReport):
+        """
+        내려받아 맞춘 구간의 다이제스트 기록 (다음 검사에서 키 목록과 로컬 기록이 그대로면 건너뜀)
+
+        중복 키나 시트에만 있는 키가 남은 구간은 기록하지 않아 다음 검사에서도 다시 확인한다.
+        """
+        unresolved = {(name, key) for name, key, _ in report.duplicate_keys} | set(report.sheet_only_keys)
+        for plan in plans:
+            spec = plan.spec
+            dirty = {spec.bucket(key) for name, key in unresolved if name == spec.name}
+            self.store.set_sheet_digests(spec.name, {
+                bucket: None if bucket in dirty or bucket not in plan.local_digests
+                else plan.local_digests[bucket]
+                for bucket in plan.suspect
+            })
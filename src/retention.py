@@ -0,0 +1,322 @@
+"""
+장중 샘플 보존 기간 / 다운샘플링 모듈
+
+샘플은 세 계층으로 보관한다.
+- raw (samples): 최근 raw_days일, 바뀐 값만 기록된 원본
+- 15m (samples_15m): 그 이전 quarter_months개월, 15분 집계
+- 1h (samples_1h): 그 이전 전체, 1시간 집계
+집계 값은 n(샘플 수), 출력 min/max/mean(W), energy(kWh, 사다리꼴 적분), 구간 마지막 카운터 값이다.
+
+압축은 날짜(현지 시각) 단위로, 계층별 워터마크(retention_state) 이후 만료된 날짜만 처리한다.
+조회(query_series)는 요청 구간을 계층 경계로 나누어 구간마다 가장 세밀한 계층을 사용한다.
+"""
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Optional, List, Iterable
+
+import sys
+sys.path.append(str(__file__).rsplit('/', 2)[0])
+from config.settings import RETENTION_CONFIG, RING_CONFIG, SAMPLER_CONFIG
+from src.local_store import LocalStore, SAMPLE_FIELDS, AGGREGATE_TABLES, AGGREGATE_COLUMNS
+from src.metrics import span
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = ["today_generation", "month_generation", "total_generation"]
+
+# 저장된 원본은 바뀐 값만 있으므로 keyframe 간격까지는 같은 값이 이어진 것으로 보고 적분
+MAX_STORED_GAP = max(RING_CONFIG["max_gap"], SAMPLER_CONFIG["keyframe_interval"])
+
+
+@dataclass
+class CompactionReport:
+    """압축 결과"""
+    days: Dict[str, int] = field(default_factory=lambda: {"15m": 0, "1h": 0})
+    rows_in: Dict[str, int] = field(default_factory=lambda: {"15m": 0, "1h": 0})
+    rows_out: Dict[str, int] = field(default_factory=lambda: {"15m": 0, "1h": 0})
+
+    def summary(self) -> str:
+        return ", ".join(
+            f"{tier}: {self.days[tier]}일 ({self.rows_in[tier]}행 -> {self.rows_out[tier]}행)"
+            for tier in ("15m", "1h")
+        )
+
+
+def months_ago(day: date, months: int) -> date:
+    """months개월 전 같은 날 (말일 보정)"""
+    month_index = day.year * 12 + day.month - 1 - months
+    year, month = divmod(month_index, 12)
+    for d in (day.day, 30, 29, 28):
+        try:
+            return date(year, month + 1, d)
+        except ValueError:
+            continue
+
+
+def _bucket(ts: str, minutes: int) -> str:
+    """ISO 시각 -> 구간 시작 시각 (YYYY-MM-DDTHH:MM:00)"""
+    minute = int(ts[14:16]) // minutes * minutes
+    return f"{ts[:13]}:{minute:02d}:00"
+
+
+def _next_day(day: str) -> str:
+    return (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+
+
+def _set_watermark(store: LocalStore, tier: str, site: str, day: str):
+    # 날짜별 압축 트랜잭션 안에서 기록 (store.set_watermark는 별도 커밋)
+    store.conn.execute(
+        "INSERT INTO retention_state (tier, site, watermark) VALUES (?, ?, ?) "
+        "ON CONFLICT(tier, site) DO UPDATE SET watermark = excluded.watermark",
+        (tier, site, day),
+    )
+
+
+def _insert_aggregates(store: LocalStore, tier: str, site: str, rows: List[Dict[str, Any]]):
+    table = AGGREGATE_TABLES[tier]
+    store.conn.executemany(
+        f"INSERT OR REPLACE INTO {table} (site, bucket, {', '.join(AGGREGATE_COLUMNS)}) "
+        f"VALUES (?, ?, {', '.join('?' for _ in AGGREGATE_COLUMNS)})",
+        [(site, row["bucket"], *(row[c] for c in AGGREGATE_COLUMNS)) for row in rows],
+    )
+
+
+def _expired_days(store: LocalStore, table: str, column: str, site: str,
+                  after: Optional[str], before: str) -> List[str]:
+    """워터마크 이후, 기준일 이전에 데이터가 있는 날짜 목록"""
+    start = _next_day(after) if after else ""
+    cursor = store.conn.execute(
+        f"SELECT DISTINCT substr({column}, 1, 10) FROM {table} "
+        f"WHERE site = ? AND {column} >= ? AND {column} < ? ORDER BY 1",
+        (site, start, before),
+    )
+    return [row[0] for row in cursor]
+
+
+def aggregate_raw(rows: Iterable[Dict[str, Any]], minutes: int = 15,
+                  state: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+    """
+    원본 샘플(바뀐 값만) -> 구간 집계
+
+    Args:
+        rows: [{"ts", "current_power", ...}, ...] (시각순, NULL은 직전 값으로 채움)
+        minutes: 집계 구간 (분)
+        state: 직전 값 (이전 날짜에서 이어질 때, 갱신됨)
+
+    Returns:
+        [{"bucket", "n", "power_min", ...}, ...]
+    """
+    state = {} if state is None else state
+    buckets: Dict[str, Dict[str, Any]] = {}
+    previous = None  # (datetime, 출력)
+
+    for row in rows:
+        state.update((c, row[c]) for c in SAMPLE_FIELDS if row[c] is not None)
+        key = _bucket(row["ts"], minutes)
+        bucket = buckets.setdefault(key, {"bucket": key, "n": 0, "powers": [], "energy": 0.0})
+        bucket["n"] += 1
+        for counter in COUNTER_FIELDS:
+            bucket[counter] = state.get(counter)
+
+        power = state.get("current_power")
+        moment = datetime.fromisoformat(row["ts"])
+        if power is not None:
+            bucket["powers"].append(power)
+            if previous is not None:
+                # 구간 사이 적분은 구간 시작 샘플이 속한 구간에 포함, 수집 중단 공백은 제외
+                dt = (moment - previous[0]).total_seconds()
+                if 0 < dt <= MAX_STORED_GAP:
+                    buckets[_bucket(previous[0].isoformat(timespec="seconds"), minutes)]["energy"] += \
+                        (previous[1] + power) / 2 * dt / 3600 / 1000
+            previous = (moment, power)
+
+    result = []
+    for bucket in buckets.values():
+        powers = bucket.pop("powers")
+        bucket["power_min"] = min(powers) if powers else None
+        bucket["power_max"] = max(powers) if powers else None
+        bucket["power_mean"] = sum(powers) / len(powers) if powers else None
+        result.append(bucket)
+    return result
+
+
+def aggregate_buckets(rows: Iterable[Dict[str, Any]], minutes: int = 60) -> List[Dict[str, Any]]:
+    """세밀한 집계 -> 더 큰 구간 집계 (평균은 샘플 수 가중)"""
+    buckets: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        key = _bucket(row["bucket"], minutes)
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = {"bucket": key, "n": 0, "power_min": None, "power_max": None,
+                                     "_sum": 0.0, "_count": 0, "energy": 0.0}
+        bucket["n"] += row["n"]
+        bucket["energy"] += row["energy"] or 0.0
+        if row["power_mean"] is not None:
+            bucket["power_min"] = row["power_min"] if bucket["power_min"] is None else min(bucket["power_min"], row["power_min"])
+            bucket["power_max"] = row["power_max"] if bucket["power_max"] is None else max(bucket["power_max"], row["power_max"])
+            bucket["_sum"] += row["power_mean"] * row["n"]
+            bucket["_count"] += row["n"]
+        for counter in COUNTER_FIELDS:
+            if row[counter] is not None:
+                bucket[counter] = row[counter]
+
+    result = []
+    for bucket in buckets.values():
+        total, count = bucket.pop("_sum"), bucket.pop("_count")
+        bucket["power_mean"] = total / count if count else None
+        for counter in COUNTER_FIELDS:
+            bucket.setdefault(counter, None)
+        result.append(bucket)
+    return result
+
+
+def _compact_raw(store: LocalStore, site: str, before: str, report: CompactionReport):
+    """만료된 원본 샘플 -> 15분 집계 (날짜 단위 트랜잭션)"""
+    state: Dict[str, float] = {}
+    for day in _expired_days(store, "samples", "ts", site, store.get_watermark("15m", site), before):
+        next_day = _next_day(day)
+        rows = store.conn.execute(
+            f"SELECT ts, {', '.join(SAMPLE_FIELDS)} FROM samples "
+            f"WHERE site = ? AND ts >= ? AND ts < ? ORDER BY ts",
+            (site, day, next_day),
+        ).fetchall()
+        aggregates = aggregate_raw(rows, 15, state)
+
+        with store.conn:
+            _insert_aggregates(store, "15m", site, aggregates)
+            # 남은 첫 원본 샘플을 전체 값으로 채워 두어, 삭제 후에도 직전 값 채움이 가능하도록
+            store.conn.execute(
+                "UPDATE samples SET "
+                + ", ".join(f"{c} = COALESCE({c}, ?)" for c in SAMPLE_FIELDS)
+                + " WHERE site = ? AND ts = (SELECT MIN(ts) FROM samples WHERE site = ? AND ts >= ?)",
+                (*(state.get(c) for c in SAMPLE_FIELDS), site, site, next_day),
+            )
+            store.conn.execute(
+                "DELETE FROM samples WHERE site = ? AND ts >= ? AND ts < ?", (site, day, next_day)
+            )
+            _set_watermark(store, "15m", site, day)
+
+        report.days["15m"] += 1
+        report.rows_in["15m"] += len(rows)
+        report.rows_out["15m"] += len(aggregates)
+
+
+def _compact_quarter(store: LocalStore, site: str, before: str, report: CompactionReport):
+    """만료된 15분 집계 -> 1시간 집계 (날짜 단위 트랜잭션)"""
+    table = AGGREGATE_TABLES["15m"]
+    for day in _expired_days(store, table, "bucket", site, store.get_watermark("1h", site), before):
+        next_day = _next_day(day)
+        rows = store.conn.execute(
+            f"SELECT bucket, {', '.join(AGGREGATE_COLUMNS)} FROM {table} "
+            f"WHERE site = ? AND bucket >= ? AND bucket < ? ORDER BY bucket",
+            (site, day, next_day),
+        ).fetchall()
+        aggregates = aggregate_buckets(rows, 60)
+
+        with store.conn:
+            _insert_aggregates(store, "1h", site, aggregates)
+            store.conn.execute(
+                f"DELETE FROM {table} WHERE site = ? AND bucket >= ? AND bucket < ?", (site, day, next_day)
+            )
+            _set_watermark(store, "1h", site, day)
+
+        report.days["1h"] += 1
+        report.rows_in["1h"] += len(rows)
+        report.rows_out["1h"] += len(aggregates)
+
+
+def compact(store: LocalStore, today: Optional[date] = None,
+            raw_days: Optional[int] = None, quarter_months: Optional[int] = None) -> CompactionReport:
+    """
+    보존 기간이 지난 샘플 압축 (워터마크 이후 만료된 날짜만)
+
+    Args:
+        store: 로컬 저장소
+        today: 기준일 (기본: 오늘)
+        raw_days: 원본 보존 일수
+        quarter_months: 15분 집계 보존 개월 수
+
+    Returns:
+        CompactionReport
+    """
+    today = today or date.today()
+    raw_days = RETENTION_CONFIG["raw_days"] if raw_days is None else raw_days
+    quarter_months = RETENTION_CONFIG["quarter_months"] if quarter_months is None else quarter_months
+
+    raw_before = (today - timedelta(days=raw_days)).isoformat()
+    quarter_before = months_ago(today, quarter_months).isoformat()
+
+    report = CompactionReport()
+    sites = [row[0] for row in store.conn.execute(
+        f"SELECT DISTINCT site FROM samples UNION SELECT DISTINCT site FROM {AGGREGATE_TABLES['15m']}"
+    )]
+    with span("retention.compact"):
+        for site in sites:
+            _compact_raw(store, site, raw_before, report)
+            _compact_quarter(store, site, quarter_before, report)
+
+    logger.info(f"샘플 압축 완료: {report.summary()}")
+    return report
+
+
+def query_series(store: LocalStore, site: str, start: str, end: str) -> List[Dict[str, Any]]:
+    """
+    장중 샘플 구간 조회 (구간마다 가장 세밀한 계층 사용)
+
+    Args:
+        store: 로컬 저장소
+        site: 사이트 식별자
+        start / end: ISO 시각 ([start, end))
+
+    Returns:
+        [{"ts", "tier", "n", "power_min", "power_max", "power_mean", "energy",
+          "today_generation", "month_generation", "total_generation"}, ...] (시각순)
+        raw 계층의 energy는 None (출력은 min/max/mean 모두 샘플 값)
+    """
+    # 계층 경계: 압축이 끝난 날짜 다음 날부터 더 세밀한 계층
+    quarter_from = store.get_watermark("1h", site)
+    raw_from = store.get_watermark("15m", site)
+    quarter_from = _next_day(quarter_from) if quarter_from else ""
+    raw_from = _next_day(raw_from) if raw_from else ""
+
+    series = []
+
+    def aggregates(tier: str, lo: str, hi: str):
+        if lo >= hi:
+            return
+        cursor = store.conn.execute(
+            f"SELECT bucket, {', '.join(AGGREGATE_COLUMNS)} FROM {AGGREGATE_TABLES[tier]} "
+            f"WHERE site = ? AND bucket >= ? AND bucket < ? ORDER BY bucket",
+            (site, lo, hi),
+        )
+        for row in cursor:
+            item = {c: row[c] for c in AGGREGATE_COLUMNS}
+            series.append(dict(item, ts=row["bucket"], tier=tier))
+
+    aggregates("1h", start, min(end, quarter_from or raw_from))
+    aggregates("15m", max(start, quarter_from), min(end, raw_from))
+
+    raw_start = max(start, raw_from)
+    if raw_start < end:
+        for sample in store.get_samples(site, since=raw_start):
+            if sample["ts"] >= end:
+                break
+            power = sample["current_power"]
+            series.append({
+                "ts": sample["ts"], "tier": "raw", "n": 1,
+                "power_min": power, "power_max": power, "power_mean": power, "energy": None,
+                **{c: sample[c] for c in COUNTER_FIELDS},
+            })
+    return series
+
+
+# 테스트용 (계층별 보관 현황)
+if __name__ == "__main__":
+    with LocalStore() as store:
+        for tier, table in (("raw", "samples"), *AGGREGATE_TABLES.items()):
+            column = "ts" if tier == "raw" else "bucket"
+            count, first, last = store.conn.execute(
+                f"SELECT COUNT(*), MIN({column}), MAX({column}) FROM {table}"
+            ).fetchone()
+            print(f"{tier:>4}: {count}행 ({first} ~ {last})")
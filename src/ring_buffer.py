@@ -0,0 +1,202 @@
+"""
+장중 샘플 링 버퍼 모듈 (NumPy)
+
+사이트별로 미리 할당한 고정 크기 배열에 샘플을 보관한다.
+- 시각: int64 epoch 초, 값: float32 (SAMPLE_FIELDS 순서, 값 없음은 NaN)
+- 변경 필드: uint8 비트마스크 (로컬 저장소에는 바뀐 필드만 기록)
+- 저장 전 바뀐 값: 원래 값(float64)을 기록할 때까지 따로 보관 (저장소/집계/재시작 후 변경 감지는
+  float32로 반올림한 값이 아닌 수집 값 그대로 사용)
+샘플 하나당 약 30바이트로, 문자열 dict 목록(수백 바이트) 대비 메모리를 크게 줄이고
+최근 N분 조회/오늘 발전량 적분을 배열 연산으로 처리한다.
+아직 저장하지 않은 샘플은 flush()로 로컬 저장소에 한 번에 기록한다.
+"""
+import logging
+from datetime import datetime
+from typing import Dict, Optional, List, Tuple
+
+import numpy as np
+
+import sys
+sys.path.append(str(__file__).rsplit('/', 2)[0])
+from config.settings import RING_CONFIG
+from src.local_store import LocalStore, SAMPLE_FIELDS
+
+logger = logging.getLogger(__name__)
+
+FIELD_INDEX = {field: i for i, field in enumerate(SAMPLE_FIELDS)}
+
+
+class SampleRing:
+    """사이트 하나의 고정 크기 샘플 링 버퍼"""
+
+    def __init__(self, capacity: Optional[int] = None):
+        """
+        Args:
+            capacity: 보관할 샘플 수 (가득 차면 가장 오래된 샘플부터 덮어씀)
+        """
+        self.capacity = capacity or RING_CONFIG["capacity"]
+        self.ts = np.zeros(self.capacity, dtype=np.int64)
+        self.values = np.full((self.capacity, len(SAMPLE_FIELDS)), np.nan, dtype=np.float32)
+        self.changed = np.zeros(self.capacity, dtype=np.uint8)
+        self._unsaved: Dict[int, Dict[str, float]] = {}   # 배열 위치 -> 저장 전 바뀐 값 (원래 값)
+        self.head = 0        # 다음 기록 위치
+        self.size = 0        # 보관 중인 샘플 수
+        self.unflushed = 0   # 저장소에 기록하지 않은 최근 샘플 수
+        self.dropped = 0     # 기록 전에 덮어쓴 샘플 수
+
+    @property
+    def nbytes(self) -> int:
+        """배열 메모리 (바이트)"""
+        return self.ts.nbytes + self.values.nbytes + self.changed.nbytes
+
+    def append(self, ts: int, values: Dict[str, Optional[float]], changes: Optional[Dict[str, float]] = None):
+        """
+        샘플 추가
+
+        Args:
+            ts: epoch 초
+            values: {필드: 값} (없는 필드는 NaN)
+            changes: 저장소에 기록할 바뀐 필드 (없으면 기록 대상 아님)
+        """
+        i = self.head
+        if self.unflushed == self.capacity:
+            self.dropped += 1
+            self.unflushed -= 1
+
+        self.ts[i] = ts
+        row = self.values[i]
+        row[:] = np.nan
+        for field, value in values.items():
+            if value is not None:
+                row[FIELD_INDEX[field]] = value
+
+        mask = 0
+        for field in changes or ():
+            mask |= 1 << FIELD_INDEX[field]
+        self.changed[i] = mask
+        if mask:
+            self._unsaved[i] = {field: float(value) for field, value in changes.items() if value is not None}
+        else:
+            self._unsaved.pop(i, None)
+
+        self.head = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self.unflushed += 1
+
+    def _order(self, count: Optional[int] = None) -> np.ndarray:
+        """최근 count개 샘플의 배열 위치 (오래된 순)"""
+        count = self.size if count is None else min(count, self.size)
+        return (self.head - count + np.arange(count)) % self.capacity
+
+    def latest(self) -> Optional[Tuple[int, Dict[str, float]]]:
+        """마지막 샘플 (epoch 초, {필드: 값})"""
+        if not self.size:
+            return None
+        i = (self.head - 1) % self.capacity
+        return int(self.ts[i]), {
+            field: float(self.values[i, j])
+            for field, j in FIELD_INDEX.items() if not np.isnan(self.values[i, j])
+        }
+
+    def window(self, seconds: float, now: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        최근 구간 샘플
+
+        Args:
+            seconds: 구간 길이 (초)
+            now: 기준 epoch 초 (기본: 마지막 샘플 시각)
+
+        Returns:
+            (시각 배열, 값 배열[샘플, 필드]) - 오래된 순, 복사본
+        """
+        order = self._order()
+        ts = self.ts[order]
+        if now is None:
+            now = int(ts[-1]) if len(ts) else 0
+        start = np.searchsorted(ts, now - seconds, side="left")
+        end = np.searchsorted(ts, now, side="right")
+        return ts[start:end], self.values[order[start:end]]
+
+    def since(self, start: int) -> Tuple[np.ndarray, np.ndarray]:
+        """start(epoch 초) 이후 샘플 (오래된 순, 복사본)"""
+        order = self._order()
+        ts = self.ts[order]
+        first = np.searchsorted(ts, start, side="left")
+        return ts[first:], self.values[order[first:]]
+
+    def field(self, name: str, seconds: float, now: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """최근 구간의 필드 하나 (값 없는 샘플 제외)"""
+        ts, values = self.window(seconds, now)
+        column = values[:, FIELD_INDEX[name]]
+        valid = ~np.isnan(column)
+        return ts[valid], column[valid]
+
+    def energy_today(self, now: Optional[datetime] = None) -> float:
+        """
+        오늘 0시부터의 발전량 적분 (current_power[W] 사다리꼴 적분 -> kWh)
+
+        샘플 간격이 max_gap보다 벌어진 구간(수집 중단)은 적분에서 제외한다.
+        """
+        now = now or datetime.now()
+        midnight = int(now.replace(hour=0, minute=0, second=0, microsecond=0).timestamp())
+        ts, values = self.since(midnight)
+        power = values[:, FIELD_INDEX["current_power"]].astype(np.float64)
+        valid = ~np.isnan(power)
+        ts, power = ts[valid], power[valid]
+        if len(ts) < 2:
+            return 0.0
+
+        dt = np.diff(ts).astype(np.float64)
+        segments = (power[1:] + power[:-1]) / 2 * dt
+        segments[dt > RING_CONFIG["max_gap"]] = 0.0
+        return float(segments.sum() / 3600 / 1000)
+
+    def pending(self) -> List[Tuple[str, Dict[str, float]]]:
+        """저장소에 기록하지 않은 바뀐 샘플 [(ISO 시각, {필드: 값}), ...]"""
+        rows = []
+        for i in self._order(self.unflushed):
+            changes = self._unsaved.get(int(i))
+            if not changes:
+                continue
+            ts = datetime.fromtimestamp(int(self.ts[i])).isoformat(timespec="seconds")
+            rows.append((ts, dict(changes)))
+        return rows
+
+    def flush(self, store: LocalStore, site: str) -> int:
+        """
+        기록하지 않은 바뀐 샘플을 저장소에 일괄 기록
+
+        Returns:
+            기록한 샘플 수
+        """
+        if not self.unflushed:
+            return 0
+        count = store.insert_samples(site, self.pending())
+        self.unflushed = 0
+        self._unsaved.clear()
+        if self.dropped:
+            logger.warning(f"{site or '기본 사이트'}: 저장 전에 덮어쓴 샘플 {self.dropped}건")
+            self.dropped = 0
+        return count
+
+
+class SiteRings:
+    """사이트별 링 버퍼 모음"""
+
+    def __init__(self, capacity: Optional[int] = None):
+        self.capacity = capacity or RING_CONFIG["capacity"]
+        self.rings: Dict[str, SampleRing] = {}
+
+    def __getitem__(self, site: str) -> SampleRing:
+        ring = self.rings.get(site)
+        if ring is None:
+            ring = self.rings[site] = SampleRing(self.capacity)
+        return ring
+
+    @property
+    def nbytes(self) -> int:
+        return sum(ring.nbytes for ring in self.rings.values())
+
+    def flush(self, store: LocalStore) -> int:
+        """모든 사이트의 미기록 샘플 일괄 기록"""
+        return sum(ring.flush(store, site) for site, ring in self.rings.items())
@@ -0,0 +1,286 @@
+"""
+장중 발전량 샘플링 모듈 (python main.py --sample)
+
+monitoring.do 카운터를 일정 간격으로 읽어 장중 발전 곡선을 남긴다.
+- 간격은 시작 시각 기준 절대 시각(start + n * interval)으로 맞춰 샘플 소요 시간이 누적되지 않음
+- 샘플이 간격보다 오래 걸리면 밀린 회차는 건너뜀 (몰아서 실행하지 않음)
+- 직전 저장 값과 같은 값은 저장하지 않고, 바뀐 필드만 로컬 저장소(samples)에 기록
+  (샘플은 메모리 링 버퍼에 모았다가 flush_every마다 일괄 기록, 비정상 종료 시 최대 flush_every개 유실)
+- 오늘 발전량이 바뀌면 일별 행을 Sheets 쓰기 버퍼에 넣어 주기적으로 일괄 반영
+- 정책(SolarPolicy)을 주면 밤에는 쉬고 남중 전후에 자주 샘플, 일몰 후 정산 샘플 1회
+"""
+import logging
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Any, Optional, Iterator, Tuple
+
+import sys
+sys.path.append(str(__file__).rsplit('/', 2)[0])
+from config.settings import SAMPLER_CONFIG, METRICS_CONFIG, SCHEDULER_CONFIG, RING_CONFIG
+from src.models import Dashboard
+from src.local_store import LocalStore
+from src.metrics import metrics, span, incr
+from src.ring_buffer import SampleRing
+from src.scheduler import local_now
+from src.solar import SAMPLE, SETTLEMENT
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeDetector:
+    """직전 저장 값 대비 변경 감지 (deadband + 주기적 전체 저장)"""
+
+    def __init__(self, last: Optional[Dict[str, float]] = None,
+                 deadband: Optional[float] = None, keyframe_interval: Optional[float] = None):
+        """
+        Args:
+            last: 필드별 마지막 저장 값 (재시작 시 저장소에서 복원)
+            deadband: 이 값 이하의 변화는 변경으로 보지 않음
+            keyframe_interval: 변화가 없어도 전체 값을 저장하는 간격 (초)
+        """
+        self.last: Dict[str, float] = dict(last or {})
+        self.deadband = SAMPLER_CONFIG["deadband"] if deadband is None else deadband
+        self.keyframe_interval = (SAMPLER_CONFIG["keyframe_interval"]
+                                  if keyframe_interval is None else keyframe_interval)
+        self._keyframe_at: Optional[float] = None
+
+    def diff(self, values: Dict[str, Optional[float]], now: float, force: bool = False) -> Dict[str, float]:
+        """
+        저장할 필드 계산 (값 없는 필드는 제외)
+
+        Args:
+            values: {필드: 값}
+            now: 현재 시각 (time.monotonic)
+            force: 전체 값 저장 (keyframe)
+
+        Returns:
+            {필드: 값} (바뀐 필드만, keyframe이면 전체)
+        """
+        values = {k: v for k, v in values.items() if v is not None}
+
+        if force or self._keyframe_at is None or now - self._keyframe_at >= self.keyframe_interval:
+            self._keyframe_at = now
+            changes = values
+        else:
+            # 직전 "저장" 값과 비교하여 작은 변화가 누적되면 결국 저장됨
+            changes = {
+                k: v for k, v in values.items()
+                if k not in self.last or abs(v - self.last[k]) > self.deadband
+            }
+
+        self.last.update(changes)
+        return changes
+
+
+class PowerSampler:
+    """사이트 하나의 장중 발전량 샘플러"""
+
+    def __init__(
+        self,
+        site: str,
+        fetch: Callable[[], Dict[str, Any]],
+        store: LocalStore,
+        buffer=None,
+        interval: Optional[float] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        policy=None,
+        on_idle: Optional[Callable[[], None]] = None,
+        ring: Optional[SampleRing] = None,
+    ):
+        """
+        Args:
+            site: 사이트 식별자
+            fetch: 카운터 조회 함수 (HevitonScraper.sample_monitoring)
+            store: 로컬 저장소 (샘플 기록 스레드에서만 사용)
+            buffer: SheetsWriteBuffer (없으면 Sheets에 기록하지 않음)
+            interval: 샘플 간격 (초)
+            on_error: 조회 실패 시 호출 (세션 폐기 등)
+            policy: 샘플 시각 정책 (SolarPolicy, 없으면 고정 간격)
+            on_idle: 다음 샘플까지 오래 남았을 때 호출 (브라우저 종료 등)
+            ring: 샘플 링 버퍼 (여러 사이트면 SiteRings[site])
+        """
+        self.site = site
+        self.fetch = fetch
+        self.store = store
+        self.buffer = buffer
+        self.interval = interval or SAMPLER_CONFIG["interval"]
+        self.on_error = on_error
+        self.policy = policy
+        self.on_idle = on_idle
+        self.detector = ChangeDetector(store.last_sample_values(site))
+        self.ring = ring if ring is not None else SampleRing()
+        self._stop = threading.Event()
+        self._daily_status: Dict[str, str] = {}
+
+        # 지표
+        self.samples = 0
+        self.stored = 0
+        self.suppressed = 0
+        self.errors = 0
+        self.skipped_ticks = 0
+        self.jitter = deque(maxlen=1000)
+
+    def sample_once(self, force: bool = False) -> Dict[str, float]:
+        """
+        샘플 한 번 (조회 -> 변경 감지 -> 저장)
+
+        Args:
+            force: 변경 여부와 관계없이 전체 값 저장 (일몰 후 정산 샘플)
+
+        Returns:
+            저장한 필드 (변경 없으면 빈 dict)
+        """
+        ts = int(time.time())
+        dashboard = Dashboard.from_raw(self.fetch())
+        values = dashboard.values()
+        changes = self.detector.diff(values, time.monotonic(), force=force)
+        self.samples += 1
+
+        # 모든 샘플은 링 버퍼에 (최근 구간 조회용), 바뀐 필드는 모아서 저장소에 일괄 기록
+        self.ring.append(ts, values, changes)
+        if self.ring.unflushed >= RING_CONFIG["flush_every"] or force:
+            self.flush()
+
+        if not changes:
+            self.suppressed += 1
+            incr("sampler_suppressed")
+            return changes
+
+        if "today_generation" in changes:
+            with span("sampler.daily"):
+                self._record_daily(dashboard)
+        self.stored += 1
+        incr("sampler_stored")
+        return changes
+
+    def flush(self) -> int:
+        """링 버퍼의 미기록 샘플을 로컬 저장소에 일괄 기록"""
+        with span("sampler.store"):
+            return self.ring.flush(self.store, self.site)
+
+    def _record_daily(self, dashboard: Dashboard):
+        """오늘 발전량이 바뀌면 일별 행 갱신 (로컬 저장소 + Sheets 버퍼)"""
+        from src.google_sheets import SHEET_DAILY, build_daily_record, daily_row
+
+        record = build_daily_record({"dashboard": dashboard})
+
+        # 설비 상태는 샘플에서 확인하지 않으므로 같은 날 마지막 일별 수집 값을 유지
+        date = record["date"]
+        if date not in self._daily_status:
+            existing = self.store.get_daily_range(date, date)
+            self._daily_status = {date: existing[0]["status"] if existing and existing[0]["status"] else "정상"}
+        record["status"] = self._daily_status[date]
+
+        self.store.upsert_daily([record])
+        if self.buffer is not None:
+            self.buffer.enqueue(SHEET_DAILY, daily_row(record))
+
+    def _deadlines(self) -> Iterator[Tuple[float, str]]:
+        """
+        다음 샘플 (time.monotonic 기준 시각, 종류)
+
+        고정 간격이면 시작 시각 기준 격자, 정책이 있으면 정책의 다음 시각을 따른다.
+        이미 지난 회차는 건너뛴다 (몰아서 실행하지 않음).
+        """
+        if self.policy is None:
+            started = time.monotonic()
+            tick = 0
+            while True:
+                yield started + tick * self.interval, SAMPLE
+                tick += 1
+                due = int((time.monotonic() - started) // self.interval) + 1
+                if due > tick:
+                    self._skip(due - tick)
+                    tick = due
+
+        last = None
+        while True:
+            now = local_now()
+            if last is not None:
+                interval = self.policy.interval_at(last)
+                if interval and (now - last).total_seconds() >= interval:
+                    self._skip(int((now - last).total_seconds() // interval))
+            # 조금 일찍 깨어나도 같은 회차를 두 번 실행하지 않도록 직전 예정 시각 이후부터
+            due, kind = self.policy.next_due(max(now, last) if last is not None else now)
+            last = due
+            yield time.monotonic() + max((due - now).total_seconds(), 0), kind
+
+    def _skip(self, count: int):
+        self.skipped_ticks += count
+        logger.warning(f"샘플이 간격보다 오래 걸려 {count}회 건너뜀")
+
+    def run(self, max_samples: Optional[int] = None):
+        """
+        종료 요청(또는 max_samples)까지 샘플링
+
+        Args:
+            max_samples: 최대 샘플 수 (None이면 무제한)
+        """
+        mode = "일출/일몰 기준" if self.policy is not None else f"{self.interval:g}초 간격"
+        logger.info(f"장중 샘플링 시작: {self.site or '기본 사이트'}, {mode}")
+        attempts = 0
+
+        for deadline, kind in self._deadlines():
+            if self._stop.is_set() or (max_samples is not None and attempts >= max_samples):
+                break
+
+            wait = deadline - time.monotonic()
+            if wait > SCHEDULER_CONFIG["idle_close"]:
+                logger.info(f"다음 샘플까지 {wait / 60:.0f}분 대기"
+                            + (" (정산)" if kind == SETTLEMENT else ""))
+                if self.on_idle is not None:
+                    self.on_idle()
+            if self._stop.wait(timeout=max(wait, 0)):
+                break
+
+            jitter = time.monotonic() - deadline
+            self.jitter.append(jitter)
+            metrics.gauge("sampler_jitter_seconds", jitter)
+
+            attempts += 1
+            try:
+                with span("sampler.sample", kind=kind):
+                    changes = self.sample_once(force=kind == SETTLEMENT)
+                if kind == SETTLEMENT:
+                    logger.info(f"정산 샘플: 오늘 발전량 {changes.get('today_generation')}")
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"샘플 실패: {e}")
+                if self.on_error is not None:
+                    self.on_error(e)
+
+            self._publish()
+
+        self.flush()
+        logger.info(f"장중 샘플링 종료: {self.summary()}")
+
+    def _publish(self):
+        """지표 갱신 (Prometheus textfile은 매 샘플 교체)"""
+        for name in ("samples", "stored", "suppressed", "errors", "skipped_ticks"):
+            metrics.gauge(f"sampler_{name}", getattr(self, name))
+        if self.buffer is not None:
+            metrics.gauge("sheets_buffer_queue_depth", self.buffer.queue_depth)
+        metrics.gauge("sampler_energy_today_kwh", self.ring.energy_today(), site=self.site)
+        if not METRICS_CONFIG["enabled"]:
+            return
+        try:
+            metrics.write_prometheus(metrics.snapshot())
+        except OSError as e:
+            logger.debug(f"샘플 지표 기록 실패: {e}")
+
+    def summary(self) -> str:
+        """샘플링 요약 (저장/억제 건수, 지연 분포)"""
+        text = (f"샘플 {self.samples}회, 저장 {self.stored}회, 변경 없음 {self.suppressed}회, "
+                f"실패 {self.errors}회, 건너뜀 {self.skipped_ticks}회")
+        if self.jitter:
+            ordered = sorted(self.jitter)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            text += (f", 시작 지연 중앙값 {statistics.median(ordered) * 1000:.1f}ms"
+                     f" / p95 {p95 * 1000:.1f}ms / 최대 {ordered[-1] * 1000:.1f}ms")
+        return text
+
+    def stop(self, *_):
+        """종료 요청 (진행 중인 샘플은 마친 뒤 종료)"""
+        self._stop.set()
@@ -0,0 +1,309 @@
+"""
+상주 실행(--serve) 스케줄러 모듈
+
+- 일/주/월 작업을 내부 스케줄로 실행 (시각은 SCHEDULER_CONFIG의 UTC 오프셋 기준, 기본 KST)
+- 로그인한 브라우저 세션 하나를 작업 간 재사용 (만료 시 재로그인)
+- 수집 스냅샷을 짧은 시간 캐시하여 같은 시각의 작업이 한 번만 수집
+- 마지막 실행 시각을 상태 파일에 저장하여, 중단 후 재시작 시 놓친 실행을 한 번씩 따라잡음
+- SIGTERM/SIGINT 수신 시 실행 중인 작업을 마친 뒤 종료
+"""
+import json
+import logging
+import os
+import re
+import signal
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, Any, Optional, List
+
+import sys
+sys.path.append(str(__file__).rsplit('/', 2)[0])
+from config.settings import SCHEDULER_CONFIG
+
+logger = logging.getLogger(__name__)
+
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+SCHEDULE_PATTERN = re.compile(r"^(?:(?P<prefix>[a-z]{3}|\d{1,2})\s+)?(?P<hour>\d{1,2}):(?P<minute>\d{2})$")
+
+
+def local_tz() -> timezone:
+    """스케줄 기준 시간대 (고정 오프셋, tzdata 불필요)"""
+    return timezone(timedelta(hours=SCHEDULER_CONFIG["utc_offset_hours"]))
+
+
+def local_now() -> datetime:
+    """스케줄 기준 현재 시각 (naive, 기존 코드의 datetime.now()와 같은 형태)"""
+    return datetime.now(local_tz()).replace(tzinfo=None)
+
+
+@dataclass
+class Schedule:
+    """
+    실행 주기
+
+    spec 형식:
+        "18:00"      매일 18시
+        "mon 00:05"  매주 월요일 0시 5분
+        "1 00:00"    매월 1일 0시
+    """
+    kind: str
+    hour: int
+    minute: int
+    weekday: int = 0
+    day: int = 1
+
+    @classmethod
+    def parse(cls, spec: str) -> "Schedule":
+        match = SCHEDULE_PATTERN.match(spec.strip().lower())
+        if not match:
+            raise ValueError(f"스케줄 형식 오류: {spec!r}")
+
+        prefix = match.group("prefix")
+        hour, minute = int(match.group("hour")), int(match.group("minute"))
+        if prefix is None:
+            return cls("daily", hour, minute)
+        if prefix in WEEKDAYS:
+            return cls("weekly", hour, minute, weekday=WEEKDAYS.index(prefix))
+        if prefix.isdigit() and 1 <= int(prefix) <= 28:
+            return cls("monthly", hour, minute, day=int(prefix))
+        raise ValueError(f"스케줄 형식 오류: {spec!r} (요일 mon~sun 또는 일자 1~28)")
+
+    def previous_due(self, now: datetime) -> datetime:
+        """now 이전(포함) 가장 최근 실행 예정 시각"""
+        due = now.replace(hour=self.hour, minute=self.minute, second=0, microsecond=0)
+
+        if self.kind == "daily":
+            return due if due <= now else due - timedelta(days=1)
+
+        if self.kind == "weekly":
+            due -= timedelta(days=(now.weekday() - self.weekday) % 7)
+            return due if due <= now else due - timedelta(days=7)
+
+        due = due.replace(day=self.day)
+        if due > now:
+            month_start = due.replace(day=1) - timedelta(days=1)
+            due = due.replace(year=month_start.year, month=month_start.month)
+        return due
+
+    def next_due(self, now: datetime) -> datetime:
+        """now 이후 다음 실행 예정 시각"""
+        if self.kind == "daily":
+            return self.previous_due(now) + timedelta(days=1)
+        if self.kind == "weekly":
+            return self.previous_due(now) + timedelta(days=7)
+
+        due = self.previous_due(now)
+        year, month = (due.year + 1, 1) if due.month == 12 else (due.year, due.month + 1)
+        return due.replace(year=year, month=month)
+
+
+@dataclass
+class ScheduledJob:
+    """스케줄 작업 (func는 실행 예정 시각을 받아 성공 여부 반환)"""
+    name: str
+    schedule: Schedule
+    func: Callable[[datetime], bool]
+
+
+class SnapshotCache:
+    """수집 스냅샷 캐시 (같은 시각대 작업이 수집 결과를 공유)"""
+
+    def __init__(self, fetch: Callable[[], Dict[str, Any]], ttl: Optional[float] = None):
+        """
+        Args:
+            fetch: 스냅샷 수집 함수
+            ttl: 캐시 유효 시간 (초)
+        """
+        self.fetch = fetch
+        self.ttl = SCHEDULER_CONFIG["snapshot_ttl"] if ttl is None else ttl
+        self._data: Optional[Dict[str, Any]] = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """캐시된 스냅샷 (없거나 오래되었으면 새로 수집)"""
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            if self._data is None or time.monotonic() - self._fetched_at > max_age:
+                self._data = self.fetch()
+                self._fetched_at = time.monotonic()
+            else:
+                logger.info("캐시된 수집 데이터 사용")
+            return self._data
+
+    def invalidate(self):
+        with self._lock:
+            self._data = None
+
+
+class SharedSession:
+    """작업 간 재사용하는 로그인 세션 (필요할 때만 로그인)"""
+
+    def __init__(self, auth_factory: Callable[[], Any], max_age: Optional[float] = None):
+        """
+        Args:
+            auth_factory: HevitonAuth 생성 함수
+            max_age: 세션 최대 사용 시간 (초, 지나면 브라우저를 새로 시작)
+        """
+        self.auth_factory = auth_factory
+        self.max_age = SCHEDULER_CONFIG["session_max_age"] if max_age is None else max_age
+        self.auth = None
+        self._started_at = 0.0
+
+    def _expired(self) -> bool:
+        """세션 만료 여부 (로그인 페이지로 돌아갔거나 최대 사용 시간 초과)"""
+        if self.auth is None or not self.auth.is_logged_in or self.auth.driver is None:
+            return True
+        if time.monotonic() - self._started_at > self.max_age:
+            logger.info("세션 최대 사용 시간 초과 - 재시작")
+            return True
+        try:
+            return "/login/" in self.auth.driver.current_url
+        except Exception:
+            return True
+
+    def driver(self):
+        """로그인된 WebDriver (만료 시 재로그인)"""
+        if self._expired():
+            self.close()
+            auth = self.auth_factory()
+            if not auth.login():
+                auth.close()
+                raise RuntimeError("로그인 실패 - 인증 정보를 확인하세요.")
+            self.auth = auth
+            self._started_at = time.monotonic()
+        return self.auth.get_driver()
+
+    def invalidate(self):
+        """작업 실패 후 다음 작업에서 새로 로그인하도록 세션 폐기"""
+        self.close()
+
+    def close(self):
+        if self.auth is not None:
+            self.auth.logout()
+            self.auth = None
+
+
+class JobScheduler:
+    """일/주/월 작업 스케줄러 (놓친 실행 따라잡기, 안전한 종료)"""
+
+    def __init__(self, jobs: List[ScheduledJob], state_path: Optional[Path] = None,
+                 on_idle: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            jobs: 스케줄 작업 목록 (같은 시각이면 목록 순서대로 실행)
+            state_path: 마지막 실행 시각 상태 파일
+            on_idle: 다음 작업까지 idle_close 이상 남았을 때 호출 (브라우저 종료 등)
+        """
+        self.jobs = jobs
+        self.on_idle = on_idle
+        self.state_path = Path(state_path or SCHEDULER_CONFIG["state"])
+        self.catchup = timedelta(days=SCHEDULER_CONFIG["catchup_days"])
+        self._stop = threading.Event()
+        self._state = self._load()
+
+    def _load(self) -> Dict[str, str]:
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"스케줄러 상태 파일 로드 실패 - 초기화: {e}")
+            return {}
+
+    def _save(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def _last_run(self, job: ScheduledJob) -> Optional[datetime]:
+        value = self._state.get(job.name)
+        return datetime.fromisoformat(value) if value else None
+
+    def pending(self, now: datetime) -> List[tuple]:
+        """
+        지금 실행할 작업 [(job, due), ...]
+
+        마지막 실행 이후 예정 시각이 지났으면 가장 최근 예정 시각으로 한 번만 실행한다.
+        처음 실행(상태 없음)이면 지난 실행은 따라잡지 않고, catchup_days보다 오래된 누락도 건너뛴다.
+        """
+        due_jobs = []
+        for job in self.jobs:
+            due = job.schedule.previous_due(now)
+            last = self._last_run(job)
+
+            if last is None:
+                # 첫 실행: 현재 주기부터 시작
+                self._state[job.name] = due.isoformat()
+                continue
+            if due <= last:
+                continue
+            if now - due > self.catchup:
+                logger.warning(f"{job.name} 작업 누락 ({due}) - 따라잡기 기간 초과로 건너뜀")
+                self._state[job.name] = due.isoformat()
+                continue
+            due_jobs.append((job, due))
+
+        self._save()
+        return due_jobs
+
+    def run_pending(self, now: Optional[datetime] = None) -> int:
+        """실행할 작업을 순서대로 실행, 실행한 작업 수 반환"""
+        count = 0
+        for job, due in self.pending(now or local_now()):
+            if self._stop.is_set():
+                break
+            late = (local_now() - due).total_seconds()
+            logger.info(f"{job.name} 작업 시작 (예정 {due:%Y-%m-%d %H:%M}"
+                        + (f", {late / 60:.0f}분 지연)" if late > 60 else ")"))
+            try:
+                ok = job.func(due)
+            except Exception as e:
+                logger.exception(f"{job.name} 작업 오류: {e}")
+                ok = False
+
+            # 실패해도 같은 예정 시각을 반복 실행하지 않음 (다음 주기에 다시 실행)
+            self._state[job.name] = due.isoformat()
+            self._save()
+            logger.info(f"{job.name} 작업 {'완료' if ok else '실패'}")
+            count += 1
+        return count
+
+    def next_wakeup(self, now: datetime) -> datetime:
+        return min(job.schedule.next_due(now) for job in self.jobs)
+
+    def stop(self, *_):
+        """종료 요청 (실행 중인 작업은 마친 뒤 종료)"""
+        if not self._stop.is_set():
+            logger.info("종료 요청 수신 - 현재 작업 완료 후 종료")
+        self._stop.set()
+
+    def install_signal_handlers(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+    def serve_forever(self):
+        """종료 요청까지 스케줄 실행"""
+        for job in self.jobs:
+            logger.info(f"스케줄 등록: {job.name} - 다음 실행 {job.schedule.next_due(local_now()):%Y-%m-%d %H:%M}")
+
+        while not self._stop.is_set():
+            if self.run_pending() and self.on_idle is not None:
+                idle = (self.next_wakeup(local_now()) - local_now()).total_seconds()
+                if idle > SCHEDULER_CONFIG["idle_close"]:
+                    self.on_idle()
+
+            now = local_now()
+            wakeup = self.next_wakeup(now)
+            # 시계 변경/절전 복귀에 대비해 최대 poll_interval마다 다시 확인
+            timeout = min((wakeup - now).total_seconds(), SCHEDULER_CONFIG["poll_interval"])
+            self._stop.wait(timeout=max(timeout, 0))
+
+        logger.info("스케줄러 종료")
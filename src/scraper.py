@@ -6,6 +6,7 @@ import time
 import re
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Any
+from urllib.parse import urlparse
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -16,10 +17,26 @@ from bs4 import BeautifulSoup
 
 import sys
 sys.path.append(str(__file__).rsplit('/', 2)[0])
-from config.settings import HEVITON_CONFIG
+from config.settings import HEVITON_CONFIG, NAV_PERF_CONFIG, SAMPLER_CONFIG
+from src.metrics import metrics, span, incr, traced
+from src.models import Dashboard, DailyPoint, ConverterStatus
+from src.page_archive import archive_page
+from src.parsers import parse_monitoring_page, parse_converter_page, parse_history_page, parse_recent_daily
+from src.profiling import checkpoint
 
 logger = logging.getLogger(__name__)
 
+# 모니터링 페이지 카운터 (get_monitoring_data와 같은 선택자, 한 번에 조회)
+MONITORING_SCRIPT = """
+const pick = (selector) => document.querySelector(selector)?.innerText || null;
+return {
+    current_power: pick('.now .num'),
+    today_generation: pick('.today .num'),
+    month_generation: pick('.month .num'),
+    total_generation: pick('.accrue .num'),
+};
+"""
+
 
 class HevitonScraper:
     """Heviton 발전량 데이터 크롤러 (Selenium 기반)"""
@@ -32,6 +49,46 @@ class HevitonScraper:
         self.driver = driver
         self.base_url = HEVITON_CONFIG["base_url"]
 
+        # 페이지 이동 성능 수집 (선택)
+        self.profiler = None
+        if NAV_PERF_CONFIG["enabled"]:
+            from src.nav_perf import NavigationProfiler
+            self.profiler = NavigationProfiler(driver, run_id=metrics.run_id)
+
+    def _navigate(self, url: str, wait: float = 3):
+        """
+        페이지 이동 후 로드 대기 (span 기록)
+
+        Args:
+            url: 이동할 URL
+            wait: 이동 후 JavaScript 로드 대기 시간 (초)
+        """
+        page = urlparse(url).path.rsplit("/", 1)[-1]
+        if self.profiler:
+            self.profiler.begin()
+        with span("scraper.navigate", page=page):
+            self.driver.get(url)
+        if wait:
+            with span("scraper.wait", page=page):
+                time.sleep(wait)
+        if self.profiler:
+            # 대기 후 수집 (로드 이후의 XHR 포함)
+            self.profiler.capture(url)
+
+    def _page_source(self) -> str:
+        """현재 페이지 소스 (수신 크기 기록, 설정 시 원본 보관)"""
+        page_source = self.driver.page_source
+        incr("scraper_page_bytes", len(page_source.encode("utf-8")))
+        archive_page(self.driver.current_url, page_source)
+        return page_source
+
+    @staticmethod
+    def _parse(page_source: str) -> BeautifulSoup:
+        """페이지 소스 파싱 (span 기록)"""
+        with span("scraper.parse"):
+            return BeautifulSoup(page_source, 'lxml')
+
+    @traced("scraper.monitoring", ok=lambda result: "error" not in result)
     def get_monitoring_data(self) -> Dict[str, Any]:
         """
         모니터링 페이지에서 발전량 데이터 추출
@@ -44,27 +101,26 @@ class HevitonScraper:
         try:
             # 모니터링 페이지로 이동
             url = f"{self.base_url}/monitoring/status/monitoring.do?ua=m&inType=web"
-            self.driver.get(url)
-            time.sleep(3)  # 페이지 및 JavaScript 로드 대기
-
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'lxml')
+            self._navigate(url)  # 페이지 및 JavaScript 로드 대기
 
             data = {
-                "current_power": None,      # 현재 발전량 (kW)
+                "current_power": None,      # 현재 발전량 (W)
                 "today_generation": None,   # 오늘 발전량 (kWh)
                 "month_generation": None,   # 이번달 발전량 (kWh)
-                "total_generation": None,   # 누적 발전량 (kWh)
+                "total_generation": None,   # 누적 발전량 (MWh)
             }
 
             # JavaScript 변수에서 데이터 추출 시도
             # 페이지 소스에서 발전량 관련 값 찾기
 
+            # 페이지 로드 후 추가 대기 (API 호출 완료 대기)
+            time.sleep(5)
+
+            # 값이 채워진 뒤의 페이지 소스 (보관본도 AJAX 응답 반영)
+            page_source = self._page_source()
+
             # 방법 1: JavaScript 실행하여 값 추출
             try:
-                # 페이지 로드 후 추가 대기 (API 호출 완료 대기)
-                time.sleep(5)
-
                 # JavaScript로 데이터 추출 시도
                 scripts = [
                     "return document.querySelector('.now .num')?.innerText;",
@@ -93,28 +149,7 @@ class HevitonScraper:
 
             # 방법 2: HTML에서 직접 추출
             if not any(data.values()):
-                # .num 클래스 요소들 찾기
-                num_elements = soup.find_all(class_='num')
-                for elem in num_elements:
-                    text = elem.get_text(strip=True)
-                    if text:
-                        logger.debug(f"발견된 값: {text}")
-
-                # 발전량 섹션 찾기
-                sections = soup.find_all(class_=['now', 'today', 'month', 'accrue'])
-                for section in sections:
-                    num = section.find(class_='num')
-                    if num:
-                        value = num.get_text(strip=True)
-                        section_class = section.get('class', [])
-                        if 'now' in section_class:
-                            data["current_power"] = value
-                        elif 'today' in section_class:
-                            data["today_generation"] = value
-                        elif 'month' in section_class:
-                            data["month_generation"] = value
-                        elif 'accrue' in section_class:
-                            data["total_generation"] = value
+                data = parse_monitoring_page(page_source, self._parse(page_source))
 
             logger.info(f"추출된 모니터링 데이터: {data}")
             return {
@@ -126,6 +161,53 @@ class HevitonScraper:
             logger.error(f"모니터링 데이터 조회 실패: {e}")
             return {"error": str(e), "data": {}}
 
+    def block_static_resources(self, patterns: Optional[list] = None) -> bool:
+        """
+        이미지/폰트 등 정적 리소스 차단 (CDP, 반복 샘플링 시 전송량 절감)
+
+        Returns:
+            적용 여부 (Chrome 외 드라이버는 False)
+        """
+        patterns = SAMPLER_CONFIG["blocked_resources"] if patterns is None else patterns
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+            return True
+        except Exception as e:
+            logger.debug(f"정적 리소스 차단 미지원: {e}")
+            return False
+
+    @traced("scraper.sample", ok=lambda result: any(result.values()))
+    def sample_monitoring(self, timeout: Optional[float] = None) -> Dict[str, Optional[str]]:
+        """
+        모니터링 카운터 샘플 (연속 수집용 경량 경로)
+
+        이미 모니터링 페이지에 있으면 새로고침만 하고, 고정 대기 대신 값이 채워질 때까지
+        짧은 간격으로 확인한다. 네 값은 스크립트 한 번으로 읽는다.
+
+        Args:
+            timeout: 값이 채워질 때까지 최대 대기 (초)
+
+        Returns:
+            {"current_power", "today_generation", "month_generation", "total_generation"}
+        """
+        timeout = SAMPLER_CONFIG["page_timeout"] if timeout is None else timeout
+
+        if "monitoring.do" in self.driver.current_url:
+            with span("scraper.navigate", page="monitoring.do", mode="refresh"):
+                self.driver.refresh()
+        else:
+            self._navigate(f"{self.base_url}/monitoring/status/monitoring.do?ua=m&inType=web", wait=0)
+
+        deadline = time.monotonic() + timeout
+        with span("scraper.wait", page="monitoring.do", mode="poll"):
+            while True:
+                values = self.driver.execute_script(MONITORING_SCRIPT) or {}
+                if values.get("today_generation") or time.monotonic() >= deadline:
+                    return values
+                time.sleep(SAMPLER_CONFIG["page_poll"])
+
+    @traced("scraper.converter", ok=lambda result: "error" not in result)
     def get_converter_status(self) -> Dict[str, Any]:
         """
         설비상태 페이지에서 컨버터/인버터 상태 확인
@@ -138,11 +220,10 @@ class HevitonScraper:
         try:
             # 설비상태 페이지로 이동
             url = f"{self.base_url}/monitoring/status/inverter.do?ua=m&inType=web&energyCode=501"
-            self.driver.get(url)
-            time.sleep(3)
+            self._navigate(url)
 
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'lxml')
+            page_source = self._page_source()
+            soup = self._parse(page_source)
 
             status_data = {
                 "is_normal": True,
@@ -171,28 +252,15 @@ class HevitonScraper:
                         if icon.is_displayed():
                             status_data["is_normal"] = False
 
-                # 컨버터 정보 추출
-                converter_sections = soup.find_all(class_=['converter', 'device_box', 'inverter_box'])
-                for section in converter_sections:
-                    name = section.find(class_=['name', 'title', 'device_name'])
-                    status = section.find(class_=['status', 'state'])
-                    if name:
-                        converter_info = {
-                            "name": name.get_text(strip=True),
-                            "status": "정상" if status and "error" not in str(status.get('class', [])) else "확인필요"
-                        }
-                        status_data["converters"].append(converter_info)
-
             except Exception as e:
                 logger.debug(f"컨버터 상태 상세 조회 실패: {e}")
 
-            # 실제 에러 상태만 확인 (단순 UI 텍스트가 아닌 실제 상태 메시지)
-            error_keywords = ["에러 발생", "통신 오류", "통신 이상", "장애 발생", "고장"]
-            for keyword in error_keywords:
-                if keyword in page_source:
-                    status_data["is_normal"] = False
-                    status_data["error_messages"].append(keyword)
-                    break
+            # 컨버터 정보 + 실제 에러 상태 (단순 UI 텍스트가 아닌 실제 상태 메시지)
+            page_status = parse_converter_page(page_source, soup)
+            status_data["converters"] = page_status["converters"]
+            if not page_status["is_normal"]:
+                status_data["is_normal"] = False
+                status_data["error_messages"].extend(page_status["error_messages"])
 
             logger.info(f"컨버터 상태: {'정상' if status_data['is_normal'] else '이상'}")
             return status_data
@@ -201,6 +269,7 @@ class HevitonScraper:
             logger.error(f"컨버터 상태 조회 실패: {e}")
             return {"is_normal": None, "error": str(e)}
 
+    @traced("scraper.recent_daily", ok=bool)
     def get_recent_daily_data(self, days: int = 5) -> list:
         """
         최근 N일간 일별 발전량 데이터 조회
@@ -216,18 +285,17 @@ class HevitonScraper:
         try:
             # 이력 페이지로 이동
             url = f"{self.base_url}/monitoring/stat/history.do?ua=m&inType=web"
-            self.driver.get(url)
+            self._navigate(url)
+
             time.sleep(3)
 
-            recent_data = []
+            # 방법 1: 인라인 스크립트의 차트 데이터 (보관본 재파싱과 같은 추출기)
+            page_source = self._page_source()
+            recent_data = parse_history_page(page_source)[-days:]
 
-            # JavaScript로 차트 데이터 추출 시도
+            # 방법 1-1: 스크립트 실행 후 채워지는 JavaScript 변수에서 추출
             try:
-                time.sleep(3)
-
-                # 차트 데이터나 테이블 데이터 추출
-                # 방법 1: JavaScript 변수에서 추출
-                chart_data = self.driver.execute_script("""
+                chart_data = None if recent_data else self.driver.execute_script("""
                     if (typeof chartData !== 'undefined') return chartData;
                     if (typeof dayData !== 'undefined') return dayData;
                     if (typeof dailyData !== 'undefined') return dailyData;
@@ -245,65 +313,13 @@ class HevitonScraper:
             # 방법 2: 통계 페이지에서 테이블 데이터 추출
             if not recent_data:
                 url = f"{self.base_url}/monitoring/stat/statistics.do?ua=m&inType=web&energyCode=501"
-                self.driver.get(url)
-                time.sleep(3)
+                self._navigate(url)
 
-                page_source = self.driver.page_source
-                soup = BeautifulSoup(page_source, 'lxml')
-
-                # 테이블에서 데이터 추출 (일별 발전량 테이블 찾기)
-                tables = soup.find_all('table')
-                for table in tables:
-                    rows = table.find_all('tr')
-                    # 헤더 확인: "기간"과 "총발전량" 컬럼이 있는 테이블 찾기
-                    if rows:
-                        header = rows[0].get_text(strip=True)
-                        if '기간' in header and '발전량' in header:
-                            # 모든 데이터 행 수집
-                            all_data = []
-                            for row in rows[1:]:  # 헤더 제외한 모든 행
-                                cols = row.find_all(['td', 'th'])
-                                if len(cols) >= 2:
-                                    date_text = cols[0].get_text(strip=True)
-                                    value_text = cols[1].get_text(strip=True)
-                                    # 날짜 형식 확인 (YYYY.MM.DD 또는 MM/DD)
-                                    # "합계", "기간" 등 헤더/푸터 행 제외
-                                    if date_text and value_text and ('.' in date_text or '/' in date_text):
-                                        if '합계' in date_text or '기간' in date_text:
-                                            continue  # 합계 행 건너뛰기
-                                        # 날짜를 MM/DD 형식으로 변환
-                                        if '.' in date_text:
-                                            parts = date_text.split('.')
-                                            if len(parts) >= 3:
-                                                date_text = f"{parts[1]}/{parts[2]}"
-                                        all_data.append({
-                                            "date": date_text,
-                                            "generation": value_text,
-                                        })
-                            # 날짜 기준 정렬 후 최근 N일 추출
-                            if all_data:
-                                # 날짜를 파싱하여 정렬 (MM/DD 형식, 연말/연초 처리)
-                                today = datetime.now()
-                                current_year = today.year
-                                current_month = today.month
-
-                                def parse_date_to_comparable(item):
-                                    try:
-                                        parts = item["date"].split("/")
-                                        month, day = int(parts[0]), int(parts[1])
-                                        # 연말에 1월 데이터가 있으면 다음 해로 처리
-                                        year = current_year
-                                        if current_month == 12 and month == 1:
-                                            year = current_year + 1
-                                        elif current_month == 1 and month == 12:
-                                            year = current_year - 1
-                                        return (year, month, day)
-                                    except:
-                                        return (0, 0, 0)
-
-                                all_data.sort(key=parse_date_to_comparable)
-                                recent_data = all_data[-days:]
-                            break  # 일별 테이블 찾았으면 종료
+                page_source = self._page_source()
+                soup = self._parse(page_source)
+
+                # 일별 발전량 테이블에서 최근 N일
+                recent_data = parse_recent_daily(page_source, days, soup=soup)
 
             # 방법 3: 모니터링 페이지의 시간별 그래프 데이터로 일별 합산
             if not recent_data:
@@ -323,6 +339,7 @@ class HevitonScraper:
             logger.error(f"최근 발전량 조회 실패: {e}")
             return []
 
+    @traced("scraper.statistics", ok=lambda result: "error" not in result)
     def get_statistics_data(self) -> Dict[str, Any]:
         """
         통계 페이지에서 발전량 데이터 추출
@@ -335,11 +352,10 @@ class HevitonScraper:
         try:
             # 통계 페이지로 이동
             url = f"{self.base_url}/monitoring/stat/statistics.do?ua=m&inType=web&energyCode=501"
-            self.driver.get(url)
-            time.sleep(3)
+            self._navigate(url)
 
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'lxml')
+            page_source = self._page_source()
+            soup = self._parse(page_source)
 
             data = {
                 "daily": [],
@@ -371,49 +387,53 @@ class HevitonScraper:
             logger.error(f"통계 데이터 조회 실패: {e}")
             return {"error": str(e), "data": {}}
 
+    @traced("scraper.all")
     def get_all_data(self) -> Dict[str, Any]:
         """
         모든 발전량 데이터 조회
 
+        화면 값은 여기서 한 번만 숫자/날짜로 해석한다 (src/models.py).
+
         Returns:
-            통합 데이터
+            통합 데이터 (dashboard: Dashboard, converter_status: ConverterStatus,
+            recent_5days: [DailyPoint, ...])
         """
         logger.info("전체 발전량 데이터 조회 시작")
 
         # 1. 모니터링 데이터 (현재/오늘/월별/누적 발전량)
         monitoring = self.get_monitoring_data()
-        mon_data = monitoring.get("data", {})
+        dashboard = Dashboard.from_raw(monitoring.get("data"))
+        checkpoint("monitoring")
 
         # 2. 컨버터 상태 확인
-        converter_status = self.get_converter_status()
+        converter_status = ConverterStatus.from_raw(self.get_converter_status())
+        checkpoint("converter")
 
         # 3. 최근 5일 발전량
-        recent_5days = self.get_recent_daily_data(5)
+        recent_5days = DailyPoint.parse_all(self.get_recent_daily_data(5), "recent_daily")
+        checkpoint("recent_daily")
 
+        now = datetime.now()
         return {
-            "collected_at": datetime.now().isoformat(),
+            "site": HEVITON_CONFIG["site_id"],
+            "collected_at": now.isoformat(),
             "daily": {
-                "date": datetime.now().strftime("%Y-%m-%d"),
-                "total": mon_data.get("today_generation"),
-                "current": mon_data.get("current_power"),
+                "date": now.strftime("%Y-%m-%d"),
+                "total": dashboard.today_generation,
+                "current": dashboard.current_power,
                 "data": [],
             },
             "weekly": {
-                "start_date": (datetime.now() - timedelta(days=datetime.now().weekday())).strftime("%Y-%m-%d"),
+                "start_date": (now - timedelta(days=now.weekday())).strftime("%Y-%m-%d"),
                 "total": None,
                 "data": [],
             },
             "monthly": {
-                "year_month": datetime.now().strftime("%Y-%m"),
-                "total": mon_data.get("month_generation"),
+                "year_month": now.strftime("%Y-%m"),
+                "total": dashboard.month_generation,
                 "data": [],
             },
-            "dashboard": {
-                "current_power": mon_data.get("current_power"),
-                "today_generation": mon_data.get("today_generation"),
-                "month_generation": mon_data.get("month_generation"),
-                "total_generation": mon_data.get("total_generation"),
-            },
+            "dashboard": dashboard,
             "converter_status": converter_status,
             "recent_5days": recent_5days,
         }
@@ -430,6 +450,6 @@ if __name__ == "__main__":
         if auth.is_logged_in:
             scraper = HevitonScraper(auth.get_driver())
             data = scraper.get_all_data()
-            print(json.dumps(data, indent=2, ensure_ascii=False))
+            print(json.dumps(data, indent=2, ensure_ascii=False, default=repr))
         else:
             print("로그인 실패!")
@@ -0,0 +1,250 @@
+"""
+Google Sheets 쓰기 버퍼 (write-behind)
+
+연속 수집 모드에서 샘플마다 values().append를 호출하지 않도록, 기록할 행을
+디스크 저널에 먼저 남기고 (시트, 키) 단위로 합친 뒤 시간/건수 기준으로
+한 번의 일괄 요청(GoogleSheetsClient.upsert_rows)으로 반영한다.
+
+반영은 주기 반영 스레드가 맡는다 (건수 도달 시 enqueue는 스레드만 깨우고 바로 반환).
+반영이 실패하면 지수 백오프 동안 다시 시도하지 않는다.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+
+import sys
+sys.path.append(str(__file__).rsplit('/', 2)[0])
+from config.settings import SHEETS_BUFFER_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class SheetsWriteBuffer:
+    """디스크 저널 기반 Sheets 쓰기 버퍼"""
+
+    def __init__(
+        self,
+        sheets,
+        journal_path: Optional[Path] = None,
+        flush_interval: Optional[float] = None,
+        max_pending: Optional[int] = None,
+    ):
+        """
+        Args:
+            sheets: GoogleSheetsClient
+            journal_path: 저널 파일 경로 (기본: SHEETS_BUFFER_CONFIG["journal"])
+            flush_interval: 주기 반영 간격 (초)
+            max_pending: 대기 건수가 이 값에 도달하면 즉시 반영
+        """
+        self.sheets = sheets
+        self.journal_path = Path(journal_path or SHEETS_BUFFER_CONFIG["journal"])
+        self.flush_interval = flush_interval or SHEETS_BUFFER_CONFIG["flush_interval"]
+        self.max_pending = max_pending or SHEETS_BUFFER_CONFIG["max_pending"]
+
+        # (시트, 키) -> 행 (같은 키는 마지막 값만 유지)
+        self._pending: "OrderedDict[Tuple[str, str], List[Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # 지표
+        self.last_flush_latency: Optional[float] = None
+        self.last_flush_at: Optional[float] = None
+        self.flush_count = 0
+        self.flush_failures = 0
+        self.rows_flushed = 0
+        self.consecutive_failures = 0
+        self._last_attempt = time.monotonic()
+        self._next_retry_at = 0.0   # 실패 후 재시도 가능 시각 (monotonic)
+
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        self._replay()
+
+    @property
+    def queue_depth(self) -> int:
+        """반영 대기 중인 행 수"""
+        with self._lock:
+            return len(self._pending)
+
+    def stats(self) -> Dict[str, Any]:
+        """버퍼 지표"""
+        return {
+            "queue_depth": self.queue_depth,
+            "last_flush_latency": self.last_flush_latency,
+            "last_flush_at": self.last_flush_at,
+            "flush_count": self.flush_count,
+            "flush_failures": self.flush_failures,
+            "rows_flushed": self.rows_flushed,
+            "retry_in": max(self._next_retry_at - time.monotonic(), 0),
+        }
+
+    def _replay(self):
+        """저널에 남은 미반영 쓰기 복원 (이전 실행 비정상 종료 대비)"""
+        if not self.journal_path.exists():
+            return
+
+        restored = 0
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # 기록 도중 중단된 마지막 줄
+                    logger.warning("손상된 저널 항목 무시")
+                    continue
+                self._pending[(entry["sheet"], entry["key"])] = entry["row"]
+                restored += 1
+
+        if self._pending:
+            logger.info(f"쓰기 저널 복원: {len(self._pending)}행 (항목 {restored}건)")
+            self._rewrite_journal()
+
+    def _rewrite_journal(self):
+        """대기 중인 행으로 저널 재작성 (임시 파일 교체)"""
+        tmp_path = self.journal_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for (sheet, key), row in self._pending.items():
+                f.write(json.dumps({"sheet": sheet, "key": key, "row": row}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+
+    def enqueue(self, sheet: str, row: List[Any]):
+        """
+        기록할 행 추가 (첫 컬럼이 키)
+
+        Args:
+            sheet: 시트 이름
+            row: 시트 행
+        """
+        key = str(row[0])
+        line = json.dumps({"sheet": sheet, "key": key, "row": row}, ensure_ascii=False)
+
+        with self._lock:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+            self._pending.pop((sheet, key), None)
+            self._pending[(sheet, key)] = row
+            full = len(self._pending) >= self.max_pending
+
+        if full:
+            if self._thread:
+                self._wakeup.set()   # 반영은 주기 반영 스레드에서 (호출 스레드는 대기하지 않음)
+            elif time.monotonic() >= self._next_retry_at:
+                self.flush()
+
+    def record_all(self, data: Dict[str, Any]):
+        """수집 데이터의 일별 행을 버퍼에 추가 (GoogleSheetsClient.record_all 대응)"""
+        from src.google_sheets import SHEET_DAILY, build_daily_record, daily_row
+
+        self.enqueue(SHEET_DAILY, daily_row(build_daily_record(data)))
+
+    def flush(self) -> bool:
+        """
+        대기 중인 행을 한 번의 일괄 요청으로 반영
+
+        Returns:
+            성공 여부 (대기 행이 없으면 True)
+        """
+        with self._flush_lock:
+            with self._lock:
+                snapshot = dict(self._pending)
+
+            if not snapshot:
+                return True
+
+            rows_by_sheet: Dict[str, List[List[Any]]] = {}
+            for (sheet, _), row in snapshot.items():
+                rows_by_sheet.setdefault(sheet, []).append(row)
+
+            self._last_attempt = time.monotonic()
+            started = time.perf_counter()
+            try:
+                ok = self.sheets.upsert_rows(rows_by_sheet)
+            except Exception as e:
+                logger.error(f"Sheets 버퍼 반영 실패: {e}")
+                ok = False
+            self.last_flush_latency = time.perf_counter() - started
+
+            if not ok:
+                self.flush_failures += 1
+                self.consecutive_failures += 1
+                backoff = min(
+                    SHEETS_BUFFER_CONFIG["retry_backoff"] * (2 ** (self.consecutive_failures - 1)),
+                    SHEETS_BUFFER_CONFIG["max_backoff"],
+                )
+                self._next_retry_at = time.monotonic() + backoff
+                logger.warning(f"Sheets 버퍼 반영 실패 - {len(snapshot)}행 유지, {backoff:.0f}초 후 재시도")
+                return False
+
+            with self._lock:
+                # 반영 중 같은 키가 다시 갱신되었으면 유지
+                for item, row in snapshot.items():
+                    if self._pending.get(item) is row:
+                        del self._pending[item]
+                self._rewrite_journal()
+
+            self.consecutive_failures = 0
+            self._next_retry_at = 0.0
+            self.flush_count += 1
+            self.rows_flushed += len(snapshot)
+            self.last_flush_at = time.time()
+            logger.info(f"Sheets 버퍼 반영: {len(snapshot)}행, {self.last_flush_latency:.2f}초")
+            return True
+
+    def _due_in(self) -> float:
+        """다음 반영까지 남은 시간 (실패 후 백오프 > 건수 도달 > 주기)"""
+        now = time.monotonic()
+        if now < self._next_retry_at:
+            return self._next_retry_at - now
+        if self.queue_depth >= self.max_pending:
+            return 0
+        return max(self._last_attempt + self.flush_interval - now, 0)
+
+    def _run(self):
+        """주기 반영 스레드 (건수 도달 시 enqueue가 깨움)"""
+        while True:
+            self._wakeup.wait(self._due_in())
+            self._wakeup.clear()
+            if self._stop.is_set():
+                return
+            if self._due_in() > 0:
+                continue
+            if self.queue_depth:
+                self.flush()
+            else:
+                self._last_attempt = time.monotonic()
+
+    def start(self):
+        """주기 반영 스레드 시작"""
+        if self._thread is None:
+            self._stop.clear()
+            self._last_attempt = time.monotonic()
+            self._thread = threading.Thread(target=self._run, name="sheets-buffer", daemon=True)
+            self._thread.start()
+
+    def close(self) -> bool:
+        """주기 반영 중지 후 남은 행 반영 (실패분은 저널에 남아 다음 실행에서 재생)"""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        return self.flush()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
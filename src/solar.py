@@ -0,0 +1,225 @@
+"""
+일출/일몰 기반 샘플링 스케줄 모듈
+
+사이트 좌표로 일출/남중/일몰 시각을 직접 계산하고 (NOAA 일반 태양 위치 근사식, 외부 서비스 없음)
+시간대별 샘플 간격을 정한다.
+- 밤 (일출 전/일몰 후 margin 밖): 샘플 없음 (night_interval 설정 시 저속 샘플)
+- 낮 (일출~일몰 ± margin): shoulder_interval 간격
+- 남중 전후 peak_hours: peak_interval 간격 (발전량 최대 구간)
+- 일몰 + settlement_delay: 하루 한 번 정산 샘플 (오늘 발전량 최종값 기록)
+
+모든 시각은 SCHEDULER_CONFIG의 UTC 오프셋 기준 naive datetime이다.
+"""
+import math
+from dataclasses import dataclass
+from datetime import date, datetime, time as dtime, timedelta
+from typing import Dict, Optional, Tuple, List
+
+import sys
+sys.path.append(str(__file__).rsplit('/', 2)[0])
+from config.settings import SOLAR_CONFIG, SCHEDULER_CONFIG
+
+SAMPLE = "sample"
+SETTLEMENT = "settlement"
+
+# 일출/일몰 기준 태양 천정각 (대기 굴절 + 태양 반지름 보정)
+SUNRISE_ZENITH = math.radians(90.833)
+
+
+@dataclass
+class SunTimes:
+    """하루의 일출/남중/일몰 시각 (극야/백야면 sunrise/sunset이 None)"""
+    sunrise: Optional[datetime]
+    noon: datetime
+    sunset: Optional[datetime]
+    polar_day: bool = False  # 백야 (해가 지지 않음)
+
+
+def sun_times(day: date, latitude: float, longitude: float,
+              utc_offset_hours: Optional[float] = None) -> SunTimes:
+    """
+    일출/남중/일몰 시각 계산 (NOAA General Solar Position 근사식, 오차 약 1분)
+
+    Args:
+        day: 날짜
+        latitude: 위도 (북위 +)
+        longitude: 경도 (동경 +)
+        utc_offset_hours: 결과 시간대 (기본: SCHEDULER_CONFIG["utc_offset_hours"])
+
+    Returns:
+        SunTimes (현지 시각)
+    """
+    offset = SCHEDULER_CONFIG["utc_offset_hours"] if utc_offset_hours is None else utc_offset_hours
+
+    # 연중 위치 (라디안, 정오 기준)
+    days_in_year = 366 if day.year % 4 == 0 and (day.year % 100 != 0 or day.year % 400 == 0) else 365
+    gamma = 2 * math.pi / days_in_year * (day.timetuple().tm_yday - 1)
+
+    # 균시차 (분), 태양 적위 (라디안)
+    eqtime = 229.18 * (0.000075 + 0.001868 * math.cos(gamma) - 0.032077 * math.sin(gamma)
+                       - 0.014615 * math.cos(2 * gamma) - 0.040849 * math.sin(2 * gamma))
+    decl = (0.006918 - 0.399912 * math.cos(gamma) + 0.070257 * math.sin(gamma)
+            - 0.006758 * math.cos(2 * gamma) + 0.000907 * math.sin(2 * gamma)
+            - 0.002697 * math.cos(3 * gamma) + 0.00148 * math.sin(3 * gamma))
+
+    midnight = datetime.combine(day, dtime())
+
+    def local(utc_minutes: float) -> datetime:
+        return (midnight + timedelta(minutes=utc_minutes + offset * 60)).replace(microsecond=0)
+
+    noon = local(720 - 4 * longitude - eqtime)
+
+    lat = math.radians(latitude)
+    cos_ha = math.cos(SUNRISE_ZENITH) / (math.cos(lat) * math.cos(decl)) - math.tan(lat) * math.tan(decl)
+    if not -1 <= cos_ha <= 1:
+        # 극야(cos_ha > 1) 또는 백야(cos_ha < -1)
+        return SunTimes(None, noon, None, polar_day=cos_ha < -1)
+
+    ha = math.degrees(math.acos(cos_ha))
+    return SunTimes(
+        sunrise=local(720 - 4 * (longitude + ha) - eqtime),
+        noon=noon,
+        sunset=local(720 - 4 * (longitude - ha) - eqtime),
+    )
+
+
+class SolarPolicy:
+    """일출/일몰 기반 샘플 시각 정책 (PowerSampler policy)"""
+
+    def __init__(
+        self,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        shoulder_interval: Optional[float] = None,
+        peak_interval: Optional[float] = None,
+        night_interval: Optional[float] = None,
+    ):
+        """
+        Args:
+            latitude / longitude: 사이트 좌표 (기본: SOLAR_CONFIG)
+            shoulder_interval: 낮 샘플 간격 (초)
+            peak_interval: 남중 전후 샘플 간격 (초)
+            night_interval: 밤 샘플 간격 (초, 0이면 샘플 없음)
+        """
+        self.latitude = SOLAR_CONFIG["latitude"] if latitude is None else latitude
+        self.longitude = SOLAR_CONFIG["longitude"] if longitude is None else longitude
+        self.shoulder_interval = shoulder_interval or SOLAR_CONFIG["shoulder_interval"]
+        self.peak_interval = peak_interval or SOLAR_CONFIG["peak_interval"]
+        self.night_interval = SOLAR_CONFIG["night_interval"] if night_interval is None else night_interval
+        self.margin = timedelta(minutes=SOLAR_CONFIG["margin_minutes"])
+        self.peak = timedelta(hours=SOLAR_CONFIG["peak_hours"])
+        self.settlement_delay = timedelta(minutes=SOLAR_CONFIG["settlement_delay_minutes"])
+        self._phases: Dict[date, List[Tuple[datetime, datetime, float]]] = {}
+
+    def sun(self, day: date) -> SunTimes:
+        return sun_times(day, self.latitude, self.longitude)
+
+    def phases(self, day: date) -> List[Tuple[datetime, datetime, float]]:
+        """
+        하루의 구간별 샘플 간격 [(시작, 끝, 간격 초), ...] (간격 0 구간은 제외)
+        """
+        if day in self._phases:
+            return self._phases[day]
+
+        start = datetime.combine(day, dtime())
+        end = start + timedelta(days=1)
+        sun = self.sun(day)
+
+        if sun.sunrise is None:
+            # 백야면 하루 종일 낮 간격, 극야면 밤 간격
+            phases = [(start, end, self.shoulder_interval if sun.polar_day else self.night_interval)]
+        else:
+            day_start = max(sun.sunrise - self.margin, start)
+            day_end = min(sun.sunset + self.margin, end)
+            peak_start = max(sun.noon - self.peak, day_start)
+            peak_end = min(sun.noon + self.peak, day_end)
+            phases = [
+                (start, day_start, self.night_interval),
+                (day_start, peak_start, self.shoulder_interval),
+                (peak_start, peak_end, self.peak_interval),
+                (peak_end, day_end, self.shoulder_interval),
+                (day_end, end, self.night_interval),
+            ]
+
+        phases = [(a, b, interval) for a, b, interval in phases if interval and b > a]
+        if len(self._phases) > 7:
+            self._phases.clear()
+        self._phases[day] = phases
+        return phases
+
+    def settlement_at(self, day: date) -> datetime:
+        """정산 샘플 시각 (일몰 + settlement_delay, 일몰이 없으면 23:00)"""
+        sun = self.sun(day)
+        if sun.sunset is None:
+            return datetime.combine(day, dtime(23, 0))
+        return min(sun.sunset + self.settlement_delay, datetime.combine(day, dtime(23, 59)))
+
+    def interval_at(self, moment: datetime) -> float:
+        """해당 시각의 샘플 간격 (초, 0이면 샘플 없음)"""
+        for start, end, interval in self.phases(moment.date()):
+            if start <= moment < end:
+                return interval
+        return 0
+
+    def next_due(self, now: datetime) -> Tuple[datetime, str]:
+        """
+        now 이후 다음 샘플 시각과 종류
+
+        구간 안에서는 자정 기준 간격 격자에 맞춰 시각이 흔들리지 않도록 한다.
+
+        Returns:
+            (시각, SAMPLE 또는 SETTLEMENT)
+        """
+        candidates = []
+        for day in (now.date(), now.date() + timedelta(days=1), now.date() + timedelta(days=2)):
+            settlement = self.settlement_at(day)
+            if settlement > now:
+                candidates.append((settlement, SETTLEMENT))
+
+            midnight = datetime.combine(day, dtime())
+            for start, end, interval in self.phases(day):
+                if end <= now:
+                    continue
+                if start > now:
+                    due = start
+                else:
+                    steps = math.floor((now - midnight).total_seconds() / interval) + 1
+                    due = midnight + timedelta(seconds=steps * interval)
+                if due < end:
+                    candidates.append((due, SAMPLE))
+                    break
+
+            if candidates:
+                break
+
+        # 같은 시각이면 정산 샘플 우선 (정산이 일반 샘플에 가려지지 않도록)
+        return min(candidates, key=lambda candidate: (candidate[0], candidate[1] != SETTLEMENT))
+
+    def plan(self, day: date) -> List[Tuple[datetime, str]]:
+        """하루 샘플 계획 (예상 요청 수 확인용)"""
+        plan = []
+        moment = datetime.combine(day, dtime()) - timedelta(microseconds=1)
+        end = datetime.combine(day + timedelta(days=1), dtime())
+        while True:
+            moment, kind = self.next_due(moment)
+            if moment >= end:
+                return plan
+            plan.append((moment, kind))
+
+
+# 테스트용 (오늘 샘플 계획 및 고정 간격 대비 요청 수)
+if __name__ == "__main__":
+    from config.settings import SAMPLER_CONFIG
+
+    policy = SolarPolicy()
+    today = date.today()
+    sun = policy.sun(today)
+    print(f"좌표 {policy.latitude}, {policy.longitude} / {today}")
+    print(f"일출 {sun.sunrise:%H:%M}  남중 {sun.noon:%H:%M}  일몰 {sun.sunset:%H:%M}")
+
+    fixed_per_day = 86400 / SAMPLER_CONFIG["interval"]
+    for offset in (0, 60, 120, 180, 240, 300):
+        day = today + timedelta(days=offset)
+        count = len(policy.plan(day))
+        print(f"{day}: 샘플 {count}회 (고정 {SAMPLER_CONFIG['interval']:g}초 간격 {fixed_per_day:.0f}회 대비 "
+              f"{count / fixed_per_day * 100:.0f}%)")
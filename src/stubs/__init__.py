@@ -0,0 +1,3 @@
+"""
+오프라인 테스트/벤치마크용 로컬 대체 서버
+"""
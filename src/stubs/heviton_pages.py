@@ -0,0 +1,293 @@
+"""
+Heviton 모니터링 페이지 HTML 생성 (익명화한 화면 구조)
+
+실제 페이지에서 추출기(src/parsers.py)와 로그인 확인(src/auth.py)이 보는 구조만 남기고
+사이트명/사용자/설비명은 가상의 값으로 바꿨다. 파서 벤치마크 고정 페이지(fixtures/heviton)와
+로컬 대체 서버(src/stubs/heviton_site.py)가 같은 생성 함수를 쓴다.
+- login.do: #loginId/#password 입력, a.btn76.c1 로그인 버튼, 실패 시 SweetAlert 팝업
+- monitoring.do: .now/.today/.month/.accrue 안의 .num 카운터
+- inverter.do: .device_box 설비 목록 (.status.normal / .status.error), 이상 메시지 .error
+- history.do: 인라인 스크립트 chartData 배열
+- statistics.do: 요약 표 + "기간/발전량" 일별 표 (YYYY.MM.DD, 값 없는 날 "-", 합계 행)
+- data_url 지정 시 모니터링 카운터/통계 표를 비워 두고 로드 후 JSON으로 채움 (대체 서버의 AJAX 모드)
+
+Usage:
+    python -m src.stubs.heviton_pages                       # fixtures/heviton 다시 생성
+    python -m src.stubs.heviton_pages --synthetic 3650      # 10년치 통계 표도 함께 생성
+"""
+import argparse
+import html
+import json
+import math
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures" / "heviton"
+
+SITE_NAME = "테스트 태양광 발전소"
+USER_NAME = "홍길동"
+
+# 고정 페이지 기준일 (재생성해도 같은 내용)
+FIXTURE_TODAY = date(2026, 10, 15)
+
+Point = Tuple[date, Optional[float]]
+
+
+def synthetic_generation(day: date, capacity_kw: float = 99.0) -> Optional[float]:
+    """날짜별 가상 발전량 (kWh, 계절/요일 변동, 가끔 수집 누락은 None)"""
+    ordinal = day.toordinal()
+    if ordinal % 97 == 0:
+        return None
+    season = 0.75 + 0.25 * math.cos((day.timetuple().tm_yday - 172) / 365 * 2 * math.pi)
+    weather = 0.45 + 0.55 * ((ordinal * 7919) % 100) / 100
+    return round(capacity_kw * 4.2 * season * weather, 2)
+
+
+def synthetic_points(start: date, days: int) -> List[Point]:
+    return [(start + timedelta(days=i), synthetic_generation(start + timedelta(days=i))) for i in range(days)]
+
+
+def _number(value: Optional[float], digits: int = 2) -> str:
+    return "-" if value is None else f"{value:,.{digits}f}"
+
+
+def layout(title: str, body: str, scripts: str = "") -> str:
+    """공통 레이아웃 (머리글, 메뉴, 로그인 사용자 표시)"""
+    return f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>{html.escape(title)} | HEVITON</title>
+<link rel="stylesheet" href="/resources/css/common.css">
+<link rel="stylesheet" href="/resources/css/monitoring.css">
+<script src="/resources/js/jquery-3.6.0.min.js"></script>
+<script src="/resources/js/common.js"></script>
+</head>
+<body>
+<div id="wrap">
+  <header id="header">
+    <h1 class="logo"><a href="/monitoring/status/monitoring.do?ua=m&amp;inType=web">HEVITON</a></h1>
+    <p class="site_name">{html.escape(SITE_NAME)}</p>
+    <div class="user_info"><span class="user_name">{html.escape(USER_NAME)}님</span>
+      <a href="/monitoring/login/logoutProc.do" class="btn_logout">로그아웃</a></div>
+    <nav id="gnb">
+      <ul>
+        <li><a href="/monitoring/status/monitoring.do?ua=m&amp;inType=web">모니터링</a></li>
+        <li><a href="/monitoring/status/inverter.do?ua=m&amp;inType=web&amp;energyCode=501">설비상태</a></li>
+        <li><a href="/monitoring/stat/history.do?ua=m&amp;inType=web">발전이력</a></li>
+        <li><a href="/monitoring/stat/statistics.do?ua=m&amp;inType=web&amp;energyCode=501">통계</a></li>
+      </ul>
+    </nav>
+  </header>
+  <div id="container">
+    <h2 class="tit">{html.escape(title)}</h2>
+{body}
+  </div>
+  <footer id="footer"><p>Copyright HEVITON. All rights reserved.</p></footer>
+</div>
+{scripts}
+</body>
+</html>
+"""
+
+
+def login_page(error: Optional[str] = None) -> str:
+    """로그인 페이지 (error: idNotFound / passNotEq, loginProc.do 실패 리다이렉트의 ret 값)"""
+    messages = {"idNotFound": "등록되지 않은 아이디입니다.", "passNotEq": "비밀번호가 일치하지 않습니다."}
+    alert = (f'<div class="swal-overlay swal-overlay--show-modal"><div class="swal-modal">'
+             f'<div class="swal-text">{messages.get(error, "로그인에 실패했습니다.")}</div></div></div>'
+             if error else "")
+    return f"""<!DOCTYPE html>
+<html lang="ko">
+<head><meta charset="UTF-8"><title>로그인 | HEVITON</title></head>
+<body>
+<div class="login_wrap">
+  <h1>HEVITON</h1>
+  <form id="loginForm" method="post" action="/monitoring/login/loginProc.do">
+    <input type="text" id="loginId" name="loginId" placeholder="아이디">
+    <input type="password" id="password" name="password" placeholder="비밀번호">
+    <a href="#" class="btn76 c1" onclick="document.getElementById('loginForm').submit(); return false;">로그인</a>
+  </form>
+</div>
+{alert}
+</body>
+</html>
+"""
+
+
+def monitoring_page(current_power: str = "50,000", today_generation: str = "123.45",
+                    month_generation: str = "3,456.78", total_generation: str = "28.90",
+                    data_url: Optional[str] = None) -> str:
+    """모니터링 페이지 (카운터 값은 화면 문자열 그대로, data_url이면 빈 카운터를 JSON으로 채움)"""
+    counters = [
+        ("now", "현재 발전량", current_power, "W"),
+        ("today", "오늘 발전량", today_generation, "kWh"),
+        ("month", "이번달 발전량", month_generation, "kWh"),
+        ("accrue", "누적 발전량", total_generation, "MWh"),
+    ]
+    items = "\n".join(
+        f'      <li class="{css}"><strong class="label">{label}</strong>'
+        f'<span class="num">{html.escape(value)}</span><em class="unit">{unit}</em></li>'
+        for css, label, value, unit in counters
+    )
+    body = f"""    <div class="monitoring_box">
+      <ul class="counter">
+{items}
+      </ul>
+      <div class="chart_area"><canvas id="hourChart" width="800" height="300"></canvas></div>
+      <div class="weather"><span class="temp">18.2℃</span><span class="sky">맑음</span></div>
+    </div>"""
+    scripts = '<script>$(function () { drawHourChart("hourChart"); });</script>'
+    if data_url:
+        scripts += f"""
+<script>
+fetch({json.dumps(data_url)}, {{credentials: "same-origin"}}).then(function (r) {{ return r.json(); }}).then(function (d) {{
+  [["now", "current_power"], ["today", "today_generation"], ["month", "month_generation"],
+   ["accrue", "total_generation"]].forEach(function (c) {{
+    document.querySelector("." + c[0] + " .num").textContent = d[c[1]];
+  }});
+}});
+</script>"""
+    return layout("모니터링", body, scripts)
+
+
+def inverter_page(converters: Sequence[Tuple[str, bool]] = (("인버터 1", True), ("인버터 2", True)),
+                  error_message: Optional[str] = None) -> str:
+    """설비상태 페이지 (converters: [(이름, 정상 여부)], error_message: 이상 메시지 예: "통신 오류")"""
+    boxes = "\n".join(
+        f'      <div class="device_box"><span class="device_name">{html.escape(name)}</span>'
+        f'<span class="status {"normal" if normal else "error"}">{"정상" if normal else "점검"}</span>'
+        f'<dl><dt>출력</dt><dd>{48.2 if normal else 0.0} kW</dd></dl></div>'
+        for name, normal in converters
+    )
+    alert = f'\n      <p class="error">{html.escape(error_message)}</p>' if error_message else ""
+    body = f"""    <div class="inverter_list">{alert}
+{boxes}
+    </div>"""
+    return layout("설비상태", body)
+
+
+def history_page(points: Iterable[Point], variable: str = "chartData") -> str:
+    """발전이력 페이지 (차트 데이터는 인라인 스크립트 배열)"""
+    data = [{"date": f"{day:%Y.%m.%d}", "generation": _number(value).replace(",", "")} for day, value in points]
+    body = '    <div class="chart_area"><canvas id="dayChart" width="800" height="300"></canvas></div>'
+    scripts = (f"<script>\nvar {variable} = {json.dumps(data, ensure_ascii=False)};\n"
+               f'$(function () {{ drawDayChart("dayChart", {variable}); }});\n</script>')
+    return layout("발전이력", body, scripts)
+
+
+def statistics_data(points: Sequence[Point]) -> Dict[str, Any]:
+    """통계 표 셀 문자열 {"rows": [[기간, 발전량, 발전시간, 최대출력], ...], "total": 합계}"""
+    return {
+        "rows": [[f"{day:%Y.%m.%d}", _number(value), _number(None if value is None else value / 99.0, 1),
+                  _number(None if value is None else value / 4.2, 1)] for day, value in points],
+        "total": _number(sum(value or 0.0 for _, value in points)),
+    }
+
+
+def statistics_page(points: Sequence[Point], start: Optional[date] = None,
+                    end: Optional[date] = None, data_url: Optional[str] = None) -> str:
+    """통계 페이지 (요약 표 + 일별 표, 합계 행 포함, data_url이면 빈 표를 JSON으로 채움)"""
+    start = start or (points[0][0] if points else FIXTURE_TODAY)
+    end = end or (points[-1][0] if points else FIXTURE_TODAY)
+    data = statistics_data(points)
+    if data_url:
+        rows = total = summary = ""
+    else:
+        rows = "\n".join(f"        <tr><td>{'</td><td>'.join(cells)}</td></tr>" for cells in data["rows"])
+        total = f'\n        <tr class="total"><td>합계</td><td>{data["total"]}</td><td>-</td><td>-</td></tr>'
+        summary = f'{data["total"]} kWh'
+    body = f"""    <form class="search_form" method="get" action="/monitoring/stat/statistics.do">
+      <input type="hidden" name="ua" value="m"><input type="hidden" name="inType" value="web">
+      <input type="hidden" name="energyCode" value="501">
+      <input type="date" name="startDate" value="{start:%Y-%m-%d}"> ~
+      <input type="date" name="endDate" value="{end:%Y-%m-%d}">
+      <button type="submit">조회</button>
+    </form>
+    <table class="tbl_summary">
+      <tr><th>구분</th><th>설비용량</th><th>조회기간 합계</th></tr>
+      <tr><td>{html.escape(SITE_NAME)}</td><td>99.00 kW</td><td id="statTotal">{summary}</td></tr>
+    </table>
+    <table class="tbl_list">
+      <thead>
+        <tr><th>기간</th><th>발전량(kWh)</th><th>발전시간(h)</th><th>최대출력(kW)</th></tr>
+      </thead>
+      <tbody id="statRows">
+{rows}{total}
+      </tbody>
+    </table>"""
+    scripts = ""
+    if data_url:
+        scripts = f"""<script>
+fetch({json.dumps(data_url)}, {{credentials: "same-origin"}}).then(function (r) {{ return r.json(); }}).then(function (d) {{
+  document.getElementById("statTotal").textContent = d.total + " kWh";
+  document.getElementById("statRows").innerHTML = d.rows.map(function (c) {{
+    return "<tr><td>" + c.join("</td><td>") + "</td></tr>";
+  }}).join("") + '<tr class="total"><td>합계</td><td>' + d.total + "</td><td>-</td><td>-</td></tr>";
+}});
+</script>"""
+    return layout("통계", body, scripts)
+
+
+def statistics_fixture(days: int, end: date = FIXTURE_TODAY - timedelta(days=1)) -> str:
+    """end까지 days일 통계 페이지 (다년 합성 표)"""
+    start = end - timedelta(days=days - 1)
+    return statistics_page(synthetic_points(start, days), start, end)
+
+
+# 고정 페이지: 파일명 -> (페이지 파일명, 생성 함수, 기대 추출 결과 요약)
+CORPUS: Dict[str, Tuple[str, Callable[[], str], Dict[str, Any]]] = {
+    "monitoring.html": ("monitoring.do", monitoring_page,
+                        {"current_power": "50,000", "today_generation": "123.45",
+                         "month_generation": "3,456.78", "total_generation": "28.90"}),
+    "monitoring_empty.html": ("monitoring.do", lambda: monitoring_page("-", "-", "-", "-"),
+                              {"current_power": "-", "today_generation": "-",
+                               "month_generation": "-", "total_generation": "-"}),
+    "inverter_normal.html": ("inverter.do", inverter_page,
+                             {"is_normal": True, "converters": 2}),
+    "inverter_error.html": ("inverter.do",
+                            lambda: inverter_page((("인버터 1", True), ("인버터 2", False)), "통신 오류"),
+                            {"is_normal": False, "converters": 2, "error_messages": ["통신 오류"]}),
+    "history.html": ("history.do", lambda: history_page(synthetic_points(FIXTURE_TODAY - timedelta(days=30), 30)),
+                     {"rows": 30}),
+    "statistics.html": ("statistics.do", lambda: statistics_fixture(30), {"rows": 30}),
+}
+
+
+def write_corpus(directory: Path = FIXTURE_DIR, synthetic_days: Sequence[int] = ()) -> List[Path]:
+    """고정 페이지 + manifest.json 생성 (synthetic_days: 추가로 만들 다년 통계 표 일수)"""
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+    written = []
+    for filename, (page, render, expected) in CORPUS.items():
+        (directory / filename).write_text(render(), encoding="utf-8")
+        manifest[filename] = {"page": page, "expected": expected}
+        written.append(directory / filename)
+    for days in synthetic_days:
+        filename = f"statistics_{days}d.html"
+        (directory / filename).write_text(statistics_fixture(days), encoding="utf-8")
+        manifest[filename] = {"page": "statistics.do", "expected": {"rows": days}}
+        written.append(directory / filename)
+    (directory / "manifest.json").write_text(json.dumps(manifest, ensure_ascii=False, indent=2) + "\n",
+                                             encoding="utf-8")
+    return written
+
+
+def load_corpus(directory: Path = FIXTURE_DIR) -> Dict[str, Tuple[str, str, Dict[str, Any]]]:
+    """고정 페이지 읽기 -> {파일명: (페이지 파일명, HTML, 기대 결과)}"""
+    manifest = json.loads((directory / "manifest.json").read_text(encoding="utf-8"))
+    return {
+        filename: (item["page"], (directory / filename).read_text(encoding="utf-8"), item["expected"])
+        for filename, item in manifest.items()
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Heviton 고정 페이지 생성")
+    parser.add_argument("--dir", type=Path, default=FIXTURE_DIR, help="출력 디렉토리")
+    parser.add_argument("--synthetic", type=int, nargs="*", default=[], help="추가 다년 통계 표 일수")
+    args = parser.parse_args()
+    for path in write_corpus(args.dir, args.synthetic):
+        print(f"{path} ({path.stat().st_size:,} bytes)")
@@ -0,0 +1,378 @@
+"""
+Heviton 모니터링 사이트 로컬 대체 서버 (오프라인 전 구간 실행용)
+
+로그인부터 통계 조회까지 크롤러(src/auth.py, src/scraper.py, src/backfill.py)가 거치는 경로만 구현한다.
+화면은 src/stubs/heviton_pages.py 생성 함수를 쓰고, 발전량은 날짜별 합성 값(synthetic_generation)이다.
+- /monitoring/login/login.do, loginProc.do (실패 시 login.do?ret=idNotFound / ret=passNotEq), logoutProc.do
+- /monitoring/status/monitoring.do, inverter.do, /monitoring/stat/history.do, statistics.do (startDate/endDate)
+- AJAX 모드(기본): 모니터링 카운터와 통계 표를 페이지 로드 후 JSON(monitoringData.do, statisticsData.do)으로
+  채움 (실제 사이트의 JSON 경로는 확인하지 못해 같은 역할의 경로로 둠, --no-ajax면 HTML에 값 포함)
+- 지연 시간 (페이지/JSON/정적 리소스), 느린 AJAX, 500 응답/응답 지연/세션 만료 주입
+
+Usage:
+    python -m src.stubs.heviton_site --port 8083 --latency 0.2 --ajax-delay 4 --error-rate 0.05
+    HEVITON_BASE_URL=http://127.0.0.1:8083 HEVITON_USER_ID=test HEVITON_PASSWORD=test python main.py --daily
+"""
+import argparse
+import json
+import logging
+import math
+import random
+import secrets
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, List, Tuple
+from urllib.parse import urlsplit, parse_qs, urlencode
+
+from src.stubs.heviton_pages import (login_page, monitoring_page, inverter_page, history_page,
+                                     statistics_page, statistics_data, synthetic_generation, synthetic_points,
+                                     layout)
+
+logger = logging.getLogger(__name__)
+
+LOGIN_PATH = "/monitoring/login/login.do"
+SESSION_COOKIE = "JSESSIONID"
+RESOURCE_TYPES = {"css": "text/css", "js": "application/javascript", "png": "image/png", "ico": "image/x-icon"}
+
+# (상태 코드, 헤더, 본문)
+Response = Tuple[int, List[Tuple[str, str]], bytes]
+
+
+class FakeHevitonSite:
+    """Heviton 모니터링 사이트 로컬 대체 서버"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, user_id: str = "test", password: str = "test",
+                 today: Optional[date] = None, history_days: int = 3 * 365, latency: float = 0.0,
+                 ajax: bool = True, ajax_delay: float = 0.0, resource_latency: float = 0.0,
+                 error_rate: float = 0.0, hang_rate: float = 0.0, hang_seconds: float = 30.0,
+                 expire_rate: float = 0.0, inverter_fault: bool = False, seed: Optional[int] = None):
+        """
+        Args:
+            host: 바인딩 주소
+            port: 포트 (0이면 임의 포트)
+            user_id/password: 로그인 계정
+            today: 기준일 (기본: 실행일, 고정하면 같은 기록)
+            history_days: 기준일 이전 발전 기록 일수 (설치일)
+            latency: 페이지/JSON 요청당 지연 시간 (초)
+            ajax: 카운터/통계 표를 JSON으로 채움 (False면 HTML에 포함)
+            ajax_delay: JSON 응답 추가 지연 (초, 느린 AJAX)
+            resource_latency: 정적 리소스(/resources/) 지연 시간 (초)
+            error_rate: 로그인 후 요청의 500 응답 확률
+            hang_rate: 로그인 후 요청의 응답 지연(hang_seconds) 확률
+            hang_seconds: 응답 지연 시간 (초)
+            expire_rate: 로그인 후 요청의 세션 만료(로그인 페이지로 이동) 확률
+            inverter_fault: 설비상태 페이지에 이상 설비 표시
+            seed: 장애 주입 난수 시드
+        """
+        self.user_id = user_id
+        self.password = password
+        self._today = today
+        self.history_days = history_days
+        self.latency = latency
+        self.ajax = ajax
+        self.ajax_delay = ajax_delay
+        self.resource_latency = resource_latency
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.expire_rate = expire_rate
+        self.inverter_fault = inverter_fault
+        self.random = random.Random(seed)
+
+        self.sessions: Dict[str, float] = {}   # 세션 토큰 -> 로그인 시각
+        self.requests: Counter = Counter()     # 페이지 파일명별 요청 수
+        self.status_counts: Counter = Counter()
+        self.logins: Counter = Counter()       # ok / idNotFound / passNotEq
+        self._lock = threading.Lock()
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """HEVITON_BASE_URL로 사용할 주소"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def today(self) -> date:
+        return self._today or date.today()
+
+    @property
+    def installed(self) -> date:
+        return self.today - timedelta(days=self.history_days)
+
+    def reset(self):
+        """세션/기록 초기화"""
+        with self._lock:
+            self.sessions.clear()
+            self.requests.clear()
+            self.status_counts.clear()
+            self.logins.clear()
+
+    # ---- 발전 기록 (합성 값) ----
+
+    def _daily_total(self, start: date, end: date) -> float:
+        """start~end 일별 발전량 합계 (kWh, 누락일 0)"""
+        start = max(start, self.installed)
+        return sum(value or 0.0 for _, value in synthetic_points(start, (end - start).days + 1))
+
+    def counters(self) -> Dict[str, str]:
+        """모니터링 카운터 화면 문자열 (오늘 값은 6~19시 진행률 기준)"""
+        now = datetime.now()
+        progress = min(max((now.hour + now.minute / 60 - 6) / 13, 0.0), 1.0)
+        full_day = synthetic_generation(self.today) or 0.0
+        today_generation = full_day * progress
+        yesterday = self.today - timedelta(days=1)
+        month = self._daily_total(self.today.replace(day=1), yesterday) + today_generation
+        total = self._daily_total(self.installed, yesterday) + today_generation
+        power = full_day / 4.2 * math.sin(math.pi * progress) * 1000
+        return {
+            "current_power": f"{power:,.0f}",
+            "today_generation": f"{today_generation:,.2f}",
+            "month_generation": f"{month:,.2f}",
+            "total_generation": f"{total / 1000:,.2f}",
+        }
+
+    def statistics_range(self, query: Dict[str, List[str]]) -> Tuple[date, date]:
+        """startDate/endDate -> 조회 기간 (없거나 잘못되면 어제까지 30일)"""
+        yesterday = self.today - timedelta(days=1)
+
+        def param(name: str, default: date) -> date:
+            try:
+                return datetime.strptime(query[name][0], "%Y-%m-%d").date()
+            except (KeyError, ValueError):
+                return default
+
+        end = param("endDate", yesterday)
+        return param("startDate", end - timedelta(days=29)), end
+
+    def statistics_points(self, start: date, end: date):
+        """조회 기간 일별 기록 (설치일 이전/오늘 이후 제외)"""
+        start = max(start, self.installed)
+        end = min(end, self.today - timedelta(days=1))
+        return synthetic_points(start, (end - start).days + 1) if start <= end else []
+
+    # ---- 요청 처리 ----
+
+    def _session(self, headers) -> Optional[str]:
+        for part in (headers.get("Cookie") or "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == SESSION_COOKIE and value in self.sessions:
+                return value
+        return None
+
+    @staticmethod
+    def _html(body: str, status: int = 200) -> Response:
+        return status, [("Content-Type", "text/html; charset=UTF-8")], body.encode("utf-8")
+
+    @staticmethod
+    def _json(payload: Dict[str, Any], status: int = 200) -> Response:
+        return status, [("Content-Type", "application/json; charset=UTF-8")], \
+            json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+    @staticmethod
+    def _redirect(location: str, *headers: Tuple[str, str]) -> Response:
+        return 302, [("Location", location), *headers], b""
+
+    def _login_proc(self, form: Dict[str, List[str]]) -> Response:
+        user_id = (form.get("loginId") or [""])[0]
+        password = (form.get("password") or [""])[0]
+        if user_id != self.user_id:
+            result = "idNotFound"
+        elif password != self.password:
+            result = "passNotEq"
+        else:
+            result = "ok"
+        with self._lock:
+            self.logins[result] += 1
+            if result == "ok":
+                token = secrets.token_hex(16)
+                self.sessions[token] = time.time()
+        if result != "ok":
+            return self._redirect(f"{LOGIN_PATH}?ret={result}")
+        return self._redirect("/monitoring/status/monitoring.do?ua=m&inType=web",
+                              ("Set-Cookie", f"{SESSION_COOKIE}={token}; Path=/; HttpOnly"))
+
+    def _page(self, page: str, query: Dict[str, List[str]]) -> Optional[Response]:
+        """로그인 후 페이지/JSON (없는 경로면 None)"""
+        if page == "monitoring.do":
+            if self.ajax:
+                return self._html(monitoring_page("", "", "", "", data_url="/monitoring/status/monitoringData.do"))
+            return self._html(monitoring_page(**self.counters()))
+        if page == "monitoringData.do":
+            return self._json(self.counters())
+        if page == "inverter.do":
+            if self.inverter_fault:
+                return self._html(inverter_page((("인버터 1", True), ("인버터 2", False)), "통신 오류"))
+            return self._html(inverter_page())
+        if page == "history.do":
+            yesterday = self.today - timedelta(days=1)
+            return self._html(history_page(self.statistics_points(yesterday - timedelta(days=29), yesterday)))
+        if page in ("statistics.do", "statisticsData.do"):
+            start, end = self.statistics_range(query)
+            points = self.statistics_points(start, end)
+            if page == "statisticsData.do":
+                return self._json(statistics_data(points))
+            data_url = None
+            if self.ajax:
+                data_url = "/monitoring/stat/statisticsData.do?" + urlencode(
+                    {"startDate": f"{start:%Y-%m-%d}", "endDate": f"{end:%Y-%m-%d}"})
+            return self._html(statistics_page(points, start, end, data_url))
+        return None
+
+    def _inject(self, page: str, token: str) -> Optional[Response]:
+        """장애 주입 (세션 만료 -> 500 -> 응답 지연 순서로 확률 판정)"""
+        with self._lock:
+            roll = self.random.random()
+            if roll < self.expire_rate:
+                self.sessions.pop(token, None)
+        if roll < self.expire_rate:
+            if page.endswith("Data.do"):
+                return self._json({"result": "sessionExpired"}, 401)
+            return self._redirect(f"{LOGIN_PATH}?ua=m&inType=web")
+        roll -= self.expire_rate
+        if roll < self.error_rate:
+            return self._html(layout("오류", '    <p class="error_page">일시적인 오류가 발생했습니다.</p>'), 500)
+        if roll - self.error_rate < self.hang_rate:
+            time.sleep(self.hang_seconds)
+        return None
+
+    def _respond(self, method: str, raw_path: str, headers, body: bytes) -> Response:
+        """요청 처리 -> (상태 코드, 헤더, 본문)"""
+        parts = urlsplit(raw_path)
+        path, query = parts.path, parse_qs(parts.query)
+        page = path.rsplit("/", 1)[-1]
+
+        if path.startswith("/resources/"):
+            if self.resource_latency:
+                time.sleep(self.resource_latency)
+            content_type = RESOURCE_TYPES.get(page.rsplit(".", 1)[-1], "application/octet-stream")
+            return 200, [("Content-Type", content_type), ("Cache-Control", "max-age=3600")], b""
+
+        delay = self.latency + (self.ajax_delay if page.endswith("Data.do") else 0.0)
+        if delay:
+            time.sleep(delay)
+
+        if path == LOGIN_PATH:
+            return self._html(login_page((query.get("ret") or [None])[0]))
+        if path == "/monitoring/login/loginProc.do":
+            form = parse_qs(body.decode("utf-8")) if method == "POST" else query
+            return self._login_proc(form)
+        if path == "/monitoring/login/logoutProc.do":
+            token = self._session(headers)
+            with self._lock:
+                self.sessions.pop(token, None)
+            return self._redirect(f"{LOGIN_PATH}?ua=m&inType=web",
+                                  ("Set-Cookie", f"{SESSION_COOKIE}=; Path=/; Max-Age=0"))
+        if not path.startswith("/monitoring/"):
+            return self._html(layout("페이지 없음", ""), 404)
+
+        token = self._session(headers)
+        if token is None:
+            if page.endswith("Data.do"):
+                return self._json({"result": "sessionExpired"}, 401)
+            return self._redirect(f"{LOGIN_PATH}?ua=m&inType=web")
+
+        response = self._inject(page, token) or self._page(page, query)
+        return response or self._html(layout("페이지 없음", ""), 404)
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self, method: str):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status, headers, payload = server._respond(method, self.path, self.headers, body)
+                with server._lock:
+                    server.requests[urlsplit(self.path).path.rsplit("/", 1)[-1]] += 1
+                    server.status_counts[status] += 1
+
+                self.send_response(status)
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def log_message(self, format, *args):
+                logger.debug("%s - %s", self.address_string(), format % args)
+
+        return Handler
+
+    def summary(self) -> str:
+        return (f"요청 {sum(self.requests.values())}건 {dict(self.requests.most_common())}, "
+                f"상태 {dict(self.status_counts)}, 로그인 {dict(self.logins)}")
+
+    def start(self) -> "FakeHevitonSite":
+        """백그라운드 스레드에서 서버 시작"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fake-heviton", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """서버 종료"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Heviton 모니터링 사이트 로컬 대체 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8083)
+    parser.add_argument("--user-id", default="test", help="로그인 ID")
+    parser.add_argument("--password", default="test", help="로그인 비밀번호")
+    parser.add_argument("--today", type=date.fromisoformat, default=None, help="기준일 (YYYY-MM-DD, 기본: 오늘)")
+    parser.add_argument("--history-days", type=int, default=3 * 365, help="기준일 이전 발전 기록 일수")
+    parser.add_argument("--latency", type=float, default=0.0, help="페이지/JSON 요청당 지연 시간 (초)")
+    parser.add_argument("--no-ajax", action="store_true", help="카운터/통계 표를 HTML에 포함 (JSON 요청 없음)")
+    parser.add_argument("--ajax-delay", type=float, default=0.0, help="JSON 응답 추가 지연 (초)")
+    parser.add_argument("--resource-latency", type=float, default=0.0, help="정적 리소스 지연 시간 (초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 응답 확률")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="응답 지연 확률")
+    parser.add_argument("--hang-seconds", type=float, default=30.0, help="응답 지연 시간 (초)")
+    parser.add_argument("--expire-rate", type=float, default=0.0, help="세션 만료 확률")
+    parser.add_argument("--inverter-fault", action="store_true", help="설비상태 페이지에 이상 설비 표시")
+    parser.add_argument("--seed", type=int, default=None, help="장애 주입 난수 시드")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = FakeHevitonSite(args.host, args.port, args.user_id, args.password, args.today, args.history_days,
+                             args.latency, not args.no_ajax, args.ajax_delay, args.resource_latency,
+                             args.error_rate, args.hang_rate, args.hang_seconds, args.expire_rate,
+                             args.inverter_fault, args.seed)
+    print(f"HEVITON_BASE_URL={server.url}")
+    print(f"HEVITON_USER_ID={args.user_id} HEVITON_PASSWORD={args.password}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(server.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+잔디 Incoming Webhook 로컬 대체 서버
+
+잔디 v2 메시지 형식을 검증하고 받은 메시지를 기록한다.
+지연 시간, 5xx/429 응답 주입을 지원한다.
+
+Usage:
+    python -m src.stubs.jandi_server --port 8082 --latency 0.1 --error-rate 0.05 --rate-limit-rate 0.05
+    JANDI_WEBHOOK_URL=http://127.0.0.1:8082/connect-api/webhook/local python main.py --test
+"""
+import argparse
+import json
+import logging
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, List
+
+logger = logging.getLogger(__name__)
+
+JANDI_ACCEPT = "application/vnd.tosslab.jandi-v2+json"
+COLOR_PATTERN = re.compile(r"^#[0-9A-Fa-f]{6}$")
+
+
+def validate_payload(payload: Any, headers: Optional[Dict[str, str]] = None) -> List[str]:
+    """
+    잔디 v2 메시지 형식 검증
+
+    Args:
+        payload: 요청 본문 (JSON 디코드 결과)
+        headers: 요청 헤더 (Accept/Content-Type 확인, 생략 가능)
+
+    Returns:
+        오류 목록 (비어 있으면 정상)
+    """
+    errors = []
+
+    if headers is not None:
+        if headers.get("Accept") != JANDI_ACCEPT:
+            errors.append(f"Accept 헤더가 {JANDI_ACCEPT}가 아님: {headers.get('Accept')}")
+        if not (headers.get("Content-Type") or "").startswith("application/json"):
+            errors.append(f"Content-Type이 application/json이 아님: {headers.get('Content-Type')}")
+
+    if not isinstance(payload, dict):
+        return errors + ["본문이 JSON 객체가 아님"]
+
+    body = payload.get("body")
+    if not isinstance(body, str) or not body.strip():
+        errors.append("body는 비어 있지 않은 문자열이어야 함")
+
+    color = payload.get("connectColor")
+    if color is not None and not (isinstance(color, str) and COLOR_PATTERN.match(color)):
+        errors.append(f"connectColor 형식 오류: {color!r}")
+
+    connect_info = payload.get("connectInfo")
+    if connect_info is not None:
+        if not isinstance(connect_info, list):
+            errors.append("connectInfo는 배열이어야 함")
+        else:
+            for i, info in enumerate(connect_info):
+                if not isinstance(info, dict):
+                    errors.append(f"connectInfo[{i}]가 객체가 아님")
+                    continue
+                if not any(isinstance(info.get(k), str) and info.get(k) for k in ("title", "description")):
+                    errors.append(f"connectInfo[{i}]에 title/description이 없음")
+                for key in ("title", "description", "imageUrl"):
+                    if key in info and not isinstance(info[key], str):
+                        errors.append(f"connectInfo[{i}].{key}는 문자열이어야 함")
+
+    unknown = set(payload) - {"body", "connectColor", "connectInfo"}
+    if unknown:
+        errors.append(f"알 수 없는 필드: {sorted(unknown)}")
+
+    return errors
+
+
+class FakeJandiServer:
+    """잔디 웹훅 로컬 대체 서버"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                 retry_after: int = 1, seed: Optional[int] = None):
+        """
+        Args:
+            host: 바인딩 주소
+            port: 포트 (0이면 임의 포트)
+            latency: 요청당 지연 시간 (초)
+            error_rate: 503 응답 확률
+            rate_limit_rate: 429 응답 확률
+            retry_after: 429 응답의 Retry-After (초)
+            seed: 응답 주입 난수 시드
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+
+        self.messages: List[Dict[str, Any]] = []
+        self.rejected: List[Dict[str, Any]] = []
+        self.status_counts: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """JANDI_WEBHOOK_URL로 사용할 주소"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/connect-api/webhook/local"
+
+    def reset(self):
+        """기록 초기화"""
+        with self._lock:
+            self.messages.clear()
+            self.rejected.clear()
+            self.status_counts.clear()
+
+    def _respond(self, path: str, headers: Dict[str, str], raw: bytes) -> int:
+        """요청 처리 -> 상태 코드"""
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._lock:
+            roll = self.random.random()
+            if roll < self.rate_limit_rate:
+                status = 429
+            elif roll < self.rate_limit_rate + self.error_rate:
+                status = 503
+            else:
+                try:
+                    payload = json.loads(raw)
+                except ValueError:
+                    payload = None
+                errors = validate_payload(payload, headers)
+                record = {"path": path, "payload": payload, "received_at": time.time()}
+                if errors:
+                    record["errors"] = errors
+                    self.rejected.append(record)
+                    status = 400
+                else:
+                    self.messages.append(record)
+                    status = 200
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        return status
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                status = server._respond(self.path, dict(self.headers), raw)
+
+                self.send_response(status)
+                if status == 429:
+                    self.send_header("Retry-After", str(server.retry_after))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                logger.debug("%s - %s", self.address_string(), format % args)
+
+        return Handler
+
+    def start(self) -> "FakeJandiServer":
+        """백그라운드 스레드에서 서버 시작"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fake-jandi", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """서버 종료"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="잔디 웹훅 로컬 대체 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8082)
+    parser.add_argument("--latency", type=float, default=0.0, help="요청당 지연 시간 (초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 응답 확률")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 응답 확률")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = FakeJandiServer(args.host, args.port, args.latency, args.error_rate, args.rate_limit_rate)
+    print(f"JANDI_WEBHOOK_URL={server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"수신 {len(server.messages)}건, 거부 {len(server.rejected)}건, 상태 {server.status_counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+"""
+Google Sheets v4 API 로컬 대체 서버
+
+GoogleSheetsClient가 사용하는 범위만 구현한다:
+    spreadsheets.get / spreadsheets.batchUpdate (addSheet)
+    values.get / values.batchGet / values.update / values.append / values.batchUpdate
+
+지연 시간, 429 응답 주입, 엔드포인트별 호출 수 집계를 지원한다.
+GOOGLE_SHEETS_API_ENDPOINT=http://127.0.0.1:<port>/ 로 클라이언트를 연결한다.
+
+Usage:
+    python -m src.stubs.sheets_server --port 8081 --latency 0.05 --error-rate 0.1
+"""
+import argparse
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, List, Tuple
+from urllib.parse import urlsplit, parse_qs, unquote
+
+logger = logging.getLogger(__name__)
+
+A1_CELL = re.compile(r"^([A-Z]*)(\d*)$")
+
+
+def _column_index(letters: str) -> int:
+    """A -> 0, Z -> 25, AA -> 26"""
+    index = 0
+    for ch in letters:
+        index = index * 26 + (ord(ch) - 64)
+    return index - 1
+
+
+def _column_letters(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def parse_a1(a1: str) -> Tuple[str, int, Optional[int], int, Optional[int]]:
+    """
+    A1 범위 파싱
+
+    Returns:
+        (시트 이름, 시작 행, 끝 행, 시작 열, 끝 열) - 0부터 시작, 끝은 포함, None은 끝까지
+    """
+    if "!" in a1:
+        sheet, cells = a1.rsplit("!", 1)
+    else:
+        sheet, cells = a1, ""
+    sheet = sheet.strip("'")
+
+    if not cells:
+        return sheet, 0, None, 0, None
+
+    start, _, end = cells.partition(":")
+    start_col, start_row = A1_CELL.match(start).groups()
+    if end:
+        end_col, end_row = A1_CELL.match(end).groups()
+    else:
+        end_col, end_row = start_col, start_row
+
+    return (
+        sheet,
+        int(start_row) - 1 if start_row else 0,
+        int(end_row) - 1 if end_row else None,
+        _column_index(start_col) if start_col else 0,
+        _column_index(end_col) if end_col else None,
+    )
+
+
+def format_a1(sheet: str, row: int, col: int, rows: int, cols: int) -> str:
+    return (f"{sheet}!{_column_letters(col)}{row + 1}:"
+            f"{_column_letters(col + max(cols, 1) - 1)}{row + max(rows, 1)}")
+
+
+class RateLimited(Exception):
+    """429 응답 주입"""
+
+
+class FakeSpreadsheets:
+    """스프레드시트 메모리 상태 (시트 이름 -> 행 리스트)"""
+
+    def __init__(self):
+        self.books: Dict[str, Dict[str, List[List[Any]]]] = {}
+        self.lock = threading.Lock()
+
+    def book(self, spreadsheet_id: str) -> Dict[str, List[List[Any]]]:
+        return self.books.setdefault(spreadsheet_id, {"Sheet1": []})
+
+    def sheet(self, spreadsheet_id: str, name: str) -> List[List[Any]]:
+        book = self.book(spreadsheet_id)
+        if name not in book:
+            raise KeyError(f"Unable to parse range: {name}")
+        return book[name]
+
+    def read(self, spreadsheet_id: str, a1: str) -> Dict[str, Any]:
+        name, r0, r1, c0, c1 = parse_a1(a1)
+        rows = self.sheet(spreadsheet_id, name)
+        selected = rows[r0:None if r1 is None else r1 + 1]
+        values = [row[c0:None if c1 is None else c1 + 1] for row in selected]
+
+        # 실제 API처럼 끝쪽 빈 셀/행 제거
+        values = [_trim(row) for row in values]
+        while values and not values[-1]:
+            values.pop()
+
+        result = {"range": a1, "majorDimension": "ROWS"}
+        if values:
+            result["values"] = values
+        return result
+
+    def write(self, spreadsheet_id: str, a1: str, values: List[List[Any]]) -> Dict[str, Any]:
+        name, r0, _, c0, _ = parse_a1(a1)
+        rows = self.sheet(spreadsheet_id, name)
+        for i, new_row in enumerate(values):
+            while len(rows) <= r0 + i:
+                rows.append([])
+            row = rows[r0 + i]
+            while len(row) < c0 + len(new_row):
+                row.append("")
+            row[c0:c0 + len(new_row)] = ["" if v is None else v for v in new_row]
+
+        width = max((len(v) for v in values), default=0)
+        return {
+            "spreadsheetId": spreadsheet_id,
+            "updatedRange": format_a1(name, r0, c0, len(values), width),
+            "updatedRows": len(values),
+            "updatedColumns": width,
+            "updatedCells": sum(len(v) for v in values),
+        }
+
+    def append(self, spreadsheet_id: str, a1: str, values: List[List[Any]]) -> Dict[str, Any]:
+        name, _, _, c0, _ = parse_a1(a1)
+        rows = self.sheet(spreadsheet_id, name)
+        last = len(rows)
+        while last and not _trim(rows[last - 1]):
+            last -= 1
+        target = format_a1(name, last, c0, len(values), max((len(v) for v in values), default=1))
+        updates = self.write(spreadsheet_id, target, values)
+        return {"spreadsheetId": spreadsheet_id, "tableRange": a1, "updates": updates}
+
+
+def _trim(row: List[Any]) -> List[Any]:
+    row = list(row)
+    while row and row[-1] in ("", None):
+        row.pop()
+    return row
+
+
+class FakeSheetsServer:
+    """Google Sheets API 로컬 대체 서버"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, error_rate: float = 0.0, seed: Optional[int] = None):
+        """
+        Args:
+            host: 바인딩 주소
+            port: 포트 (0이면 임의 포트)
+            latency: 요청당 지연 시간 (초)
+            error_rate: 429 응답 확률 (0.0 ~ 1.0)
+            seed: 429 주입 난수 시드
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.state = FakeSpreadsheets()
+        self.calls: Counter = Counter()
+        self.rate_limited: Counter = Counter()
+        self._stats_lock = threading.Lock()
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """GOOGLE_SHEETS_API_ENDPOINT로 사용할 주소"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def reset_stats(self):
+        """호출 수 초기화"""
+        with self._stats_lock:
+            self.calls.clear()
+            self.rate_limited.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {"calls": dict(self.calls), "rate_limited": dict(self.rate_limited)}
+
+    def _record_call(self, endpoint: str):
+        """호출 집계, 지연/429 주입"""
+        with self._stats_lock:
+            self.calls[endpoint] += 1
+            limited = self.error_rate and self.random.random() < self.error_rate
+            if limited:
+                self.rate_limited[endpoint] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if limited:
+            raise RateLimited()
+
+    @staticmethod
+    def endpoint_name(method: str, rest: str) -> Optional[str]:
+        """요청 -> 집계용 엔드포인트 이름"""
+        if rest == "":
+            return "get" if method == "GET" else None
+        if rest == ":batchUpdate":
+            return "batchUpdate" if method == "POST" else None
+        if rest == "/values:batchGet":
+            return "values.batchGet" if method == "GET" else None
+        if rest == "/values:batchUpdate":
+            return "values.batchUpdate" if method == "POST" else None
+        if rest.startswith("/values/"):
+            if method == "POST" and rest.endswith(":append"):
+                return "values.append"
+            return {"GET": "values.get", "PUT": "values.update"}.get(method)
+        return None
+
+    def dispatch(self, method: str, path: str, query: Dict[str, List[str]],
+                 body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """요청 처리 -> (상태 코드, 응답)"""
+        match = re.match(r"^/v4/spreadsheets/([^/:]+)(.*)$", path)
+        endpoint = self.endpoint_name(method, match.group(2)) if match else None
+        if not endpoint:
+            return 404, _error(404, f"Unsupported: {method} {path}")
+
+        # 지연/429 주입은 상태 잠금 밖에서 (동시 요청이 직렬화되지 않도록)
+        self._record_call(endpoint)
+
+        spreadsheet_id, rest = match.group(1), match.group(2)
+        state = self.state
+
+        with state.lock:
+            if endpoint == "get":
+                book = state.book(spreadsheet_id)
+                return 200, {
+                    "spreadsheetId": spreadsheet_id,
+                    "sheets": [
+                        {"properties": {"sheetId": i, "title": title, "index": i}}
+                        for i, title in enumerate(book)
+                    ],
+                }
+
+            if endpoint == "batchUpdate":
+                book = state.book(spreadsheet_id)
+                replies = []
+                for request in body.get("requests", []):
+                    if "addSheet" in request:
+                        title = request["addSheet"]["properties"]["title"]
+                        if title in book:
+                            return 400, _error(400, f"A sheet with the name \"{title}\" already exists.")
+                        book[title] = []
+                        replies.append({"addSheet": {"properties": {"title": title, "sheetId": len(book) - 1}}})
+                    else:
+                        replies.append({})
+                return 200, {"spreadsheetId": spreadsheet_id, "replies": replies}
+
+            if endpoint == "values.batchGet":
+                return 200, {
+                    "spreadsheetId": spreadsheet_id,
+                    "valueRanges": [state.read(spreadsheet_id, r) for r in query.get("ranges", [])],
+                }
+
+            if endpoint == "values.batchUpdate":
+                responses = [
+                    state.write(spreadsheet_id, item["range"], item.get("values", []))
+                    for item in body.get("data", [])
+                ]
+                return 200, {
+                    "spreadsheetId": spreadsheet_id,
+                    "totalUpdatedRows": sum(r["updatedRows"] for r in responses),
+                    "totalUpdatedCells": sum(r["updatedCells"] for r in responses),
+                    "responses": responses,
+                }
+
+            a1 = rest[len("/values/"):]
+            if endpoint == "values.append":
+                return 200, state.append(spreadsheet_id, unquote(a1[:-len(":append")]),
+                                         body.get("values", []))
+            if endpoint == "values.get":
+                return 200, state.read(spreadsheet_id, unquote(a1))
+            return 200, state.write(spreadsheet_id, unquote(a1), body.get("values", []))
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self, method: str):
+                url = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+
+                if url.path == "/_stats":
+                    return self._send(200, server.stats())
+
+                try:
+                    body = json.loads(raw) if raw else {}
+                    status, payload = server.dispatch(method, url.path, parse_qs(url.query), body)
+                except RateLimited:
+                    status, payload = 429, _error(429, "Quota exceeded (injected)", "RESOURCE_EXHAUSTED")
+                except KeyError as e:
+                    status, payload = 400, _error(400, str(e.args[0]))
+                except Exception as e:
+                    logger.exception("요청 처리 실패")
+                    status, payload = 500, _error(500, str(e))
+
+                self._send(status, payload)
+
+            def _send(self, status: int, payload: Dict[str, Any]):
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=UTF-8")
+                self.send_header("Content-Length", str(len(data)))
+                # 헤더와 본문을 한 번에 전송 (지연 ACK로 인한 응답 지연 방지)
+                self._headers_buffer.append(b"\r\n" + data)
+                self.wfile.write(b"".join(self._headers_buffer))
+                self._headers_buffer = []
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def do_PUT(self):
+                self._handle("PUT")
+
+            def log_message(self, format, *args):
+                logger.debug("%s - %s", self.address_string(), format % args)
+
+        return Handler
+
+    def start(self) -> "FakeSheetsServer":
+        """백그라운드 스레드에서 서버 시작"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fake-sheets", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """서버 종료"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def _error(code: int, message: str, status: str = "INVALID_ARGUMENT") -> Dict[str, Any]:
+    return {"error": {"code": code, "message": message, "status": status}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Google Sheets API 로컬 대체 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="요청당 지연 시간 (초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429 응답 확률 (0.0 ~ 1.0)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = FakeSheetsServer(args.host, args.port, args.latency, args.error_rate)
+    print(f"GOOGLE_SHEETS_API_ENDPOINT={server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
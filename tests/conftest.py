@@ -0,0 +1,37 @@
+"""
+pytest 공용 fixture
+
+외부 서비스 대신 로컬 대체 서버(src/stubs)와 임시 SQLite 파일을 사용한다.
+"""
+import sys
+sys.path.append(str(__file__).rsplit('/', 2)[0])
+
+import pytest
+
+from config.settings import GOOGLE_SHEETS_CONFIG
+from src.local_store import LocalStore
+from src.stubs.sheets_server import FakeSheetsServer
+
+
+@pytest.fixture
+def store(tmp_path):
+    """임시 로컬 저장소"""
+    with LocalStore(tmp_path / "heviton.db") as local_store:
+        yield local_store
+
+
+@pytest.fixture
+def sheets_server(monkeypatch, tmp_path):
+    """Sheets API 대체 서버 (GOOGLE_SHEETS_CONFIG["api_endpoint"]를 서버 주소로)"""
+    with FakeSheetsServer(seed=0) as server:
+        monkeypatch.setitem(GOOGLE_SHEETS_CONFIG, "api_endpoint", server.url)
+        monkeypatch.setitem(GOOGLE_SHEETS_CONFIG, "discovery_cache", tmp_path / "sheets.v4.json")
+        yield server
+
+
+@pytest.fixture
+def sheets(sheets_server):
+    """대체 서버에 연결된 GoogleSheetsClient"""
+    from src.google_sheets import GoogleSheetsClient
+
+    return GoogleSheetsClient(credentials_json="")
@@ -0,0 +1,79 @@
+"""반복 알림 억제 (AlertCoalescer) 테스트"""
+import pytest
+
+from src.alerts import AlertCoalescer, fingerprint, normalize_message
+
+
+class Clock:
+    """time.time 대체 (src.alerts 모듈에서만)"""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("src.alerts.time", clock)
+    return clock
+
+
+def test_fingerprint_ignores_variable_parts():
+    a = "2026-10-15 18:00:01 타임아웃: http://host/a?x=1 (3회)"
+    b = "2026-10-16 18:00:07 타임아웃: http://host/b?y=2 (5회)"
+
+    assert normalize_message(a) == normalize_message(b)
+    assert fingerprint(a, "scraper") == fingerprint(b, "scraper")
+    assert fingerprint(a, "scraper") != fingerprint(a, "auth")
+
+
+def test_duplicates_within_window_become_digest(tmp_path, clock):
+    coalescer = AlertCoalescer(tmp_path / "state.json", window=600, rate_limit=10, rate_period=60)
+
+    assert coalescer.submit("ch", "로그인 실패 1", "auth") == {"send": True, "digests": []}
+    clock.now += 10
+    assert coalescer.submit("ch", "로그인 실패 2", "auth")["send"] is False
+    clock.now += 10
+    assert coalescer.submit("ch", "로그인 실패 3", "auth")["send"] is False
+
+    # 구간 안에서는 요약 없음, 구간이 끝나면 억제 건수 요약 1건
+    assert coalescer.flush_expired("ch") == []
+    clock.now += 600
+    digests = coalescer.flush_expired("ch")
+    assert len(digests) == 1
+    assert digests[0]["suppressed"] == 2 and digests[0]["sample"] == "로그인 실패 3"
+
+    # 요약 후 같은 알림은 다시 바로 전송
+    assert coalescer.submit("ch", "로그인 실패 4", "auth")["send"] is True
+
+
+def test_state_survives_new_instance(tmp_path, clock):
+    path = tmp_path / "state.json"
+    AlertCoalescer(path, window=600).submit("ch", "설비 이상", "converter")
+    clock.now += 60
+
+    assert AlertCoalescer(path, window=600).submit("ch", "설비 이상", "converter")["send"] is False
+
+
+def test_rate_limited_digest_is_merged_into_next_window(tmp_path, clock):
+    coalescer = AlertCoalescer(tmp_path / "state.json", window=60, rate_limit=1, rate_period=3600)
+
+    assert coalescer.submit("ch", "오류 1", "main")["send"] is True
+    first_seen = clock.now
+    clock.now += 1
+    coalescer.submit("ch", "오류 2", "main")
+    coalescer.submit("ch", "오류 3", "main")
+
+    # 구간은 끝났지만 전송량 제한으로 요약을 보내지 못한 상태에서 같은 알림이 다시 발생
+    clock.now += 120
+    result = coalescer.submit("ch", "오류 4", "main")
+    assert result == {"send": False, "digests": []}
+
+    clock.now += 3600
+    digests = coalescer.flush_expired("ch")
+    assert len(digests) == 1
+    assert digests[0]["suppressed"] == 3
+    assert digests[0]["first_seen"] == first_seen
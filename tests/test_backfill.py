@@ -0,0 +1,97 @@
+"""과거 기록 가져오기 (Backfill) 워터마크 테스트"""
+from datetime import date, timedelta
+
+import pytest
+
+from config.settings import HISTORY_CONFIG
+from src.backfill import Backfill, WATERMARK_KIND, plan_ranges, range_from_url
+from src.stubs.heviton_pages import statistics_page, synthetic_points
+
+TODAY = date(2026, 10, 15)
+YESTERDAY = TODAY - timedelta(days=1)
+DEFAULT_DAYS = 40   # 기간 없이 요청할 때 페이지가 보여주는 일수
+
+
+class StatisticsSite:
+    """통계 페이지 대체 (요청 URL의 기간만 표에 포함, 요청 기록)"""
+
+    def __init__(self):
+        self.requests = []
+        self.overrides = {}
+
+    def __call__(self, url: str) -> str:
+        start, end = range_from_url(url)
+        self.requests.append((start, end))
+        start = start or end - timedelta(days=DEFAULT_DAYS - 1)
+        points = [(day, self.overrides.get(day, value))
+                  for day, value in synthetic_points(start, (end - start).days + 1)]
+        return statistics_page(points, start, end)
+
+
+@pytest.fixture(autouse=True)
+def history_config(monkeypatch):
+    monkeypatch.setitem(HISTORY_CONFIG, "start_date", "")
+    monkeypatch.setitem(HISTORY_CONFIG, "refetch_days", 1)
+
+
+def test_plan_ranges():
+    assert plan_ranges(None, YESTERDAY) == [(None, YESTERDAY)]
+    assert plan_ranges(YESTERDAY, YESTERDAY, refetch_days=1) == [(YESTERDAY, YESTERDAY)]
+    ranges = plan_ranges(None, YESTERDAY, date(2026, 1, 1), max_range_days=100)
+    assert ranges[0][0] == date(2026, 1, 1) and ranges[-1][1] == YESTERDAY
+    assert all((end - start).days < 100 for start, end in ranges)
+
+
+def test_first_run_sets_watermark(store):
+    site = StatisticsSite()
+    report = Backfill(store, site, site="s1").run(TODAY)
+
+    assert site.requests == [(None, YESTERDAY)]
+    assert report.watermark == YESTERDAY.isoformat()
+    assert store.get_watermark(WATERMARK_KIND, "s1") == YESTERDAY.isoformat()
+    assert report.days == DEFAULT_DAYS
+    assert len(store.get_daily_range("2000-01-01", YESTERDAY.isoformat())) == DEFAULT_DAYS
+
+
+def test_next_run_resumes_from_watermark(store):
+    site = StatisticsSite()
+    Backfill(store, site, site="s1").run(TODAY)
+
+    site.requests.clear()
+    report = Backfill(store, site, site="s1").run(TODAY + timedelta(days=3))
+
+    # 워터마크 날(늦은 보정 반영)부터 새 기준일 전날까지만 요청
+    assert site.requests == [(YESTERDAY, TODAY + timedelta(days=2))]
+    assert report.watermark == (TODAY + timedelta(days=2)).isoformat()
+    assert report.changed == 3
+
+
+def test_late_correction_is_merged(store):
+    site = StatisticsSite()
+    Backfill(store, site, site="s1").run(TODAY)
+
+    site.overrides[YESTERDAY] = 1.5
+    report = Backfill(store, site, site="s1").run(TODAY)
+
+    assert report.changed == 1
+    assert store.get_daily_range(YESTERDAY.isoformat(), YESTERDAY.isoformat())[0]["generation"] == "1.50"
+
+
+def test_detached_range_does_not_move_watermark(store):
+    site = StatisticsSite()
+    Backfill(store, site, site="s1").run(TODAY)
+
+    later = (TODAY + timedelta(days=10), TODAY + timedelta(days=12))
+    report = Backfill(store, site, site="s1").run(TODAY + timedelta(days=20), ranges=[later])
+
+    assert report.days == 3
+    assert store.get_watermark(WATERMARK_KIND, "s1") == YESTERDAY.isoformat()
+
+
+def test_full_ignores_watermark(store):
+    site = StatisticsSite()
+    Backfill(store, site, site="s1").run(TODAY)
+
+    site.requests.clear()
+    Backfill(store, site, site="s1").run(TODAY, full=True)
+    assert site.requests == [(None, YESTERDAY)]
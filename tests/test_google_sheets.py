@@ -0,0 +1,51 @@
+"""시트 행 변환 / 일괄 기록(upsert_rows) 테스트"""
+from src.google_sheets import SHEET_DAILY, SHEET_MONTHLY, daily_row, monthly_row, weekly_row
+
+
+def test_daily_row_defaults():
+    row = daily_row({"date": "2026-10-15", "generation": "123.45", "current_power": None})
+
+    assert row[:4] == ["2026-10-15", "123.45", "-", "정상"]
+    assert len(row) == 5 and row[4]  # 기록 시각 기본값
+
+
+def test_weekly_and_monthly_row_order():
+    weekly = {"week_label": "2026-W42", "start_date": "2026-10-12", "end_date": "2026-10-18",
+              "total": "700.00", "record_time": "2026-10-19 00:05:00"}
+    monthly = {"year_month": "2026-09", "total": "3,000.00", "cumulative": None,
+               "record_time": "2026-10-01 00:00:00"}
+
+    assert weekly_row(weekly) == ["2026-W42", "2026-10-12", "2026-10-18", "700.00", "2026-10-19 00:05:00"]
+    assert monthly_row(monthly) == ["2026-09", "3,000.00", "", "2026-10-01 00:00:00"]
+
+
+def test_upsert_rows_updates_existing_keys_and_appends_new(sheets, sheets_server):
+    assert sheets.upsert_rows({SHEET_DAILY: [["2026-10-14", "100.00", "-", "정상", "18:00:00"],
+                                             ["2026-10-15", "110.00", "-", "정상", "18:00:00"]]})
+
+    sheets_server.reset_stats()
+    assert sheets.upsert_rows({
+        SHEET_DAILY: [["2026-10-15", "120.00", "-", "정상", "19:00:00"],
+                      ["2026-10-16", "130.00", "-", "정상", "18:00:00"]],
+        SHEET_MONTHLY: [["2026-09", "3,000.00", "", "2026-10-01 00:00:00"]],
+    })
+
+    calls = sheets_server.stats()["calls"]
+    assert calls.get("values.batchGet") == 1
+    assert calls.get("values.batchUpdate") == 1
+
+    rows = sheets.batch_get_values([f"{SHEET_DAILY}!A:B", f"{SHEET_MONTHLY}!A:B"])
+    daily = {row[0]: row[1] for row in rows[0] if row}
+    assert daily["2026-10-14"] == "100.00"
+    assert daily["2026-10-15"] == "120.00"
+    assert daily["2026-10-16"] == "130.00"
+    assert [row[0] for row in rows[0]].count("2026-10-15") == 1
+    assert ["2026-09", "3,000.00"] in rows[1]
+
+
+def test_upsert_rows_without_rows_makes_no_requests(sheets, sheets_server):
+    sheets.service  # 서비스 생성 (discovery 조회는 네트워크 요청 없음)
+    sheets_server.reset_stats()
+
+    assert sheets.upsert_rows({SHEET_DAILY: []})
+    assert sheets_server.stats()["calls"] == {}
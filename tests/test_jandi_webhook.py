@@ -0,0 +1,138 @@
+"""잔디 메시지 생성 테스트 (발전량 리포트 / 에러 알림 내용 + v2 형식)"""
+import time
+
+import pytest
+
+from config.settings import JANDI_CONFIG
+from src.jandi_router import JandiRouter, JandiRoute
+from src.jandi_webhook import JandiWebhook
+from src.stubs.jandi_server import FakeJandiServer, validate_payload
+
+# 발전량 리포트 샘플 (이름, 데이터, connectInfo에 있어야 할 문자열)
+REPORT_CASES = [
+    (
+        "dashboard",
+        {
+            "dashboard": {
+                "current_power": "50000",
+                "today_generation": "123.45",
+                "month_generation": "3456.78",
+                "total_generation": "28.90",
+            },
+            "converter_status": {"is_normal": True},
+        },
+        ["50.00 kW", "123.45 kWh", "3456.78 kWh", "28.90 MWh", "컨버터 정상 작동 중"],
+    ),
+    (
+        "converter_error",
+        {
+            "dashboard": {"current_power": "0", "today_generation": "1.20"},
+            "converter_status": {"is_normal": False, "error_messages": ["인버터 통신 오류"]},
+        },
+        ["1.20 kWh", "이상 감지: 인버터 통신 오류"],
+    ),
+    (
+        "legacy",
+        {
+            "daily": {"date": "2024-12-26", "total": "150", "data": []},
+            "monthly": {"year_month": "2024-12", "total": "4,500", "data": []},
+            "dashboard": {"data": [{"label": "x"}]},
+        },
+        ["(2024-12-26) 150 kWh", "(2024-12) 4,500 kWh"],
+    ),
+    (
+        "recent_5days",
+        {
+            "site": "site-a",
+            "dashboard": {"today_generation": "10.00"},
+            "recent_5days": [
+                {"date": "12-22", "generation": "11.10"},
+                {"date": "12-23", "generation": "-"},
+            ],
+        },
+        ["12/22: 11.10kWh | 12/23: -"],
+    ),
+    (
+        # 해석할 수 없는 값은 표시하지 않음 (수집 단계 경고 + parse_errors 지표)
+        "non_numeric_power",
+        {"dashboard": {"current_power": "N/A"}},
+        ["수집된 발전량 데이터가 없습니다."],
+    ),
+    (
+        "unit_suffix",
+        {"dashboard": {"current_power": "1.5 kW", "month_generation": "3.2 MWh"}},
+        ["1.50 kW", "3200.00 kWh"],
+    ),
+    (
+        "empty",
+        {},
+        ["수집된 발전량 데이터가 없습니다."],
+    ),
+]
+
+
+@pytest.fixture
+def webhook():
+    client = JandiWebhook("http://127.0.0.1")
+    yield client
+    client.close()
+
+
+def connect_text(payload):
+    return "\n".join(f"{i['title']} {i['description']}" for i in payload["connectInfo"])
+
+
+@pytest.mark.parametrize("data, expected", [case[1:] for case in REPORT_CASES],
+                         ids=[case[0] for case in REPORT_CASES])
+def test_generation_report(webhook, data, expected):
+    payload = webhook.build_generation_report(data)
+
+    assert validate_payload(payload) == []
+    text = connect_text(payload)
+    for snippet in expected:
+        assert snippet in text
+    if data.get("site"):
+        assert data["site"] in payload["body"]
+
+
+def test_error_alert(webhook):
+    payload = webhook.build_error_alert("로그인 실패: idNotFound")
+
+    assert validate_payload(payload) == []
+    assert "로그인 실패: idNotFound" in connect_text(payload)
+
+
+def test_alert_digest(webhook):
+    payload = webhook.build_alert_digest([{
+        "source": "auth", "sample": "로그인 실패", "suppressed": 3,
+        "first_seen": time.time() - 3600, "last_seen": time.time(),
+    }])
+
+    assert validate_payload(payload) == []
+
+
+def test_report_digest_respects_item_limit(webhook):
+    router = JandiRouter([JandiRoute(url="http://127.0.0.1")], webhook_factory=lambda url: webhook)
+    sites = [dict(REPORT_CASES[0][1], site=f"site-{i:02d}") for i in range(30)]
+
+    reports = router.build_reports(sites, digest=True)
+
+    assert reports
+    for _, payload in reports:
+        assert validate_payload(payload) == []
+        assert len(payload["connectInfo"]) <= JANDI_CONFIG["digest_max_items"]
+
+
+def test_stub_server_accepts_messages(webhook):
+    payloads = [webhook.build_generation_report(data) for _, data, _ in REPORT_CASES]
+    payloads.append(webhook.build_error_alert("로그인 실패: idNotFound"))
+
+    with FakeJandiServer() as server:
+        with JandiWebhook(server.url) as client:
+            for payload in payloads:
+                assert client.post_payload(payload)
+            assert client.send_generation_report(REPORT_CASES[0][1])
+            assert client.send_error_alert("로그인 실패: idNotFound")
+
+    assert server.rejected == []
+    assert len(server.messages) == len(payloads) + 2
@@ -0,0 +1,83 @@
+"""주별/월별 집계 작업 테스트"""
+from datetime import date, timedelta
+
+import pytest
+
+from src.backfill import range_from_url, weekly_rollups
+from src.jobs import MissingDataError, last_week, weekly_record
+from src.models import DailyPoint
+from src.stubs.heviton_pages import statistics_page, synthetic_points
+
+
+def fill_days(store, start: date, days: int, generation: str = "100.00"):
+    store.upsert_daily([{"date": (start + timedelta(days=i)).isoformat(), "generation": generation,
+                         "current_power": "", "status": "정상", "record_time": "18:00:00"}
+                        for i in range(days)])
+
+
+def no_fetch(url):
+    raise AssertionError("로컬 기록이 모두 있으면 통계 페이지를 요청하지 않음")
+
+
+class StatisticsSite:
+    """통계 페이지 대체 (요청 기간 중 skip에 없는 날만 표에 포함)"""
+
+    def __init__(self, skip=()):
+        self.skip = set(skip)
+        self.requests = []
+
+    def __call__(self, url: str) -> str:
+        start, end = range_from_url(url)
+        self.requests.append((start, end))
+        points = [p for p in synthetic_points(start, (end - start).days + 1) if p[0] not in self.skip]
+        return statistics_page(points, start, end)
+
+
+def test_last_week():
+    assert last_week(date(2026, 1, 5)) == (date(2025, 12, 29), date(2026, 1, 4))
+
+
+def test_week_label_uses_iso_year_at_year_boundary(store):
+    monday = date(2025, 12, 29)
+    fill_days(store, monday, 7)
+
+    record = weekly_record(monday, store, no_fetch)
+
+    assert record["week_label"] == "2026년 1주차"
+    assert (record["start_date"], record["end_date"]) == ("2025-12-29", "2026-01-04")
+    assert record["total"] == "700.00"
+    # 과거 기록 가져오기(backfill)와 같은 키 -> Sheets 주별 행을 같은 주로 갱신
+    rows = store.get_daily_range(record["start_date"], record["end_date"])
+    assert [r["week_label"] for r in weekly_rollups(DailyPoint.parse_all(rows, "store.daily"))] == \
+        [record["week_label"]]
+
+
+def test_week_label_first_iso_week_starting_in_previous_year(store):
+    monday = date(2024, 12, 30)
+    fill_days(store, monday, 7)
+
+    assert weekly_record(monday, store, no_fetch)["week_label"] == "2025년 1주차"
+
+
+def test_weekly_fetches_missing_days_from_statistics_page(store):
+    monday = date(2026, 10, 5)
+    fill_days(store, monday, 3)   # 데이터가 유지되지 않는 실행: 앞 3일만 로컬 기록
+    site = StatisticsSite()
+
+    record = weekly_record(monday, store, site)
+
+    assert site.requests == [(monday, monday + timedelta(days=6))]
+    assert len(store.get_daily_range(record["start_date"], record["end_date"])) == 7
+    # 통계 페이지 값이 기준 (로컬에 있던 날도 페이지 값으로 병합)
+    expected = sum(value or 0 for _, value in synthetic_points(monday, 7))
+    assert float(record["total"]) == pytest.approx(expected, abs=0.01)
+
+
+def test_weekly_unconfirmed_days_raise(store):
+    monday = date(2026, 10, 5)
+    fill_days(store, monday, 5)
+
+    with pytest.raises(MissingDataError):
+        weekly_record(monday, store)
+    with pytest.raises(MissingDataError):
+        weekly_record(monday, store, StatisticsSite(skip=[monday + timedelta(days=6)]))
@@ -0,0 +1,57 @@
+"""실행 지표 (span 집계 / Prometheus 텍스트 형식) 테스트"""
+import re
+from collections import defaultdict
+
+from src.metrics import MetricsRegistry, format_prometheus, metrics
+from src.pipeline import SinkStage, run_sinks
+
+SAMPLE_LINE = re.compile(r"^(\w+)(\{.*\})? (\S+)$")
+
+
+def series(text: str):
+    """Prometheus 텍스트 -> {지표 이름: [라벨 문자열, ...]}"""
+    families = defaultdict(list)
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        name, labels, _ = SAMPLE_LINE.match(line).groups()
+        families[name].append(labels or "")
+    return families
+
+
+def test_each_family_has_unique_label_sets():
+    metrics.reset()
+    with metrics.span("scraper.navigate", page="monitoring.do"):
+        pass
+    with metrics.span("scraper.navigate", page="inverter.do"):
+        pass
+    metrics.incr("retries", stage="login")
+    run_sinks([SinkStage("store", lambda s: None), SinkStage("sheets", lambda s: None),
+               SinkStage("jandi", lambda s: False)], {})
+
+    families = series(format_prometheus(metrics.snapshot()))
+
+    assert families
+    for name, label_sets in families.items():
+        assert len(label_sets) == len(set(label_sets)), name
+
+
+def test_sink_stages_keep_their_own_series():
+    metrics.reset()
+    run_sinks([SinkStage("store", lambda s: None), SinkStage("jandi", lambda s: False)], {})
+
+    text = format_prometheus(metrics.snapshot())
+
+    assert 'heviton_stage_success{sink="store",stage="sink"} 1.0' in text
+    assert 'heviton_stage_success{sink="jandi",stage="sink"} 0.0' in text
+
+
+def test_stage_stats_aggregate_by_labels():
+    registry = MetricsRegistry(run_id="test")
+    for _ in range(3):
+        with registry.span("sheets.upsert", sheet="daily"):
+            pass
+
+    stages = registry.snapshot()["stages"]
+    assert [(s["name"], s["labels"], s["calls"], s["failures"]) for s in stages] == \
+        [("sheets.upsert", {"sheet": "daily"}, 3, 0)]
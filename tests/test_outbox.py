@@ -0,0 +1,166 @@
+"""잔디 알림 outbox 테스트 (재시도 백오프, 전송 포기, 실행별 대기, 선점)"""
+import threading
+import time
+
+import pytest
+
+from config.settings import OUTBOX_CONFIG
+from src.outbox import NotificationOutbox, STATUS_DEAD
+
+
+class FakeWebhook:
+    """채널별 전송 결과를 지정하는 JandiWebhook 대체"""
+
+    failing = set()
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self.sent = []
+
+    def post_payload(self, payload, label=""):
+        if self.channel in self.failing:
+            return False
+        self.sent.append(payload)
+        return True
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    FakeWebhook.failing = set()
+    box = NotificationOutbox(tmp_path / "outbox.db", webhook_factory=FakeWebhook)
+    yield box
+    box.close(timeout=0)
+
+
+def rows(box):
+    return box._conn.execute(
+        "SELECT id, channel, status, attempts, next_attempt_at FROM outbox ORDER BY id"
+    ).fetchall()
+
+
+def test_delivered_messages_are_removed(outbox):
+    outbox.enqueue("ch", {"n": 1})
+    outbox.enqueue("ch", {"n": 2})
+
+    assert outbox.deliver_pending() == (2, 0)
+    assert outbox.pending_count() == 0
+    assert outbox._webhook("ch").sent == [{"n": 1}, {"n": 2}]
+
+
+def test_failure_backs_off_and_blocks_channel(outbox, monkeypatch):
+    monkeypatch.setitem(OUTBOX_CONFIG, "retry_backoff", 30)
+    FakeWebhook.failing = {"bad"}
+    outbox.enqueue("bad", {"n": 1})
+    outbox.enqueue("bad", {"n": 2})
+    outbox.enqueue("good", {"n": 3})
+
+    started = time.time()
+    assert outbox.deliver_pending() == (1, 1)
+
+    first, second = rows(outbox)
+    assert first[3] == 1 and first[4] >= started + 30
+    assert second[3] == 0  # 순서 보장: 실패한 채널의 뒤 메시지는 시도하지 않음
+
+    # 재시도 대기 중에는 보내지 않고, 대기 시간을 무시하면 다시 시도 (백오프 2배)
+    assert outbox.deliver_pending() == (0, 0)
+    assert outbox.deliver_pending(ignore_schedule=True) == (0, 1)
+    first = rows(outbox)[0]
+    assert first[3] == 2 and first[4] >= time.time() + 59
+
+
+def test_dead_letter_after_max_attempts(outbox, monkeypatch):
+    monkeypatch.setattr(outbox, "max_attempts", 3)
+    FakeWebhook.failing = {"bad"}
+    outbox.enqueue("bad", {"n": 1})
+
+    for _ in range(3):
+        outbox.deliver_pending(ignore_schedule=True)
+
+    (_, _, status, attempts, _), = rows(outbox)
+    assert status == STATUS_DEAD and attempts == 3
+    assert outbox.pending_count() == 0
+    assert outbox.deliver_pending(ignore_schedule=True) == (0, 0)
+
+
+def test_wait_for_ignores_earlier_backlog(outbox):
+    FakeWebhook.failing = {"bad"}
+    outbox.enqueue("bad", {"n": 0})
+    outbox.deliver_pending()  # 이전 실행이 남긴 재시도 대기 메시지
+
+    outbox.start()
+    ids = [outbox.enqueue("good", {"n": 1}), outbox.enqueue("good", {"n": 2})]
+
+    assert outbox.wait_for(ids, timeout=5) == []
+    assert outbox.pending_count() == 1
+
+
+def test_wait_for_reports_undelivered(outbox):
+    FakeWebhook.failing = {"bad"}
+    outbox.start()
+    message_id = outbox.enqueue("bad", {"n": 1})
+
+    assert outbox.wait_for([message_id], timeout=5) == [message_id]
+
+
+def test_claim_prevents_double_send(tmp_path):
+    sent = []
+    lock = threading.Lock()
+
+    class SlowWebhook(FakeWebhook):
+        def post_payload(self, payload, label=""):
+            time.sleep(0.05)
+            with lock:
+                sent.append(payload["n"])
+            return True
+
+    path = tmp_path / "outbox.db"
+    boxes = [NotificationOutbox(path, webhook_factory=SlowWebhook) for _ in range(2)]
+    for n in range(5):
+        boxes[0].enqueue("ch", {"n": n})
+
+    threads = [threading.Thread(target=box.deliver_pending, kwargs={"ignore_schedule": True})
+               for box in boxes * 2]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for box in boxes:
+        box.deliver_pending(ignore_schedule=True)
+        box.close(timeout=0)
+
+    assert sorted(sent) == list(range(5))
+
+
+def test_close_waits_for_in_flight_send(tmp_path):
+    release = threading.Event()
+    posting = threading.Event()
+
+    class SlowWebhook(FakeWebhook):
+        def post_payload(self, payload, label=""):
+            posting.set()
+            release.wait(5)
+            return super().post_payload(payload, label)
+
+    box = NotificationOutbox(tmp_path / "outbox.db", webhook_factory=SlowWebhook)
+    box.enqueue("ch", {"n": 1})
+    box.enqueue("ch", {"n": 2})
+    box.start()
+    assert posting.wait(5)
+
+    closer = threading.Thread(target=box.close, kwargs={"timeout": 0})
+    closer.start()
+    closer.join(0.2)
+    assert closer.is_alive()  # 전송 중인 메시지 결과를 기록하기 전에는 닫지 않음
+
+    release.set()
+    closer.join(5)
+    assert not closer.is_alive()
+
+    # 전송된 메시지는 삭제, 종료 후 남은 메시지는 선점 없이 대기 상태
+    reopened = NotificationOutbox(tmp_path / "outbox.db", webhook_factory=FakeWebhook)
+    remaining = reopened._conn.execute("SELECT payload, claimed_by FROM outbox").fetchall()
+    reopened.close(timeout=0)
+    assert remaining == [('{"n": 2}', None)]
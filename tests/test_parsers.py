@@ -0,0 +1,59 @@
+"""페이지 추출기 테스트 (고정 페이지: src/stubs/fixtures/heviton, manifest.json의 기대 결과)"""
+from datetime import datetime, date
+
+import pytest
+
+from src.parsers import (EXTRACTORS, parse_daily_page, parse_history_page, parse_recent_daily,
+                         parse_statistics_table)
+from src.stubs.heviton_pages import FIXTURE_TODAY, load_corpus
+
+CORPUS = load_corpus()
+
+
+@pytest.mark.parametrize("filename", sorted(CORPUS))
+def test_corpus_page_matches_manifest(filename):
+    page, source, expected = CORPUS[filename]
+    result = EXTRACTORS[page](source)
+
+    for key, value in expected.items():
+        if key == "rows":
+            assert len(result) == value
+        elif key == "converters":
+            assert len(result[key]) == value
+        else:
+            assert result[key] == value
+
+
+def test_history_page_items_are_dicts():
+    _, source, _ = CORPUS["history.html"]
+    items = parse_history_page(source)
+
+    assert items and all(isinstance(item, dict) for item in items)
+    assert parse_history_page("<html><script>var other = [1, 2];</script></html>") == []
+
+
+def test_statistics_table_skips_total_row():
+    _, source, _ = CORPUS["statistics.html"]
+    rows = parse_statistics_table(source)
+
+    assert all("합계" not in row["date"] for row in rows)
+    assert rows[0]["date"].count(".") == 2
+
+
+def test_daily_page_filters_range():
+    _, source, _ = CORPUS["statistics.html"]
+    points = parse_daily_page(source)
+    start, end = points[5].day, points[9].day
+    window = parse_daily_page(source, start, end)
+
+    assert [p.day for p in window] == [p.day for p in points[5:10]]
+    assert all(isinstance(p.day, date) for p in points)
+
+
+def test_recent_daily_last_days_oldest_first():
+    _, source, _ = CORPUS["statistics.html"]
+    today = datetime.combine(FIXTURE_TODAY, datetime.min.time())
+    recent = parse_recent_daily(source, 5, today)
+
+    assert len(recent) == 5
+    assert recent[-1]["date"].endswith(f"{(FIXTURE_TODAY.day - 1):02d}")
@@ -0,0 +1,86 @@
+"""로컬 저장소 <-> Google Sheets 정합성 동기화 테스트 (바뀐 구간만 내려받기)"""
+from src.google_sheets import SHEET_DAILY
+from src.reconcile import SheetsReconciler
+
+
+def daily(day: str, generation: str):
+    return {"date": day, "generation": generation, "current_power": "", "status": "정상",
+            "record_time": "18:00:00"}
+
+
+def fill(store):
+    store.upsert_daily([daily(f"2026-08-{d:02d}", f"{100 + d}.00") for d in range(1, 11)]
+                       + [daily(f"2026-09-{d:02d}", f"{200 + d}.00") for d in range(1, 11)])
+
+
+def sheet_values(sheets, a1=f"{SHEET_DAILY}!A:D"):
+    return sheets.batch_get_values([a1])[0]
+
+
+def test_first_sync_appends_and_second_run_downloads_nothing(sheets, store):
+    fill(store)
+    first = SheetsReconciler(sheets, store).reconcile(sheet_names=[SHEET_DAILY])
+
+    assert first.rows_appended == 20
+    assert len(sheet_values(sheets)) == 21
+
+    second = SheetsReconciler(sheets, store).reconcile(sheet_names=[SHEET_DAILY])
+    assert second.buckets_checked == 2
+    assert (second.buckets_fetched, second.rows_fetched) == (0, 0)
+    assert second.buckets_changed == []
+    assert second.api_calls == 2   # 시트 확인 + 키 컬럼
+
+
+def test_local_change_downloads_only_that_month(sheets, store, sheets_server):
+    fill(store)
+    SheetsReconciler(sheets, store).reconcile(sheet_names=[SHEET_DAILY])
+
+    store.upsert_daily([daily("2026-09-05", "999.00")])
+    report = SheetsReconciler(sheets, store).reconcile(sheet_names=[SHEET_DAILY])
+
+    assert (report.buckets_fetched, report.rows_fetched) == (1, 10)
+    assert report.buckets_changed == [(SHEET_DAILY, "2026-09")]
+    assert report.cells_updated == 1
+    assert ["2026-09-05", "999.00", "", "정상"] in sheet_values(sheets)
+
+
+def test_deleted_and_duplicated_rows_are_detected(sheets, store):
+    fill(store)
+    SheetsReconciler(sheets, store).reconcile(sheet_names=[SHEET_DAILY])
+
+    # 8월 마지막 행 지움, 9월 행 하나 중복 추가
+    sheets.batch_update_values([
+        {"range": f"{SHEET_DAILY}!A11:E11", "values": [["", "", "", "", ""]]},
+        {"range": f"{SHEET_DAILY}!A22:D22", "values": [["2026-09-03", "203.00", "", "정상"]]},
+    ])
+    report = SheetsReconciler(sheets, store).reconcile(sheet_names=[SHEET_DAILY])
+
+    assert report.buckets_fetched == 2
+    assert report.rows_appended == 1
+    assert report.duplicate_keys == [(SHEET_DAILY, "2026-09-03", [14, 22])]
+
+    # 중복이 남은 구간은 다음 검사에서도 다시 확인, 맞춘 구간은 건너뜀
+    again = SheetsReconciler(sheets, store).reconcile(sheet_names=[SHEET_DAILY])
+    assert again.buckets_fetched == 1 and again.rows_appended == 0
+
+
+def test_direct_value_edit_needs_full(sheets, store):
+    fill(store)
+    SheetsReconciler(sheets, store).reconcile(sheet_names=[SHEET_DAILY])
+    sheets.batch_update_values([{"range": f"{SHEET_DAILY}!B3", "values": [["0"]]}])
+
+    assert SheetsReconciler(sheets, store).reconcile(sheet_names=[SHEET_DAILY]).buckets_changed == []
+
+    report = SheetsReconciler(sheets, store).reconcile(sheet_names=[SHEET_DAILY], full=True)
+    assert report.buckets_fetched == 2
+    assert report.buckets_changed == [(SHEET_DAILY, "2026-08")]
+    assert sheet_values(sheets, f"{SHEET_DAILY}!A3:B3") == [["2026-08-02", "102.00"]]
+
+
+def test_dry_run_records_nothing(sheets, store):
+    fill(store)
+    report = SheetsReconciler(sheets, store).reconcile(sheet_names=[SHEET_DAILY], dry_run=True)
+
+    assert report.rows_appended == 20
+    assert sheet_values(sheets)[1:] == []
+    assert store.get_sheet_digests(SHEET_DAILY) == {}
@@ -0,0 +1,85 @@
+"""장중 샘플 보존 기간 압축 (retention) 테스트"""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src.local_store import AGGREGATE_TABLES
+from src.retention import aggregate_raw, compact, months_ago, query_series
+
+SITE = "s1"
+TODAY = date(2026, 10, 15)
+
+
+def insert_day(store, day: date, start_hour: int = 10, minutes: int = 60, step: int = 5, power: float = 6000.0):
+    """day의 start_hour부터 minutes분 동안 step분 간격 샘플 (출력 일정, 카운터 증가)"""
+    rows = []
+    for i in range(0, minutes, step):
+        ts = datetime.combine(day, datetime.min.time()) + timedelta(hours=start_hour, minutes=i)
+        rows.append((ts.isoformat(timespec="seconds"),
+                     {"current_power": power, "today_generation": round(i * power / 60000, 3)}))
+    store.insert_samples(SITE, rows)
+    return len(rows)
+
+
+def count(store, table):
+    return store.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_months_ago_clamps_month_end():
+    assert months_ago(date(2026, 8, 31), 6) == date(2026, 2, 28)
+    assert months_ago(date(2026, 10, 15), 6) == date(2026, 4, 15)
+
+
+def test_aggregate_raw_energy():
+    rows = [{"ts": f"2026-10-01T10:{m:02d}:00", "current_power": 6000.0, "today_generation": None,
+             "month_generation": None, "total_generation": None} for m in range(0, 30, 5)]
+    buckets = aggregate_raw(rows, 15)
+
+    assert [b["bucket"] for b in buckets] == ["2026-10-01T10:00:00", "2026-10-01T10:15:00"]
+    assert [b["n"] for b in buckets] == [3, 3]
+    # 6kW, 15분 구간 (마지막 샘플 이후는 적분하지 않음)
+    assert buckets[0]["energy"] == pytest.approx(1.5)
+    assert buckets[1]["energy"] == pytest.approx(1.0)
+
+
+def test_compact_expired_raw_days(store):
+    old_day, recent_day = TODAY - timedelta(days=20), TODAY - timedelta(days=3)
+    insert_day(store, old_day)
+    recent = insert_day(store, recent_day)
+
+    report = compact(store, TODAY, raw_days=14, quarter_months=6)
+
+    assert report.days == {"15m": 1, "1h": 0}
+    assert report.rows_out["15m"] == 4
+    assert count(store, AGGREGATE_TABLES["15m"]) == 4
+    assert store.get_watermark("15m", SITE) == old_day.isoformat()
+    # 원본은 보존 기간 안의 날짜만 남음
+    assert count(store, "samples") == recent
+
+    # 이미 압축한 날짜는 다시 처리하지 않음
+    again = compact(store, TODAY, raw_days=14, quarter_months=6)
+    assert again.days == {"15m": 0, "1h": 0}
+
+
+def test_compact_quarter_to_hourly(store):
+    old_day = months_ago(TODAY, 7)
+    insert_day(store, old_day, minutes=120)
+
+    report = compact(store, TODAY, raw_days=14, quarter_months=6)
+
+    assert report.days == {"15m": 1, "1h": 1}
+    assert count(store, AGGREGATE_TABLES["15m"]) == 0
+    hourly = store.conn.execute(f"SELECT bucket, n FROM {AGGREGATE_TABLES['1h']} ORDER BY bucket").fetchall()
+    assert [tuple(row) for row in hourly] == [(f"{old_day}T10:00:00", 12), (f"{old_day}T11:00:00", 12)]
+
+
+def test_query_series_spans_tiers(store):
+    old_day, recent_day = TODAY - timedelta(days=20), TODAY - timedelta(days=3)
+    insert_day(store, old_day)
+    recent = insert_day(store, recent_day)
+    compact(store, TODAY, raw_days=14, quarter_months=6)
+
+    series = query_series(store, SITE, old_day.isoformat(), TODAY.isoformat())
+
+    assert [item["tier"] for item in series] == ["15m"] * 4 + ["raw"] * recent
+    assert series == sorted(series, key=lambda item: item["ts"])
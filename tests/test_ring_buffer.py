@@ -0,0 +1,50 @@
+"""장중 샘플 링 버퍼 테스트"""
+from datetime import datetime
+
+import pytest
+
+from src.ring_buffer import SampleRing
+
+SITE = "s1"
+START = int(datetime(2026, 10, 15, 10, 0).timestamp())
+
+
+def test_flush_stores_original_values(store):
+    ring = SampleRing(capacity=8)
+    values = {"current_power": 12345.6, "today_generation": 1234.56}
+    ring.append(START, values, changes=values)
+    ring.append(START + 60, dict(values, current_power=12000.1), changes={"current_power": 12000.1})
+
+    assert ring.flush(store, SITE) == 2
+    # 배열은 float32지만 저장소에는 수집 값 그대로
+    assert store.last_sample_values(SITE) == {"current_power": 12000.1, "today_generation": 1234.56}
+    assert ring.pending() == []
+
+
+def test_unchanged_samples_are_not_stored(store):
+    ring = SampleRing(capacity=8)
+    ring.append(START, {"current_power": 100.0}, changes={"current_power": 100.0})
+    ring.append(START + 60, {"current_power": 100.0})
+
+    assert [ts for ts, _ in ring.pending()] == ["2026-10-15T10:00:00"]
+    assert ring.flush(store, SITE) == 1
+
+
+def test_overwritten_samples_are_dropped_before_flush(store):
+    ring = SampleRing(capacity=3)
+    for n in range(5):
+        ring.append(START + n * 60, {"current_power": float(n)}, changes={"current_power": float(n)})
+
+    assert ring.dropped == 2
+    assert [changes["current_power"] for _, changes in ring.pending()] == [2.0, 3.0, 4.0]
+    assert ring.flush(store, SITE) == 3
+
+
+def test_window_and_energy_today():
+    ring = SampleRing(capacity=16)
+    for n in range(7):   # 6kW 30분 (5분 간격)
+        ring.append(START + n * 300, {"current_power": 6000.0})
+
+    ts, power = ring.field("current_power", 600)
+    assert list(ts) == [START + 1200, START + 1500, START + 1800]
+    assert ring.energy_today(datetime(2026, 10, 15, 12, 0)) == pytest.approx(3.0)